@@ -168,15 +168,97 @@ CELERY_TIMEZONE = "UTC"
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60
 
+# Task routing: three queues so a large fan-out or a maintenance sweep never
+# sits in front of latency-sensitive deliveries (a DM, a follow, an Accept).
+#   interactive — one activity for one recipient, inbox handling
+#   fanout      — broadcasts to followers and other bulk work
+#   maintenance — periodic sweeps, purges and crawls
+# A worker started without -Q consumes all of them; `manage.py run_worker
+# <queue>` starts a worker dedicated to one, sized by TASK_QUEUE_WORKERS.
+CELERY_TASK_DEFAULT_QUEUE = "interactive"
+CELERY_TASK_QUEUES = {
+    name: {"exchange": name, "routing_key": name}
+    for name in ("interactive", "fanout", "maintenance")
+}
+CELERY_TASK_ROUTES = {
+    **{
+        f"suddenly.activitypub.tasks.{name}": {"queue": "fanout"}
+        for name in ("broadcast_activity", "deliver_activity_batch")
+    },
+    "suddenly.core.tasks.fan_out_notifications": {"queue": "fanout"},
+    "suddenly.users.tasks.import_follows_from_rows": {"queue": "fanout"},
+    **{
+        f"suddenly.activitypub.tasks.{name}": {"queue": "maintenance"}
+        for name in (
+            "requeue_inbound_activities",
+            "purge_processed_activities",
+            "purge_outbound_activities",
+            "replay_parked_deliveries",
+            "probe_open_circuits",
+            "crawl_nodeinfo",
+            "refill_key_pool",
+            "expire_stale_link_requests",
+            "refresh_remote_actors",
+            "fetch_remote_actor",
+        )
+    },
+}
+# Per-queue worker sizing for `run_worker`: processes, and messages reserved
+# per process. Interactive and fan-out workers reserve one task at a time so a
+# long batch never holds back a short delivery queued behind it.
+TASK_QUEUE_WORKERS = {
+    "interactive": {
+        "concurrency": int(os.environ.get("CELERY_INTERACTIVE_CONCURRENCY", "4")),
+        "prefetch_multiplier": 1,
+    },
+    "fanout": {
+        "concurrency": int(os.environ.get("CELERY_FANOUT_CONCURRENCY", "2")),
+        "prefetch_multiplier": 1,
+    },
+    "maintenance": {
+        "concurrency": int(os.environ.get("CELERY_MAINTENANCE_CONCURRENCY", "1")),
+        "prefetch_multiplier": 4,
+    },
+}
+
+# "database" sends task calls to the QueuedTask table instead of the broker,
+# run by `manage.py run_task_queue` (suddenly/core/task_queue.py): for
+# deployments without Redis, where tasks would otherwise run in the request.
+TASK_QUEUE_BACKEND = os.environ.get("TASK_QUEUE_BACKEND", "celery")
+
 CELERY_BEAT_SCHEDULE = {
     "refresh-remote-actors": {
         "task": "suddenly.activitypub.tasks.refresh_remote_actors",
-        "schedule": 86400,
+        "schedule": 900,
     },
     "expire-stale-link-requests": {
         "task": "suddenly.activitypub.tasks.expire_stale_link_requests",
         "schedule": 86400,
     },
+    "requeue-inbound-activities": {
+        "task": "suddenly.activitypub.tasks.requeue_inbound_activities",
+        "schedule": 300,
+    },
+    "refill-key-pool": {
+        "task": "suddenly.activitypub.tasks.refill_key_pool",
+        "schedule": 300,
+    },
+    "purge-processed-activities": {
+        "task": "suddenly.activitypub.tasks.purge_processed_activities",
+        "schedule": 3600,
+    },
+    "purge-outbound-activities": {
+        "task": "suddenly.activitypub.tasks.purge_outbound_activities",
+        "schedule": 3600,
+    },
+    "crawl-nodeinfo": {
+        "task": "suddenly.activitypub.tasks.crawl_nodeinfo",
+        "schedule": 3600,
+    },
+    "probe-open-circuits": {
+        "task": "suddenly.activitypub.tasks.probe_open_circuits",
+        "schedule": 120,
+    },
 }
 
 # =================================================================
@@ -279,10 +361,104 @@ AP_ACCEPTED_ACTIVITIES = [
 # Mastodon uses a comparable window (SUD-F2).
 AP_SIGNATURE_MAX_SKEW = int(os.environ.get("AP_SIGNATURE_MAX_SKEW", "300"))
 
+# Process-local cache of parsed RSA keys and remote actors' public key PEMs
+# (signatures.py): entry count and lifetime in seconds.
+AP_KEY_CACHE_SIZE = int(os.environ.get("AP_KEY_CACHE_SIZE", "1024"))
+AP_KEY_CACHE_TTL = int(os.environ.get("AP_KEY_CACHE_TTL", "3600"))
+
+# Process-local resolver cache for SSRF-pinned fetches (activitypub/_http.py):
+# seconds a resolved host / a failed lookup is reused, and entry count.
+AP_DNS_CACHE_TTL = int(os.environ.get("AP_DNS_CACHE_TTL", "300"))
+AP_DNS_NEGATIVE_TTL = int(os.environ.get("AP_DNS_NEGATIVE_TTL", "30"))
+AP_DNS_CACHE_SIZE = int(os.environ.get("AP_DNS_CACHE_SIZE", "1024"))
+
+# Process-local cache of fetched remote documents (actors, WebFinger, outboxes;
+# activitypub/_http.py): the peer's Cache-Control max-age is clamped to
+# [MIN_TTL, MAX_TTL] seconds, 404/410 and unreachable hosts are remembered for
+# NEGATIVE_TTL seconds; entry count. A size of 0 disables the cache.
+AP_REMOTE_CACHE_MIN_TTL = int(os.environ.get("AP_REMOTE_CACHE_MIN_TTL", "60"))
+AP_REMOTE_CACHE_MAX_TTL = int(os.environ.get("AP_REMOTE_CACHE_MAX_TTL", "900"))
+AP_REMOTE_CACHE_NEGATIVE_TTL = int(os.environ.get("AP_REMOTE_CACHE_NEGATIVE_TTL", "60"))
+AP_REMOTE_CACHE_SIZE = int(os.environ.get("AP_REMOTE_CACHE_SIZE", "1024"))
+
+# Remote profile page (activitypub/follow_federation.py): seconds the outbox
+# and game fetches may take before the page renders what arrived, and seconds
+# a complete profile summary is cached per actor.
+AP_REMOTE_PROFILE_DEADLINE = float(os.environ.get("AP_REMOTE_PROFILE_DEADLINE", "4"))
+AP_REMOTE_PROFILE_CACHE_TTL = int(os.environ.get("AP_REMOTE_PROFILE_CACHE_TTL", "300"))
+
+# Follow import (users/follow_import.py): WebFinger + actor lookups in flight
+# at once, of which at most PER_DOMAIN hit the same instance, and follows
+# written per batch (the status record the settings page polls moves with it).
+AP_FOLLOW_IMPORT_CONCURRENCY = int(os.environ.get("AP_FOLLOW_IMPORT_CONCURRENCY", "16"))
+AP_FOLLOW_IMPORT_PER_DOMAIN = int(os.environ.get("AP_FOLLOW_IMPORT_PER_DOMAIN", "4"))
+AP_FOLLOW_IMPORT_BATCH = int(os.environ.get("AP_FOLLOW_IMPORT_BATCH", "100"))
+
+# Pre-generated RSA key pairs kept ready for new users, games and characters
+# (suddenly/activitypub/keypool.py). 0 disables the pool: keys are generated
+# inline in the creating request, as before.
+AP_KEY_POOL_SIZE = int(os.environ.get("AP_KEY_POOL_SIZE", "20"))
+
+# Lifetime (seconds) of rendered actor documents and first outbox pages in the
+# Django cache (suddenly/activitypub/document_cache.py). Saves invalidate them
+# earlier; the TTL only bounds changes made to related rows.
+AP_DOCUMENT_CACHE_TTL = int(os.environ.get("AP_DOCUMENT_CACHE_TTL", "300"))
+
 # Whether plain-http actor fetches are permitted. https is mandatory by default;
 # development overrides this to reach local http peers (SUD-F3).
 AP_ALLOW_INSECURE_HTTP = os.environ.get("AP_ALLOW_INSECURE_HTTP", "0") == "1"
 
+# Inboxes per deliver_activity_batch task. broadcast_activity groups follower
+# inboxes by host and posts each batch over one pooled connection.
+AP_DELIVERY_BATCH_SIZE = int(os.environ.get("AP_DELIVERY_BATCH_SIZE", "50"))
+
+# Queued inbox (see suddenly/activitypub/inbox_queue.py). When on, inbox POSTs
+# only validate (rate limit, signature, JSON, dedup) and store the activity;
+# handlers — which may fetch remote actors — run in a Celery worker, or in
+# `manage.py process_inbox_queue` when no broker is configured.
+AP_INBOX_ASYNC = os.environ.get("AP_INBOX_ASYNC", "0") == "1"
+# Concurrent handler runs allowed per remote domain across all workers.
+AP_INBOX_DOMAIN_CONCURRENCY = int(os.environ.get("AP_INBOX_DOMAIN_CONCURRENCY", "4"))
+# Attempts before a queued activity is parked as FAILED.
+AP_INBOX_MAX_ATTEMPTS = int(os.environ.get("AP_INBOX_MAX_ATTEMPTS", "5"))
+
+# Inbox dedup (suddenly/activitypub/dedup.py): days a processed activity id is
+# kept in the database before the hourly purge, and seconds it stays in the
+# cache "recently seen" set that answers retries without a query.
+AP_DEDUP_RETENTION_DAYS = int(os.environ.get("AP_DEDUP_RETENTION_DAYS", "30"))
+AP_DEDUP_CACHE_TTL = int(os.environ.get("AP_DEDUP_CACHE_TTL", "86400"))
+
+# NodeInfo crawler (suddenly/activitypub/nodeinfo.py), run hourly: instances
+# probed per run and in parallel, and hours before a peer is probed again
+# after a successful / failed probe.
+AP_NODEINFO_CRAWL_BATCH = int(os.environ.get("AP_NODEINFO_CRAWL_BATCH", "50"))
+AP_NODEINFO_CONCURRENCY = int(os.environ.get("AP_NODEINFO_CONCURRENCY", "8"))
+AP_NODEINFO_REFRESH_HOURS = int(os.environ.get("AP_NODEINFO_REFRESH_HOURS", "24"))
+AP_NODEINFO_RETRY_HOURS = int(os.environ.get("AP_NODEINFO_RETRY_HOURS", "6"))
+
+# Remote actor refresh (suddenly/activitypub/actor_refresh.py), run every 15
+# minutes: mirrors fetched per batch and in parallel, seconds of batches per
+# run (a backlog left queues a follow-up run), per-fetch timeout, and hours
+# before a mirror is fetched again after a successful / failed fetch.
+AP_ACTOR_REFRESH_BATCH = int(os.environ.get("AP_ACTOR_REFRESH_BATCH", "200"))
+AP_ACTOR_REFRESH_CONCURRENCY = int(os.environ.get("AP_ACTOR_REFRESH_CONCURRENCY", "8"))
+AP_ACTOR_REFRESH_TIME_BUDGET = int(os.environ.get("AP_ACTOR_REFRESH_TIME_BUDGET", "240"))
+AP_ACTOR_REFRESH_TIMEOUT = int(os.environ.get("AP_ACTOR_REFRESH_TIMEOUT", "10"))
+AP_ACTOR_REFRESH_HOURS = int(os.environ.get("AP_ACTOR_REFRESH_HOURS", "24"))
+AP_ACTOR_REFRESH_RETRY_HOURS = int(os.environ.get("AP_ACTOR_REFRESH_RETRY_HOURS", "6"))
+
+# Delivery circuit breaker (suddenly/activitypub/delivery_health.py): consecutive
+# failed deliveries that open an instance's circuit, seconds before an open
+# circuit lets one probe through, and days a parked delivery is kept.
+AP_CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get("AP_CIRCUIT_FAILURE_THRESHOLD", "5"))
+AP_CIRCUIT_COOLDOWN = int(os.environ.get("AP_CIRCUIT_COOLDOWN", "600"))
+AP_CIRCUIT_PARK_DAYS = int(os.environ.get("AP_CIRCUIT_PARK_DAYS", "7"))
+
+# Outbound activity store (suddenly/activitypub/outbound.py): days a stored
+# outgoing activity is kept before the hourly purge. Must outlive the delivery
+# retries and AP_CIRCUIT_PARK_DAYS, or parked deliveries lose their body.
+AP_OUTBOUND_RETENTION_DAYS = int(os.environ.get("AP_OUTBOUND_RETENTION_DAYS", "8"))
+
 # =================================================================
 # INGESTION
 # =================================================================
@@ -300,6 +476,15 @@ INGEST_TOKEN = os.environ.get("INGEST_TOKEN", "")
 # shorter than this, at least one promo is still guaranteed.
 FEED_PROMO_EVERY = int(os.environ.get("FEED_PROMO_EVERY", "6"))
 
+# =================================================================
+# NOTIFICATIONS
+# =================================================================
+
+# Recipients above which NotificationService.fan_out writes the notifications
+# in a Celery task after commit rather than inside the request (only when a
+# broker is configured; eager mode always writes inline).
+NOTIFICATION_FANOUT_SYNC_LIMIT = int(os.environ.get("NOTIFICATION_FANOUT_SYNC_LIMIT", "100"))
+
 # =================================================================
 # MISC
 # =================================================================
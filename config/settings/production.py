@@ -65,7 +65,9 @@ else:
             "LOCATION": "django_cache",
         }
     }
-    CELERY_TASK_ALWAYS_EAGER = True  # Run tasks synchronously without broker
+    # Run tasks synchronously without broker, unless TASK_QUEUE_BACKEND=database
+    # queues them for `manage.py run_task_queue` (started by the entrypoint).
+    CELERY_TASK_ALWAYS_EAGER = True
 
 # Media storage — S3/Cloudflare R2, optional (falls back to local filesystem)
 #
@@ -0,0 +1,519 @@
+"""
+Federation throughput benchmarks against an in-process fake peer instance.
+
+A stand-in remote instance runs on 127.0.0.1 in a background thread: it
+serves actor documents and WebFinger, signs the activities it sends to our
+inboxes with its actors' keys, and counts the deliveries it receives. The
+scenarios run against a throwaway test database, with the database task
+queue (``TASK_QUEUE_BACKEND = "database"``) so queued work can be timed on
+its own:
+
+- signatures   sign_request / verify_signature ops/s (parsed keys cached);
+- inbox        signed Follow / Undo requests/s through ``process_inbox``,
+               inline (``AP_INBOX_ASYNC`` off) and queued (on); the peer's
+               keys are fetched over localhost by the first requests;
+- broadcast    ``broadcast_activity`` to N remote followers with one inbox
+               each: time to plan the fan-out (query, grouping, stored
+               activity, queued batches) and to deliver it to the peer.
+
+Results can be written as JSON and compared with a previous run: any metric
+worse than the baseline by more than ``--max-regression`` fails the run.
+
+Needs the development database server (a ``test_`` database is created and
+dropped). Usage:
+    python scripts/bench_federation.py
+    python scripts/bench_federation.py --followers 1000 --json bench.json
+    python scripts/bench_federation.py --baseline bench.json --max-regression 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+ROOT = Path(__file__).resolve().parent.parent
+AS_CONTEXT = "https://www.w3.org/ns/activitystreams"
+ALL_SCENARIOS = ("signatures", "inbox", "broadcast")
+
+
+# =================================================================
+# Fake peer
+# =================================================================
+
+
+class FakePeer:
+    """A remote instance on 127.0.0.1: actors, WebFinger, signed traffic, an inbox."""
+
+    def __init__(self, private_pem: str, public_pem: str) -> None:
+        self.private_pem = private_pem
+        self.public_pem = public_pem
+        self.received = 0
+        self.unsigned = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self.netloc = f"127.0.0.1:{self._server.server_address[1]}"
+        self.base_url = f"http://{self.netloc}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def __enter__(self) -> FakePeer:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def actor_url(self, name: str) -> str:
+        return f"{self.base_url}/users/{name}"
+
+    def actor(self, name: str) -> dict[str, Any]:
+        url = self.actor_url(name)
+        return {
+            "@context": [AS_CONTEXT, "https://w3id.org/security/v1"],
+            "id": url,
+            "type": "Person",
+            "preferredUsername": name,
+            "name": name.title(),
+            "summary": "",
+            "inbox": f"{url}/inbox",
+            "outbox": f"{url}/outbox",
+            "publicKey": {"id": f"{url}#main-key", "owner": url, "publicKeyPem": self.public_pem},
+        }
+
+    def signed_post(self, name: str, inbox_url: str, activity: dict[str, Any]) -> Any:
+        """A Django request carrying `activity` to `inbox_url`, signed by actor `name`."""
+        from django.test import RequestFactory
+
+        from suddenly.activitypub.signatures import encode_body, sign_request
+
+        body = encode_body(activity)
+        headers = sign_request(
+            "POST",
+            inbox_url,
+            {},
+            body=body,
+            key_id=f"{self.actor_url(name)}#main-key",
+            private_key_pem=self.private_pem,
+        )
+        return RequestFactory().post(
+            urlparse(inbox_url).path,
+            data=body.content,
+            content_type="application/activity+json",
+            HTTP_HOST=headers["Host"],
+            HTTP_DATE=headers["Date"],
+            HTTP_DIGEST=headers["Digest"],
+            HTTP_SIGNATURE=headers["Signature"],
+        )
+
+    def _record(self, signed: bool) -> None:
+        with self._lock:
+            self.received += 1
+            if not signed:
+                self.unsigned += 1
+
+    def reset_counts(self) -> None:
+        with self._lock:
+            self.received = self.unsigned = 0
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        peer = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _json(self, status: int, data: dict[str, Any] | None = None) -> None:
+                payload = json.dumps(data).encode() if data is not None else b""
+                self.send_response(status)
+                self.send_header("Content-Type", "application/activity+json")
+                self.send_header("Cache-Control", "max-age=300")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self) -> None:  # noqa: N802 — http.server naming
+                url = urlparse(self.path)
+                parts = url.path.strip("/").split("/")
+                if url.path == "/.well-known/webfinger":
+                    account = parse_qs(url.query).get("resource", [""])[0].removeprefix("acct:")
+                    name = account.split("@")[0]
+                    self._json(
+                        200,
+                        {
+                            "subject": f"acct:{account}",
+                            "links": [
+                                {
+                                    "rel": "self",
+                                    "type": "application/activity+json",
+                                    "href": peer.actor_url(name),
+                                }
+                            ],
+                        },
+                    )
+                elif len(parts) == 2 and parts[0] == "users":
+                    self._json(200, peer.actor(parts[1]))
+                else:
+                    self._json(404)
+
+            def do_POST(self) -> None:  # noqa: N802 — http.server naming
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                if not self.path.endswith("/inbox"):
+                    self._json(404)
+                    return
+                peer._record("Signature" in self.headers)
+                self._json(202)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                return None
+
+        return Handler
+
+
+@contextmanager
+def _allow_loopback() -> Iterator[None]:
+    """Let the SSRF guard reach the fake peer on 127.0.0.1 — and nothing else private."""
+    from suddenly.activitypub import _http
+
+    blocked = _http._is_blocked_ip
+    with mock.patch.object(_http, "_is_blocked_ip", lambda ip: ip != "127.0.0.1" and blocked(ip)):
+        yield
+
+
+# =================================================================
+# Results
+# =================================================================
+
+
+class Results:
+    """Named metrics, each with a unit and the direction that counts as better."""
+
+    def __init__(self) -> None:
+        self.metrics: dict[str, dict[str, Any]] = {}
+
+    def add(self, name: str, value: float, unit: str, *, higher_is_better: bool) -> None:
+        self.metrics[name] = {
+            "value": round(value, 4),
+            "unit": unit,
+            "higher_is_better": higher_is_better,
+        }
+        print(f"{name:<32} {value:>12.2f} {unit}")
+
+    def as_dict(self, params: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "suite": "federation",
+            "created_at": datetime.now(UTC).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "params": params,
+            "metrics": self.metrics,
+        }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def compare(
+    metrics: dict[str, dict[str, Any]], baseline: dict[str, Any], max_regression: float
+) -> list[str]:
+    """Metrics worse than `baseline` by more than `max_regression` (a fraction)."""
+    regressions: list[str] = []
+    for name, metric in metrics.items():
+        before = baseline.get("metrics", {}).get(name)
+        if not before or not before.get("value"):
+            continue
+        change = metric["value"] / before["value"] - 1
+        worse = -change if metric["higher_is_better"] else change
+        print(f"{name:<32} {change:>+11.1%} vs baseline")
+        if worse > max_regression:
+            regressions.append(f"{name}: {before['value']} -> {metric['value']} {metric['unit']}")
+    return regressions
+
+
+# =================================================================
+# Scenarios
+# =================================================================
+
+
+def _local_user(username: str) -> Any:
+    from suddenly.users.models import User
+
+    # Created through the ORM so post_save gives it a key pair, as at signup.
+    return User.objects.create_user(username=username, email=f"{username}@bench.invalid")
+
+
+def bench_signatures(results: Results, peer: FakePeer, iterations: int) -> None:
+    from suddenly.activitypub.signatures import encode_body, sign_request, verify_signature
+
+    target = "https://remote.example/users/bob/inbox"
+    key_id = f"{peer.actor_url('signer')}#main-key"
+    body = encode_body({"type": "Create", "object": {"type": "Note", "content": "x" * 512}})
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        sign_request("POST", target, {}, body=body, key_id=key_id, private_key_pem=peer.private_pem)
+    results.add(
+        "signatures.sign",
+        iterations / (time.perf_counter() - start),
+        "ops/s",
+        higher_is_better=True,
+    )
+
+    request = peer.signed_post("signer", target, {"type": "Create", "actor": key_id})
+    assert verify_signature(request)[0], "fake peer signature rejected"
+    start = time.perf_counter()
+    for _ in range(iterations):
+        verify_signature(request)
+    results.add(
+        "signatures.verify",
+        iterations / (time.perf_counter() - start),
+        "ops/s",
+        higher_is_better=True,
+    )
+
+
+def _inbox_traffic(peer: FakePeer, actor_url: str, count: int, senders: int) -> list[Any]:
+    """Signed Follow / Undo(Follow) pairs from `senders` peer actors to one local actor."""
+    requests = []
+    inbox_url = f"{actor_url}/inbox"
+    for n in range(count):
+        name = f"peer{n % senders}"
+        sender = peer.actor_url(name)
+        follow = {
+            "@context": AS_CONTEXT,
+            "id": f"{sender}/follows/{uuid.uuid4().hex}",
+            "type": "Follow",
+            "actor": sender,
+            "object": actor_url,
+        }
+        # Every sender follows, then unfollows on its next turn, and so on.
+        if (n // senders) % 2:
+            activity = {
+                "@context": AS_CONTEXT,
+                "id": f"{sender}/undo/{uuid.uuid4().hex}",
+                "type": "Undo",
+                "actor": sender,
+                "object": {k: v for k, v in follow.items() if k != "@context"},
+            }
+        else:
+            activity = follow
+        requests.append(peer.signed_post(name, inbox_url, activity))
+    return requests
+
+
+def bench_inbox(results: Results, peer: FakePeer, count: int, senders: int) -> None:
+    from django.test.utils import override_settings
+
+    from suddenly.activitypub._http import clear_remote_cache
+    from suddenly.activitypub.inbox import process_inbox
+    from suddenly.activitypub.signatures import clear_key_cache
+    from suddenly.core.models import QueuedTask
+
+    target = _local_user("bench_inbox")
+    for mode, async_inbox in (("inline", False), ("queued", True)):
+        clear_remote_cache()
+        clear_key_cache()
+        requests = _inbox_traffic(peer, target.actor_url, count, senders)
+        errors = 0
+        with override_settings(AP_INBOX_ASYNC=async_inbox):
+            start = time.perf_counter()
+            for request in requests:
+                if process_inbox(request, "user", target.username).status_code != 202:
+                    errors += 1
+            elapsed = time.perf_counter() - start
+        if errors:
+            print(f"  {errors} of {count} {mode} inbox requests were refused", file=sys.stderr)
+        results.add(f"inbox.{mode}", count / elapsed, "req/s", higher_is_better=True)
+        QueuedTask.objects.all().delete()
+
+
+def _add_followers(peer: FakePeer, target: Any, start: int, stop: int) -> None:
+    from django.contrib.contenttypes.models import ContentType
+
+    from suddenly.characters.models import Follow
+    from suddenly.users.models import User
+
+    followers = [
+        User(
+            username=f"f{n}@{peer.netloc}",
+            remote=True,
+            ap_id=peer.actor_url(f"f{n}"),
+            inbox_url=f"{peer.actor_url(f'f{n}')}/inbox",
+        )
+        for n in range(start, stop)
+    ]
+    User.objects.bulk_create(followers, batch_size=1000)
+    content_type = ContentType.objects.get_for_model(User)
+    Follow.objects.bulk_create(
+        [
+            Follow(follower=follower, content_type=content_type, object_id=target.pk)
+            for follower in followers
+        ],
+        batch_size=1000,
+    )
+
+
+def bench_broadcast(results: Results, peer: FakePeer, sizes: list[int]) -> None:
+    from suddenly.activitypub.tasks import broadcast_activity
+    from suddenly.core.models import QueuedTask
+    from suddenly.core.task_queue import drain_task_queue
+
+    author = _local_user("bench_author")
+    have = 0
+    for size in sorted(sizes):
+        _add_followers(peer, author, have, size)
+        have = size
+        QueuedTask.objects.all().delete()
+        peer.reset_counts()
+        activity = {
+            "@context": AS_CONTEXT,
+            "id": f"{author.actor_url}/notes/{uuid.uuid4().hex}",
+            "type": "Create",
+            "actor": author.actor_url,
+            "object": {"type": "Note", "content": "x" * 512},
+        }
+
+        start = time.perf_counter()
+        broadcast_activity(activity, str(author.pk), "user")
+        results.add(
+            f"broadcast.{size}.plan", time.perf_counter() - start, "s", higher_is_better=False
+        )
+
+        start = time.perf_counter()
+        while sum(drain_task_queue(limit=50, queues=["fanout"]).values()):
+            pass
+        elapsed = time.perf_counter() - start
+        results.add(f"broadcast.{size}.deliver", elapsed, "s", higher_is_better=False)
+        if peer.received != size or peer.unsigned:
+            print(
+                f"  peer received {peer.received}/{size} deliveries, {peer.unsigned} unsigned",
+                file=sys.stderr,
+            )
+        results.add(
+            f"broadcast.{size}.deliveries",
+            peer.received / elapsed,
+            "req/s",
+            higher_is_better=True,
+        )
+
+
+# =================================================================
+# Entry point
+# =================================================================
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scenario", action="append", choices=ALL_SCENARIOS)
+    parser.add_argument("--iterations", type=int, default=500, help="sign/verify operations")
+    parser.add_argument("--inbox-requests", type=int, default=400)
+    parser.add_argument("--peer-actors", type=int, default=20, help="distinct inbox senders")
+    parser.add_argument("--followers", default="1000,10000", help="comma-separated sizes")
+    parser.add_argument("--json", type=Path, help="write the results to this file")
+    parser.add_argument("--baseline", type=Path, help="results file of a previous run")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    parser.add_argument("--keepdb", action="store_true", help="keep the test database")
+    args = parser.parse_args()
+    scenarios = args.scenario or list(ALL_SCENARIOS)
+    sizes = [int(size) for size in args.followers.split(",") if size.strip()]
+    # Read before the run: --json may overwrite the baseline file.
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else None
+
+    sys.path.insert(0, str(ROOT))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.development")
+    import django
+
+    django.setup()
+
+    from django.test.utils import (
+        override_settings,
+        setup_databases,
+        setup_test_environment,
+        teardown_databases,
+        teardown_test_environment,
+    )
+
+    from suddenly.activitypub._http import reset_delivery_client
+    from suddenly.activitypub.signatures import generate_key_pair
+    from suddenly.celery import app as celery_app
+
+    # Shared tasks run through the project app's QueueAwareTask: with the
+    # database backend set below, queued work (inbox jobs, broadcast batches)
+    # lands in the database queue the scenarios drain, never on a broker.
+    celery_app.conf.task_always_eager = False
+
+    # Request logging would dominate the timings; warnings and errors still show.
+    logging.disable(logging.INFO)
+    setup_test_environment(debug=False)
+    old_config = setup_databases(verbosity=0, interactive=False, keepdb=args.keepdb)
+    results = Results()
+    try:
+        with (
+            override_settings(
+                TASK_QUEUE_BACKEND="database",
+                AP_INBOX_ASYNC=False,
+                AP_ALLOW_INSECURE_HTTP=True,
+                RATELIMIT_ENABLE=False,
+            ),
+            _allow_loopback(),
+            FakePeer(*generate_key_pair()) as peer,
+        ):
+            if "signatures" in scenarios:
+                bench_signatures(results, peer, args.iterations)
+            if "inbox" in scenarios:
+                bench_inbox(results, peer, args.inbox_requests, args.peer_actors)
+            if "broadcast" in scenarios:
+                bench_broadcast(results, peer, sizes)
+            reset_delivery_client()
+    finally:
+        teardown_databases(old_config, verbosity=0, keepdb=args.keepdb)
+        teardown_test_environment()
+
+    report = results.as_dict(
+        {
+            "scenarios": scenarios,
+            "iterations": args.iterations,
+            "inbox_requests": args.inbox_requests,
+            "peer_actors": args.peer_actors,
+            "followers": sizes,
+        }
+    )
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2) + "\n")
+    if baseline is not None:
+        regressions = compare(results.metrics, baseline, args.max_regression)
+        if regressions:
+            print("Regressions beyond the allowed margin:", file=sys.stderr)
+            for line in regressions:
+                print(f"  {line}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
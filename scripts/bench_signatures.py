@@ -0,0 +1,97 @@
+"""
+Micro-benchmark: HTTP signature signing/verification with and without the
+parsed-key cache (suddenly/activitypub/signatures.py).
+
+"cold" clears the cache before every operation (the old behaviour: one PEM
+parse per request); "warm" reuses the parsed key objects.
+
+Usage:
+    python scripts/bench_signatures.py
+    python scripts/bench_signatures.py --iterations 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+
+def _timed(
+    label: str, iterations: int, op: Callable[[], object], before: Callable[[], None]
+) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        before()
+        op()
+    elapsed = time.perf_counter() - start
+    rate = iterations / elapsed
+    print(f"{label:<16} {rate:>10.0f} ops/s   {elapsed * 1e6 / iterations:>8.1f} µs/op")
+    return rate
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.development")
+    import django
+
+    django.setup()
+
+    from suddenly.activitypub.signatures import (
+        _verify_with_key,
+        clear_key_cache,
+        generate_key_pair,
+        load_private_key,
+        sign_request,
+    )
+
+    private_pem, public_pem = generate_key_pair()
+    key_id = "https://bench.local/users/bench#main-key"
+    body = {"type": "Create", "object": {"type": "Note", "content": "x" * 512}}
+
+    def sign() -> object:
+        return sign_request(
+            "POST",
+            "https://remote.example/inbox",
+            {},
+            body=body,
+            key_id=key_id,
+            private_key_pem=private_pem,
+        )
+
+    signing_string = "(request-target): post /inbox\nhost: remote.example"
+    import base64
+
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.asymmetric import padding
+
+    signature = base64.b64encode(
+        load_private_key(private_pem).sign(
+            signing_string.encode(), padding.PKCS1v15(), hashes.SHA256()
+        )
+    ).decode()
+
+    def verify() -> object:
+        return _verify_with_key(public_pem, signature, signing_string, key_id)
+
+    def nothing() -> None:
+        return None
+
+    n = args.iterations
+    sign_cold = _timed("sign (cold)", n, sign, clear_key_cache)
+    sign_warm = _timed("sign (warm)", n, sign, nothing)
+    verify_cold = _timed("verify (cold)", n, verify, clear_key_cache)
+    verify_warm = _timed("verify (warm)", n, verify, nothing)
+    print(f"speed-up: sign x{sign_warm / sign_cold:.2f}, verify x{verify_warm / verify_cold:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
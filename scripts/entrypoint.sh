@@ -12,6 +12,11 @@ python manage.py migrate --noinput
 echo "==> Creating DB cache table (no-op if already exists)..."
 python manage.py createcachetable 2>/dev/null || true
 
+if [ "${TASK_QUEUE_BACKEND:-}" = "database" ]; then
+    echo "==> Starting database task queue worker..."
+    python manage.py run_task_queue --beat &
+fi
+
 echo "==> Starting gunicorn..."
 exec gunicorn suddenly.wsgi:application \
     --bind "0.0.0.0:${PORT:-8000}" \
@@ -6,3 +6,9 @@
 # federation can list instances with their version. Bumped once per release by
 # the maintainer; volunteers deploying the project never manage it by hand.
 __version__ = "0.8.0"
+
+# Load the Celery app whenever Django starts, so ``@shared_task`` binds to it
+# (and its QueueAwareTask) in web processes too, not only in workers.
+from .celery import app as celery_app
+
+__all__ = ("__version__", "celery_app")
@@ -7,10 +7,16 @@ signature verification, inbox processing, and Celery delivery tasks.
 
 from __future__ import annotations
 
+import copy
+import importlib.util
 import ipaddress
 import logging
+import os
 import socket
-from typing import Any
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, NamedTuple
 from urllib.parse import urlparse, urlunparse
 
 logger = logging.getLogger(__name__)
@@ -37,14 +43,108 @@ def _is_blocked_ip(ip: str) -> bool:
     )
 
 
+# =================================================================
+# Resolver cache
+# =================================================================
+#
+# Every SSRF-safe fetch resolves its host before connecting, and a single
+# remote profile view or inbox burst fetches from the same host several times
+# (actor, key refetch, WebFinger, outbox). Resolutions are kept in a
+# process-local LRU: addresses for AP_DNS_CACHE_TTL seconds, failures for
+# AP_DNS_NEGATIVE_TTL seconds. Only the raw addresses are cached; every fetch
+# still runs them through `_is_blocked_ip` and connects to the address it
+# validated, so the pinning guarantee is unchanged. A cached entry can only
+# outlive the record's real TTL by the configured lifetime — the resolver
+# does not expose record TTLs, which is why both lifetimes are kept short.
+
+
+class _ResolverCache:
+    """Thread-safe hostname → addresses LRU with positive/negative expiry."""
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict[str, tuple[float, tuple[str, ...]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, hostname: str) -> tuple[str, ...] | None:
+        with self._lock:
+            entry = self._entries.get(hostname)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[hostname]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(hostname)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, hostname: str, addresses: tuple[str, ...]) -> None:
+        from django.conf import settings
+
+        if addresses:
+            ttl = float(getattr(settings, "AP_DNS_CACHE_TTL", 300))
+        else:
+            ttl = float(getattr(settings, "AP_DNS_NEGATIVE_TTL", 30))
+        max_size = int(getattr(settings, "AP_DNS_CACHE_SIZE", 1024))
+        if ttl <= 0 or max_size <= 0:
+            return
+        with self._lock:
+            self._entries[hostname] = (time.monotonic() + ttl, addresses)
+            self._entries.move_to_end(hostname)
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
+_resolver_cache = _ResolverCache()
+
+
+def resolve_host(hostname: str) -> tuple[str, ...]:
+    """Return `hostname`'s addresses in resolver order, cached; empty when unresolvable."""
+    hostname = hostname.lower()
+    addresses = _resolver_cache.get(hostname)
+    if addresses is not None:
+        return addresses
+
+    try:
+        resolved = socket.getaddrinfo(hostname, None, proto=socket.IPPROTO_TCP)
+    except (socket.gaierror, UnicodeError):
+        resolved = []
+    # getaddrinfo repeats an address once per socket type; keep the first of each.
+    addresses = tuple(dict.fromkeys(str(sockaddr[0]) for *_, sockaddr in resolved))
+    _resolver_cache.put(hostname, addresses)
+    return addresses
+
+
+def dns_cache_stats() -> dict[str, int]:
+    """Hit/miss counters and current size of the resolver cache."""
+    return _resolver_cache.stats()
+
+
+def clear_dns_cache() -> None:
+    """Empty the resolver cache and reset its counters (tests, benchmarks)."""
+    _resolver_cache.clear()
+
+
 def _validate_and_pin(url: str) -> tuple[str, dict[str, str], dict[str, Any]] | None:
     """Validate a URL for SSRF safety and return connection details for a pinned GET.
 
-    Resolves the hostname once and blocks private/loopback/link-local addresses,
-    then produces a request URL that connects directly to the validated IP so
-    httpx cannot re-resolve the name and land on a different (internal) address —
-    closing the DNS-rebinding TOCTOU window (SUD-F3). TLS SNI and certificate
-    verification still use the original hostname. Only http/https schemes allowed.
+    Resolves the hostname once (through the resolver cache) and blocks
+    private/loopback/link-local addresses, then produces a request URL that
+    connects directly to the validated IP so httpx cannot re-resolve the name
+    and land on a different (internal) address — closing the DNS-rebinding
+    TOCTOU window (SUD-F3). TLS SNI and certificate verification still use the
+    original hostname. Only http/https schemes allowed.
 
     Returns:
         `None` if the request must be rejected outright (disallowed scheme, no
@@ -68,15 +168,10 @@ def _validate_and_pin(url: str) -> tuple[str, dict[str, str], dict[str, Any]] |
     if not hostname:
         return None
 
-    # Resolve once. The IP we validate here is the exact IP we connect to below.
-    try:
-        resolved = socket.getaddrinfo(hostname, parsed.port, proto=socket.IPPROTO_TCP)
-    except socket.gaierror:
-        resolved = []
-
+    # Resolve once (cached). The IP we validate here is the exact IP we connect
+    # to below.
     pinned_ip: str | None = None
-    for _family, _type, _proto, _canon, sockaddr in resolved:
-        ip = str(sockaddr[0])
+    for ip in resolve_host(hostname):
         if _is_blocked_ip(ip):
             logger.warning("Blocked SSRF attempt to %s (%s)", url, ip)
             return None
@@ -98,90 +193,397 @@ def _validate_and_pin(url: str) -> tuple[str, dict[str, str], dict[str, Any]] |
     return (request_url, headers, extensions)
 
 
-def fetch_ap_json(url: str, *, accept: str, timeout: int = 10) -> dict[str, Any] | None:
-    """Fetch a JSON document over HTTP(S) with SSRF protection.
+class RemoteDocument(NamedTuple):
+    """Outcome of a (conditional) remote GET — see `fetch_ap_document`.
 
-    Shared by ActivityPub actor fetches and WebFinger lookups. Every outbound
-    GET on a caller-influenced URL MUST go through this helper (or a wrapper),
-    never a raw `httpx.Client`, so the SSRF allow/deny + IP-pin logic applies.
-
-    Args:
-        url: The URL to fetch.
-        accept: The `Accept` header value (e.g. `application/jrd+json`).
-        timeout: HTTP timeout in seconds (default 10).
+    `status` is 0 when the URL was rejected or the host unreachable; `data` is
+    the parsed JSON body of a 200 response only.
+    """
 
-    Returns:
-        The parsed dict on a 200 response, or None on rejection or any failure.
+    status: int
+    data: dict[str, Any] | None
+    etag: str = ""
+    last_modified: str = ""
+    cache_control: str = ""
+
+
+def fetch_ap_document(
+    url: str,
+    *,
+    accept: str,
+    timeout: int = 10,
+    etag: str = "",
+    last_modified: str = "",
+) -> RemoteDocument:
+    """Fetch a JSON document with SSRF protection, conditionally when validators are given.
+
+    `etag` / `last_modified` (from a previous response) are sent as
+    `If-None-Match` / `If-Modified-Since`; an unchanged document then answers
+    304 with no body. The response's own validators are returned for the next
+    request. Same SSRF guarantees as `fetch_ap_json`, which wraps this.
     """
     import httpx
 
     pinned = _validate_and_pin(url)
     if pinned is None:
-        return None
+        return RemoteDocument(0, None)
     request_url, extra_headers, extensions = pinned
     headers = {"Accept": accept, **extra_headers}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
 
     try:
         # follow_redirects=False (explicit): a redirect would re-resolve to an
         # unvalidated host and reopen the SSRF window we just closed.
         with httpx.Client(timeout=timeout, follow_redirects=False) as client:
             resp = client.get(request_url, headers=headers, extensions=extensions)
-        if resp.status_code == 200:
-            return resp.json()  # type: ignore[no-any-return]
+        status = int(resp.status_code)
+        new_etag = resp.headers.get("ETag")
+        new_last_modified = resp.headers.get("Last-Modified")
+        cache_control = resp.headers.get("Cache-Control")
+        data = resp.json() if status == 200 else None
     except Exception:
         logger.warning("Failed to fetch %s", url, exc_info=True)
+        return RemoteDocument(0, None)
+
+    return RemoteDocument(
+        status,
+        data if isinstance(data, dict) else None,
+        new_etag if isinstance(new_etag, str) else "",
+        new_last_modified if isinstance(new_last_modified, str) else "",
+        cache_control if isinstance(cache_control, str) else "",
+    )
 
-    return None
 
+# =================================================================
+# Remote document cache
+# =================================================================
+#
+# The same remote documents are fetched over and over: an actor by the inbox
+# (key, then profile), the search box, the remote profile view and the
+# follow flow; a WebFinger answer by every handle lookup. `fetch_ap_json`
+# therefore keeps answers in a process-local LRU keyed by (URL, Accept):
+#
+# - a 200 is kept for its `Cache-Control: max-age`, clamped to
+#   [AP_REMOTE_CACHE_MIN_TTL, AP_REMOTE_CACHE_MAX_TTL] (the floor when the peer
+#   sends no lifetime or `no-cache`); `no-store` is never kept;
+# - once expired, an entry carrying an ETag / Last-Modified is revalidated
+#   with a conditional GET — a 304 extends it without a body;
+# - 404/410 and unreachable hosts are remembered for AP_REMOTE_CACHE_NEGATIVE_TTL
+#   seconds, so a dead actor is not re-fetched by every activity mentioning it;
+# - concurrent fetches of one URL in a process share a single request.
+#
+# Callers get a copy: a cached document cannot be altered through them.
+# `fresh=True` always goes to the peer (revalidating), for the signature
+# path where a cached document may hold a rotated-out key.
+
+
+class _CachedDocument(NamedTuple):
+    expires: float
+    document: RemoteDocument
+
+
+class _Flight:
+    """One in-progress fetch that concurrent callers wait on."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.document: RemoteDocument | None = None
+
+
+_NEGATIVE_STATUSES = frozenset({0, 404, 410})
+
+
+def _max_age(cache_control: str) -> float | None:
+    """Lifetime granted by a Cache-Control header: None when unspecified, -1 for no-store."""
+    max_age: float | None = None
+    for directive in cache_control.lower().split(","):
+        name, _, value = directive.strip().partition("=")
+        if name == "no-store":
+            return -1
+        if name == "no-cache":
+            max_age = 0
+        elif name == "max-age" and max_age is None:
+            try:
+                max_age = max(float(value.strip().strip('"')), 0)
+            except ValueError:
+                continue
+    return max_age
+
+
+class _DocumentCache:
+    """Thread-safe (URL, Accept) → remote document LRU with request coalescing."""
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict[tuple[str, str], _CachedDocument] = OrderedDict()
+        self._flights: dict[tuple[str, str], _Flight] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.coalesced = 0
+
+    def _lookup(self, key: tuple[str, str]) -> _CachedDocument | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _store(self, key: tuple[str, str], document: RemoteDocument) -> None:
+        from django.conf import settings
+
+        max_size = int(getattr(settings, "AP_REMOTE_CACHE_SIZE", 1024))
+        if document.status in _NEGATIVE_STATUSES:
+            ttl = float(getattr(settings, "AP_REMOTE_CACHE_NEGATIVE_TTL", 60))
+        elif document.status == 200 and document.data is not None:
+            max_age = _max_age(document.cache_control)
+            if max_age is not None and max_age < 0:
+                self.discard(key)
+                return
+            floor = float(getattr(settings, "AP_REMOTE_CACHE_MIN_TTL", 60))
+            ceiling = float(getattr(settings, "AP_REMOTE_CACHE_MAX_TTL", 900))
+            ttl = min(max(max_age or 0, floor), ceiling)
+        else:
+            return
+        if ttl <= 0 or max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = _CachedDocument(time.monotonic() + ttl, document)
+            self._entries.move_to_end(key)
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+
+    def fetch(self, url: str, *, accept: str, timeout: int, fresh: bool) -> RemoteDocument:
+        key = (url, accept)
+        entry = self._lookup(key)
+        if entry is not None and not fresh and entry.expires >= time.monotonic():
+            with self._lock:
+                self.hits += 1
+            return entry.document
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.coalesced += 1
+        if not leader:
+            flight.done.wait(timeout)
+            if flight.document is not None:
+                return flight.document
+
+        try:
+            document = self._refetch(key, entry, timeout)
+            flight.document = document
+        finally:
+            if leader:
+                with self._lock:
+                    self._flights.pop(key, None)
+                flight.done.set()
+        return document
+
+    def _refetch(
+        self, key: tuple[str, str], entry: _CachedDocument | None, timeout: int
+    ) -> RemoteDocument:
+        url, accept = key
+        cached = entry.document if entry is not None and entry.document.data is not None else None
+        document = fetch_ap_document(
+            url,
+            accept=accept,
+            timeout=timeout,
+            etag=cached.etag if cached else "",
+            last_modified=cached.last_modified if cached else "",
+        )
+        if document.status == 304 and cached is not None:
+            with self._lock:
+                self.revalidated += 1
+            document = cached._replace(
+                etag=document.etag or cached.etag,
+                last_modified=document.last_modified or cached.last_modified,
+                cache_control=document.cache_control or cached.cache_control,
+            )
+        else:
+            with self._lock:
+                self.misses += 1
+        self._store(key, document)
+        return document
+
+    def discard(self, key: tuple[str, str]) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def discard_url(self, url: str) -> None:
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == url]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.revalidated = 0
+            self.coalesced = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidated": self.revalidated,
+                "coalesced": self.coalesced,
+                "size": len(self._entries),
+            }
+
+
+_document_cache = _DocumentCache()
+
+
+def remote_cache_stats() -> dict[str, int]:
+    """Hit/miss/revalidation/coalescing counters and current size of the document cache."""
+    return _document_cache.stats()
+
+
+def forget_remote_document(url: str) -> None:
+    """Drop every cached answer for `url` (the peer announced a change)."""
+    _document_cache.discard_url(url)
+
+
+def clear_remote_cache() -> None:
+    """Empty the remote document cache and reset its counters (tests, benchmarks)."""
+    _document_cache.clear()
+
+
+def fetch_ap_json(
+    url: str, *, accept: str, timeout: int = 10, fresh: bool = False
+) -> dict[str, Any] | None:
+    """Fetch a JSON document over HTTP(S) with SSRF protection.
 
-def fetch_ap_actor(url: str, *, timeout: int = 10) -> dict[str, Any] | None:
+    Shared by ActivityPub actor fetches and WebFinger lookups. Every outbound
+    GET on a caller-influenced URL MUST go through this helper (or a wrapper),
+    never a raw `httpx.Client`, so the SSRF allow/deny + IP-pin logic applies.
+    Answers are served from the remote document cache while fresh (see above).
+
+    Args:
+        url: The URL to fetch.
+        accept: The `Accept` header value (e.g. `application/jrd+json`).
+        timeout: HTTP timeout in seconds (default 10).
+        fresh: Skip the cached copy and ask the peer (conditionally).
+
+    Returns:
+        The parsed dict on a 200 response, or None on rejection or any failure.
+    """
+    document = _document_cache.fetch(url, accept=accept, timeout=timeout, fresh=fresh)
+    return copy.deepcopy(document.data)
+
+
+def fetch_ap_actor(url: str, *, timeout: int = 10, fresh: bool = False) -> dict[str, Any] | None:
     """Fetch an ActivityPub actor JSON document with SSRF protection.
 
-    Thin wrapper over `fetch_ap_json` with the actor `Accept` header. Behavior is
-    unchanged from the previous standalone implementation.
+    Thin wrapper over `fetch_ap_json` with the actor `Accept` header.
     """
     return fetch_ap_json(
         url,
         accept="application/activity+json, application/ld+json",
         timeout=timeout,
+        fresh=fresh,
     )
 
 
+def shared_inbox_from_actor(actor_data: dict[str, Any]) -> str | None:
+    """Return the actor's advertised ``endpoints.sharedInbox``, if any."""
+    endpoints = actor_data.get("endpoints")
+    if not isinstance(endpoints, dict):
+        return None
+    shared = endpoints.get("sharedInbox")
+    return shared if isinstance(shared, str) and shared else None
+
+
+# =================================================================
+# Pooled delivery client
+# =================================================================
+#
+# Outbound POSTs reuse one long-lived client per worker process, so a batch of
+# deliveries to the same host rides one keep-alive connection (one TLS
+# handshake) instead of opening a client per inbox. HTTP/2 is negotiated when
+# the optional `h2` package is installed. The client is rebuilt after a fork
+# (Celery prefork children must not share the parent's sockets).
+
+_delivery_client: Any = None
+_delivery_client_pid: int | None = None
+_delivery_client_lock = threading.Lock()
+
+
+def get_delivery_client() -> Any:
+    """Return this process's pooled `httpx.Client` for inbox deliveries."""
+    global _delivery_client, _delivery_client_pid
+
+    import httpx
+
+    pid = os.getpid()
+    if _delivery_client is not None and _delivery_client_pid == pid:
+        return _delivery_client
+
+    with _delivery_client_lock:
+        if _delivery_client is None or _delivery_client_pid != pid:
+            _delivery_client = httpx.Client(
+                timeout=30,
+                follow_redirects=False,
+                http2=importlib.util.find_spec("h2") is not None,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            )
+            _delivery_client_pid = pid
+    return _delivery_client
+
+
+def reset_delivery_client() -> None:
+    """Close and drop the pooled delivery client (next use builds a fresh one)."""
+    global _delivery_client, _delivery_client_pid
+
+    with _delivery_client_lock:
+        client, _delivery_client, _delivery_client_pid = _delivery_client, None, None
+    if client is not None:
+        client.close()
+
+
 # =================================================================
 # Signed delivery (audit rows 2, 24)
 # =================================================================
 #
-# Single source for the "sign with the local actor's key, then enqueue
-# delivery" pair, previously hand-rolled at every outbound call site
-# (`get_actor_signing_keys(signer)` immediately followed by
-# `deliver_activity.delay(...)`). `tasks` is imported lazily — `tasks.py`
-# imports `get_or_create_remote_user` from this module, so a top-level import
-# here would be circular.
+# Single source for the "store the activity with its signer, then enqueue
+# delivery" pair, previously hand-rolled at every outbound call site. The
+# queued message only carries the stored activity's id and the inbox; the
+# body and the signer's private key stay in the database (`outbound.py`).
+# `tasks` is imported lazily — `tasks.py` imports `get_or_create_remote_user`
+# from this module, so a top-level import here would be circular.
 
 
 def sign_and_deliver(activity: dict[str, Any], inbox_url: str | None, *, signer: Any) -> None:
-    """Sign `activity` with `signer`'s local keys and enqueue delivery to `inbox_url`.
+    """Store `activity` signed by `signer` and enqueue its delivery to `inbox_url`.
 
     `signer` is the local actor (User/Game/Character) whose private key signs the
     request — see `tasks.get_actor_signing_keys`, which already tolerates `None`
-    or a remote actor (returns `(None, None)`, an unsigned/dev-mode delivery).
+    or a remote actor (an unsigned/dev-mode delivery). The key itself is read
+    by the delivery task, never put in the queue.
     No-ops when `inbox_url` is falsy; callers keep their own eligibility guard
     (e.g. "only if the recipient is remote") before calling this.
 
     `deliver_activity.delay()` is always called with all-keyword arguments — some
     tests assert on kwargs-only mock calls.
     """
-    from .tasks import deliver_activity, get_actor_signing_keys
+    from .outbound import store_signed_activity
+    from .tasks import deliver_activity
 
     if not inbox_url:
         return
 
-    actor_key_id, private_key_pem = get_actor_signing_keys(signer)
     deliver_activity.delay(
-        activity=activity,
+        outbound_id=store_signed_activity(activity, signer),
         inbox_url=inbox_url,
-        actor_key_id=actor_key_id,
-        private_key_pem=private_key_pem,
     )
 
 
@@ -219,6 +621,17 @@ def get_or_create_remote_user(actor_url: str | None) -> tuple[Any, bool] | None:
     if actor_data is None:
         return None
 
+    return upsert_remote_user(actor_url, actor_data)
+
+
+def upsert_remote_user(actor_url: str, actor_data: dict[str, Any]) -> tuple[Any, bool]:
+    """Create or update the remote User mirrored from an already fetched actor document.
+
+    The write half of `get_or_create_remote_user`, for callers that fetch
+    actors themselves (the follow import resolves them in a thread pool).
+    """
+    from suddenly.users.models import User
+
     username = actor_data.get("preferredUsername", actor_url.split("/")[-1])
     domain = actor_url.split("/")[2]
 
@@ -230,6 +643,7 @@ def get_or_create_remote_user(actor_url: str | None) -> tuple[Any, bool] | None:
             "bio": actor_data.get("summary", ""),
             "remote": True,
             "inbox_url": actor_data.get("inbox"),
+            "shared_inbox_url": shared_inbox_from_actor(actor_data),
             "outbox_url": actor_data.get("outbox"),
             "public_key": actor_data.get("publicKey", {}).get("publicKeyPem", ""),
         },
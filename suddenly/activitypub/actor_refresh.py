@@ -0,0 +1,271 @@
+"""
+Remote actor refresh engine.
+
+Keeps the local mirrors of remote actors — ``User``, ``Game`` and
+``Character`` rows with ``remote=True`` — in step with their origin.
+``refresh_remote_actors`` runs periodically (Celery beat) and works through
+the stale mirrors in batches:
+
+1. a mirror is due when its :class:`RemoteActorRefresh` row says so
+   (``next_refresh_at``), or when it has no row yet; the least recently
+   updated mirrors go first, all actor types sharing one batch;
+2. the batch is fetched in a small thread pool with ``fetch_ap_document``,
+   conditionally: the ETag / Last-Modified of the previous answer are sent,
+   so an unchanged actor costs a 304 and no parsing;
+3. changed fields are written back with one ``bulk_update`` per model — a
+   mirror whose document did not change is not written at all — and the
+   bookkeeping rows with one upsert (next refresh ``AP_ACTOR_REFRESH_HOURS``
+   after a success, ``AP_ACTOR_REFRESH_RETRY_HOURS`` after a failure).
+
+A run takes batches until nothing is due or ``AP_ACTOR_REFRESH_TIME_BUDGET``
+is spent; with a backlog left it queues its own follow-up right away, so the
+refresh rate follows the backlog instead of a fixed daily cap. The threads
+only do HTTP; every database read and write stays on the calling thread.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, NamedTuple
+
+from django.conf import settings
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from ._http import RemoteDocument, fetch_ap_document, shared_inbox_from_actor
+from .models import PublicKeyCache, RemoteActorRefresh
+
+logger = logging.getLogger(__name__)
+
+_ACTOR_ACCEPT = "application/activity+json, application/ld+json"
+# Per-domain placeholder Games (``https://<domain>``) are no actor to fetch.
+_PLACEHOLDER_AP_ID = r"^https?://[^/]+/?$"
+
+
+class StaleActor(NamedTuple):
+    """One due mirror, with the validators of its last fetch."""
+
+    actor_type: str
+    actor: Any
+    etag: str
+    last_modified: str
+
+
+def _actor_models() -> dict[str, Any]:
+    from suddenly.characters.models import Character
+    from suddenly.games.models import Game
+    from suddenly.users.models import User
+
+    return {"user": User, "game": Game, "character": Character}
+
+
+def stale_actors(limit: int) -> list[StaleActor]:
+    """Up to `limit` remote mirrors due for a refresh, least recently updated first."""
+    now = timezone.now()
+    fresh = RemoteActorRefresh.objects.filter(ap_id=OuterRef("ap_id"), next_refresh_at__gt=now)
+    candidates: list[tuple[Any, str, Any]] = []
+    for actor_type, model in _actor_models().items():
+        due = (
+            model.objects.filter(remote=True, ap_id__isnull=False)
+            .exclude(ap_id__regex=_PLACEHOLDER_AP_ID)
+            .filter(~Exists(fresh))
+            .order_by("updated_at")
+        )
+        candidates.extend((actor.updated_at, actor_type, actor) for actor in due[:limit])
+    candidates.sort(key=lambda c: c[0])
+    picked = candidates[:limit]
+
+    known = RemoteActorRefresh.objects.filter(
+        ap_id__in=[actor.ap_id for _, _, actor in picked]
+    ).values_list("ap_id", "etag", "last_modified")
+    validators = {ap_id: (etag, last_modified) for ap_id, etag, last_modified in known}
+    return [
+        StaleActor(actor_type, actor, *validators.get(actor.ap_id, ("", "")))
+        for _, actor_type, actor in picked
+    ]
+
+
+def _fetch(stale: StaleActor) -> RemoteDocument:
+    return fetch_ap_document(
+        stale.actor.ap_id,
+        accept=_ACTOR_ACCEPT,
+        timeout=int(getattr(settings, "AP_ACTOR_REFRESH_TIMEOUT", 10)),
+        etag=stale.etag,
+        last_modified=stale.last_modified,
+    )
+
+
+def _public_key_pem(data: dict[str, Any]) -> str | None:
+    key = data.get("publicKey")
+    if not isinstance(key, dict):
+        return None
+    pem = key.get("publicKeyPem")
+    return pem if isinstance(pem, str) else None
+
+
+def _text(data: dict[str, Any], key: str, max_length: int | None = None) -> str | None:
+    value = data.get(key)
+    if not isinstance(value, str):
+        return None
+    return value[:max_length] if max_length else value
+
+
+def actor_changes(actor_type: str, data: dict[str, Any]) -> dict[str, Any]:
+    """Mirror fields carried by an actor document. Absent keys are left out."""
+    if actor_type == "user":
+        name_field, name_length, text_field = "display_name", 100, "bio"
+    elif actor_type == "game":
+        name_field, name_length, text_field = "title", 200, "description"
+    else:
+        name_field, name_length, text_field = "name", 100, "description"
+
+    changes: dict[str, Any] = {
+        name_field: _text(data, "name", name_length),
+        text_field: _text(data, "summary"),
+        "inbox_url": _text(data, "inbox"),
+        "outbox_url": _text(data, "outbox"),
+        "public_key": _public_key_pem(data),
+    }
+    if actor_type == "user":
+        changes["shared_inbox_url"] = shared_inbox_from_actor(data)
+    return {field: value for field, value in changes.items() if value is not None}
+
+
+def _apply(actor: Any, changes: dict[str, Any]) -> list[str]:
+    """Set the fields that differ on `actor`. Returns their names."""
+    changed = [field for field, value in changes.items() if getattr(actor, field) != value]
+    for field in changed:
+        setattr(actor, field, changes[field])
+    return changed
+
+
+def refresh_batch(limit: int) -> dict[str, int]:
+    """Fetch one batch of due mirrors and write the results back. Returns counters."""
+    batch = stale_actors(limit)
+    if not batch:
+        return {"fetched": 0, "updated": 0, "unchanged": 0, "failed": 0}
+
+    workers = max(int(getattr(settings, "AP_ACTOR_REFRESH_CONCURRENCY", 8)), 1)
+    with ThreadPoolExecutor(max_workers=min(workers, len(batch))) as pool:
+        documents = list(pool.map(_fetch, batch))
+
+    now = timezone.now()
+    refresh = timedelta(hours=int(getattr(settings, "AP_ACTOR_REFRESH_HOURS", 24)))
+    retry = timedelta(hours=int(getattr(settings, "AP_ACTOR_REFRESH_RETRY_HOURS", 6)))
+    updated: dict[str, tuple[list[Any], set[str]]] = {}
+    rotated: list[str] = []
+    rows: list[RemoteActorRefresh] = []
+    failed: set[str] = set()
+    stats = {"fetched": len(batch), "updated": 0, "unchanged": 0, "failed": 0}
+
+    for stale, document in zip(batch, documents, strict=True):
+        row = RemoteActorRefresh(
+            ap_id=stale.actor.ap_id,
+            actor_type=stale.actor_type,
+            etag=stale.etag,
+            last_modified=stale.last_modified,
+            last_fetched_at=now,
+            next_refresh_at=now + refresh,
+            failures=0,
+        )
+        rows.append(row)
+        if document.status == 304:
+            stats["unchanged"] += 1
+            continue
+        if document.data is None:
+            stats["failed"] += 1
+            failed.add(row.ap_id)
+            row.next_refresh_at = now + retry
+            continue
+
+        row.etag, row.last_modified = document.etag[:255], document.last_modified[:64]
+        changed = _apply(stale.actor, actor_changes(stale.actor_type, document.data))
+        if not changed:
+            stats["unchanged"] += 1
+            continue
+        stats["updated"] += 1
+        stale.actor.updated_at = now
+        objects, fields = updated.setdefault(stale.actor_type, ([], {"updated_at"}))
+        objects.append(stale.actor)
+        fields.update(changed)
+        if "public_key" in changed:
+            rotated.append(stale.actor.ap_id)
+
+    models = _actor_models()
+    for actor_type, (objects, fields) in updated.items():
+        models[actor_type].objects.bulk_update(objects, sorted(fields))
+    _save_bookkeeping(rows, failed)
+    if rotated:
+        _forget_keys(rotated)
+    return stats
+
+
+def _save_bookkeeping(rows: list[RemoteActorRefresh], failed: set[str]) -> None:
+    """Upsert the refresh rows; a failure adds one to the stored failure count."""
+    previous = dict(
+        RemoteActorRefresh.objects.filter(ap_id__in=failed).values_list("ap_id", "failures")
+    )
+    for row in rows:
+        if row.ap_id in failed:
+            row.failures = min(previous.get(row.ap_id, 0) + 1, 32767)
+    RemoteActorRefresh.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=["ap_id"],
+        update_fields=[
+            "actor_type",
+            "etag",
+            "last_modified",
+            "last_fetched_at",
+            "next_refresh_at",
+            "failures",
+            "updated_at",
+        ],
+    )
+
+
+def _forget_keys(actor_urls: list[str]) -> None:
+    """Drop cached keys of actors whose key rotated, so the next verify re-reads it."""
+    from ._http import forget_remote_document
+    from .signatures import invalidate_cached_key
+
+    PublicKeyCache.objects.filter(actor_url__in=actor_urls).delete()
+    for actor_url in actor_urls:
+        invalidate_cached_key(actor_url)
+        forget_remote_document(actor_url)
+
+
+def refresh_remote_actors() -> dict[str, int]:
+    """Refresh due mirrors batch after batch within the run's time budget.
+
+    Returns run counters; ``backlog`` is 1 when due mirrors were left for the
+    follow-up run.
+    """
+    batch = max(int(getattr(settings, "AP_ACTOR_REFRESH_BATCH", 200)), 1)
+    budget = float(getattr(settings, "AP_ACTOR_REFRESH_TIME_BUDGET", 240))
+    deadline = time.monotonic() + budget
+    totals = {"fetched": 0, "updated": 0, "unchanged": 0, "failed": 0, "backlog": 0}
+
+    while True:
+        stats = refresh_batch(batch)
+        for key, value in stats.items():
+            totals[key] += value
+        if stats["fetched"] < batch:
+            break
+        if time.monotonic() >= deadline:
+            totals["backlog"] = 1
+            break
+
+    if totals["fetched"]:
+        logger.info(
+            "Actor refresh: %d fetched, %d updated, %d unchanged, %d failed%s",
+            totals["fetched"],
+            totals["updated"],
+            totals["unchanged"],
+            totals["failed"],
+            " (backlog left)" if totals["backlog"] else "",
+        )
+    return totals
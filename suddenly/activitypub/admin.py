@@ -2,11 +2,18 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from django.contrib import admin
 
-from .models import FederatedServer, ProcessedActivity
+from .models import (
+    FederatedServer,
+    InboundActivity,
+    ParkedDelivery,
+    PooledKeyPair,
+    ProcessedActivity,
+    RemoteActorRefresh,
+)
 
 if TYPE_CHECKING:
     _FederatedServerBase = admin.ModelAdmin[FederatedServer]
@@ -18,8 +25,17 @@ else:
 class FederatedServerAdmin(_FederatedServerBase):
     """Admin for known remote ActivityPub instances."""
 
-    list_display = ["server_name", "application_type", "status", "user_count", "last_checked"]
-    list_filter = ["status", "application_type"]
+    list_display = [
+        "server_name",
+        "application_type",
+        "status",
+        "user_count",
+        "last_checked",
+        "next_check_at",
+        "circuit_state",
+        "delivery_failures",
+    ]
+    list_filter = ["status", "application_type", "circuit_state"]
     search_fields = ["server_name"]
     ordering = ["server_name"]
     readonly_fields = ["created_at", "updated_at"]
@@ -34,3 +50,49 @@ class ProcessedActivityAdmin(admin.ModelAdmin):  # type: ignore[type-arg]
     search_fields = ["ap_id", "actor_domain"]
     readonly_fields = ["created_at", "updated_at"]
     ordering = ["-created_at"]
+
+
+@admin.register(InboundActivity)
+class InboundActivityAdmin(admin.ModelAdmin):  # type: ignore[type-arg]
+    """Admin for queued inbound activities (AP_INBOX_ASYNC)."""
+
+    list_display = ["activity_type", "ap_id", "actor_domain", "status", "attempts", "available_at"]
+    list_filter = ["status", "activity_type"]
+    search_fields = ["ap_id", "actor_domain"]
+    readonly_fields = ["created_at", "updated_at"]
+    ordering = ["available_at"]
+
+
+@admin.register(ParkedDelivery)
+class ParkedDeliveryAdmin(admin.ModelAdmin):  # type: ignore[type-arg]
+    """Admin for deliveries held back by an open delivery circuit."""
+
+    list_display = ["inbox_url", "server", "created_at"]
+    list_select_related = ["server"]
+    search_fields = ["inbox_url", "server__server_name"]
+    readonly_fields = ["outbound", "created_at", "updated_at"]
+    ordering = ["created_at"]
+
+
+@admin.register(PooledKeyPair)
+class PooledKeyPairAdmin(admin.ModelAdmin):  # type: ignore[type-arg]
+    """Admin for the pre-generated key pool (count only; keys are not shown)."""
+
+    list_display = ["id", "created_at"]
+    fields = ["id", "created_at"]
+    readonly_fields = ["id", "created_at"]
+    ordering = ["created_at"]
+
+    def has_add_permission(self, request: Any) -> bool:
+        return False
+
+
+@admin.register(RemoteActorRefresh)
+class RemoteActorRefreshAdmin(admin.ModelAdmin):  # type: ignore[type-arg]
+    """Admin for remote actor refresh bookkeeping."""
+
+    list_display = ["ap_id", "actor_type", "last_fetched_at", "next_refresh_at", "failures"]
+    list_filter = ["actor_type"]
+    search_fields = ["ap_id"]
+    readonly_fields = ["created_at", "updated_at"]
+    ordering = ["next_refresh_at"]
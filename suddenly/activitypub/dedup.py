@@ -0,0 +1,92 @@
+"""
+Inbox deduplication store.
+
+Every inbound activity id is claimed once: the first delivery is processed,
+redeliveries (remote retries, the same post reaching several inboxes) are
+acknowledged and dropped. Two layers keep this cheap however long the
+instance runs:
+
+- a "recently seen" set in the Django cache, checked first, so a retry burst
+  is rejected without touching the database;
+- the :class:`ProcessedActivity` table, authoritative across cache evictions
+  and restarts, but bounded: rows older than ``AP_DEDUP_RETENTION_DAYS`` are
+  deleted in chunks by the ``purge_processed_activities`` task.
+
+Forgetting an old id is safe: a replayed delivery must also carry a fresh
+signed ``Date`` (``AP_SIGNATURE_MAX_SKEW``), and peers stop retrying long
+before the retention window ends.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import ProcessedActivity
+
+logger = logging.getLogger(__name__)
+
+# Rows per DELETE statement in purge_processed_activities: keeps each
+# statement (and its locks) short on a large table.
+PURGE_CHUNK_SIZE = 5000
+
+
+def _seen_key(ap_id: str) -> str:
+    # Hashed: activity ids can be longer than memcached's 250-byte key limit.
+    return f"ap-dedup:{hashlib.sha256(ap_id.encode()).hexdigest()[:40]}"
+
+
+def claim_activity(ap_id: str, actor_domain: str) -> bool:
+    """Record `ap_id` as processed. Returns False when it was already seen.
+
+    The cache pre-check answers most duplicates; a miss falls through to a
+    single INSERT, whose unique constraint settles races between workers. If
+    the INSERT fails otherwise, the cache entry is withdrawn before the error
+    propagates: the activity was never processed, so the peer's retry must
+    not be dropped as a duplicate.
+    """
+    seen_ttl = int(getattr(settings, "AP_DEDUP_CACHE_TTL", 86400))
+    if not cache.add(_seen_key(ap_id), 1, timeout=seen_ttl):
+        return False
+
+    try:
+        with transaction.atomic():
+            ProcessedActivity.objects.create(ap_id=ap_id, actor_domain=actor_domain[:255])
+    except IntegrityError:
+        return False
+    except Exception:
+        cache.delete(_seen_key(ap_id))
+        raise
+    return True
+
+
+def retention_cutoff() -> datetime:
+    """Rows created before this instant may be purged."""
+    days = int(getattr(settings, "AP_DEDUP_RETENTION_DAYS", 30))
+    return timezone.now() - timedelta(days=days)
+
+
+def purge_processed_activities(chunk_size: int = PURGE_CHUNK_SIZE) -> int:
+    """Delete dedup rows older than the retention window. Returns the count."""
+    cutoff = retention_cutoff()
+    total = 0
+    while True:
+        # Walks the created_at index; each chunk is its own short statement.
+        pks = list(
+            ProcessedActivity.objects.filter(created_at__lt=cutoff)
+            .order_by("created_at")
+            .values_list("pk", flat=True)[:chunk_size]
+        )
+        if not pks:
+            break
+        deleted, _ = ProcessedActivity.objects.filter(pk__in=pks).delete()
+        total += deleted
+    if total:
+        logger.info("Purged %d processed activities older than %s", total, cutoff)
+    return total
@@ -0,0 +1,213 @@
+"""
+Outbound delivery health and circuit breaker.
+
+Every delivery outcome is folded into the target instance's
+:class:`FederatedServer` row (success/failure counters, last error). After
+``AP_CIRCUIT_FAILURE_THRESHOLD`` consecutive failures the instance's circuit
+opens: deliveries to it are parked as :class:`ParkedDelivery` rows instead of
+being attempted and retried, so a dead instance no longer ties up workers with
+doomed requests.
+
+Once ``AP_CIRCUIT_COOLDOWN`` seconds have passed, a single delivery is let
+through as a probe (half-open). A success closes the circuit and replays the
+parked deliveries; a failure re-opens it for another cooldown. The
+``probe_open_circuits`` task feeds that probe from the oldest parked delivery
+when no fresh delivery comes along.
+
+A closed circuit costs no query to check: it is read from the in-memory
+domain registry (``domains.is_circuit_open``), which every state transition
+retires.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import timedelta
+from typing import Any
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .domains import invalidate_domain_registry, is_circuit_open
+from .models import CircuitState, FederatedServer, ParkedDelivery
+
+logger = logging.getLogger(__name__)
+
+# Parked deliveries re-queued per query by replay_parked_deliveries.
+REPLAY_CHUNK_SIZE = 500
+
+
+def delivery_domain(inbox_url: str) -> str:
+    """The instance a delivery to `inbox_url` goes to (lowercased hostname)."""
+    return (urlparse(inbox_url).hostname or "").lower()
+
+
+def _cooldown() -> timedelta:
+    return timedelta(seconds=int(getattr(settings, "AP_CIRCUIT_COOLDOWN", 600)))
+
+
+def claim_delivery(domain: str) -> bool:
+    """True when a delivery to `domain` may be attempted now.
+
+    Always true for a closed circuit. For an open one, only once its cooldown
+    has passed, and only for the single caller that claims the half-open
+    probe; everyone else parks.
+    """
+    if not domain or not is_circuit_open(domain):
+        return True
+
+    now = timezone.now()
+    claimed = FederatedServer.objects.filter(
+        server_name=domain,
+        circuit_state__in=[CircuitState.OPEN, CircuitState.HALF_OPEN],
+        circuit_retry_at__lte=now,
+    ).update(circuit_state=CircuitState.HALF_OPEN, circuit_retry_at=now + _cooldown())
+    if claimed:
+        return True
+    # The registry may lag behind a circuit another process just closed.
+    return (
+        not FederatedServer.objects.filter(server_name=domain)
+        .exclude(circuit_state=CircuitState.CLOSED)
+        .exists()
+    )
+
+
+def record_delivery_results(
+    domain: str, *, succeeded: int = 0, failed: int = 0, error: str = ""
+) -> bool:
+    """Fold delivery outcomes for `domain` into its health counters.
+
+    Any success resets the failure streak and closes the circuit (replaying
+    what was parked); failures may open it. Returns True when the circuit is
+    open afterwards: the caller parks the failed delivery instead of retrying.
+    """
+    if not domain or not (succeeded or failed):
+        return False
+
+    now = timezone.now()
+    updates: dict[str, Any] = {"last_delivery_at": now}
+    if succeeded:
+        updates["delivery_successes"] = F("delivery_successes") + succeeded
+        updates["consecutive_failures"] = 0
+    if failed:
+        updates["delivery_failures"] = F("delivery_failures") + failed
+        updates["last_delivery_error"] = error[:255]
+        if not succeeded:
+            updates["consecutive_failures"] = F("consecutive_failures") + failed
+
+    rows = FederatedServer.objects.filter(server_name=domain)
+    if not rows.update(**updates):
+        FederatedServer.objects.bulk_create(
+            [FederatedServer(server_name=domain)], ignore_conflicts=True
+        )
+        rows.update(**updates)
+
+    if succeeded:
+        if is_circuit_open(domain) and _close_circuit(domain):
+            from .tasks import replay_parked_deliveries
+
+            replay_parked_deliveries.delay(domain)
+        return False
+
+    threshold = int(getattr(settings, "AP_CIRCUIT_FAILURE_THRESHOLD", 5))
+    opened = (
+        rows.filter(
+            Q(consecutive_failures__gte=threshold) | Q(circuit_state=CircuitState.HALF_OPEN)
+        )
+        .exclude(circuit_state=CircuitState.OPEN)
+        .update(circuit_state=CircuitState.OPEN, circuit_retry_at=now + _cooldown())
+    )
+    if opened:
+        invalidate_domain_registry()
+        logger.warning("Delivery circuit opened for %s: %s", domain, error)
+        return True
+    return is_circuit_open(domain)
+
+
+def _close_circuit(domain: str) -> bool:
+    closed = (
+        FederatedServer.objects.filter(server_name=domain)
+        .exclude(circuit_state=CircuitState.CLOSED)
+        .update(circuit_state=CircuitState.CLOSED, circuit_retry_at=None)
+    )
+    if closed:
+        invalidate_domain_registry()
+        logger.info("Delivery circuit closed for %s", domain)
+    return bool(closed)
+
+
+def park_delivery(domain: str, outbound_id: str, *inbox_urls: str) -> None:
+    """Hold deliveries of stored activity `outbound_id` back until `domain`'s circuit closes.
+
+    All of `inbox_urls` are parked with one insert.
+    """
+    if not inbox_urls:
+        return
+    server, _ = FederatedServer.objects.get_or_create(server_name=domain)
+    ParkedDelivery.objects.bulk_create(
+        [
+            ParkedDelivery(server=server, outbound_id=outbound_id, inbox_url=inbox_url)
+            for inbox_url in inbox_urls
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def replay_parked_deliveries(domain: str, chunk_size: int = REPLAY_CHUNK_SIZE) -> int:
+    """Re-queue `domain`'s parked deliveries, oldest first. Returns how many.
+
+    Stops early if the circuit opens again meanwhile: the rest stay parked.
+    """
+    from .tasks import deliver_activity
+
+    closed = FederatedServer.objects.filter(server_name=domain, circuit_state=CircuitState.CLOSED)
+    total = 0
+    while closed.exists():
+        parked = list(
+            ParkedDelivery.objects.filter(server__server_name=domain)
+            .order_by("created_at")
+            .values_list("pk", "outbound_id", "inbox_url")[:chunk_size]
+        )
+        if not parked:
+            break
+        for _pk, outbound_id, inbox_url in parked:
+            # A backlog: replayed on the fan-out queue, behind interactive work.
+            deliver_activity.apply_async(
+                kwargs={"outbound_id": str(outbound_id), "inbox_url": inbox_url}, queue="fanout"
+            )
+        ParkedDelivery.objects.filter(pk__in=[row[0] for row in parked]).delete()
+        total += len(parked)
+    return total
+
+
+def probe_open_circuits() -> int:
+    """Send one parked delivery to each instance whose cooldown is over.
+
+    The delivery goes through ``deliver_activity``, which claims the
+    half-open probe. Also drops parked deliveries older than
+    ``AP_CIRCUIT_PARK_DAYS``. Returns the number of probes queued.
+    """
+    from .tasks import deliver_activity
+
+    park_days = int(getattr(settings, "AP_CIRCUIT_PARK_DAYS", 7))
+    expired, _ = ParkedDelivery.objects.filter(
+        created_at__lt=timezone.now() - timedelta(days=park_days)
+    ).delete()
+    if expired:
+        logger.info("Dropped %d parked deliveries older than %d days", expired, park_days)
+
+    due = FederatedServer.objects.filter(
+        circuit_state__in=[CircuitState.OPEN, CircuitState.HALF_OPEN],
+        circuit_retry_at__lte=timezone.now(),
+    ).values_list("pk", flat=True)
+    probes = 0
+    for server_pk in due:
+        delivery = ParkedDelivery.objects.filter(server_id=server_pk).order_by("created_at").first()
+        if delivery is None:
+            continue
+        delivery.delete()
+        deliver_activity.delay(outbound_id=str(delivery.outbound_id), inbox_url=delivery.inbox_url)
+        probes += 1
+    return probes
@@ -0,0 +1,150 @@
+"""
+Rendered-JSON cache for ActivityPub documents served to remote instances.
+
+Peers fetch actor documents (``/users/<name>``, ``/games/<id>``,
+``/characters/<id>``) on every signature verification and profile refresh,
+and crawl the first outbox page. Those documents are rendered once, encoded,
+and kept in the Django cache with their ETag; a repeat fetch is answered from
+the cache (or with 304 Not Modified) without querying the models. With the
+Redis cache backend that means no database access at all.
+
+Invalidation (``signals.py``): saving or deleting a User, Game or Character
+drops its actor document. Outbox pages carry a generation per local actor
+(users by id, so a report needs no author fetch): saving or deleting a local
+Report bumps its author's and its game's, a User bumps its own, and a Game
+bumps its own and its report authors' (a game's visibility changes which
+reports their outboxes list). Other actors' pages stay cached, and remote
+objects bump nothing. Documents that also depend on other rows — trait sets,
+a renamed game owner — are bounded by ``AP_DOCUMENT_CACHE_TTL``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from collections.abc import Callable
+from typing import Any, TypedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+class RenderedDocument(TypedDict):
+    """An encoded ActivityPub document and its validators."""
+
+    body: str
+    etag: str
+    last_modified: float
+
+
+def _ttl() -> int:
+    return int(getattr(settings, "AP_DOCUMENT_CACHE_TTL", 300))
+
+
+def actor_document_key(actor_type: str, identifier: Any) -> str:
+    """Cache key of a local actor document (identifier: username or UUID)."""
+    return f"ap-doc:actor:{actor_type}:{identifier}"
+
+
+def _outbox_generation_key(actor_type: str, identifier: Any) -> str:
+    return f"ap-doc:outbox-gen:{actor_type}:{identifier}"
+
+
+def outbox_page_key(actor_type: str, identifier: Any) -> str:
+    """Cache key of an actor's first outbox page, in that actor's current generation."""
+    generation = cache.get_or_set(_outbox_generation_key(actor_type, identifier), 0, timeout=None)
+    return f"ap-doc:outbox:{actor_type}:{identifier}:{generation}"
+
+
+def _user_pk_key(username: str) -> str:
+    return f"ap-doc:user-pk:{username}"
+
+
+def user_outbox_page_key(username: str) -> str | None:
+    """:func:`outbox_page_key` of local user `username`; None if there is no such user.
+
+    The username → id mapping is cached too, so a hit still needs no query.
+    """
+    from suddenly.users.models import User
+
+    pk = cache.get(_user_pk_key(username))
+    if pk is None:
+        pk = (
+            User.objects.filter(username=username, remote=False)
+            .values_list("pk", flat=True)
+            .first()
+        )
+        if pk is None:
+            return None
+        cache.set(_user_pk_key(username), pk, timeout=_ttl())
+    return outbox_page_key("user", pk)
+
+
+def forget_user_pk(username: str) -> None:
+    cache.delete(_user_pk_key(username))
+
+
+def invalidate_actor_document(actor_type: str, identifier: Any) -> None:
+    cache.delete(actor_document_key(actor_type, identifier))
+
+
+def invalidate_outbox_pages(actor_type: str, identifier: Any) -> None:
+    """Retire one actor's cached outbox pages (entries of older generations expire)."""
+    key = _outbox_generation_key(actor_type, identifier)
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:  # evicted between add and incr
+        cache.set(key, int(time.time()), timeout=None)
+
+
+def render_document(data: dict[str, Any]) -> RenderedDocument:
+    """Encode `data` once and compute its validators."""
+    body = json.dumps(data, cls=DjangoJSONEncoder)
+    return {
+        "body": body,
+        "etag": f'"{hashlib.sha256(body.encode()).hexdigest()[:32]}"',
+        "last_modified": time.time(),
+    }
+
+
+def get_document(
+    key: str | None, build: Callable[[], dict[str, Any] | None]
+) -> RenderedDocument | None:
+    """Return the cached document for `key`, building and storing it on a miss.
+
+    `build` returns None when the object does not exist or is not public;
+    that outcome is not cached. With `key` None the document is built every
+    time (uncached collections), still with an ETag.
+    """
+    if key is not None:
+        cached: RenderedDocument | None = cache.get(key)
+        if cached is not None:
+            return cached
+
+    data = build()
+    if data is None:
+        return None
+    document = render_document(data)
+    if key is not None:
+        cache.set(key, document, timeout=_ttl())
+    return document
+
+
+def document_response(request: HttpRequest, document: RenderedDocument) -> HttpResponse:
+    """Serve `document` as activity+json, or 304 when the client copy is current."""
+    response = HttpResponse(document["body"], content_type="application/activity+json")
+    response["ETag"] = document["etag"]
+    response["Last-Modified"] = http_date(document["last_modified"])
+    conditional = get_conditional_response(
+        request,
+        etag=document["etag"],
+        last_modified=int(document["last_modified"]),
+        response=response,
+    )
+    return conditional if conditional is not None else response
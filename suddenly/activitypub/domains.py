@@ -0,0 +1,175 @@
+"""
+Federation domain registry.
+
+Every federation path that needs to know something about a remote instance —
+is it known (inbox rate limit), does it run Suddenly (Offer guard, remote
+actor typing), is it blocked (inbox gate), is its delivery circuit open
+(outbound delivery) — asks this module instead of querying
+:class:`FederatedServer` on each call.
+
+The registry is one snapshot of five domain sets, built from a single query
+and shared through the Django cache under a generation number. Each process
+also keeps the snapshot in memory and only re-reads the generation every
+``_LOCAL_RECHECK`` seconds, so the hot path (every inbox POST) touches neither
+the cache nor the database. Saving or deleting a ``FederatedServer`` bumps the
+generation (``signals.py``): the saving process sees the change at once, the
+others within ``_LOCAL_RECHECK`` seconds.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import NamedTuple
+
+from django.core.cache import cache
+
+_GENERATION_KEY = "ap-domains:gen"
+
+# Seconds a process trusts its in-memory snapshot before re-reading the
+# generation from the shared cache.
+_LOCAL_RECHECK = 5.0
+
+# Lifetime of a snapshot in the shared cache (a new generation replaces it
+# sooner).
+_SNAPSHOT_TTL = 3600
+
+
+class DomainRegistry(NamedTuple):
+    """Remote instance domains by what federation code needs to know."""
+
+    known: frozenset[str]
+    identified: frozenset[str]
+    suddenly: frozenset[str]
+    blocked: frozenset[str]
+    circuit_open: frozenset[str]
+
+
+class _LocalSnapshot:
+    """This process's copy of the registry and the generation it belongs to."""
+
+    def __init__(self) -> None:
+        self.generation: object = None
+        self.registry: DomainRegistry | None = None
+        self.checked_at = 0.0
+
+
+_lock = threading.Lock()
+_local = _LocalSnapshot()
+
+
+def _normalize(domain: str) -> str:
+    return domain.strip().lower()
+
+
+def _build_registry() -> DomainRegistry:
+    from .models import CircuitState, FederatedServer, ServerStatus
+
+    known: set[str] = set()
+    identified: set[str] = set()
+    suddenly: set[str] = set()
+    blocked: set[str] = set()
+    circuit_open: set[str] = set()
+    rows = FederatedServer.objects.values_list(
+        "server_name", "status", "application_type", "circuit_state"
+    )
+    for server_name, status, application_type, circuit_state in rows:
+        domain = _normalize(server_name)
+        known.add(domain)
+        if application_type:
+            identified.add(domain)
+        if application_type == "suddenly":
+            suddenly.add(domain)
+        if status == ServerStatus.BLOCKED:
+            blocked.add(domain)
+        if circuit_state != CircuitState.CLOSED:
+            circuit_open.add(domain)
+    return DomainRegistry(
+        frozenset(known),
+        frozenset(identified),
+        frozenset(suddenly),
+        frozenset(blocked),
+        frozenset(circuit_open),
+    )
+
+
+def get_registry() -> DomainRegistry:
+    """Return the current domain registry (in-process, then shared cache, then DB)."""
+    now = time.monotonic()
+    with _lock:
+        if _local.registry is not None and now - _local.checked_at < _LOCAL_RECHECK:
+            return _local.registry
+
+    generation = cache.get_or_set(_GENERATION_KEY, 0, timeout=None)
+    with _lock:
+        if _local.registry is not None and _local.generation == generation:
+            _local.checked_at = now
+            return _local.registry
+
+    snapshot_key = f"ap-domains:{generation}"
+    registry: DomainRegistry | None = cache.get(snapshot_key)
+    if registry is None:
+        registry = _build_registry()
+        cache.set(snapshot_key, registry, timeout=_SNAPSHOT_TTL)
+
+    with _lock:
+        _local.generation, _local.registry, _local.checked_at = generation, registry, now
+    return registry
+
+
+def reset_local_registry() -> None:
+    """Forget this process's copy; the next lookup re-reads the shared cache."""
+    with _lock:
+        _local.generation, _local.registry, _local.checked_at = None, None, 0.0
+
+
+def invalidate_domain_registry() -> None:
+    """Retire the registry everywhere (this process immediately)."""
+    cache.add(_GENERATION_KEY, 0, timeout=None)
+    try:
+        cache.incr(_GENERATION_KEY)
+    except ValueError:  # evicted between add and incr
+        cache.set(_GENERATION_KEY, int(time.time()), timeout=None)
+    reset_local_registry()
+
+
+def _hostname(domain: str) -> str:
+    """`domain` without a port (a signature keyId netloc may carry one)."""
+    return _normalize(domain).rsplit(":", 1)[0] if domain else ""
+
+
+def _lookup(domain: str, domains: frozenset[str]) -> bool:
+    if not domain:
+        return False
+    normalized = _normalize(domain)
+    return normalized in domains or _hostname(normalized) in domains
+
+
+def is_known_domain(domain: str) -> bool:
+    """True when `domain` has a ``FederatedServer`` row."""
+    return _lookup(domain, get_registry().known)
+
+
+def is_suddenly_domain(domain: str) -> bool:
+    """True when `domain` is a known instance running Suddenly (NodeInfo-detected)."""
+    return _lookup(domain, get_registry().suddenly)
+
+
+def is_blocked_domain(domain: str) -> bool:
+    """True when an admin blocked `domain` (``ServerStatus.BLOCKED``)."""
+    return _lookup(domain, get_registry().blocked)
+
+
+def is_known_non_suddenly_domain(domain: str) -> bool:
+    """True when NodeInfo identified `domain`'s software and it is not Suddenly.
+
+    An unknown or not-yet-probed domain is not "non-Suddenly": its software is
+    simply not known yet.
+    """
+    registry = get_registry()
+    return _lookup(domain, registry.identified) and not _lookup(domain, registry.suddenly)
+
+
+def is_circuit_open(domain: str) -> bool:
+    """True when deliveries to `domain` are held back (open or half-open circuit)."""
+    return _lookup(domain, get_registry().circuit_open)
@@ -101,11 +101,12 @@ def remote_profile(request: HttpRequest) -> HttpResponse:
     # Profile enrichment (DEC-C5, Phase 4): parties/personnages/activité for a
     # Suddenly actor, résumé + activité récente only otherwise. Any fetch
     # failure inside must never surface as a 500 — degrade to empty sections.
+    # Fetched concurrently under a deadline; a slow peer yields partial sections.
     collections: dict[str, list[dict[str, Any]]] = {"activity": [], "games": [], "characters": []}
     try:
-        from .follow_federation import fetch_remote_actor_collections
+        from .follow_federation import remote_profile_collections
 
-        collections = fetch_remote_actor_collections(actor_data, is_suddenly=is_suddenly)
+        collections = remote_profile_collections(ap_id, actor_data, is_suddenly=is_suddenly)
     except Exception:
         logger.warning("Remote profile enrichment failed for %s", ap_id, exc_info=True)
 
@@ -129,11 +130,9 @@ def remote_profile(request: HttpRequest) -> HttpResponse:
 
 def _is_suddenly_actor(ap_id: str) -> bool:
     """True if the actor's home instance is a known Suddenly instance (NodeInfo-detected)."""
-    from .models import FederatedServer
+    from .domains import is_suddenly_domain
 
-    domain = urlparse(ap_id).netloc
-    server = FederatedServer.objects.filter(server_name=domain).first()
-    return server is not None and server.is_suddenly_instance()
+    return is_suddenly_domain(urlparse(ap_id).netloc)
 
 
 def _resolve_remote_actor_type(
@@ -151,7 +150,7 @@ def _resolve_remote_actor_type(
     (Person-only), so a Mastodon actor never 500s even if its JSON happens to
     carry an unrelated "status" field. `is_suddenly` may be passed in by a
     caller that already computed it (`_is_suddenly_actor`), to avoid a
-    duplicate `FederatedServer` lookup.
+    duplicate registry lookup.
     """
     if is_suddenly is None:
         is_suddenly = _is_suddenly_actor(ap_id)
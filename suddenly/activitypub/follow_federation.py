@@ -15,13 +15,28 @@ Reports. A non-Suddenly actor's outbox (e.g. Mastodon Notes) has no such
 fields, so `is_suddenly=False` skips that derivation and only "activity" is
 populated — matching the plan's Task 2 (résumé + activité récente, no
 Suddenly-specific section).
+
+The enrichment runs in the request, so it is bounded in time as well:
+`remote_profile_collections` fetches the outbox and the game actors in a small
+thread pool under one deadline (`AP_REMOTE_PROFILE_DEADLINE`), renders what
+arrived by then, and caches a complete summary per actor for
+`AP_REMOTE_PROFILE_CACHE_TTL` seconds.
 """
 
 from __future__ import annotations
 
+import hashlib
+import logging
+import time
 from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor, wait
 from typing import Any
 
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
 # Hard bounds (DEC-C5 risk register: "jamais dans une boucle non bornée").
 # Remote pagination is not followed past the outbox's first page at MVP.
 MAX_OUTBOX_ITEMS = 10
@@ -32,34 +47,88 @@ _AP_ACCEPT = "application/activity+json, application/ld+json"
 
 
 def fetch_remote_actor_collections(
-    actor_data: dict[str, Any], *, is_suddenly: bool
+    actor_data: dict[str, Any], *, is_suddenly: bool, deadline: float | None = None
 ) -> dict[str, list[dict[str, Any]]]:
     """Fetch and summarize a remote actor's outbox for profile enrichment.
 
     Always populates "activity" (bounded, works for any actor — a Suddenly
     Article or a Mastodon Note). "games"/"characters" are populated only when
-    `is_suddenly` is True.
+    `is_suddenly` is True. With a `deadline` (a ``time.monotonic()`` value),
+    whatever was not fetched by then is left out.
     """
-    result: dict[str, list[dict[str, Any]]] = {"activity": [], "games": [], "characters": []}
-
-    outbox_url = actor_data.get("outbox")
-    if not isinstance(outbox_url, str) or not outbox_url:
-        return result
+    return _collect(actor_data, is_suddenly=is_suddenly, deadline=deadline)[0]
 
-    items = _fetch_outbox_items(outbox_url)
-    result["activity"] = [s for s in (_summarize_activity_item(i) for i in items) if s]
 
-    if not is_suddenly:
-        return result
+def remote_profile_collections(
+    ap_id: str, actor_data: dict[str, Any], *, is_suddenly: bool
+) -> dict[str, list[dict[str, Any]]]:
+    """`fetch_remote_actor_collections` under the profile deadline, cached per actor.
 
-    game_iris = _unique_ordered(item.get("context") for item in items if isinstance(item, dict))[
-        :MAX_GAMES
-    ]
-    result["games"] = [s for s in (_fetch_actor_summary(iri) for iri in game_iris) if s]
+    Only a complete summary is cached: after a partial one, the next view
+    tries again (the fetches still running meanwhile warm the remote
+    document cache).
+    """
+    key = "remote-profile:" + hashlib.sha256(f"{is_suddenly}:{ap_id}".encode()).hexdigest()
+    cached: dict[str, list[dict[str, Any]]] | None = cache.get(key)
+    if cached is not None:
+        return cached
+
+    budget = float(getattr(settings, "AP_REMOTE_PROFILE_DEADLINE", 4))
+    collections, complete = _collect(
+        actor_data, is_suddenly=is_suddenly, deadline=time.monotonic() + budget
+    )
+    if complete:
+        ttl = int(getattr(settings, "AP_REMOTE_PROFILE_CACHE_TTL", 300))
+        cache.set(key, collections, timeout=ttl)
+    else:
+        logger.info("Remote profile enrichment for %s cut at the deadline", ap_id)
+    return collections
+
+
+def _collect(
+    actor_data: dict[str, Any], *, is_suddenly: bool, deadline: float | None
+) -> tuple[dict[str, list[dict[str, Any]]], bool]:
+    """Build the enrichment sections. Returns them and whether nothing was cut."""
+    result: dict[str, list[dict[str, Any]]] = {"activity": [], "games": [], "characters": []}
 
-    result["characters"] = _extract_character_mentions(items)
+    outbox_url = actor_data.get("outbox")
+    if not isinstance(outbox_url, str) or not outbox_url:
+        return result, True
 
-    return result
+    # Threads only do HTTP. The pool is not joined: a fetch still running at
+    # the deadline finishes in the background (bounded by its own timeout).
+    pool = ThreadPoolExecutor(max_workers=MAX_GAMES, thread_name_prefix="remote-profile")
+    try:
+        outbox = pool.submit(_fetch_outbox_items, outbox_url)
+        done, _ = wait([outbox], timeout=_remaining(deadline))
+        if not done:
+            return result, False
+        items = outbox.result()
+        result["activity"] = [s for s in (_summarize_activity_item(i) for i in items) if s]
+
+        if not is_suddenly:
+            return result, True
+
+        result["characters"] = _extract_character_mentions(items)
+        game_iris = _unique_ordered(
+            item.get("context") for item in items if isinstance(item, dict)
+        )[:MAX_GAMES]
+        games = [pool.submit(_fetch_actor_summary, iri) for iri in game_iris]
+        wait(games, timeout=_remaining(deadline))
+        # Game order follows the outbox, whichever fetch answered first.
+        for future in games:
+            if future.done() and future.exception() is None:
+                summary = future.result()
+                if summary:
+                    result["games"].append(summary)
+        complete = all(future.done() and future.exception() is None for future in games)
+        return result, complete
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _remaining(deadline: float | None) -> float | None:
+    return None if deadline is None else max(deadline - time.monotonic(), 0)
 
 
 def _fetch_outbox_items(
@@ -68,8 +137,8 @@ def _fetch_outbox_items(
     """Fetch up to `max_items` items from an actor's outbox, first page only.
 
     Tolerates both shapes seen in the wild: `orderedItems` inlined on the root
-    `OrderedCollection` (this server's own `user_outbox`), or a separate
-    `first` `OrderedCollectionPage` (spec-conformant remote servers). Never
+    `OrderedCollection` (older servers), or a separate `first`
+    `OrderedCollectionPage` (spec-conformant servers, this one included). Never
     follows `next` — remote pagination stops at page 1 (DEC-C5).
     """
     from ._http import fetch_ap_json
@@ -24,7 +24,7 @@ from django_ratelimit.core import is_ratelimited
 from suddenly.core.utils import get_local_actor
 
 from ._http import get_or_create_remote_user, sign_and_deliver
-from .models import FederatedServer
+from .domains import is_blocked_domain, is_known_domain
 from .signatures import verify_signature
 
 logger = logging.getLogger(__name__)
@@ -52,8 +52,7 @@ def _check_rate_limit(request: HttpRequest) -> bool:
     Unknown instances: 10 req/min.
     """
     domain = _get_request_domain(request)
-    is_known = FederatedServer.objects.filter(server_name=domain).exists()
-    rate = _KNOWN_INSTANCE_RATE if is_known else _UNKNOWN_INSTANCE_RATE
+    rate = _KNOWN_INSTANCE_RATE if is_known_domain(domain) else _UNKNOWN_INSTANCE_RATE
     group = f"ap-inbox-{domain}"
 
     return bool(
@@ -106,10 +105,62 @@ def character_inbox(request: HttpRequest, character_id: str) -> HttpResponse:
     return process_inbox(request, actor_type="character", actor_identifier=character_id)
 
 
+@csrf_exempt
+@require_POST
+def shared_inbox(request: HttpRequest) -> HttpResponse:
+    """
+    Instance-wide inbox (the ``endpoints.sharedInbox`` of every local actor).
+
+    POST /inbox
+
+    A remote server delivers an activity here once instead of once per local
+    recipient: it is verified and deduplicated once, then handed to the local
+    actors it targets (see ``shared_inbox_targets``).
+    """
+    received = _receive_activity(request, "shared inbox")
+    if isinstance(received, HttpResponse):
+        return received
+    activity, request_domain = received
+
+    targets = shared_inbox_targets(activity)
+    logger.info("Received %s on shared inbox for %d actor(s)", activity.get("type"), len(targets))
+    for actor_type, actor_identifier in targets:
+        _hand_off(activity, actor_type, actor_identifier, request_domain)
+    return HttpResponse(status=202)
+
+
 def process_inbox(request: HttpRequest, actor_type: str, actor_identifier: str) -> HttpResponse:
     """
     Common inbox processing logic.
     """
+    received = _receive_activity(request, f"{actor_type} inbox {actor_identifier}")
+    if isinstance(received, HttpResponse):
+        return received
+    activity, request_domain = received
+
+    logger.info("Received %s for %s/%s", activity.get("type"), actor_type, actor_identifier)
+    _hand_off(activity, actor_type, actor_identifier, request_domain)
+
+    # ActivityPub spec says to return 202 Accepted
+    return HttpResponse(status=202)
+
+
+def _receive_activity(
+    request: HttpRequest, inbox_label: str
+) -> tuple[dict[str, Any], str] | HttpResponse:
+    """Run the request-bound inbox checks shared by every inbox endpoint.
+
+    Rate limit, HTTP signature, JSON body, actor/signature domain match and
+    deduplication. Returns the parsed activity and the signing domain, or the
+    response to send back (an error, or 202 for a duplicate).
+    """
+    # Blocked instances are refused first: no rate-limit bookkeeping, no
+    # crypto, no database (the domain registry is held in memory).
+    request_domain = _get_request_domain(request)
+    if is_blocked_domain(request_domain):
+        logger.info("Refused %s delivery from blocked instance %s", inbox_label, request_domain)
+        return HttpResponseForbidden("Instance blocked")
+
     # Rate limit check (before signature verification to save resources)
     if _check_rate_limit(request):
         domain = _get_request_domain(request)
@@ -121,12 +172,7 @@ def process_inbox(request: HttpRequest, actor_type: str, actor_identifier: str)
     # Verify HTTP signature
     is_valid, reason = verify_signature(request)
     if not is_valid:
-        logger.warning(
-            "Invalid signature for %s inbox %s: %s",
-            actor_type,
-            actor_identifier,
-            reason,
-        )
+        logger.warning("Invalid signature for %s: %s", inbox_label, reason)
         return HttpResponseForbidden("Invalid signature")
 
     # Parse activity
@@ -135,15 +181,13 @@ def process_inbox(request: HttpRequest, actor_type: str, actor_identifier: str)
     except json.JSONDecodeError:
         return HttpResponseBadRequest("Invalid JSON")
 
-    activity_type = activity.get("type")
     activity_id = activity.get("id", "")
     actor_url = activity.get("actor", "")
 
-    if not activity_type:
+    if not activity.get("type"):
         return HttpResponseBadRequest("Missing activity type")
 
     # Validate actor domain matches signature domain
-    request_domain = _get_request_domain(request)
     if actor_url and request_domain:
         from urllib.parse import urlparse as _urlparse
 
@@ -160,27 +204,125 @@ def process_inbox(request: HttpRequest, actor_type: str, actor_identifier: str)
             )
             return HttpResponseForbidden("Actor domain mismatch")
 
-    # Inbox deduplication — atomic get_or_create to avoid race condition
+    # Inbox deduplication — cache pre-check, then one INSERT (see dedup.py)
     if activity_id:
-        from django.db import IntegrityError
+        from .dedup import claim_activity
 
-        from suddenly.activitypub.models import ProcessedActivity
-
-        try:
-            _, created = ProcessedActivity.objects.get_or_create(
-                ap_id=activity_id,
-                defaults={"actor_domain": request_domain or ""},
-            )
-            if not created:
-                logger.info("Skipping duplicate activity %s", activity_id)
-                return HttpResponse(status=202)
-        except IntegrityError:
-            logger.info("Duplicate activity detected (race): %s", activity_id)
+        if not claim_activity(str(activity_id), request_domain or ""):
+            logger.info("Skipping duplicate activity %s", activity_id)
             return HttpResponse(status=202)
 
-    logger.info("Received %s for %s/%s", activity_type, actor_type, actor_identifier)
+    return activity, request_domain
+
+
+def _hand_off(
+    activity: dict[str, Any], actor_type: str, actor_identifier: str, request_domain: str
+) -> None:
+    """Dispatch a received activity for one local inbox owner, inline or queued."""
+    # Async mode: everything above is cheap and request-bound; the handler
+    # (which may fetch remote actors over HTTP) runs in a worker instead.
+    if getattr(settings, "AP_INBOX_ASYNC", False):
+        from .inbox_queue import enqueue_inbound_activity
+
+        enqueue_inbound_activity(activity, actor_type, actor_identifier, request_domain)
+        return
 
-    # Route to appropriate handler
+    try:
+        dispatch_activity(activity, actor_type, actor_identifier)
+    except Exception:
+        logger.exception("Error handling %s", activity.get("type"))
+        # Still return 202 - we received it, processing failed
+
+
+# Actor IRI path segment → local actor type (see ``*.actor_url``).
+_LOCAL_ACTOR_SEGMENTS = {"users": "user", "games": "game", "characters": "character"}
+
+# Addressing properties read when routing a shared-inbox delivery.
+_ADDRESSING_FIELDS = ("to", "cc", "bto", "bcc", "audience")
+
+# Nominal owner for an owner-independent activity addressed to no local actor
+# (a public post delivered because local users follow its author).
+_INSTANCE_OWNER = ("instance", "")
+
+
+def _local_actor_from_iri(iri: Any) -> tuple[str, str] | None:
+    """Map a local actor IRI (``{AP_BASE_URL}/users/{username}``, ``/games/{id}``,
+    ``/characters/{id}``) to ``(actor_type, identifier)``. None for anything else,
+    collections included."""
+    if not isinstance(iri, str):
+        return None
+    prefix = f"{settings.AP_BASE_URL}/"
+    if not iri.startswith(prefix):
+        return None
+    parts = iri[len(prefix) :].split("/")
+    if len(parts) != 2 or parts[0] not in _LOCAL_ACTOR_SEGMENTS or not parts[1]:
+        return None
+    return _LOCAL_ACTOR_SEGMENTS[parts[0]], parts[1]
+
+
+def _addressed_iris(activity: dict[str, Any]) -> list[Any]:
+    """Every addressing entry of the activity and of its embedded object."""
+    iris: list[Any] = []
+    obj = activity.get("object")
+    for source in (activity, obj if isinstance(obj, dict) else {}):
+        for field in _ADDRESSING_FIELDS:
+            value = source.get(field)
+            iris.extend([value] if isinstance(value, str) else list(value or []))
+    return iris
+
+
+def shared_inbox_targets(activity: dict[str, Any]) -> list[tuple[str, str]]:
+    """Resolve the local inbox owners a shared-inbox delivery is handed to.
+
+    Follow and Undo(Follow) target the local actor they name as ``object``, one
+    dispatch per existing actor. Any other activity is dispatched once, for the
+    first existing local actor it addresses — or for the instance itself when
+    it only addresses followers collections or the public (its handler does not
+    depend on the owner).
+    """
+    # Only the Follow handlers act on the inbox owner; every other handler
+    # ignores it, so one dispatch serves the whole audience.
+    activity_type = activity.get("type")
+    obj = activity.get("object")
+    owner_scoped = True
+    if activity_type == "Follow":
+        candidates: list[Any] = [obj]
+    elif activity_type == "Undo" and isinstance(obj, dict) and obj.get("type") == "Follow":
+        candidates = [obj.get("object")]
+    else:
+        owner_scoped = False
+        candidates = _addressed_iris(activity)
+
+    targets: list[tuple[str, str]] = []
+    for iri in candidates:
+        target = _local_actor_from_iri(iri)
+        if target is None or target in targets:
+            continue
+        if get_local_actor(*target) is None:
+            continue
+        targets.append(target)
+        if not owner_scoped:
+            break
+
+    if not targets and not owner_scoped:
+        targets.append(_INSTANCE_OWNER)
+    return targets
+
+
+class _InboxHandler(Protocol):
+    def __call__(
+        self, activity: dict[str, Any], actor_type: str, actor_identifier: str
+    ) -> None: ...
+
+
+def dispatch_activity(activity: dict[str, Any], actor_type: str, actor_identifier: str) -> None:
+    """Route a validated activity to its ``handle_*`` handler.
+
+    Shared by the synchronous inbox path and the queued worker path
+    (``inbox_queue.run_inbound_activity``). Handler exceptions propagate — the
+    sync caller logs them, the worker turns them into a retry. The table is
+    built per call so tests patching ``inbox.handle_*`` keep working.
+    """
     handlers: dict[str, _InboxHandler] = {
         "Follow": handle_follow,
         "Undo": handle_undo,
@@ -192,25 +334,13 @@ def process_inbox(request: HttpRequest, actor_type: str, actor_identifier: str)
         "Reject": handle_reject,
     }
 
-    handler = handlers.get(activity_type)
+    activity_type = activity.get("type")
+    handler = handlers.get(activity_type) if isinstance(activity_type, str) else None
     if handler:
-        try:
-            handler(activity, actor_type, actor_identifier)
-        except Exception:
-            logger.exception("Error handling %s", activity_type)
-            # Still return 202 - we received it, processing failed
+        handler(activity, actor_type, actor_identifier)
     else:
         logger.warning(f"Unknown activity type: {activity_type}")
 
-    # ActivityPub spec says to return 202 Accepted
-    return HttpResponse(status=202)
-
-
-class _InboxHandler(Protocol):
-    def __call__(
-        self, activity: dict[str, Any], actor_type: str, actor_identifier: str
-    ) -> None: ...
-
 
 def handle_follow(activity: dict[str, Any], actor_type: str, actor_identifier: str) -> None:
     """
@@ -695,11 +825,18 @@ def handle_update(activity: dict[str, Any], actor_type: str, actor_identifier: s
 
 
 def _invalidate_actor_key(actor_url: object) -> None:
-    """Drop the cached public key for a remote actor (key rotation via Update(Person))."""
+    """Drop the cached public key for a remote actor (key rotation via Update(Person)).
+
+    The cached actor document goes too, so the next fetch reads the new key.
+    """
+    from ._http import forget_remote_document
     from .models import PublicKeyCache
+    from .signatures import invalidate_cached_key
 
     if isinstance(actor_url, str) and actor_url:
         PublicKeyCache.objects.filter(actor_url=actor_url).delete()
+        invalidate_cached_key(actor_url)
+        forget_remote_document(actor_url)
 
 
 def _handle_update_character(obj: dict[str, Any]) -> None:
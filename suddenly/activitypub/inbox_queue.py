@@ -0,0 +1,210 @@
+"""
+Queued inbox processing (``AP_INBOX_ASYNC``).
+
+The inbox request keeps only the cheap checks — rate limit, signature, JSON,
+dedup — then writes an :class:`InboundActivity` row and acknowledges with 202.
+Handler dispatch (``inbox.dispatch_activity``), which may fetch remote actors
+over HTTP, runs here instead: in the ``process_inbound_activity`` Celery task
+when a broker is configured, or in the ``process_inbox_queue`` management
+command (a local worker loop) when tasks would otherwise run eagerly in the
+web request.
+
+A per-domain concurrency cap keeps one busy peer from occupying every worker:
+a domain over its cap is deferred, not failed.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+from datetime import timedelta
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import InboundActivity, InboundActivityStatus
+
+logger = logging.getLogger(__name__)
+
+# A PROCESSING row whose worker died is reclaimed after this long. Matches the
+# task hard time limit with margin, so a live attempt is never stolen.
+_STALE_PROCESSING_AFTER = timedelta(minutes=10)
+
+# Slot counters expire on their own so a crashed worker cannot leak a slot
+# forever (same bound as the task hard time limit).
+_DOMAIN_SLOT_TTL = 150
+
+
+class InboundDomainBusyError(Exception):
+    """Raised when the activity's domain already uses all its worker slots."""
+
+
+def _broker_available() -> bool:
+    """Return True when Celery tasks leave the process (a broker or the database queue)."""
+    from suddenly.core.task_queue import database_queue_enabled
+
+    if database_queue_enabled():
+        return True
+    try:
+        from suddenly.celery import app as celery_app
+    except Exception:  # noqa: BLE001 — Celery not configured at all
+        return False
+    return not celery_app.conf.task_always_eager
+
+
+def enqueue_inbound_activity(
+    activity: dict[str, Any], actor_type: str, actor_identifier: str, actor_domain: str
+) -> InboundActivity:
+    """Persist a validated activity for deferred dispatch and schedule it.
+
+    With a broker, the Celery task is queued after commit. Without one (eager
+    mode), nothing runs inline — the row waits for ``process_inbox_queue``.
+    """
+    activity_id = activity.get("id")
+    record = InboundActivity.objects.create(
+        ap_id=activity_id[:500] if isinstance(activity_id, str) else "",
+        activity_type=str(activity.get("type", ""))[:50],
+        payload=activity,
+        actor_type=actor_type,
+        actor_identifier=actor_identifier,
+        actor_domain=(actor_domain or "")[:255],
+    )
+
+    if _broker_available():
+        from .signals import _safe_delay
+        from .tasks import process_inbound_activity
+
+        record_id = str(record.pk)
+        transaction.on_commit(lambda: _safe_delay(process_inbound_activity, record_id))
+
+    return record
+
+
+def _domain_slot_key(domain: str) -> str:
+    return f"ap-inbox-slots:{domain}"
+
+
+def _acquire_domain_slot(domain: str) -> bool:
+    """Take one of the domain's concurrent-processing slots. False when full."""
+    limit = int(getattr(settings, "AP_INBOX_DOMAIN_CONCURRENCY", 4))
+    key = _domain_slot_key(domain)
+    cache.add(key, 0, timeout=_DOMAIN_SLOT_TTL)
+    try:
+        taken = cache.incr(key)
+    except ValueError:
+        # Expired between add and incr — start a fresh window.
+        cache.set(key, 1, timeout=_DOMAIN_SLOT_TTL)
+        taken = 1
+    if taken > limit:
+        _release_domain_slot(domain)
+        return False
+    return True
+
+
+def _release_domain_slot(domain: str) -> None:
+    with contextlib.suppress(ValueError):  # counter already expired
+        cache.decr(_domain_slot_key(domain))
+
+
+def _claimable(now: Any) -> Q:
+    """Rows a worker may take: due PENDING ones, or PROCESSING ones left by a dead worker."""
+    return Q(status=InboundActivityStatus.PENDING, available_at__lte=now) | Q(
+        status=InboundActivityStatus.PROCESSING, updated_at__lt=now - _STALE_PROCESSING_AFTER
+    )
+
+
+def _claim(inbound_id: Any) -> InboundActivity | None:
+    """Atomically move a claimable row to PROCESSING; None if another worker won."""
+    now = timezone.now()
+    claimed = InboundActivity.objects.filter(_claimable(now), pk=inbound_id).update(
+        status=InboundActivityStatus.PROCESSING, updated_at=now
+    )
+    if not claimed:
+        return None
+    return InboundActivity.objects.filter(pk=inbound_id).first()
+
+
+def _retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff between attempts (same curve as ``deliver_activity``)."""
+    return timedelta(seconds=2 ** max(attempts - 1, 0) * 60)
+
+
+def run_inbound_activity(inbound_id: Any) -> bool:
+    """Dispatch one queued activity. Returns True when its handler succeeded.
+
+    Returns False when the row is not claimable (already done, not yet due, or
+    held by another worker). Raises :class:`InboundDomainBusyError` when the domain
+    is at its concurrency cap — the row goes back to PENDING untouched. A
+    handler exception is recorded on the row (attempt count, backoff, error)
+    and re-raised so the Celery task can schedule its own retry; once
+    ``AP_INBOX_MAX_ATTEMPTS`` is reached the row is parked as FAILED.
+    """
+    from .inbox import dispatch_activity
+
+    record = _claim(inbound_id)
+    if record is None:
+        return False
+
+    domain = record.actor_domain or "unknown"
+    if not _acquire_domain_slot(domain):
+        InboundActivity.objects.filter(pk=record.pk).update(status=InboundActivityStatus.PENDING)
+        raise InboundDomainBusyError(domain)
+
+    try:
+        dispatch_activity(record.payload, record.actor_type, record.actor_identifier)
+    except Exception as exc:
+        attempts = record.attempts + 1
+        max_attempts = int(getattr(settings, "AP_INBOX_MAX_ATTEMPTS", 5))
+        exhausted = attempts >= max_attempts
+        InboundActivity.objects.filter(pk=record.pk).update(
+            status=InboundActivityStatus.FAILED if exhausted else InboundActivityStatus.PENDING,
+            attempts=attempts,
+            available_at=timezone.now() + _retry_delay(attempts),
+            last_error=f"{type(exc).__name__}: {exc}"[:2000],
+        )
+        logger.warning(
+            "Inbound %s %s failed (attempt %d/%d): %s",
+            record.activity_type,
+            record.ap_id or record.pk,
+            attempts,
+            max_attempts,
+            exc,
+        )
+        raise
+    finally:
+        _release_domain_slot(domain)
+
+    record.delete()
+    return True
+
+
+def due_inbound_ids(limit: int) -> list[Any]:
+    """Return the ids of the oldest queued activities ready to run."""
+    return list(
+        InboundActivity.objects.filter(_claimable(timezone.now()))
+        .order_by("available_at")
+        .values_list("pk", flat=True)[:limit]
+    )
+
+
+def drain_inbound_queue(limit: int = 100) -> dict[str, int]:
+    """Process up to `limit` due activities in this process.
+
+    Used by the ``process_inbox_queue`` command (broker-less worker). Busy
+    domains and failing handlers are counted, never raised — the loop must
+    survive any single activity.
+    """
+    stats = {"done": 0, "deferred": 0, "failed": 0}
+    for inbound_id in due_inbound_ids(limit):
+        try:
+            if run_inbound_activity(inbound_id):
+                stats["done"] += 1
+        except InboundDomainBusyError:
+            stats["deferred"] += 1
+        except Exception:  # noqa: BLE001 — recorded on the row by run_inbound_activity
+            stats["failed"] += 1
+    return stats
@@ -0,0 +1,110 @@
+"""
+Pool of pre-generated RSA key pairs for new local actors.
+
+A 2048-bit RSA generation costs tens of milliseconds of CPU. Doing it in the
+``post_save`` signal of every new user or game put that cost on signup, game
+creation and bulk paths (``seed_demo``, game imports). The pool moves it to the
+background: ``refill_key_pool`` (Celery beat, or ``manage.py fill_key_pool``)
+keeps up to ``AP_KEY_POOL_SIZE`` :class:`PooledKeyPair` rows ready, and the
+signals claim one atomically. An empty pool falls back to inline generation,
+so a pool that is never filled behaves exactly like before.
+"""
+
+from __future__ import annotations
+
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import PooledKeyPair
+from .signatures import generate_key_pair
+
+logger = logging.getLogger(__name__)
+
+# Debounce for the refill task queued from claim_key_pair: one per window.
+_REFILL_LOCK_KEY = "ap-key-pool-refill"
+_REFILL_LOCK_TTL = 60
+
+
+def pool_target() -> int:
+    """Number of pairs the pool is kept topped up to (0 disables the pool)."""
+    return max(int(getattr(settings, "AP_KEY_POOL_SIZE", 20)), 0)
+
+
+def _take_pooled_pair() -> tuple[str, str] | None:
+    """Remove the oldest free pooled pair and return it; None when the pool is empty.
+
+    The row is locked with ``SKIP LOCKED`` and deleted in the same transaction:
+    concurrent signups each take a different row instead of racing for the
+    oldest one (and falling back to inline generation when they lose).
+    """
+    with transaction.atomic():
+        row = (
+            PooledKeyPair.objects.select_for_update(skip_locked=True)
+            .values_list("pk", "private_key", "public_key")
+            .first()
+        )
+        if row is None:
+            return None
+        pk, private_pem, public_pem = row
+        PooledKeyPair.objects.filter(pk=pk).delete()
+    return private_pem, public_pem
+
+
+def _schedule_refill() -> None:
+    """Queue a background refill, at most once per lock window.
+
+    Only with a real broker: in eager mode the task would run here, inside the
+    request the pool exists to keep fast.
+    """
+    from .inbox_queue import _broker_available
+
+    if not _broker_available() or not cache.add(_REFILL_LOCK_KEY, 1, timeout=_REFILL_LOCK_TTL):
+        return
+
+    from .signals import _safe_delay
+    from .tasks import refill_key_pool
+
+    _safe_delay(refill_key_pool)
+
+
+def claim_pooled_key_pair() -> tuple[str, str] | None:
+    """Take a pre-generated ``(private_key_pem, public_key_pem)`` from the pool.
+
+    Returns None when the pool is empty or disabled. Either way a background
+    refill is requested, so the next claims find the pool stocked.
+    """
+    if not pool_target():
+        return None
+    pair = _take_pooled_pair()
+    if pair is None:
+        logger.info("Key pool empty")
+    _schedule_refill()
+    return pair
+
+
+def claim_key_pair() -> tuple[str, str]:
+    """Return ``(private_key_pem, public_key_pem)`` for a new local actor.
+
+    Pooled pair when available, inline generation otherwise.
+    """
+    return claim_pooled_key_pair() or generate_key_pair()
+
+
+def fill_key_pool(target: int | None = None) -> int:
+    """Generate pairs until the pool holds `target` (default: ``AP_KEY_POOL_SIZE``).
+
+    Returns the number of pairs created. Pairs are saved one by one, so a
+    claim running meanwhile can already use the first ones.
+    """
+    wanted = pool_target() if target is None else max(target, 0)
+    created = 0
+    while PooledKeyPair.objects.count() < wanted:
+        private_pem, public_pem = generate_key_pair()
+        PooledKeyPair.objects.create(private_key=private_pem, public_key=public_pem)
+        created += 1
+    if created:
+        logger.info("Key pool refilled with %d pair(s)", created)
+    return created
@@ -0,0 +1,35 @@
+"""
+Management command: pre-fill the RSA key pool.
+
+Generates key pairs until the pool holds ``AP_KEY_POOL_SIZE`` of them (or
+``--count``), so that a deployment without a Celery beat — or a bulk run such
+as ``seed_demo`` — starts with keys ready instead of generating them inline.
+
+Usage:
+    python manage.py fill_key_pool
+    python manage.py fill_key_pool --count 200
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from suddenly.activitypub.keypool import fill_key_pool
+
+
+class Command(BaseCommand):
+    help = "Pre-generate RSA key pairs for new local users, games and characters."
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            "--count",
+            type=int,
+            default=None,
+            help="Pool size to reach (default: AP_KEY_POOL_SIZE).",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        created = fill_key_pool(options["count"])
+        self.stdout.write(self.style.SUCCESS(f"{created} key pair(s) generated"))
@@ -0,0 +1,54 @@
+"""
+Management command: run queued inbox activities in a local worker loop.
+
+The broker-less counterpart of the ``process_inbound_activity`` Celery task
+for ``AP_INBOX_ASYNC`` deployments: without Redis, tasks run eagerly in the web
+request, so the inbox leaves its queued activities for this process instead.
+
+Usage:
+    python manage.py process_inbox_queue
+    python manage.py process_inbox_queue --once
+    python manage.py process_inbox_queue --batch 50 --idle-sleep 2
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from suddenly.activitypub.inbox_queue import drain_inbound_queue
+
+
+class Command(BaseCommand):
+    help = "Process queued inbound ActivityPub activities (broker-less inbox worker)."
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            "--once", action="store_true", help="Drain one batch, then exit (cron mode)."
+        )
+        parser.add_argument(
+            "--batch", type=int, default=100, help="Activities claimed per iteration."
+        )
+        parser.add_argument(
+            "--idle-sleep",
+            type=float,
+            default=1.0,
+            help="Seconds to wait when the queue has nothing due.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        batch: int = options["batch"]
+        idle_sleep: float = options["idle_sleep"]
+
+        while True:
+            stats = drain_inbound_queue(limit=batch)
+            if any(stats.values()):
+                self.stdout.write(
+                    f"done={stats['done']} deferred={stats['deferred']} failed={stats['failed']}"
+                )
+            if options["once"]:
+                return
+            if not any(stats.values()):
+                time.sleep(idle_sleep)
@@ -0,0 +1,86 @@
+# Generated by Django 5.0.14 on 2026-10-16 22:37
+
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("activitypub", "0004_processedactivity"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="InboundActivity",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "ap_id",
+                    models.URLField(
+                        blank=True,
+                        help_text="ActivityPub activity ID (may be empty for anonymous activities)",
+                        max_length=500,
+                    ),
+                ),
+                ("activity_type", models.CharField(max_length=50)),
+                ("payload", models.JSONField(help_text="Parsed activity body, as received")),
+                (
+                    "actor_type",
+                    models.CharField(
+                        help_text="Local inbox owner type (user/game/character)", max_length=20
+                    ),
+                ),
+                (
+                    "actor_identifier",
+                    models.CharField(
+                        help_text="Local inbox owner identifier (username or UUID)", max_length=255
+                    ),
+                ),
+                (
+                    "actor_domain",
+                    models.CharField(
+                        help_text="Domain of the signing remote instance", max_length=255
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("PENDING", "En attente"),
+                            ("PROCESSING", "En cours"),
+                            ("FAILED", "Échec"),
+                        ],
+                        default="PENDING",
+                        max_length=20,
+                    ),
+                ),
+                ("attempts", models.PositiveSmallIntegerField(default=0)),
+                (
+                    "available_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        help_text="Earliest time the next attempt may run (retry backoff)",
+                    ),
+                ),
+                ("last_error", models.TextField(blank=True)),
+            ],
+            options={
+                "verbose_name": "Activité entrante en file",
+                "verbose_name_plural": "Activités entrantes en file",
+                "indexes": [
+                    models.Index(
+                        fields=["status", "available_at"], name="inbound_status_avail_idx"
+                    ),
+                    models.Index(fields=["actor_domain"], name="inbound_domain_idx"),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.14 on 2026-10-16 22:50
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("activitypub", "0005_inboundactivity"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PooledKeyPair",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("private_key", models.TextField(help_text="PEM-encoded private key")),
+                ("public_key", models.TextField(help_text="PEM-encoded public key")),
+            ],
+            options={
+                "verbose_name": "Paire de clés en réserve",
+                "verbose_name_plural": "Paires de clés en réserve",
+                "ordering": ["created_at"],
+            },
+        ),
+    ]
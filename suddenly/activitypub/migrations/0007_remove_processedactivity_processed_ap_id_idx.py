@@ -0,0 +1,16 @@
+# Generated by Django 5.0.14 on 2026-10-17 01:05
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("activitypub", "0006_pooledkeypair"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="processedactivity",
+            name="processed_ap_id_idx",
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.0.14 on 2026-10-17 01:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("activitypub", "0007_remove_processedactivity_processed_ap_id_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="federatedserver",
+            name="next_check_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="When the NodeInfo crawler should probe this instance next (null: asap)",
+                null=True,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="federatedserver",
+            index=models.Index(fields=["next_check_at"], name="fedserver_next_check_idx"),
+        ),
+    ]
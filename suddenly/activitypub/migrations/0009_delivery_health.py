@@ -0,0 +1,100 @@
+# Generated by Django 5.0.14 on 2026-10-17 03:10
+
+import uuid
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("activitypub", "0008_federatedserver_next_check_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="federatedserver",
+            name="delivery_successes",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="federatedserver",
+            name="delivery_failures",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="federatedserver",
+            name="consecutive_failures",
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text="Failed deliveries since the last success (opens the circuit)",
+            ),
+        ),
+        migrations.AddField(
+            model_name="federatedserver",
+            name="last_delivery_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="federatedserver",
+            name="last_delivery_error",
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="federatedserver",
+            name="circuit_state",
+            field=models.CharField(
+                choices=[("CLOSED", "Fermé"), ("OPEN", "Ouvert"), ("HALF_OPEN", "Semi-ouvert")],
+                default="CLOSED",
+                max_length=20,
+            ),
+        ),
+        migrations.AddField(
+            model_name="federatedserver",
+            name="circuit_retry_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="When an open circuit lets one probe delivery through",
+                null=True,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="federatedserver",
+            index=models.Index(
+                fields=["circuit_state", "circuit_retry_at"], name="fedserver_circuit_idx"
+            ),
+        ),
+        migrations.CreateModel(
+            name="ParkedDelivery",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("inbox_url", models.URLField(max_length=500)),
+                ("activity", models.JSONField(help_text="Activity body to deliver")),
+                ("actor_key_id", models.CharField(blank=True, max_length=500)),
+                (
+                    "server",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="parked_deliveries",
+                        to="activitypub.federatedserver",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Livraison en attente",
+                "verbose_name_plural": "Livraisons en attente",
+                "indexes": [
+                    models.Index(
+                        fields=["server", "created_at"], name="parked_server_created_idx"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 5.0.14 on 2026-10-17 04:20
+
+import uuid
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def park_into_store(apps, schema_editor):
+    """Move each parked delivery's payload and signer into an OutboundActivity."""
+    OutboundActivity = apps.get_model("activitypub", "OutboundActivity")
+    ParkedDelivery = apps.get_model("activitypub", "ParkedDelivery")
+    for parked in ParkedDelivery.objects.all().iterator():
+        parked.outbound = OutboundActivity.objects.create(
+            activity=parked.activity, signer_key_id=parked.actor_key_id
+        )
+        parked.save(update_fields=["outbound"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("activitypub", "0009_delivery_health"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OutboundActivity",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("activity", models.JSONField(help_text="Activity body to deliver")),
+                (
+                    "signer_key_id",
+                    models.CharField(
+                        blank=True,
+                        help_text="Key id of the local actor signing the deliveries (empty: unsigned)",
+                        max_length=500,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Activité sortante",
+                "verbose_name_plural": "Activités sortantes",
+                "indexes": [models.Index(fields=["created_at"], name="outbound_created_idx")],
+            },
+        ),
+        migrations.AddField(
+            model_name="parkeddelivery",
+            name="outbound",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="parked_deliveries",
+                to="activitypub.outboundactivity",
+            ),
+        ),
+        migrations.RunPython(park_into_store, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name="parkeddelivery",
+            name="activity",
+        ),
+        migrations.RemoveField(
+            model_name="parkeddelivery",
+            name="actor_key_id",
+        ),
+        migrations.AlterField(
+            model_name="parkeddelivery",
+            name="outbound",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="parked_deliveries",
+                to="activitypub.outboundactivity",
+            ),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.0.14 on 2026-10-17 12:30
+
+import uuid
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("activitypub", "0010_outboundactivity"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RemoteActorRefresh",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "ap_id",
+                    models.URLField(help_text="Remote actor URL", max_length=500, unique=True),
+                ),
+                (
+                    "actor_type",
+                    models.CharField(help_text="Mirror type (user/game/character)", max_length=20),
+                ),
+                ("etag", models.CharField(blank=True, max_length=255)),
+                ("last_modified", models.CharField(blank=True, max_length=64)),
+                ("last_fetched_at", models.DateTimeField(blank=True, null=True)),
+                ("next_refresh_at", models.DateTimeField(default=django.utils.timezone.now)),
+                (
+                    "failures",
+                    models.PositiveSmallIntegerField(
+                        default=0, help_text="Consecutive failed fetches (reset by a success)"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Rafraîchissement d'acteur distant",
+                "verbose_name_plural": "Rafraîchissements d'acteurs distants",
+                "indexes": [
+                    models.Index(fields=["next_refresh_at"], name="actor_refresh_due_idx")
+                ],
+            },
+        ),
+    ]
@@ -6,6 +6,7 @@ federation metrics. No federation logic lives here — this is structure only.
 """
 
 from django.db import models
+from django.utils import timezone
 
 from suddenly.core.models import BaseModel
 
@@ -18,12 +19,22 @@ class ServerStatus(models.TextChoices):
     BLOCKED = "BLOCKED", "Bloqué"
 
 
+class CircuitState(models.TextChoices):
+    """Delivery circuit breaker state of a remote instance."""
+
+    CLOSED = "CLOSED", "Fermé"
+    OPEN = "OPEN", "Ouvert"
+    HALF_OPEN = "HALF_OPEN", "Semi-ouvert"
+
+
 class FederatedServer(BaseModel):
     """
     Known remote ActivityPub instance.
 
-    Populated from NodeInfo discovery. Used for moderation (block/allow)
-    and federation health monitoring.
+    Populated from NodeInfo discovery (``nodeinfo.crawl_nodeinfo``). Used for
+    moderation (block/allow) and federation health monitoring: outbound
+    delivery outcomes feed the counters and circuit breaker below
+    (``delivery_health``).
     """
 
     server_name = models.CharField(
@@ -56,6 +67,29 @@ class FederatedServer(BaseModel):
         blank=True,
         help_text="Timestamp of last successful NodeInfo fetch",
     )
+    next_check_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the NodeInfo crawler should probe this instance next (null: asap)",
+    )
+    delivery_successes = models.PositiveIntegerField(default=0)
+    delivery_failures = models.PositiveIntegerField(default=0)
+    consecutive_failures = models.PositiveIntegerField(
+        default=0,
+        help_text="Failed deliveries since the last success (opens the circuit)",
+    )
+    last_delivery_at = models.DateTimeField(null=True, blank=True)
+    last_delivery_error = models.CharField(max_length=255, blank=True)
+    circuit_state = models.CharField(
+        max_length=20,
+        choices=CircuitState.choices,
+        default=CircuitState.CLOSED,
+    )
+    circuit_retry_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When an open circuit lets one probe delivery through",
+    )
 
     class Meta:
         verbose_name = "Instance fédérée"
@@ -64,6 +98,10 @@ class FederatedServer(BaseModel):
             models.Index(fields=["server_name"], name="fedserver_name_idx"),
             models.Index(fields=["status"], name="fedserver_status_idx"),
             models.Index(fields=["application_type"], name="fedserver_type_idx"),
+            models.Index(fields=["next_check_at"], name="fedserver_next_check_idx"),
+            models.Index(
+                fields=["circuit_state", "circuit_retry_at"], name="fedserver_circuit_idx"
+            ),
         ]
 
     def __str__(self) -> str:
@@ -112,7 +150,8 @@ class ProcessedActivity(BaseModel):
     Tracks already-processed ActivityPub activity IDs for inbox deduplication.
 
     Prevents replay attacks and duplicate processing when the same
-    activity is delivered multiple times (retries, network issues).
+    activity is delivered multiple times (retries, network issues). Rows are
+    kept for ``AP_DEDUP_RETENTION_DAYS`` (see ``dedup.py``).
     """
 
     ap_id = models.URLField(
@@ -129,9 +168,183 @@ class ProcessedActivity(BaseModel):
         verbose_name = "Activité traitée"
         verbose_name_plural = "Activités traitées"
         indexes = [
-            models.Index(fields=["ap_id"], name="processed_ap_id_idx"),
+            # ap_id lookups use the unique constraint's index; created_at
+            # drives the retention purge.
             models.Index(fields=["created_at"], name="processed_created_idx"),
         ]
 
     def __str__(self) -> str:
         return self.ap_id
+
+
+class OutboundActivity(BaseModel):
+    """
+    An outgoing activity, stored once for all of its deliveries.
+
+    Delivery tasks carry this row's id and an inbox URL instead of the
+    payload and the signer's private key (``outbound.py``). Purged after
+    ``AP_OUTBOUND_RETENTION_DAYS``.
+    """
+
+    activity = models.JSONField(help_text="Activity body to deliver")
+    signer_key_id = models.CharField(
+        max_length=500,
+        blank=True,
+        help_text="Key id of the local actor signing the deliveries (empty: unsigned)",
+    )
+
+    class Meta:
+        verbose_name = "Activité sortante"
+        verbose_name_plural = "Activités sortantes"
+        indexes = [
+            models.Index(fields=["created_at"], name="outbound_created_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.activity.get('type', '?')} {self.activity.get('id', self.pk)}"
+
+
+class ParkedDelivery(BaseModel):
+    """
+    Outbound delivery held back while its instance's circuit is open.
+
+    Replayed (re-queued through ``deliver_activity``) once a probe delivery to
+    the instance succeeds; dropped after ``AP_CIRCUIT_PARK_DAYS``.
+    """
+
+    server = models.ForeignKey(
+        FederatedServer,
+        on_delete=models.CASCADE,
+        related_name="parked_deliveries",
+    )
+    outbound = models.ForeignKey(
+        OutboundActivity,
+        on_delete=models.CASCADE,
+        related_name="parked_deliveries",
+    )
+    inbox_url = models.URLField(max_length=500)
+
+    class Meta:
+        verbose_name = "Livraison en attente"
+        verbose_name_plural = "Livraisons en attente"
+        indexes = [
+            models.Index(fields=["server", "created_at"], name="parked_server_created_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.inbox_url} ({self.created_at:%Y-%m-%d %H:%M})"
+
+
+class InboundActivityStatus(models.TextChoices):
+    """Processing state of a queued inbound activity."""
+
+    PENDING = "PENDING", "En attente"
+    PROCESSING = "PROCESSING", "En cours"
+    FAILED = "FAILED", "Échec"
+
+
+class InboundActivity(BaseModel):
+    """
+    Durable record of an accepted inbound activity awaiting handler dispatch.
+
+    Written by the inbox when ``AP_INBOX_ASYNC`` is on: the request only runs
+    the cheap checks (rate limit, signature, JSON, dedup) and acknowledges with
+    202, the handler runs later in a worker. A row is deleted once its handler
+    succeeds; rows left in FAILED exhausted their retries and are kept for
+    inspection.
+    """
+
+    ap_id = models.URLField(
+        max_length=500,
+        blank=True,
+        help_text="ActivityPub activity ID (may be empty for anonymous activities)",
+    )
+    activity_type = models.CharField(max_length=50)
+    payload = models.JSONField(help_text="Parsed activity body, as received")
+    actor_type = models.CharField(
+        max_length=20,
+        help_text="Local inbox owner type (user/game/character)",
+    )
+    actor_identifier = models.CharField(
+        max_length=255,
+        help_text="Local inbox owner identifier (username or UUID)",
+    )
+    actor_domain = models.CharField(
+        max_length=255,
+        help_text="Domain of the signing remote instance",
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=InboundActivityStatus.choices,
+        default=InboundActivityStatus.PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    available_at = models.DateTimeField(
+        default=timezone.now,
+        help_text="Earliest time the next attempt may run (retry backoff)",
+    )
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        verbose_name = "Activité entrante en file"
+        verbose_name_plural = "Activités entrantes en file"
+        indexes = [
+            models.Index(fields=["status", "available_at"], name="inbound_status_avail_idx"),
+            models.Index(fields=["actor_domain"], name="inbound_domain_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.activity_type} {self.ap_id or self.pk}"
+
+
+class PooledKeyPair(BaseModel):
+    """
+    Pre-generated RSA key pair waiting to be assigned to a new local actor.
+
+    Topped up in the background by ``refill_key_pool`` (see ``keypool.py``) so
+    account, game and character creation do not pay for an RSA generation in
+    the request. A pair is deleted the moment it is claimed: it is never handed
+    out twice.
+    """
+
+    private_key = models.TextField(help_text="PEM-encoded private key")
+    public_key = models.TextField(help_text="PEM-encoded public key")
+
+    class Meta:
+        verbose_name = "Paire de clés en réserve"
+        verbose_name_plural = "Paires de clés en réserve"
+        ordering = ["created_at"]
+
+    def __str__(self) -> str:
+        return f"Paire de clés {self.pk}"
+
+
+class RemoteActorRefresh(BaseModel):
+    """
+    Refresh bookkeeping for one remote actor mirror (User, Game or Character).
+
+    Written by the refresh engine (``actor_refresh.py``): when the actor was
+    last fetched, the validators of that response for a conditional re-fetch,
+    and when it is due again. A mirror without a row has never been refreshed
+    and is due immediately.
+    """
+
+    ap_id = models.URLField(max_length=500, unique=True, help_text="Remote actor URL")
+    actor_type = models.CharField(max_length=20, help_text="Mirror type (user/game/character)")
+    etag = models.CharField(max_length=255, blank=True)
+    last_modified = models.CharField(max_length=64, blank=True)
+    last_fetched_at = models.DateTimeField(null=True, blank=True)
+    next_refresh_at = models.DateTimeField(default=timezone.now)
+    failures = models.PositiveSmallIntegerField(
+        default=0, help_text="Consecutive failed fetches (reset by a success)"
+    )
+
+    class Meta:
+        verbose_name = "Rafraîchissement d'acteur distant"
+        verbose_name_plural = "Rafraîchissements d'acteurs distants"
+        indexes = [
+            models.Index(fields=["next_refresh_at"], name="actor_refresh_due_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return self.ap_id
@@ -0,0 +1,203 @@
+"""
+NodeInfo discovery crawler.
+
+Keeps :class:`FederatedServer` warm so routing decisions (Suddenly-only
+Offers, remote actor typing, inbox rate limits) read a local table instead of
+probing peers live. ``crawl_nodeinfo`` runs periodically (Celery beat):
+
+1. every domain seen in remote users' ``ap_id``/``inbox_url`` or in inbox
+   dedup rows gets a ``FederatedServer`` row;
+2. rows whose ``next_check_at`` is due (new rows first) are probed through
+   ``/.well-known/nodeinfo`` with the SSRF-safe ``fetch_ap_json``, a bounded
+   number at a time in a small thread pool;
+3. results are written back in one pass: software, version, user count and
+   ``last_checked`` on success, and the next probe time either way
+   (``AP_NODEINFO_REFRESH_HOURS`` after a success, ``AP_NODEINFO_RETRY_HOURS``
+   after a failure).
+
+Blocked instances are never probed. The threads only do HTTP; every database
+read and write stays on the calling thread.
+"""
+
+from __future__ import annotations
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, NamedTuple
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+
+from ._http import fetch_ap_json
+from .models import FederatedServer, ProcessedActivity, ServerStatus
+
+logger = logging.getLogger(__name__)
+
+_NODEINFO_REL_PREFIX = "http://nodeinfo.diaspora.software/ns/schema/"
+
+
+class NodeInfo(NamedTuple):
+    """The NodeInfo fields Suddenly keeps about a peer."""
+
+    software: str
+    version: str
+    user_count: int
+
+
+def parse_nodeinfo(document: dict[str, Any]) -> NodeInfo:
+    """Extract software name/version and total users from a NodeInfo document."""
+    software = document.get("software")
+    software = software if isinstance(software, dict) else {}
+    usage = document.get("usage")
+    users = usage.get("users") if isinstance(usage, dict) else None
+    total = users.get("total") if isinstance(users, dict) else None
+    return NodeInfo(
+        software=str(software.get("name") or "").lower()[:100],
+        version=str(software.get("version") or "")[:50],
+        user_count=total if isinstance(total, int) and total >= 0 else 0,
+    )
+
+
+def _nodeinfo_href(index: dict[str, Any], domain: str) -> str | None:
+    """Pick the newest-schema NodeInfo link of `domain`'s discovery document.
+
+    Links pointing at another host are ignored: the crawler only ever talks
+    to the domain it is probing.
+    """
+    links = index.get("links")
+    candidates: list[tuple[str, str]] = []
+    for link in links if isinstance(links, list) else []:
+        if not isinstance(link, dict):
+            continue
+        rel, href = str(link.get("rel", "")), link.get("href")
+        if not rel.startswith(_NODEINFO_REL_PREFIX) or not isinstance(href, str):
+            continue
+        if urlparse(href).netloc.lower() != domain:
+            continue
+        candidates.append((rel[len(_NODEINFO_REL_PREFIX) :], href))
+    if not candidates:
+        return None
+    return max(candidates)[1]
+
+
+def fetch_nodeinfo(domain: str) -> NodeInfo | None:
+    """Probe `domain`'s NodeInfo. None when it has none or cannot be reached."""
+    index = fetch_ap_json(f"https://{domain}/.well-known/nodeinfo", accept="application/json")
+    if not isinstance(index, dict):
+        return None
+    href = _nodeinfo_href(index, domain)
+    if href is None:
+        return None
+    document = fetch_ap_json(href, accept="application/json")
+    if not isinstance(document, dict):
+        return None
+    return parse_nodeinfo(document)
+
+
+def _domain_of(url: str | None) -> str:
+    return urlparse(url).netloc.lower() if url else ""
+
+
+def discover_domains() -> set[str]:
+    """Every remote domain seen so far: remote users and inbox dedup rows."""
+    from suddenly.users.models import User
+
+    domains: set[str] = set()
+    remote_urls = User.objects.filter(remote=True).values_list("ap_id", "inbox_url")
+    for ap_id, inbox_url in remote_urls.iterator():
+        domains.add(_domain_of(ap_id))
+        domains.add(_domain_of(inbox_url))
+    domains.update(
+        d.lower()
+        for d in ProcessedActivity.objects.values_list("actor_domain", flat=True).distinct()
+    )
+    domains.discard("")
+    domains.discard("unknown")
+    domains.discard(str(getattr(settings, "DOMAIN", "")).lower())
+    return domains
+
+
+def register_domains(domains: set[str]) -> int:
+    """Create a ``FederatedServer`` row for each new domain. Returns how many."""
+    existing = set(
+        FederatedServer.objects.filter(server_name__in=domains).values_list(
+            "server_name", flat=True
+        )
+    )
+    new = [FederatedServer(server_name=d[:255]) for d in sorted(domains - existing)]
+    FederatedServer.objects.bulk_create(new, ignore_conflicts=True)
+    return len(new)
+
+
+def due_servers(limit: int) -> list[FederatedServer]:
+    """Non-blocked servers whose probe is due, never-probed ones first."""
+    now = timezone.now()
+    return list(
+        FederatedServer.objects.exclude(status=ServerStatus.BLOCKED)
+        .filter(Q(next_check_at__isnull=True) | Q(next_check_at__lte=now))
+        .order_by(F("next_check_at").asc(nulls_first=True))[:limit]
+    )
+
+
+def crawl_nodeinfo() -> dict[str, int]:
+    """Discover new domains, then probe the due ones. Returns run counters."""
+    from .domains import invalidate_domain_registry
+
+    discovered = register_domains(discover_domains())
+
+    batch = int(getattr(settings, "AP_NODEINFO_CRAWL_BATCH", 50))
+    workers = max(int(getattr(settings, "AP_NODEINFO_CONCURRENCY", 8)), 1)
+    servers = due_servers(batch)
+    if not servers:
+        if discovered:
+            invalidate_domain_registry()
+        return {"discovered": discovered, "probed": 0, "failed": 0}
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(servers))) as pool:
+        results = list(pool.map(fetch_nodeinfo, [s.server_name for s in servers]))
+
+    now = timezone.now()
+    refresh = timedelta(hours=int(getattr(settings, "AP_NODEINFO_REFRESH_HOURS", 24)))
+    retry = timedelta(hours=int(getattr(settings, "AP_NODEINFO_RETRY_HOURS", 6)))
+    failed = 0
+    for server, info in zip(servers, results, strict=True):
+        server.updated_at = now
+        if info is None:
+            failed += 1
+            server.next_check_at = now + retry
+            continue
+        server.application_type = info.software
+        server.application_version = info.version
+        server.user_count = info.user_count
+        server.last_checked = now
+        server.next_check_at = now + refresh
+
+    FederatedServer.objects.bulk_update(
+        servers,
+        [
+            "application_type",
+            "application_version",
+            "user_count",
+            "last_checked",
+            "next_check_at",
+            "updated_at",
+        ],
+    )
+    # Status is promoted separately so a block set meanwhile is never overwritten.
+    answered = [s.pk for s, info in zip(servers, results, strict=True) if info is not None]
+    FederatedServer.objects.filter(pk__in=answered, status=ServerStatus.UNKNOWN).update(
+        status=ServerStatus.FEDERATED
+    )
+    # bulk_update sends no post_save: retire the domain registry here.
+    invalidate_domain_registry()
+
+    logger.info(
+        "NodeInfo crawl: %d new domain(s), %d probed, %d failed",
+        discovered,
+        len(servers),
+        failed,
+    )
+    return {"discovered": discovered, "probed": len(servers), "failed": failed}
@@ -0,0 +1,90 @@
+"""
+Outbound activity store.
+
+An outgoing activity is written once to :class:`OutboundActivity`, together
+with a reference to its signer (the key id, ``<actor_url>#main-key``).
+Delivery tasks then carry only that row's id and an inbox URL: a broadcast
+to N inboxes puts one activity in the database instead of N payload copies
+in the broker, and private keys never enter the queue. They are looked up
+from the signer at send time.
+
+Rows are purged after ``AP_OUTBOUND_RETENTION_DAYS``, which must outlive the
+delivery retries and parked deliveries (``AP_CIRCUIT_PARK_DAYS``).
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import timedelta
+from typing import Any
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import OutboundActivity
+
+logger = logging.getLogger(__name__)
+
+# Rows per DELETE statement in purge_outbound_activities.
+PURGE_CHUNK_SIZE = 5000
+
+_ACTOR_SEGMENTS = {"users": "user", "games": "game", "characters": "character"}
+
+
+def store_activity(activity: dict[str, Any], signer_key_id: str | None) -> str:
+    """Persist `activity` for delivery; returns the id delivery tasks carry."""
+    outbound = OutboundActivity.objects.create(activity=activity, signer_key_id=signer_key_id or "")
+    return str(outbound.pk)
+
+
+def store_signed_activity(activity: dict[str, Any], signer: Any) -> str:
+    """``store_activity`` with the key id of local actor `signer` (may be None)."""
+    from .tasks import get_actor_signing_keys
+
+    actor_key_id, _ = get_actor_signing_keys(signer)
+    return store_activity(activity, actor_key_id)
+
+
+def signing_keys(signer_key_id: str) -> tuple[str | None, str | None] | None:
+    """Resolve a signer reference to ``(key_id, private_key_pem)``.
+
+    ``(None, None)`` — an unsigned delivery, as before the store existed — for
+    an empty reference or a key that is not a local actor's. None when the
+    local actor is gone: its deliveries can no longer be signed.
+    """
+    from suddenly.core.utils import get_local_actor
+
+    from .tasks import get_actor_signing_keys
+
+    prefix = f"{settings.AP_BASE_URL}/"
+    actor_url = signer_key_id.split("#", 1)[0]
+    if not actor_url.startswith(prefix):
+        return None, None
+    parts = actor_url[len(prefix) :].split("/")
+    if len(parts) != 2 or parts[0] not in _ACTOR_SEGMENTS:
+        return None, None
+    actor = get_local_actor(_ACTOR_SEGMENTS[parts[0]], parts[1])
+    if actor is None:
+        return None
+    return get_actor_signing_keys(actor)
+
+
+def purge_outbound_activities(chunk_size: int = PURGE_CHUNK_SIZE) -> int:
+    """Delete stored activities past the retention window. Returns the count."""
+    days = int(getattr(settings, "AP_OUTBOUND_RETENTION_DAYS", 8))
+    cutoff = timezone.now() - timedelta(days=days)
+    total = 0
+    while True:
+        pks = list(
+            OutboundActivity.objects.filter(created_at__lt=cutoff)
+            .order_by("created_at")
+            .values_list("pk", flat=True)[:chunk_size]
+        )
+        if not pks:
+            break
+        # Parked deliveries of a purged activity cascade; only count activities.
+        _, per_model = OutboundActivity.objects.filter(pk__in=pks).delete()
+        total += per_model.get(OutboundActivity._meta.label, 0)
+    if total:
+        logger.info("Purged %d outbound activities older than %s", total, cutoff)
+    return total
@@ -6,9 +6,11 @@ Converts Django models to ActivityPub JSON-LD format.
 
 from __future__ import annotations
 
+from collections.abc import Iterable
 from typing import Any
 
 from django.conf import settings
+from django.db.models import Prefetch, prefetch_related_objects
 
 from suddenly.activitypub.url_utils import absolute_media_url, media_type_for_file
 
@@ -115,6 +117,11 @@ def serialize_trait_sets(character: Any) -> list[dict[str, Any]]:
     return result
 
 
+def _endpoints() -> dict[str, str]:
+    """``endpoints`` block shared by every local actor (one inbox for the instance)."""
+    return {"sharedInbox": f"{settings.AP_BASE_URL}/inbox"}
+
+
 def serialize_user(user: Any) -> dict[str, Any]:
     """Serialize a User to ActivityPub Person."""
     actor_url: str = user.actor_url
@@ -128,6 +135,7 @@ def serialize_user(user: Any) -> dict[str, Any]:
         "inbox": f"{actor_url}/inbox",
         "outbox": f"{actor_url}/outbox",
         "followers": f"{actor_url}/followers",
+        "endpoints": _endpoints(),
         "following": f"{actor_url}/following",
         "url": f"https://{settings.DOMAIN}/@{user.username}",
         "published": user.created_at.isoformat(),
@@ -166,6 +174,7 @@ def serialize_game(game: Any) -> dict[str, Any]:
         "inbox": f"{actor_url}/inbox",
         "outbox": f"{actor_url}/outbox",
         "followers": f"{actor_url}/followers",
+        "endpoints": _endpoints(),
         "url": f"https://{settings.DOMAIN}/games/{game.pk}",
         "published": game.created_at.isoformat(),
     }
@@ -198,6 +207,7 @@ def serialize_character(character: Any) -> dict[str, Any]:
         "inbox": f"{actor_url}/inbox",
         "outbox": f"{actor_url}/outbox",
         "followers": f"{actor_url}/followers",
+        "endpoints": _endpoints(),
         "url": f"https://{settings.DOMAIN}/characters/{character.pk}",
         "published": character.created_at.isoformat(),
         "status": character.status,
@@ -242,8 +252,44 @@ def serialize_character(character: Any) -> dict[str, Any]:
     return data
 
 
+# Relations serialize_report dereferences. Applied once per page by
+# serialize_reports so a page of N reports costs a constant number of queries.
+REPORT_SERIALIZER_RELATED = ("author", "game", "previous_report", "temporal_anchor")
+
+
+def _report_appearances(report: Any) -> Iterable[Any]:
+    """The report's character appearances, from the prefetch cache when present."""
+    if "character_appearances" in getattr(report, "_prefetched_objects_cache", {}):
+        return report.character_appearances.all()  # type: ignore[no-any-return]
+    return report.character_appearances.select_related("character")  # type: ignore[no-any-return]
+
+
+def serialize_reports(reports: Iterable[Any]) -> list[dict[str, Any]]:
+    """Serialize many Reports with one prefetch plan for the whole batch.
+
+    Accepts a queryset or already-loaded instances (e.g. a collection page).
+    Relations already loaded by ``select_related`` are not fetched again.
+    """
+    from suddenly.characters.models import CharacterAppearance
+
+    reports = list(reports)
+    prefetch_related_objects(
+        reports,
+        *REPORT_SERIALIZER_RELATED,
+        Prefetch(
+            "character_appearances",
+            queryset=CharacterAppearance.objects.select_related("character"),
+        ),
+    )
+    return [serialize_report(report) for report in reports]
+
+
 def serialize_report(report: Any) -> dict[str, Any]:
-    """Serialize a Report to ActivityPub Note/Article."""
+    """Serialize a Report to ActivityPub Note/Article.
+
+    Serializing several reports? Use :func:`serialize_reports`, which batches
+    the relation lookups this function would otherwise run per report.
+    """
     report_url = f"https://{settings.DOMAIN}/reports/{report.pk}"
 
     data: dict[str, Any] = {
@@ -282,7 +328,7 @@ def serialize_report(report: Any) -> dict[str, Any]:
 
     # Mentions
     mentions: list[dict[str, str]] = []
-    for appearance in report.character_appearances.select_related("character"):
+    for appearance in _report_appearances(report):
         mentions.append(
             {
                 "type": "Mention",
@@ -12,7 +12,7 @@ import logging
 from typing import Any
 
 from django.db import transaction
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
 
@@ -33,6 +33,25 @@ def _safe_delay(task: Any, *args: Any, **kwargs: Any) -> None:
         logger.warning("Failed to queue task %s: %s", task.name, exc)
 
 
+def _assign_actor_keys(instance: Any, *, generate: bool) -> None:
+    """Store a claimed key pair on a freshly created local actor.
+
+    Written with ``update()`` so the post_save signal does not fire again, and
+    mirrored on the instance so later code in the same request (the allauth
+    ``user_signed_up`` handler, the caller) sees the keys without a reload.
+    """
+    from suddenly.activitypub.keypool import claim_key_pair, claim_pooled_key_pair
+
+    pair = claim_key_pair() if generate else claim_pooled_key_pair()
+    if pair is None:
+        return
+    instance.private_key, instance.public_key = pair
+    type(instance).objects.filter(pk=instance.pk).update(
+        private_key=instance.private_key,
+        public_key=instance.public_key,
+    )
+
+
 @receiver(post_save, sender="games.Report")
 def report_post_save(sender: type[Any], instance: Any, created: bool, **kwargs: Any) -> None:
     """
@@ -69,10 +88,16 @@ def report_pre_save(sender: type[Any], instance: Any, **kwargs: Any) -> None:
 def character_post_save(sender: type[Any], instance: Any, created: bool, **kwargs: Any) -> None:
     """
     When a new character is created locally, broadcast it.
+
+    Also hands it a pooled key pair when one is ready. Characters never had
+    keys generated inline, so an empty pool leaves them keyless as before
+    rather than adding an RSA generation to every character creation.
     """
     from suddenly.activitypub.tasks import send_create_activity
 
     if created and not instance.remote:
+        if not instance.private_key:
+            _assign_actor_keys(instance, generate=False)
         _safe_delay(send_create_activity, "character", str(instance.id))
 
 
@@ -158,17 +183,10 @@ def follow_post_save(sender: type[Any], instance: Any, created: bool, **kwargs:
 @receiver(post_save, sender="users.User")
 def user_post_save(sender: type[Any], instance: Any, created: bool, **kwargs: Any) -> None:
     """
-    Generate ActivityPub keys for new local users.
+    Assign ActivityPub keys to new local users (from the key pool when possible).
     """
-    from suddenly.activitypub.signatures import generate_key_pair
-
     if created and not instance.remote and not instance.private_key:
-        private_key, public_key = generate_key_pair()
-        # Use update to avoid triggering signal again
-        type(instance).objects.filter(pk=instance.pk).update(
-            private_key=private_key,
-            public_key=public_key,
-        )
+        _assign_actor_keys(instance, generate=True)
 
 
 @receiver(post_save, sender="messaging.DirectMessage")
@@ -196,13 +214,87 @@ def direct_message_post_save(
 @receiver(post_save, sender="games.Game")
 def game_post_save(sender: type[Any], instance: Any, created: bool, **kwargs: Any) -> None:
     """
-    Generate ActivityPub keys for new local games.
+    Assign ActivityPub keys to new local games (from the key pool when possible).
     """
-    from suddenly.activitypub.signatures import generate_key_pair
-
     if created and not instance.remote and not instance.private_key:
-        private_key, public_key = generate_key_pair()
-        type(instance).objects.filter(pk=instance.pk).update(
-            private_key=private_key,
-            public_key=public_key,
+        _assign_actor_keys(instance, generate=True)
+
+
+# =================================================================
+# Rendered-document cache invalidation (document_cache.py)
+# =================================================================
+
+
+@receiver(post_save, sender="users.User")
+@receiver(post_delete, sender="users.User")
+def user_document_changed(sender: type[Any], instance: Any, **kwargs: Any) -> None:
+    """Drop the cached actor document and outbox pages of a changed local user."""
+    from suddenly.activitypub.document_cache import (
+        forget_user_pk,
+        invalidate_actor_document,
+        invalidate_outbox_pages,
+    )
+
+    if not instance.remote:
+        invalidate_actor_document("user", instance.username)
+        invalidate_outbox_pages("user", instance.pk)
+        if "created" not in kwargs:  # post_delete: the username may be reused
+            forget_user_pk(instance.username)
+
+
+@receiver(post_save, sender="games.Game")
+@receiver(post_delete, sender="games.Game")
+def game_document_changed(sender: type[Any], instance: Any, **kwargs: Any) -> None:
+    """Drop the cached game actor document; visibility also reshapes outboxes."""
+    from suddenly.activitypub.document_cache import (
+        invalidate_actor_document,
+        invalidate_outbox_pages,
+    )
+    from suddenly.games.models import Report
+
+    if not instance.remote:
+        invalidate_actor_document("game", instance.pk)
+        invalidate_outbox_pages("game", instance.pk)
+        # Members' outboxes only list reports of public games.
+        authors = Report.objects.filter(game=instance, remote=False).values_list(
+            "author_id", flat=True
         )
+        for author_id in authors.distinct():
+            invalidate_outbox_pages("user", author_id)
+
+
+@receiver(post_save, sender="characters.Character")
+@receiver(post_delete, sender="characters.Character")
+def character_document_changed(sender: type[Any], instance: Any, **kwargs: Any) -> None:
+    """Drop the cached actor document of a changed local character."""
+    from suddenly.activitypub.document_cache import invalidate_actor_document
+
+    if not instance.remote:
+        invalidate_actor_document("character", instance.pk)
+
+
+@receiver(post_save, sender="games.Report")
+@receiver(post_delete, sender="games.Report")
+def report_document_changed(sender: type[Any], instance: Any, **kwargs: Any) -> None:
+    """Retire the cached outbox pages of a changed local report's author and game."""
+    from suddenly.activitypub.document_cache import invalidate_outbox_pages
+
+    # Remote reports are served by their own instance: nothing cached here.
+    if instance.remote:
+        return
+    invalidate_outbox_pages("user", instance.author_id)
+    invalidate_outbox_pages("game", instance.game_id)
+
+
+@receiver(post_save, sender="activitypub.FederatedServer")
+@receiver(post_delete, sender="activitypub.FederatedServer")
+def federated_server_changed(sender: type[Any], instance: Any, **kwargs: Any) -> None:
+    """Retire the domain registry now, and again once the change is committed.
+
+    The second bump drops a snapshot another request may have rebuilt from
+    the pre-commit state in between.
+    """
+    from suddenly.activitypub.domains import invalidate_domain_registry
+
+    invalidate_domain_registry()
+    transaction.on_commit(invalidate_domain_registry)
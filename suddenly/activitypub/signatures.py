@@ -11,8 +11,14 @@ import base64
 import binascii
 import hashlib
 import hmac
+import json
 import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
 from datetime import UTC, datetime
+from typing import Any, NamedTuple, cast
 from urllib.parse import urlparse
 
 from cryptography.exceptions import InvalidSignature
@@ -25,9 +31,142 @@ from django.http import HttpRequest
 from django.utils import timezone
 from django.utils.http import parse_http_date
 
+try:  # Optional faster encoder for outgoing bodies; the stdlib one is the fallback.
+    import orjson
+except ImportError:  # pragma: no cover - depends on the deployment
+    orjson = None  # type: ignore[assignment]
+
 logger = logging.getLogger(__name__)
 
 
+# =================================================================
+# Parsed-key cache
+# =================================================================
+#
+# PEM parsing (and, for inbound verification, the PublicKeyCache row lookup)
+# used to run on every signed request. Parsed RSA key objects are kept in a
+# process-local LRU, keyed by key id + PEM fingerprint so a rotated key can
+# never be served under its old PEM; the actor → PEM mapping is cached the
+# same way to skip the DB. Entries expire after AP_KEY_CACHE_TTL seconds, and
+# `invalidate_cached_key` drops an actor's entries when its key is replaced.
+# A stale entry in another process is harmless: a failed verification with
+# the cached key always falls back to a fresh fetch (see verify_signature).
+
+
+class _KeyLRU:
+    """Thread-safe LRU with per-entry expiry and hit/miss counters."""
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Any) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Any, value: Any) -> None:
+        ttl = float(getattr(settings, "AP_KEY_CACHE_TTL", 3600))
+        max_size = int(getattr(settings, "AP_KEY_CACHE_SIZE", 1024))
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+
+    def discard(self, predicate: Callable[[Any], bool]) -> None:
+        with self._lock:
+            for key in [k for k in self._entries if predicate(k)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_private_keys = _KeyLRU()  # (key_id, fingerprint) -> RSAPrivateKey
+_public_keys = _KeyLRU()  # (key_id, fingerprint) -> RSAPublicKey
+_actor_pems = _KeyLRU()  # actor_url -> public key PEM
+
+
+def _fingerprint(pem: str) -> str:
+    return hashlib.sha256(pem.encode("utf-8")).hexdigest()
+
+
+def load_private_key(private_key_pem: str, key_id: str = "") -> RSAPrivateKey:
+    """Parse a PEM private key, reusing the cached object when already parsed."""
+    cache_key = (key_id, _fingerprint(private_key_pem))
+    key = _private_keys.get(cache_key)
+    if key is None:
+        # Cast to RSAPrivateKey since we know we use RSA keys (DEC-018)
+        key = cast(
+            RSAPrivateKey,
+            serialization.load_pem_private_key(
+                private_key_pem.encode("utf-8"), password=None, backend=default_backend()
+            ),
+        )
+        _private_keys.put(cache_key, key)
+    return cast(RSAPrivateKey, key)
+
+
+def load_public_key(public_key_pem: str, key_id: str = "") -> RSAPublicKey:
+    """Parse a PEM public key, reusing the cached object when already parsed.
+
+    Raises ``ValueError`` on an unparseable PEM (never cached).
+    """
+    cache_key = (key_id, _fingerprint(public_key_pem))
+    key = _public_keys.get(cache_key)
+    if key is None:
+        # Cast to RSAPublicKey since we only support RSA keys (DEC-018)
+        key = cast(
+            RSAPublicKey,
+            serialization.load_pem_public_key(
+                public_key_pem.encode("utf-8"),
+                backend=default_backend(),
+            ),
+        )
+        _public_keys.put(cache_key, key)
+    return cast(RSAPublicKey, key)
+
+
+def invalidate_cached_key(actor_url: str) -> None:
+    """Forget every cached key entry belonging to `actor_url` (key rotation)."""
+    _actor_pems.discard(lambda k: k == actor_url)
+    _public_keys.discard(lambda k: k[0].split("#")[0] == actor_url)
+
+
+def clear_key_cache() -> None:
+    """Empty all parsed-key caches (tests, benchmarks)."""
+    for lru in (_private_keys, _public_keys, _actor_pems):
+        lru.clear()
+
+
+def _actor_public_key_pem(actor_url: str) -> str | None:
+    """Return the known public key PEM for `actor_url`: memory, then PublicKeyCache."""
+    from .models import PublicKeyCache
+
+    pem = _actor_pems.get(actor_url)
+    if pem is not None:
+        return cast(str, pem)
+
+    cached = PublicKeyCache.objects.filter(actor_url=actor_url).only("public_key_pem").first()
+    if cached is None:
+        return None
+    _actor_pems.put(actor_url, cached.public_key_pem)
+    return cached.public_key_pem
+
+
 def generate_key_pair() -> tuple[str, str]:
     """
     Generate a new RSA key pair for ActivityPub signatures.
@@ -57,11 +196,42 @@ def generate_key_pair() -> tuple[str, str]:
     return private_pem, public_pem
 
 
+# =================================================================
+# Outgoing bodies
+# =================================================================
+
+
+class EncodedBody(NamedTuple):
+    """An outgoing request body, serialized once, with its ``Digest`` value.
+
+    The exact bytes that are digested are the bytes sent: build one with
+    ``encode_body`` and hand it to both ``sign_request`` and the HTTP client,
+    once per activity rather than once per recipient.
+    """
+
+    content: bytes
+    digest: str
+
+
+def encode_body(body: dict[str, Any]) -> EncodedBody:
+    """Serialize `body` to compact JSON and compute its SHA-256 ``Digest``."""
+    content: bytes | None = None
+    if orjson is not None:
+        try:
+            content = orjson.dumps(body)
+        except TypeError:  # e.g. an integer orjson cannot represent
+            content = None
+    if content is None:
+        content = json.dumps(body, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    digest = base64.b64encode(hashlib.sha256(content).digest()).decode("ascii")
+    return EncodedBody(content, f"SHA-256={digest}")
+
+
 def sign_request(
     method: str,
     url: str,
     headers: dict[str, str],
-    body: dict[str, object] | None = None,
+    body: dict[str, object] | EncodedBody | None = None,
     key_id: str | None = None,
     private_key_pem: str | None = None,
 ) -> dict[str, str]:
@@ -72,15 +242,15 @@ def sign_request(
         method: HTTP method (GET, POST, etc.)
         url: Target URL
         headers: Request headers (will be modified)
-        body: Request body (for digest)
+        body: Request body (for digest): an ``EncodedBody`` whose precomputed
+            digest is reused as is, or a dict digested as ``json.dumps(body)``
+            (the caller must then send exactly that encoding)
         key_id: Key identifier URL (defaults to instance actor)
         private_key_pem: Private key PEM (defaults to instance key)
 
     Returns:
         Updated headers dict with Signature header
     """
-    import json
-
     # Default to instance key
     if not key_id:
         key_id = f"{settings.AP_BASE_URL}/actor#main-key"
@@ -107,7 +277,10 @@ def sign_request(
     # Calculate digest if body present
     signed_headers = ["(request-target)", "host", "date"]
 
-    if body:
+    if isinstance(body, EncodedBody):
+        headers["Digest"] = body.digest
+        signed_headers.append("digest")
+    elif body:
         body_bytes = json.dumps(body).encode("utf-8")
         digest = base64.b64encode(hashlib.sha256(body_bytes).digest()).decode("utf-8")
         headers["Digest"] = f"SHA-256={digest}"
@@ -123,15 +296,7 @@ def sign_request(
 
     signing_string = "\n".join(signing_parts)
 
-    # Cast to RSAPrivateKey since we know we use RSA keys (DEC-018)
-    from typing import cast
-
-    private_key = cast(
-        RSAPrivateKey,
-        serialization.load_pem_private_key(
-            private_key_pem.encode("utf-8"), password=None, backend=default_backend()
-        ),
-    )
+    private_key = load_private_key(private_key_pem, key_id)
 
     signature = private_key.sign(
         signing_string.encode("utf-8"), padding.PKCS1v15(), hashes.SHA256()
@@ -152,17 +317,20 @@ def sign_request(
     return headers
 
 
-def _fetch_public_key(actor_url: str) -> str | None:
+def _fetch_public_key(actor_url: str, *, fresh: bool = False) -> str | None:
     """
     Fetch the public key PEM from a remote actor and update cache.
 
+    With `fresh`, the actor document is asked of the peer even when the
+    remote document cache holds a copy (the key in that copy just failed).
+
     Returns:
         The public key PEM string, or None on failure.
     """
     from ._http import fetch_ap_actor
     from .models import PublicKeyCache
 
-    actor = fetch_ap_actor(actor_url)
+    actor = fetch_ap_actor(actor_url, fresh=fresh)
     if actor is None:
         return None
 
@@ -175,6 +343,8 @@ def _fetch_public_key(actor_url: str) -> str | None:
         actor_url=actor_url,
         defaults={"public_key_pem": pem},
     )
+    invalidate_cached_key(actor_url)
+    _actor_pems.put(actor_url, pem)
     return pem
 
 
@@ -192,19 +362,12 @@ def _build_signing_string(request: HttpRequest, signed_headers: list[str]) -> st
     return "\n".join(parts)
 
 
-def _verify_with_key(public_key_pem: str, signature_b64: str, signing_string: str) -> bool:
+def _verify_with_key(
+    public_key_pem: str, signature_b64: str, signing_string: str, key_id: str = ""
+) -> bool:
     """Verify a signature against a public key. Returns True if valid."""
     try:
-        # Cast to RSAPublicKey since we only support RSA keys (DEC-018)
-        from typing import cast
-
-        public_key = cast(
-            RSAPublicKey,
-            serialization.load_pem_public_key(
-                public_key_pem.encode("utf-8"),
-                backend=default_backend(),
-            ),
-        )
+        public_key = load_public_key(public_key_pem, key_id)
         public_key.verify(
             base64.b64decode(signature_b64),
             signing_string.encode("utf-8"),
@@ -229,8 +392,6 @@ def verify_signature(request: HttpRequest) -> tuple[bool, str | None]:
     Returns:
         Tuple of (is_valid, key_id or error message)
     """
-    from .models import PublicKeyCache
-
     signature_header = request.headers.get("Signature")
     if not signature_header:
         return False, "No Signature header"
@@ -300,27 +461,38 @@ def verify_signature(request: HttpRequest) -> tuple[bool, str | None]:
     actor_url = key_id.split("#")[0]
     signing_string = _build_signing_string(request, signed_headers)
 
-    # Try cached key first
-    cached = PublicKeyCache.objects.filter(actor_url=actor_url).first()
-    if cached:
-        if _verify_with_key(cached.public_key_pem, signature_b64, signing_string):
+    # Try cached key first (process memory, then PublicKeyCache)
+    cached_pem = _actor_public_key_pem(actor_url)
+    if cached_pem:
+        if _verify_with_key(cached_pem, signature_b64, signing_string, key_id):
             return True, key_id
 
         # Cached key failed — re-fetch once
         logger.info("Cached key failed for %s, re-fetching", actor_url)
-        fresh_pem = _fetch_public_key(actor_url)
-        if fresh_pem and _verify_with_key(fresh_pem, signature_b64, signing_string):
+        fresh_pem = _fetch_public_key(actor_url, fresh=True)
+        if fresh_pem and _verify_with_key(fresh_pem, signature_b64, signing_string, key_id):
             return True, key_id
 
         logger.warning("Signature invalid after key re-fetch for %s", actor_url)
         return False, f"Verification failed for {actor_url}"
 
-    # No cached key — fetch
+    # No cached key — fetch (possibly served by the remote document cache)
     pem = _fetch_public_key(actor_url)
     if not pem:
         return False, f"Could not fetch actor: {actor_url}"
 
-    if _verify_with_key(pem, signature_b64, signing_string):
+    if _verify_with_key(pem, signature_b64, signing_string, key_id):
+        return True, key_id
+
+    # The actor document may be a stale cached copy from before a key
+    # rotation — ask the peer once (conditionally) before rejecting.
+    logger.info("Fetched key failed for %s, re-fetching fresh", actor_url)
+    fresh_pem = _fetch_public_key(actor_url, fresh=True)
+    if (
+        fresh_pem
+        and fresh_pem != pem
+        and _verify_with_key(fresh_pem, signature_b64, signing_string, key_id)
+    ):
         return True, key_id
 
     logger.warning("Signature invalid for %s (first fetch)", actor_url)
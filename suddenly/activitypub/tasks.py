@@ -6,12 +6,14 @@ from __future__ import annotations
 
 import logging
 from collections.abc import Callable
-from datetime import timedelta
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from celery import shared_task
 from django.utils import timezone
 
+if TYPE_CHECKING:
+    from .signatures import EncodedBody
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,6 +22,61 @@ logger = logging.getLogger(__name__)
 # =================================================================
 
 
+def _post_activity(
+    body: EncodedBody,
+    inbox_url: str,
+    actor_key_id: str | None,
+    private_key_pem: str | None,
+) -> Any:
+    """Sign (when keys are given) and POST an encoded activity over the pooled client.
+
+    `body` comes from ``encode_body``, called once per activity: its bytes and
+    ``Digest`` are shared by every recipient, only the signature (which covers
+    the target, host and date) is computed per inbox.
+
+    Returns the `httpx.Response`; network errors propagate as
+    `httpx.RequestError` for the caller's retry policy.
+    """
+    from ._http import get_delivery_client
+    from .signatures import sign_request
+
+    headers = {
+        # POST-to-inbox requires the profiled ld+json content type (08-activitypub);
+        # Content-Type is not among the signed headers, so this is signature-safe.
+        "Content-Type": 'application/ld+json; profile="https://www.w3.org/ns/activitystreams"',
+        "Accept": "application/activity+json",
+    }
+
+    if actor_key_id and private_key_pem:
+        headers = sign_request(
+            method="POST",
+            url=inbox_url,
+            headers=headers,
+            body=body,
+            key_id=actor_key_id,
+            private_key_pem=private_key_pem,
+        )
+
+    return get_delivery_client().post(inbox_url, content=body.content, headers=headers)
+
+
+def _load_outbound(outbound_id: str) -> tuple[EncodedBody, str | None, str | None] | None:
+    """Encoded body and signing keys of a stored activity; None if it cannot be sent."""
+    from .models import OutboundActivity
+    from .outbound import signing_keys
+    from .signatures import encode_body
+
+    outbound = OutboundActivity.objects.filter(pk=outbound_id).first()
+    if outbound is None:
+        logger.warning("Outbound activity %s no longer stored; delivery dropped", outbound_id)
+        return None
+    keys = signing_keys(outbound.signer_key_id)
+    if keys is None:
+        logger.warning("Signer of outbound activity %s is gone; delivery dropped", outbound_id)
+        return None
+    return encode_body(outbound.activity), keys[0], keys[1]
+
+
 @shared_task(  # type: ignore[untyped-decorator]
     bind=True,
     max_retries=5,
@@ -30,75 +87,198 @@ logger = logging.getLogger(__name__)
 )
 def deliver_activity(
     self: Any,
-    activity: dict[str, Any],
-    inbox_url: str,
-    actor_key_id: str | None = None,
-    private_key_pem: str | None = None,
+    outbound_id: str | None = None,
+    inbox_url: str = "",
     **kwargs: Any,
 ) -> None:
-    """Deliver a signed activity to a remote inbox.
+    """Deliver a stored activity to a remote inbox.
 
+    The message only carries the ``OutboundActivity`` id and the inbox: the
+    body and the signer's key are read from the database (``outbound.py``).
     Signs outgoing requests with HTTP Signatures (DEC-018).
-    Falls back to unsigned if no key provided (dev mode).
-    """
-    import json as json_module
+    Falls back to unsigned if the signer has no key (dev mode).
 
+    The outcome feeds the instance's delivery health (``delivery_health``):
+    while its circuit is open the delivery is parked rather than attempted,
+    and a failure that opens the circuit parks instead of retrying.
+    """
     import httpx
 
-    from .signatures import sign_request
+    from .delivery_health import (
+        claim_delivery,
+        delivery_domain,
+        park_delivery,
+        record_delivery_results,
+    )
 
-    try:
-        headers = {
-            # POST-to-inbox requires the profiled ld+json content type (08-activitypub);
-            # Content-Type is not among the signed headers, so this is signature-safe.
-            "Content-Type": 'application/ld+json; profile="https://www.w3.org/ns/activitystreams"',
-            "Accept": "application/activity+json",
-        }
-
-        # Sign request (pass dict — sign_request calls json.dumps internally)
-        if actor_key_id and private_key_pem:
-            headers = sign_request(
-                method="POST",
-                url=inbox_url,
-                headers=headers,
-                body=activity,
-                key_id=actor_key_id,
-                private_key_pem=private_key_pem,
-            )
+    if outbound_id is None and "activity" in kwargs:
+        # Message queued before the outbound store existed: store it now.
+        from .outbound import store_activity
+
+        outbound_id = store_activity(kwargs["activity"], kwargs.get("actor_key_id"))
+    if not outbound_id or not inbox_url:
+        return
 
-        body = json_module.dumps(activity).encode()
+    domain = delivery_domain(inbox_url)
+    if not claim_delivery(domain):
+        park_delivery(domain, outbound_id, inbox_url)
+        return
 
-        with httpx.Client(timeout=30) as client:
-            response = client.post(inbox_url, content=body, headers=headers)
+    loaded = _load_outbound(outbound_id)
+    if loaded is None:
+        return
+    body, actor_key_id, private_key_pem = loaded
+
+    try:
+        response = _post_activity(body, inbox_url, actor_key_id, private_key_pem)
+    except httpx.RequestError as e:
+        if record_delivery_results(domain, failed=1, error=f"{type(e).__name__}: {e}"):
+            park_delivery(domain, outbound_id, inbox_url)
+            return
+        raise self.retry(exc=e, countdown=2**self.request.retries * 60) from e
 
-        if response.status_code == 410:
-            # Gone: actor/inbox permanently removed. Log and stop retrying.
-            # Proper unfederate (actor removal) is handled by a separate task.
-            logger.warning("AP delivery 410 Gone: %s", inbox_url)
+    if response.status_code >= 500:
+        # Transient server error: retry with exponential backoff.
+        if record_delivery_results(domain, failed=1, error=f"HTTP {response.status_code}"):
+            park_delivery(domain, outbound_id, inbox_url)
             return
+        raise self.retry(countdown=2**self.request.retries * 60)
+
+    # Any answer below 500 means the instance is up, whatever it thinks of
+    # this particular activity.
+    record_delivery_results(domain, succeeded=1)
+
+    if response.status_code == 410:
+        # Gone: actor/inbox permanently removed. Log and stop retrying.
+        # Proper unfederate (actor removal) is handled by a separate task.
+        logger.warning("AP delivery 410 Gone: %s", inbox_url)
+        return
+
+    if 400 <= response.status_code < 500:
+        # Permanent client error: retrying will not help.
+        logger.warning("AP permanent delivery failure %s -> %s", inbox_url, response.status_code)
+
+
+@shared_task(  # type: ignore[untyped-decorator]
+    acks_late=True,
+    reject_on_worker_lost=True,
+    soft_time_limit=540,
+    time_limit=600,
+)
+def deliver_activity_batch(outbound_id: str, inbox_urls: list[str]) -> None:
+    """Deliver one stored activity to several inboxes on the same host.
+
+    Queued by ``broadcast_activity``: every inbox in `inbox_urls` shares one
+    host, so the posts reuse the pooled client's keep-alive connection, and
+    the body is loaded and encoded once for the whole batch. A transient
+    failure (5xx, network error) hands that single inbox over to
+    ``deliver_activity``, which owns the retry/backoff policy; 4xx/410 are
+    dropped exactly as there. A network error means the host is unreachable:
+    the inboxes not yet attempted are handed over the same way. When the
+    host's circuit is (or becomes) open, the whole remainder is parked.
+
+    A slow host can make the batch outlive its soft time limit (50 inboxes
+    at a 30 s timeout each): the inboxes not yet delivered are then queued
+    again as a new batch rather than lost when the task is killed.
+    """
+    import httpx
+    from celery.exceptions import SoftTimeLimitExceeded
 
-        if 400 <= response.status_code < 500:
-            # Permanent client error: retrying will not help.
+    from .delivery_health import (
+        claim_delivery,
+        delivery_domain,
+        park_delivery,
+        record_delivery_results,
+    )
+
+    if not inbox_urls:
+        return
+    domain = delivery_domain(inbox_urls[0])
+    if not claim_delivery(domain):
+        park_delivery(domain, outbound_id, *inbox_urls)
+        return
+
+    loaded = _load_outbound(outbound_id)
+    if loaded is None:
+        return
+    body, actor_key_id, private_key_pem = loaded
+
+    succeeded = 0
+    failed: list[str] = []
+    unsent: list[str] = []
+    error = ""
+    for index, inbox_url in enumerate(inbox_urls):
+        try:
+            response = _post_activity(body, inbox_url, actor_key_id, private_key_pem)
+        except httpx.RequestError as e:
+            failed.extend(inbox_urls[index:])
+            error = f"{type(e).__name__}: {e}"
+            break
+        except SoftTimeLimitExceeded:
+            # The interrupted post may or may not have landed: send it again,
+            # inboxes deduplicate on the activity id.
+            unsent = inbox_urls[index:]
+            logger.warning("AP batch to %s out of time, %d inboxes requeued", domain, len(unsent))
+            break
+
+        if response.status_code >= 500:
+            failed.append(inbox_url)
+            error = f"HTTP {response.status_code}"
+            continue
+        succeeded += 1
+        if response.status_code >= 400:
             logger.warning(
                 "AP permanent delivery failure %s -> %s", inbox_url, response.status_code
             )
-            return
 
-        if response.status_code >= 500:
-            # Transient server error: retry with exponential backoff.
-            raise self.retry(countdown=2**self.request.retries * 60)
+    circuit_open = record_delivery_results(
+        domain, succeeded=succeeded, failed=len(failed), error=error
+    )
+    if circuit_open:
+        park_delivery(domain, outbound_id, *failed, *unsent)
+        return
+    if unsent:
+        deliver_activity_batch.delay(outbound_id=outbound_id, inbox_urls=unsent)
+    for inbox_url in failed:
+        # Stays on the fan-out queue: a broadcast's retries must not crowd
+        # out interactive deliveries.
+        deliver_activity.apply_async(
+            kwargs={"outbound_id": outbound_id, "inbox_url": inbox_url},
+            countdown=60,
+            queue="fanout",
+        )
+
+
+def _group_inboxes_by_host(inbox_urls: set[str], batch_size: int) -> list[list[str]]:
+    """Split inbox URLs into per-host batches of at most `batch_size`."""
+    from urllib.parse import urlparse
 
-    except httpx.RequestError as e:
-        raise self.retry(exc=e, countdown=2**self.request.retries * 60) from e
+    by_host: dict[str, list[str]] = {}
+    for inbox_url in sorted(inbox_urls):
+        by_host.setdefault(urlparse(inbox_url).netloc, []).append(inbox_url)
+
+    batches: list[list[str]] = []
+    for urls in by_host.values():
+        for start in range(0, len(urls), batch_size):
+            batches.append(urls[start : start + batch_size])
+    return batches
 
 
 @shared_task  # type: ignore[untyped-decorator]
 def broadcast_activity(activity: dict[str, Any], actor_id: str, actor_type: str) -> None:
-    """Broadcast an activity to all followers."""
+    """Broadcast an activity to all followers.
+
+    Followers on the same instance collapse onto its shared inbox when one is
+    advertised; the remaining inboxes are grouped by host into
+    ``deliver_activity_batch`` tasks (one task per host batch, not per inbox),
+    all pointing at a single stored copy of the activity.
+    """
+    from django.conf import settings
+
     from suddenly.characters.models import Follow
     from suddenly.core.utils import actor_model_for, content_type_for_actor
 
-    from ._http import sign_and_deliver
+    from .outbound import store_signed_activity
 
     try:
         content_type = content_type_for_actor(actor_type)
@@ -106,16 +286,25 @@ def broadcast_activity(activity: dict[str, Any], actor_id: str, actor_type: str)
     except ValueError:
         return
 
-    followers = Follow.objects.filter(content_type=content_type, object_id=actor_id).select_related(
-        "follower"
+    followers = Follow.objects.filter(content_type=content_type, object_id=actor_id).values_list(
+        "follower__shared_inbox_url", "follower__inbox_url"
     )
 
     actor_obj = ActorModel._default_manager.filter(pk=actor_id).first()
 
-    inboxes = {f.follower.inbox_url for f in followers if f.follower.inbox_url}
+    inboxes: set[str] = set()
+    for shared, inbox in followers:
+        target = shared or inbox
+        if target:
+            inboxes.add(target)
+    if not inboxes:
+        return
 
-    for inbox_url in inboxes:
-        sign_and_deliver(activity, inbox_url, signer=actor_obj)
+    # Stored once; every host batch only carries its id.
+    outbound_id = store_signed_activity(activity, actor_obj)
+    batch_size = int(getattr(settings, "AP_DELIVERY_BATCH_SIZE", 50))
+    for batch in _group_inboxes_by_host(inboxes, batch_size):
+        deliver_activity_batch.delay(outbound_id=outbound_id, inbox_urls=batch)
 
 
 @shared_task  # type: ignore[untyped-decorator]
@@ -173,7 +362,7 @@ def send_offer_activity(link_request_id: str) -> None:
     from suddenly.characters.models import LinkRequest
 
     from ._http import sign_and_deliver
-    from .models import FederatedServer
+    from .domains import is_known_non_suddenly_domain
     from .serializers import serialize_link_request
 
     request = (
@@ -196,15 +385,14 @@ def send_offer_activity(link_request_id: str) -> None:
     # AS2 extensions (suddenly:* namespace, DEC-038) a non-Suddenly instance
     # cannot interpret (08-activitypub.md "Never send Suddenly-only
     # activities to non-Suddenly instances"). Resolve the target inbox's
-    # FederatedServer by domain (same lookup as inbox.py's rate limiter) and
-    # skip only when it is a KNOWN non-Suddenly instance. An instance with
+    # domain in the federation domain registry (domains.py) and skip only
+    # when it is a KNOWN non-Suddenly instance. An instance with
     # no FederatedServer row (never NodeInfo-probed) is NOT blocked here —
     # blocking on "unknown" would prevent first contact with any instance
     # entirely, since a FederatedServer row only exists after a prior
     # WebFinger/NodeInfo discovery.
     domain = urlparse(creator.inbox_url).netloc
-    server = FederatedServer.objects.filter(server_name=domain).first()
-    if server is not None and not server.is_suddenly_instance():
+    if is_known_non_suddenly_domain(domain):
         logger.info("Skipping Offer delivery to non-Suddenly instance: %s", domain)
         return
 
@@ -364,6 +552,97 @@ def send_reject_activity(link_request_id: str) -> None:
     _send_link_response(link_request_id, create_reject_activity)
 
 
+# =================================================================
+# Incoming activities (AP_INBOX_ASYNC)
+# =================================================================
+
+
+@shared_task(  # type: ignore[untyped-decorator]
+    bind=True,
+    max_retries=5,
+    acks_late=True,
+    reject_on_worker_lost=True,
+    soft_time_limit=120,
+    time_limit=150,
+)
+def process_inbound_activity(self: Any, inbound_id: str) -> None:
+    """Run the inbox handler for a queued :class:`InboundActivity`.
+
+    A domain at its concurrency cap is retried shortly without counting as a
+    failure; a handler error is retried with the ``deliver_activity`` backoff.
+    """
+    from .inbox_queue import InboundDomainBusyError, run_inbound_activity
+
+    try:
+        run_inbound_activity(inbound_id)
+    except InboundDomainBusyError as e:
+        raise self.retry(exc=e, countdown=5, max_retries=None) from e
+    except Exception as e:
+        raise self.retry(exc=e, countdown=2**self.request.retries * 60) from e
+
+
+@shared_task  # type: ignore[untyped-decorator]
+def requeue_inbound_activities() -> None:
+    """Re-enqueue queued activities whose task was lost (broker down, worker killed)."""
+    from .inbox_queue import due_inbound_ids
+
+    for inbound_id in due_inbound_ids(500):
+        process_inbound_activity.delay(str(inbound_id))
+
+
+@shared_task  # type: ignore[untyped-decorator]
+def purge_processed_activities() -> int:
+    """Drop inbox dedup rows past ``AP_DEDUP_RETENTION_DAYS``, in chunks."""
+    from .dedup import purge_processed_activities as purge
+
+    return purge()
+
+
+@shared_task  # type: ignore[untyped-decorator]
+def purge_outbound_activities() -> int:
+    """Drop stored outgoing activities past ``AP_OUTBOUND_RETENTION_DAYS``, in chunks."""
+    from .outbound import purge_outbound_activities as purge
+
+    return purge()
+
+
+@shared_task  # type: ignore[untyped-decorator]
+def replay_parked_deliveries(domain: str) -> int:
+    """Re-queue deliveries parked while `domain`'s circuit was open."""
+    from .delivery_health import replay_parked_deliveries as replay
+
+    return replay(domain)
+
+
+@shared_task  # type: ignore[untyped-decorator]
+def probe_open_circuits() -> int:
+    """Send one parked delivery to each open-circuit instance whose cooldown is over."""
+    from .delivery_health import probe_open_circuits as probe
+
+    return probe()
+
+
+@shared_task  # type: ignore[untyped-decorator]
+def crawl_nodeinfo() -> dict[str, int]:
+    """Register newly seen domains and refresh due ``FederatedServer`` NodeInfo."""
+    from .nodeinfo import crawl_nodeinfo as crawl
+
+    return crawl()
+
+
+# =================================================================
+# Key pool
+# =================================================================
+
+
+@shared_task  # type: ignore[untyped-decorator]
+def refill_key_pool() -> int:
+    """Top the pre-generated RSA key pool back up to ``AP_KEY_POOL_SIZE``."""
+    from .keypool import fill_key_pool
+
+    return fill_key_pool()
+
+
 # =================================================================
 # Periodic tasks
 # =================================================================
@@ -575,16 +854,18 @@ def expire_stale_link_requests() -> None:
 
 
 @shared_task  # type: ignore[untyped-decorator]
-def refresh_remote_actors() -> None:
-    """Refresh stale remote actors."""
-    from suddenly.users.models import User
+def refresh_remote_actors() -> dict[str, int]:
+    """Refresh stale remote actor mirrors (users, games, characters) in batches.
 
-    stale = User.objects.filter(remote=True, updated_at__lt=timezone.now() - timedelta(hours=24))[
-        :100
-    ]
+    When the run's time budget left due mirrors behind, a follow-up run is
+    queued right away instead of waiting for the next beat.
+    """
+    from .actor_refresh import refresh_remote_actors as refresh
 
-    for user in stale:
-        fetch_remote_actor.delay(user.ap_id)
+    stats = refresh()
+    if stats["backlog"]:
+        refresh_remote_actors.apply_async(countdown=5)
+    return stats
 
 
 @shared_task  # type: ignore[untyped-decorator]
@@ -636,8 +917,11 @@ def update_remote_user(actor_url: str, data: dict[str, Any]) -> None:
     """Update remote user from AP data."""
     from suddenly.users.models import User
 
+    from ._http import shared_inbox_from_actor
+
     User.objects.filter(ap_id=actor_url).update(
         inbox_url=data.get("inbox"),
+        shared_inbox_url=shared_inbox_from_actor(data),
         outbox_url=data.get("outbox"),
         display_name=data.get("name", "")[:100],
         bio=data.get("summary", ""),
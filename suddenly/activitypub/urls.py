@@ -7,6 +7,8 @@ from django.urls import path
 from . import inbox, views
 
 urlpatterns = [
+    # Instance-wide shared inbox (advertised as endpoints.sharedInbox)
+    path("inbox", inbox.shared_inbox, name="shared-inbox"),
     # User actors
     path("users/<str:username>", views.user_actor, name="user-actor"),
     path("users/<str:username>/inbox", inbox.user_inbox, name="user-inbox"),
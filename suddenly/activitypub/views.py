@@ -5,9 +5,11 @@ ActivityPub views for federation discovery and actors.
 from __future__ import annotations
 
 import re
+from collections.abc import Callable, Sequence
 from typing import Any
 
 from django.conf import settings
+from django.db.models import QuerySet
 from django.http import (
     HttpRequest,
     HttpResponse,
@@ -23,10 +25,18 @@ from suddenly.core.version import get_available_languages, get_version
 from suddenly.games.models import Game, Report
 from suddenly.users.models import User
 
+from .document_cache import (
+    actor_document_key,
+    document_response,
+    get_document,
+    outbox_page_key,
+    user_outbox_page_key,
+)
+from .paging import InvalidCursorError, is_first_page_request, paged_collection
 from .serializers import (
     serialize_character,
     serialize_game,
-    serialize_report,
+    serialize_reports,
     serialize_user,
 )
 
@@ -41,9 +51,44 @@ def is_activitypub_request(request: HttpRequest) -> bool:
     return "application/activity+json" in accept or "application/ld+json" in accept
 
 
-def activitypub_response(data: dict[str, Any], status: int = 200) -> JsonResponse:
-    """Return an ActivityPub JSON-LD response."""
-    return JsonResponse(data, content_type="application/activity+json", status=status)
+def cached_document_response(
+    request: HttpRequest,
+    key: str | None,
+    build: Callable[[], dict[str, Any] | None],
+    not_found: str,
+) -> HttpResponse:
+    """Serve an ActivityPub document through the rendered-JSON cache.
+
+    `build` returns None for a missing object (404). With `key` None the
+    document is rendered on every request but still carries an ETag.
+    """
+    try:
+        document = get_document(key, build)
+    except InvalidCursorError:
+        return HttpResponseBadRequest("Invalid cursor")
+    if document is None:
+        return HttpResponseNotFound(not_found)
+    return document_response(request, document)
+
+
+def collection_response(
+    request: HttpRequest,
+    collection_id: str,
+    queryset: QuerySet[Any],
+    order_field: str,
+    serialize_page: Callable[[Sequence[Any]], list[Any]],
+) -> HttpResponse:
+    """Serve a paged actor collection (root or page, see ``paging``), uncached."""
+    return cached_document_response(
+        request,
+        None,
+        lambda: paged_collection(request, collection_id, queryset, order_field, serialize_page),
+        "",
+    )
+
+
+def _follower_urls(follows: Sequence[Any]) -> list[str]:
+    return [f.follower.actor_url for f in follows]
 
 
 # =================================================================
@@ -191,20 +236,24 @@ def user_actor(request: HttpRequest, username: str) -> HttpResponse:
 
     GET /users/{username}
     """
-    try:
-        user = User.objects.get(username=username, remote=False)
-    except User.DoesNotExist:
-        return HttpResponseNotFound("User not found")
-
     # Content negotiation: HTML vs ActivityPub
     if not is_activitypub_request(request):
+        if not User.objects.filter(username=username, remote=False).exists():
+            return HttpResponseNotFound("User not found")
+
         # Redirect to profile page for browsers
         from django.shortcuts import redirect
 
         response: HttpResponseRedirect = redirect(f"/@{username}")
         return response
 
-    return activitypub_response(serialize_user(user))
+    def build() -> dict[str, Any] | None:
+        user = User.objects.filter(username=username, remote=False).first()
+        return serialize_user(user) if user else None
+
+    return cached_document_response(
+        request, actor_document_key("user", username), build, "User not found"
+    )
 
 
 @require_GET
@@ -214,28 +263,21 @@ def user_outbox(request: HttpRequest, username: str) -> HttpResponse:
 
     GET /users/{username}/outbox
     """
-    try:
-        user = User.objects.get(username=username, remote=False)
-    except User.DoesNotExist:
-        return HttpResponseNotFound("User not found")
 
-    # Get user's public activities (reports). totalItems must count the whole
-    # collection, not the sliced page — .count() on a [:20] queryset caps at 20.
-    reports_qs = Report.objects.filter(author=user, status="published", game__is_public=True)
-    total = reports_qs.count()
-    reports = reports_qs.order_by("-published_at")[:20]
+    def build() -> dict[str, Any] | None:
+        user = User.objects.filter(username=username, remote=False).first()
+        if user is None:
+            return None
+        # User's public activities (reports), paged on (published_at, id).
+        reports_qs = Report.objects.filter(
+            author=user, status="published", game__is_public=True, published_at__isnull=False
+        ).select_related("author", "game")
+        return paged_collection(
+            request, f"{user.actor_url}/outbox", reports_qs, "published_at", serialize_reports
+        )
 
-    items = [serialize_report(r) for r in reports]
-
-    return activitypub_response(
-        {
-            "@context": "https://www.w3.org/ns/activitystreams",
-            "type": "OrderedCollection",
-            "id": f"{user.actor_url}/outbox",
-            "totalItems": total,
-            "orderedItems": items,
-        }
-    )
+    key = user_outbox_page_key(username) if is_first_page_request(request) else None
+    return cached_document_response(request, key, build, "User not found")
 
 
 @require_GET
@@ -255,14 +297,8 @@ def user_followers(request: HttpRequest, username: str) -> HttpResponse:
         "follower"
     )
 
-    return activitypub_response(
-        {
-            "@context": "https://www.w3.org/ns/activitystreams",
-            "type": "OrderedCollection",
-            "id": f"{user.actor_url}/followers",
-            "totalItems": followers.count(),
-            "orderedItems": [f.follower.actor_url for f in followers],
-        }
+    return collection_response(
+        request, f"{user.actor_url}/followers", followers, "created_at", _follower_urls
     )
 
 
@@ -284,14 +320,12 @@ def user_following(request: HttpRequest, username: str) -> HttpResponse:
 
     following = Follow.objects.filter(follower=user).prefetch_related("target")
 
-    return activitypub_response(
-        {
-            "@context": "https://www.w3.org/ns/activitystreams",
-            "type": "OrderedCollection",
-            "id": f"{user.actor_url}/following",
-            "totalItems": following.count(),
-            "orderedItems": [f.target.actor_url for f in following if f.target is not None],
-        }
+    return collection_response(
+        request,
+        f"{user.actor_url}/following",
+        following,
+        "created_at",
+        lambda follows: [f.target.actor_url for f in follows if f.target is not None],
     )
 
 
@@ -303,42 +337,45 @@ def user_following(request: HttpRequest, username: str) -> HttpResponse:
 @require_GET
 def game_actor(request: HttpRequest, game_id: str) -> HttpResponse:
     """Game actor endpoint."""
-    try:
-        game = Game.objects.get(id=game_id, remote=False, is_public=True)
-    except Game.DoesNotExist:
-        return HttpResponseNotFound("Game not found")
-
     if not is_activitypub_request(request):
+        if not Game.objects.filter(id=game_id, remote=False, is_public=True).exists():
+            return HttpResponseNotFound("Game not found")
+
         from django.shortcuts import redirect
 
         response: HttpResponseRedirect = redirect(f"/games/{game_id}")
         return response
 
-    return activitypub_response(serialize_game(game))
+    def build() -> dict[str, Any] | None:
+        game = (
+            Game.objects.filter(id=game_id, remote=False, is_public=True)
+            .select_related("owner")
+            .first()
+        )
+        return serialize_game(game) if game else None
+
+    return cached_document_response(
+        request, actor_document_key("game", game_id), build, "Game not found"
+    )
 
 
 @require_GET
 def game_outbox(request: HttpRequest, game_id: str) -> HttpResponse:
     """Game outbox endpoint."""
-    try:
-        game = Game.objects.get(id=game_id, remote=False, is_public=True)
-    except Game.DoesNotExist:
-        return HttpResponseNotFound("Game not found")
 
-    reports_qs = game.reports.filter(status="published")
-    total = reports_qs.count()  # whole collection, not the sliced page
-    reports = reports_qs.order_by("-published_at")[:20]
-    items = [serialize_report(r) for r in reports]
+    def build() -> dict[str, Any] | None:
+        game = Game.objects.filter(id=game_id, remote=False, is_public=True).first()
+        if game is None:
+            return None
+        reports_qs = game.reports.filter(
+            status="published", published_at__isnull=False
+        ).select_related("author", "game")
+        return paged_collection(
+            request, f"{game.actor_url}/outbox", reports_qs, "published_at", serialize_reports
+        )
 
-    return activitypub_response(
-        {
-            "@context": "https://www.w3.org/ns/activitystreams",
-            "type": "OrderedCollection",
-            "id": f"{game.actor_url}/outbox",
-            "totalItems": total,
-            "orderedItems": items,
-        }
-    )
+    key = outbox_page_key("game", game_id) if is_first_page_request(request) else None
+    return cached_document_response(request, key, build, "Game not found")
 
 
 @require_GET
@@ -363,14 +400,8 @@ def game_followers(request: HttpRequest, game_id: str) -> HttpResponse:
         "follower"
     )
 
-    return activitypub_response(
-        {
-            "@context": "https://www.w3.org/ns/activitystreams",
-            "type": "OrderedCollection",
-            "id": f"{game.actor_url}/followers",
-            "totalItems": followers.count(),
-            "orderedItems": [f.follower.actor_url for f in followers],
-        }
+    return collection_response(
+        request, f"{game.actor_url}/followers", followers, "created_at", _follower_urls
     )
 
 
@@ -382,18 +413,26 @@ def game_followers(request: HttpRequest, game_id: str) -> HttpResponse:
 @require_GET
 def character_actor(request: HttpRequest, character_id: str) -> HttpResponse:
     """Character actor endpoint."""
-    try:
-        character = Character.objects.get(id=character_id, remote=False)
-    except Character.DoesNotExist:
-        return HttpResponseNotFound("Character not found")
-
     if not is_activitypub_request(request):
+        if not Character.objects.filter(id=character_id, remote=False).exists():
+            return HttpResponseNotFound("Character not found")
+
         from django.shortcuts import redirect
 
         response: HttpResponseRedirect = redirect(f"/characters/{character_id}")
         return response
 
-    return activitypub_response(serialize_character(character))
+    def build() -> dict[str, Any] | None:
+        character = (
+            Character.objects.filter(id=character_id, remote=False)
+            .select_related("origin_game", "owner", "creator", "parent")
+            .first()
+        )
+        return serialize_character(character) if character else None
+
+    return cached_document_response(
+        request, actor_document_key("character", character_id), build, "Character not found"
+    )
 
 
 @require_GET
@@ -404,14 +443,12 @@ def character_outbox(request: HttpRequest, character_id: str) -> HttpResponse:
     except Character.DoesNotExist:
         return HttpResponseNotFound("Character not found")
 
-    return activitypub_response(
-        {
-            "@context": "https://www.w3.org/ns/activitystreams",
-            "type": "OrderedCollection",
-            "id": f"{character.actor_url}/outbox",
-            "totalItems": 0,
-            "orderedItems": [],
-        }
+    return collection_response(
+        request,
+        f"{character.actor_url}/outbox",
+        Report.objects.none(),
+        "published_at",
+        lambda reports: [],
     )
 
 
@@ -437,12 +474,6 @@ def character_followers(request: HttpRequest, character_id: str) -> HttpResponse
         content_type=character_ct, object_id=character.id
     ).select_related("follower")
 
-    return activitypub_response(
-        {
-            "@context": "https://www.w3.org/ns/activitystreams",
-            "type": "OrderedCollection",
-            "id": f"{character.actor_url}/followers",
-            "totalItems": followers.count(),
-            "orderedItems": [f.follower.actor_url for f in followers],
-        }
+    return collection_response(
+        request, f"{character.actor_url}/followers", followers, "created_at", _follower_urls
     )
@@ -9,7 +9,9 @@ from celery import Celery
 # Set the default Django settings module
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.development")
 
-app = Celery("suddenly")
+# QueueAwareTask sends task calls to the database queue instead of the broker
+# when TASK_QUEUE_BACKEND is "database" (suddenly/core/task_queue.py).
+app = Celery("suddenly", task_cls="suddenly.core.task_queue:QueueAwareTask")
 
 # Load config from Django settings
 app.config_from_object("django.conf:settings", namespace="CELERY")
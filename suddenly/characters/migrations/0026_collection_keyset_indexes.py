@@ -0,0 +1,28 @@
+# Generated by Django 5.0.14 on 2026-10-16 23:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("characters", "0025_character_is_archived_and_more"),
+        ("contenttypes", "0002_remove_content_type_name"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="follow",
+            index=models.Index(
+                fields=["content_type", "object_id", "created_at"],
+                name="characters__content_c9c3a5_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="follow",
+            index=models.Index(
+                fields=["follower", "created_at"], name="characters__followe_fb9a37_idx"
+            ),
+        ),
+    ]
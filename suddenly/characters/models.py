@@ -601,6 +601,9 @@ class Follow(BaseModel):
         indexes = [
             models.Index(fields=["content_type", "object_id"]),
             models.Index(fields=["follower"]),
+            # Keyset pages of the followers/following collections (activitypub.paging).
+            models.Index(fields=["content_type", "object_id", "created_at"]),
+            models.Index(fields=["follower", "created_at"]),
         ]
 
     def __str__(self) -> str:
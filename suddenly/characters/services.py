@@ -17,6 +17,7 @@ from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from suddenly.core.models import Notification, NotificationType
+from suddenly.core.services import NotificationService
 from suddenly.games.models import Game
 from suddenly.users.models import User
 
@@ -521,21 +522,18 @@ class LinkService:
         if not recipients:
             return
 
-        ct = ContentType.objects.get_for_model(SharedSequence)
         message = (
             f"La séquence « {sequence.title} » a été publiée"
             if sequence.title
             else "Une séquence partagée a été publiée"
         )
-        for recipient in recipients:
-            Notification.objects.create(
-                recipient=recipient,
-                type=NotificationType.SHARED_SEQUENCE,
-                actor=actor,
-                target_content_type=ct,
-                target_object_id=sequence.pk,
-                message=message,
-            )
+        NotificationService.fan_out(
+            recipients,
+            notification_type=NotificationType.SHARED_SEQUENCE,
+            actor=actor,
+            target=sequence,
+            message=message,
+        )
 
     @classmethod
     @transaction.atomic
@@ -9,6 +9,7 @@ from suddenly.core.models import (
     DonationPrompt,
     Notification,
     NotificationPreference,
+    QueuedTask,
     Tag,
     UserBlock,
     UserMute,
@@ -91,3 +92,12 @@ class UserUsageStatsAdmin(admin.ModelAdmin):  # type: ignore[type-arg]
     list_display = ["user", "total_posts", "posts_since_last_prompt", "last_donation_date"]
     search_fields = ["user__username"]
     readonly_fields = ["created_at", "updated_at"]
+
+
+@admin.register(QueuedTask)
+class QueuedTaskAdmin(admin.ModelAdmin):  # type: ignore[type-arg]
+    list_display = ["task_name", "status", "retries", "available_at", "created_at"]
+    list_filter = ["status", "task_name"]
+    search_fields = ["task_name", "last_error"]
+    readonly_fields = ["created_at", "updated_at", "locked_at", "last_error"]
+    ordering = ["available_at"]
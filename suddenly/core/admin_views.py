@@ -9,6 +9,7 @@ from __future__ import annotations
 
 from django.conf import settings
 from django.contrib import messages
+from django.db.models import Count
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
@@ -48,8 +49,10 @@ def admin_dashboard(request: HttpRequest) -> HttpResponse:
 
 @admin_required
 def admin_instances(request: HttpRequest) -> HttpResponse:
-    """Instance management — list federated/blocked instances (US-26)."""
-    instances = FederatedServer.objects.order_by("status", "server_name")
+    """Instance management — list federated/blocked instances and delivery health (US-26)."""
+    instances = FederatedServer.objects.annotate(parked=Count("parked_deliveries")).order_by(
+        "status", "server_name"
+    )
 
     return htmx_render(
         request,
@@ -1,3 +1,5 @@
+from typing import Any
+
 from django.apps import AppConfig
 
 
@@ -16,14 +18,20 @@ class CoreConfig(AppConfig):
 
         import suddenly.core.notification_signals  # noqa: F401
         from suddenly.activitypub.models import FederatedServer
-        from suddenly.characters.models import Character
+        from suddenly.characters.models import Character, LinkRequest
         from suddenly.core.cache_invalidation import (
+            invalidate_account_badges_achievement,
+            invalidate_account_badges_direct_message,
+            invalidate_account_badges_link_request,
+            invalidate_account_badges_notification,
             invalidate_explorer_tags_character,
             invalidate_explorer_tags_game,
             invalidate_instance_stats,
             invalidate_recent_public_reports,
         )
+        from suddenly.core.models import Notification, UnlockedAchievement
         from suddenly.games.models import Game, Report
+        from suddenly.messaging.models import DirectMessage
         from suddenly.users.models import User
 
         m2m_changed.connect(
@@ -57,3 +65,20 @@ class CoreConfig(AppConfig):
                 sender=model,
                 dispatch_uid=f"suddenly.cache.invalidate_instance_stats_delete_{model._meta.label_lower}",
             )
+        badge_handlers: list[tuple[Any, Any, str]] = [
+            (Notification, invalidate_account_badges_notification, "notification"),
+            (UnlockedAchievement, invalidate_account_badges_achievement, "achievement"),
+            (LinkRequest, invalidate_account_badges_link_request, "link_request"),
+            (DirectMessage, invalidate_account_badges_direct_message, "direct_message"),
+        ]
+        for model, handler, name in badge_handlers:
+            post_save.connect(
+                handler,
+                sender=model,
+                dispatch_uid=f"suddenly.cache.invalidate_account_badges_save_{name}",
+            )
+            post_delete.connect(
+                handler,
+                sender=model,
+                dispatch_uid=f"suddenly.cache.invalidate_account_badges_delete_{name}",
+            )
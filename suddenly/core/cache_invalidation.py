@@ -40,3 +40,45 @@ def invalidate_recent_public_reports(sender: Any, **kwargs: Any) -> None:
 
 def invalidate_instance_stats(sender: Any, **kwargs: Any) -> None:
     cache.delete("instance_stats")
+
+
+def invalidate_account_badges(*user_ids: Any) -> None:
+    """Drop the cached account-menu badges of `user_ids` (``get_account_badges``).
+
+    Called directly by write paths that use ``QuerySet.update()`` (no signal):
+    mark-all-read, conversation read cursor, achievements seen.
+    """
+    from suddenly.core.services import account_badges_cache_key
+
+    cache.delete_many([account_badges_cache_key(uid) for uid in user_ids if uid is not None])
+
+
+def invalidate_account_badges_notification(sender: Any, instance: Any, **kwargs: Any) -> None:
+    invalidate_account_badges(instance.recipient_id)
+
+
+def invalidate_account_badges_achievement(sender: Any, instance: Any, **kwargs: Any) -> None:
+    invalidate_account_badges(instance.user_id)
+
+
+def invalidate_account_badges_link_request(sender: Any, instance: Any, **kwargs: Any) -> None:
+    from suddenly.characters.models import Character
+
+    creator_id = (
+        Character.objects.filter(pk=instance.target_character_id)
+        .values_list("creator_id", flat=True)
+        .first()
+    )
+    invalidate_account_badges(creator_id)
+
+
+def invalidate_account_badges_direct_message(sender: Any, instance: Any, **kwargs: Any) -> None:
+    from suddenly.messaging.models import Conversation
+
+    participants = (
+        Conversation.objects.filter(pk=instance.conversation_id)
+        .values_list("participant_low_id", "participant_high_id")
+        .first()
+    )
+    if participants:
+        invalidate_account_badges(*participants)
@@ -42,27 +42,14 @@ def account_badges(request: object) -> dict[str, object]:
 
     The base template references ``pending_requests_count`` and
     ``unread_notifications_count`` but nothing populated them. Compute them here
-    for authenticated users only (two cheap indexed counts); anonymous requests
-    get an empty dict so the badges simply don't render.
+    for authenticated users only, from the per-user cached payload
+    (``core.services.get_account_badges``); anonymous requests get an empty
+    dict so the badges simply don't render.
     """
     user = getattr(request, "user", None)
     if user is None or not user.is_authenticated:
         return {}
 
-    from suddenly.characters.models import LinkRequest, LinkRequestStatus
-    from suddenly.core.models import Notification, UnlockedAchievement
-    from suddenly.messaging.services import MessageService
+    from suddenly.core.services import get_account_badges
 
-    return {
-        "pending_requests_count": LinkRequest.objects.filter(
-            target_character__creator=user, status=LinkRequestStatus.PENDING
-        ).count(),
-        "unread_notifications_count": Notification.objects.filter(
-            recipient=user, is_read=False
-        ).count(),
-        "unread_messages_count": MessageService.unread_count(user),
-        # Newly unlocked achievements not yet seen on the Stats page (#153).
-        "new_stats_count": UnlockedAchievement.objects.filter(
-            user=user, seen_at__isnull=True
-        ).count(),
-    }
+    return dict(get_account_badges(user))
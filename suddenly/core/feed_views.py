@@ -4,33 +4,58 @@ Feed views — 3 scopes (DA-1, wireframe 10-feed.md).
 Abonnements: CRs from followed users/games
 Instance: All public local content
 Fediverse: Federated content from known instances
+
+Each scope is paged with a keyset cursor on ``(published_at, id)``: the first
+page comes with the full view, later pages are HTMX "load more" fragments
+(``?cursor=``) appended by an infinite-scroll sentinel. A page is one indexed
+range scan of ``FEED_PAGE_SIZE + 1`` rows, however deep the reader scrolls.
 """
 
 from __future__ import annotations
 
 from typing import Any
+from urllib.parse import urlencode
 
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import ValidationError
-from django.db.models import Q
-from django.http import HttpRequest, HttpResponse, HttpResponseNotFound
+from django.db.models import Q, QuerySet
+from django.http import HttpRequest, HttpResponse, HttpResponseBadRequest, HttpResponseNotFound
 from django.shortcuts import render
 from django.views.decorators.http import require_POST
 
+from suddenly.activitypub.paging import InvalidCursorError, decode_cursor, encode_cursor
 from suddenly.core.types import AuthenticatedRequest
 from suddenly.core.views import htmx_render
 from suddenly.games.models import Like, Recommendation, Report, ReportStatus
 from suddenly.games.services import annotate_viewer_reactions, build_composer_feed_context
 
+# Reports per feed page (first load and each "load more").
+FEED_PAGE_SIZE = 20
+
+# Claimable NPCs blended into the Abonnements feed, across all of its pages.
+FEED_PROMO_POOL = 6
+
 
-def interleave_promos(reports: list[Any], npcs: list[Any], every: int) -> list[dict[str, Any]]:
+def interleave_promos(
+    reports: list[Any],
+    npcs: list[Any],
+    every: int,
+    *,
+    start: int = 0,
+    complete: bool = True,
+) -> list[dict[str, Any]]:
     """Blend reports and claimable-NPC promocards into one ordered feed (SUD-P1).
 
     Produces a single ordered list of ``{"type": "report"|"promo", "obj": ...}``
     items rather than two disjoint blocks. A promocard is inserted after every
     ``every`` reports, consuming NPCs in order until they run out.
 
+    ``start`` is the number of reports shown on earlier pages: promo slots are
+    counted from the top of the whole feed, so the same NPC lands after the
+    same report whichever page it is rendered on. ``complete`` is False when
+    more pages follow.
+
     Wireframe guarantee: if the feed is non-empty but shorter than ``every``
     (so no promo would otherwise be inserted), one promo is still appended at
     the end — as long as an NPC is available.
@@ -38,26 +63,72 @@ def interleave_promos(reports: list[Any], npcs: list[Any], every: int) -> list[d
     items: list[dict[str, Any]] = []
     if every < 1:
         every = 1
-    npc_iter = iter(npcs)
     promos_inserted = 0
 
-    for index, report in enumerate(reports, start=1):
+    for index, report in enumerate(reports, start=start + 1):
         items.append({"type": "report", "obj": report})
         if index % every == 0:
-            npc = next(npc_iter, None)
-            if npc is not None:
-                items.append({"type": "promo", "obj": npc})
+            slot = index // every - 1
+            if slot < len(npcs):
+                items.append({"type": "promo", "obj": npcs[slot]})
                 promos_inserted += 1
 
     # Guarantee at least one promo on a non-empty, short feed.
-    if reports and promos_inserted == 0:
-        npc = next(npc_iter, None)
-        if npc is not None:
-            items.append({"type": "promo", "obj": npc})
+    if reports and start == 0 and complete and promos_inserted == 0 and npcs:
+        items.append({"type": "promo", "obj": npcs[0]})
 
     return items
 
 
+def _feed_page(request: HttpRequest, reports_qs: QuerySet[Any]) -> dict[str, Any]:
+    """Fetch the page of `reports_qs` requested by ``?cursor=``, newest first.
+
+    Returns the page context: ``reports``, ``position`` (reports shown on
+    earlier pages, carried in the query string) and ``next_page_url`` (None on
+    the last page).
+
+    Raises:
+        InvalidCursorError: The ``cursor`` parameter is malformed.
+    """
+    token = request.GET.get("cursor")
+    position = 0
+    if token:
+        published_at, pk = decode_cursor(token)
+        reports_qs = reports_qs.filter(
+            Q(published_at__lt=published_at) | Q(published_at=published_at, pk__lt=pk)
+        )
+        try:
+            position = max(int(request.GET.get("position", 0)), 0)
+        except ValueError:
+            position = 0
+
+    rows = list(reports_qs.order_by("-published_at", "-pk")[: FEED_PAGE_SIZE + 1])
+    has_next = len(rows) > FEED_PAGE_SIZE
+    rows = rows[:FEED_PAGE_SIZE]
+
+    next_page_url = None
+    if has_next:
+        last = rows[-1]
+        query = {
+            "cursor": encode_cursor(last.published_at, last.pk),
+            "position": position + len(rows),
+        }
+        next_page_url = f"{request.path}?{urlencode(query)}"
+    return {"reports": rows, "position": position, "next_page_url": next_page_url}
+
+
+def _render_feed(request: HttpRequest, context: dict[str, Any]) -> HttpResponse:
+    """Render a feed scope: the full page / tab swap, or a "load more" fragment."""
+    if request.GET.get("cursor"):
+        return render(request, "feed/_feed_page.html", context)
+    return htmx_render(
+        request,
+        full_template="feed/home.html",
+        partial_template="feed/_feed_items.html",
+        context={**context, **_composer_sidebar_context(request)},
+    )
+
+
 def _composer_sidebar_context(request: HttpRequest) -> dict[str, object]:
     """Composer context for the feed sidebar — first load only, authenticated only.
 
@@ -107,13 +178,16 @@ def feed_home(request: AuthenticatedRequest) -> HttpResponse:
                 queryset=Rapport.objects.select_related("actor").order_by("created_at"),
             )
         )
-        .order_by("-published_at")
     )
     # `liked` (#138) + `recommended` (#155) via correlated subqueries — one extra
     # JOIN each for the whole page, never one query per card. Feed is login-gated.
-    reports = annotate_viewer_reactions(reports_base, user)[:20]
+    try:
+        page = _feed_page(request, annotate_viewer_reactions(reports_base, user))
+    except InvalidCursorError:
+        return HttpResponseBadRequest("Invalid cursor")
 
-    # Available NPCs in followed games — promocard pool for interleaving.
+    # Available NPCs in followed games — promocard pool for interleaving. The
+    # pool is the same on every page, so each promo slot keeps its NPC.
     npcs = (
         Character.objects.filter(
             status="npc",
@@ -121,27 +195,29 @@ def feed_home(request: AuthenticatedRequest) -> HttpResponse:
             origin_game_id__in=followed_game_ids,
         )
         .select_related("origin_game")
-        .order_by("-created_at")[:6]
+        .order_by("-created_at", "-pk")[:FEED_PROMO_POOL]
     )
 
     # Blend reports and claim/adopt/fork promocards into one ordered feed (SUD-P1).
     promo_every = getattr(settings, "FEED_PROMO_EVERY", 6)
-    feed_items = interleave_promos(list(reports), list(npcs), promo_every)
-
-    return htmx_render(
-        request,
-        full_template="feed/home.html",
-        partial_template="feed/_feed_items.html",
-        context={
-            "feed_items": feed_items,
-            "reports": reports,
-            "npcs": npcs,
-            "active_tab": "subscriptions",
-            "is_empty": not Follow.objects.filter(follower=user).exists(),
-            **_composer_sidebar_context(request),
-        },
+    feed_items = interleave_promos(
+        page["reports"],
+        list(npcs),
+        promo_every,
+        start=page["position"],
+        complete=page["next_page_url"] is None,
     )
 
+    context: dict[str, Any] = {
+        **page,
+        "feed_items": feed_items,
+        "npcs": npcs,
+        "active_tab": "subscriptions",
+    }
+    if not page["position"]:
+        context["is_empty"] = not Follow.objects.filter(follower=user).exists()
+    return _render_feed(request, context)
+
 
 def feed_instance(request: HttpRequest) -> HttpResponse:
     """Feed — Instance tab. All public local content."""
@@ -162,19 +238,12 @@ def feed_instance(request: HttpRequest) -> HttpResponse:
     )
     # Instance is anonymous-accessible: the helper annotates `liked`/`recommended`
     # only for a logged-in visitor (anonymous → falsy `report.liked`/`recommended`).
-    annotated = annotate_viewer_reactions(reports_qs, request.user)
-    reports = annotated.order_by("-published_at")[:20]
+    try:
+        page = _feed_page(request, annotate_viewer_reactions(reports_qs, request.user))
+    except InvalidCursorError:
+        return HttpResponseBadRequest("Invalid cursor")
 
-    return htmx_render(
-        request,
-        full_template="feed/home.html",
-        partial_template="feed/_feed_items.html",
-        context={
-            "reports": reports,
-            "active_tab": "instance",
-            **_composer_sidebar_context(request),
-        },
-    )
+    return _render_feed(request, {**page, "active_tab": "instance"})
 
 
 def feed_fediverse(request: HttpRequest) -> HttpResponse:
@@ -196,19 +265,12 @@ def feed_fediverse(request: HttpRequest) -> HttpResponse:
     )
     # Fediverse is anonymous-accessible: annotate `liked`/`recommended` only when
     # logged in (the helper is a no-op for anonymous visitors).
-    annotated = annotate_viewer_reactions(reports_qs, request.user)
-    reports = annotated.order_by("-published_at")[:20]
+    try:
+        page = _feed_page(request, annotate_viewer_reactions(reports_qs, request.user))
+    except InvalidCursorError:
+        return HttpResponseBadRequest("Invalid cursor")
 
-    return htmx_render(
-        request,
-        full_template="feed/home.html",
-        partial_template="feed/_feed_items.html",
-        context={
-            "reports": reports,
-            "active_tab": "fediverse",
-            **_composer_sidebar_context(request),
-        },
-    )
+    return _render_feed(request, {**page, "active_tab": "fediverse"})
 
 
 @require_POST
@@ -0,0 +1,79 @@
+"""
+Management command: run tasks from the database queue in a local worker loop.
+
+The broker-less counterpart of ``celery worker`` for deployments with
+``TASK_QUEUE_BACKEND = "database"`` (see ``suddenly/core/task_queue.py``).
+Several copies may run side by side: rows are claimed with SKIP LOCKED.
+``--queue`` restricts a worker to some queues (``CELERY_TASK_ROUTES``), e.g.
+to keep one for interactive deliveries. With ``--beat``, this worker also
+queues the fixed-interval entries of ``CELERY_BEAT_SCHEDULE`` — give that flag
+to a single worker only.
+
+Usage:
+    python manage.py run_task_queue
+    python manage.py run_task_queue --beat
+    python manage.py run_task_queue --queue interactive
+    python manage.py run_task_queue --once --batch 50
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from suddenly.core.task_queue import drain_task_queue, enqueue_task, periodic_schedule
+
+
+class Command(BaseCommand):
+    help = "Run queued tasks from the database queue (broker-less worker)."
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            "--once", action="store_true", help="Drain one batch, then exit (cron mode)."
+        )
+        parser.add_argument("--batch", type=int, default=20, help="Tasks claimed per iteration.")
+        parser.add_argument(
+            "--idle-sleep",
+            type=float,
+            default=1.0,
+            help="Seconds to wait when the queue has nothing due.",
+        )
+        parser.add_argument(
+            "--queue",
+            action="append",
+            dest="queues",
+            help="Only run tasks of this queue (repeatable; default: all queues).",
+        )
+        parser.add_argument(
+            "--beat",
+            action="store_true",
+            help="Also queue the periodic tasks of CELERY_BEAT_SCHEDULE.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        batch: int = options["batch"]
+        idle_sleep: float = options["idle_sleep"]
+        schedule = periodic_schedule() if options["beat"] else {}
+        # Like Celery beat, the first run of each entry is one interval away.
+        next_run = {name: time.monotonic() + interval for name, (_, interval) in schedule.items()}
+
+        while True:
+            close_old_connections()
+            now = time.monotonic()
+            for name, (task_name, interval) in schedule.items():
+                if next_run[name] <= now:
+                    enqueue_task(task_name)
+                    next_run[name] = now + interval
+
+            stats = drain_task_queue(limit=batch, queues=options["queues"])
+            if any(stats.values()):
+                self.stdout.write(
+                    f"done={stats['done']} retried={stats['retried']} failed={stats['failed']}"
+                )
+            if options["once"]:
+                return
+            if not any(stats.values()):
+                time.sleep(idle_sleep)
@@ -0,0 +1,50 @@
+"""
+Management command: start a Celery worker dedicated to one task queue.
+
+Queues and routes are declared in settings (``CELERY_TASK_QUEUES``,
+``CELERY_TASK_ROUTES``); each queue's worker is sized by ``TASK_QUEUE_WORKERS``
+so a fan-out backlog has its own processes and never delays interactive
+deliveries.
+
+Usage:
+    python manage.py run_worker interactive
+    python manage.py run_worker fanout --concurrency 8
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "Start a Celery worker consuming a single task queue."
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument("queue", type=str, help="Queue to consume (see TASK_QUEUE_WORKERS).")
+        parser.add_argument(
+            "--concurrency", type=int, default=None, help="Override the queue's process count."
+        )
+        parser.add_argument("--loglevel", type=str, default="info", help="Celery log level.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        from suddenly.celery import app
+
+        queue: str = options["queue"]
+        sizing = getattr(settings, "TASK_QUEUE_WORKERS", {})
+        if queue not in sizing:
+            raise CommandError(f"Unknown queue '{queue}'. Known: {', '.join(sorted(sizing))}.")
+
+        concurrency = options["concurrency"] or sizing[queue]["concurrency"]
+        app.worker_main(
+            [
+                "worker",
+                f"--queues={queue}",
+                f"--hostname={queue}@%h",
+                f"--concurrency={concurrency}",
+                f"--prefetch-multiplier={sizing[queue]['prefetch_multiplier']}",
+                f"--loglevel={options['loglevel']}",
+            ]
+        )
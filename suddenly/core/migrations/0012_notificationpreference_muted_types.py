@@ -0,0 +1,21 @@
+# Generated by Django 5.0.14 on 2026-10-17 00:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0011_remove_userusagestats_total_quotes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notificationpreference",
+            name="muted_types",
+            field=models.JSONField(
+                blank=True,
+                default=list,
+                help_text="In-app notification types (NotificationType values) not to create",
+            ),
+        ),
+    ]
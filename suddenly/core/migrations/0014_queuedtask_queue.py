@@ -0,0 +1,25 @@
+# Generated by Django 5.0.14 on 2026-10-17 11:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0013_queuedtask"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="queuedtask",
+            name="queue",
+            field=models.CharField(
+                default="interactive", help_text="Queue the task is routed to", max_length=50
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="queuedtask",
+            index=models.Index(
+                fields=["queue", "status", "available_at"], name="queuedtask_queue_idx"
+            ),
+        ),
+    ]
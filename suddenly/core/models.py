@@ -13,6 +13,7 @@ from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
 from django.db.utils import OperationalError, ProgrammingError
+from django.utils import timezone
 
 
 class BaseModel(models.Model):
@@ -206,6 +207,11 @@ class NotificationPreference(BaseModel):
     email_mention = models.BooleanField(default=True)
     email_invitation = models.BooleanField(default=True)
     email_new_follower = models.BooleanField(default=False)
+    muted_types = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="In-app notification types (NotificationType values) not to create",
+    )
 
     def __str__(self) -> str:
         return f"Notification prefs for {self.user}"
@@ -436,6 +442,58 @@ class UserUsageStats(BaseModel):
         return self.posts_since_last_prompt >= interval
 
 
+class QueuedTaskStatus(models.TextChoices):
+    """State of a task call in the database queue."""
+
+    PENDING = "PENDING", "En attente"
+    RUNNING = "RUNNING", "En cours"
+    FAILED = "FAILED", "Échec"
+
+
+class QueuedTask(BaseModel):
+    """
+    A Celery task call waiting in the database queue.
+
+    Written instead of a broker message when ``TASK_QUEUE_BACKEND`` is
+    ``"database"`` (see ``core/task_queue.py``) and run by the
+    ``run_task_queue`` worker command. A row is deleted once its task returns
+    or re-queues itself with ``self.retry``; rows left in FAILED raised
+    without retrying and are kept for inspection.
+    """
+
+    task_name = models.CharField(max_length=200, help_text="Registered Celery task name")
+    queue = models.CharField(
+        max_length=50, default="interactive", help_text="Queue the task is routed to"
+    )
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    status = models.CharField(
+        max_length=20,
+        choices=QueuedTaskStatus.choices,
+        default=QueuedTaskStatus.PENDING,
+    )
+    retries = models.PositiveSmallIntegerField(
+        default=0, help_text="Retries already made (the task's self.request.retries)"
+    )
+    available_at = models.DateTimeField(
+        default=timezone.now,
+        help_text="Earliest time the task may run (countdown / retry backoff)",
+    )
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        verbose_name = "Tâche en file"
+        verbose_name_plural = "Tâches en file"
+        indexes = [
+            models.Index(fields=["status", "available_at"], name="queuedtask_status_avail_idx"),
+            models.Index(fields=["queue", "status", "available_at"], name="queuedtask_queue_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.task_name} {self.pk}"
+
+
 class InstanceSettings(models.Model):
     """
     Singleton model for instance-wide configuration.
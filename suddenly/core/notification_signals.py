@@ -100,22 +100,22 @@ def notify_admins_on_user_report(sender: type, instance: Any, created: bool, **k
     if not created:
         return
 
-    from django.contrib.contenttypes.models import ContentType
-
-    from suddenly.core.models import Notification, NotificationType
+    from suddenly.core.models import NotificationType
+    from suddenly.core.services import NotificationService
     from suddenly.users.models import User
 
-    report_ct = ContentType.objects.get_for_model(instance)
-    admins = User.objects.filter(is_admin=True, remote=False).exclude(pk=instance.reported_user_id)
-    for admin in admins:
-        Notification.objects.create(
-            recipient=admin,
-            type=NotificationType.MODERATION_REPORT,
-            actor=instance.reporter,
-            target_content_type=report_ct,
-            target_object_id=instance.pk,
-            message=(f"@{instance.reporter.username} a signalé @{instance.reported_user.username}"),
-        )
+    admin_ids = (
+        User.objects.filter(is_admin=True, remote=False)
+        .exclude(pk=instance.reported_user_id)
+        .values_list("pk", flat=True)
+    )
+    NotificationService.fan_out(
+        admin_ids,
+        notification_type=NotificationType.MODERATION_REPORT,
+        actor=instance.reporter,
+        target=instance,
+        message=(f"@{instance.reporter.username} a signalé @{instance.reported_user.username}"),
+    )
 
 
 @receiver(post_save, sender="games.Report")
@@ -127,7 +127,8 @@ def notify_on_report_published(sender: type, instance: Any, created: bool, **kwa
     from django.contrib.contenttypes.models import ContentType
 
     from suddenly.characters.models import Follow
-    from suddenly.core.models import Notification, NotificationType
+    from suddenly.core.models import NotificationType
+    from suddenly.core.services import NotificationService
     from suddenly.games.models import Game
     from suddenly.users.models import User
 
@@ -147,13 +148,12 @@ def notify_on_report_published(sender: type, instance: Any, created: bool, **kwa
     follower_ids.discard(instance.author_id)  # Don't notify self
 
     title = instance.title or "Sans titre"
-    for fid in follower_ids:
-        Notification.objects.create(
-            recipient_id=fid,
-            type=NotificationType.NEW_REPORT,
-            actor=instance.author,
-            message=f"@{instance.author.username} a publié « {title} »",
-        )
+    NotificationService.fan_out(
+        follower_ids,
+        notification_type=NotificationType.NEW_REPORT,
+        actor=instance.author,
+        message=f"@{instance.author.username} a publié « {title} »",
+    )
 
     # Track usage for donation prompts
     _track_usage_and_prompt(instance.author)
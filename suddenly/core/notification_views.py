@@ -38,7 +38,10 @@ def notification_list(request: AuthenticatedRequest) -> HttpResponse:
 def notification_mark_all_read(request: AuthenticatedRequest) -> HttpResponse:
     """Mark all notifications as read (HTMX POST)."""
     if request.method == "POST":
+        from suddenly.core.cache_invalidation import invalidate_account_badges
+
         Notification.objects.filter(recipient=request.user, is_read=False).update(is_read=True)
+        invalidate_account_badges(request.user.pk)
 
     return notification_list(request)
 
@@ -4,9 +4,12 @@ Core service layer — shared business queries used by views.
 
 from __future__ import annotations
 
+from collections.abc import Iterable
 from typing import TYPE_CHECKING, Any, cast
 
+from django.conf import settings
 from django.core.cache import cache
+from django.db import transaction
 
 from suddenly.games.models import Report, ReportStatus
 
@@ -21,6 +24,9 @@ POPULAR_SCENES_PER_PAGE = 20
 EXPLORER_TAGS_TTL = 300
 INSTANCE_STATS_TTL = 600
 RECENT_REPORTS_TTL = 60
+# Short: the badge payload is also invalidated on every write that moves a count
+# (cache_invalidation.invalidate_account_badges); the TTL only bounds misses.
+ACCOUNT_BADGES_TTL = 30
 
 # Limits passed to get_recent_public_reports — every value must be listed here
 # so cache_invalidation.invalidate_recent_public_reports can flush all keys.
@@ -110,3 +116,127 @@ def get_instance_stats() -> dict[str, int]:
     }
     cache.set(cache_key, stats, INSTANCE_STATS_TTL)
     return stats
+
+
+def account_badges_cache_key(user_id: Any) -> str:
+    return f"account_badges:{user_id}"
+
+
+def get_account_badges(user: User) -> dict[str, int]:
+    """Account-menu badge counts for `user`, cached per user.
+
+    Rendered on every authenticated page (``account_badges`` context
+    processor), so the four counts are computed together and reused until a
+    relevant write invalidates them.
+    """
+    cache_key = account_badges_cache_key(user.pk)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cast(dict[str, int], cached)
+
+    from suddenly.characters.models import LinkRequest, LinkRequestStatus
+    from suddenly.core.models import Notification, UnlockedAchievement
+    from suddenly.messaging.services import MessageService
+
+    badges = {
+        "pending_requests_count": LinkRequest.objects.filter(
+            target_character__creator=user, status=LinkRequestStatus.PENDING
+        ).count(),
+        "unread_notifications_count": Notification.objects.filter(
+            recipient=user, is_read=False
+        ).count(),
+        "unread_messages_count": MessageService.unread_count(user),
+        # Newly unlocked achievements not yet seen on the Stats page (#153).
+        "new_stats_count": UnlockedAchievement.objects.filter(
+            user=user, seen_at__isnull=True
+        ).count(),
+    }
+    cache.set(cache_key, badges, ACCOUNT_BADGES_TTL)
+    return badges
+
+
+# Notifications per bulk_create statement in NotificationService.fan_out.
+NOTIFICATION_FANOUT_CHUNK = 500
+
+
+class NotificationService:
+    """Creates in-app notifications for many recipients at once."""
+
+    @classmethod
+    def fan_out(
+        cls,
+        recipients: Iterable[Any],
+        *,
+        notification_type: str,
+        message: str,
+        actor: User | None = None,
+        target: Any = None,
+    ) -> int:
+        """Notify every recipient (users or user ids) with the same notification.
+
+        Recipients who muted `notification_type` (``NotificationPreference``)
+        are skipped. Rows are written with chunked ``bulk_create``; above
+        ``NOTIFICATION_FANOUT_SYNC_LIMIT`` recipients, and when a Celery broker
+        is available, the writes run in the ``fan_out_notifications`` task
+        after the current transaction commits instead of inside the request.
+
+        Returns the number of recipients notified inline, or queued.
+        """
+        recipient_ids = [str(getattr(r, "pk", r)) for r in recipients]
+        recipient_ids = list(dict.fromkeys(recipient_ids))
+        if not recipient_ids:
+            return 0
+
+        fields: dict[str, Any] = {
+            "type": str(notification_type),
+            "message": message,
+            "actor_id": str(actor.pk) if actor is not None else None,
+            "target_content_type_id": None,
+            "target_object_id": None,
+        }
+        if target is not None:
+            from django.contrib.contenttypes.models import ContentType
+
+            fields["target_content_type_id"] = ContentType.objects.get_for_model(target).pk
+            fields["target_object_id"] = str(target.pk)
+
+        from suddenly.activitypub.inbox_queue import _broker_available
+
+        sync_limit = int(getattr(settings, "NOTIFICATION_FANOUT_SYNC_LIMIT", 100))
+        if len(recipient_ids) > sync_limit and _broker_available():
+            from suddenly.activitypub.signals import _safe_delay
+            from suddenly.core.tasks import fan_out_notifications
+
+            transaction.on_commit(lambda: _safe_delay(fan_out_notifications, recipient_ids, fields))
+            return len(recipient_ids)
+
+        return cls.create_notifications(recipient_ids, fields)
+
+    @staticmethod
+    def create_notifications(recipient_ids: list[str], fields: dict[str, Any]) -> int:
+        """Write one notification per recipient, ``NOTIFICATION_FANOUT_CHUNK`` at a time.
+
+        `fields` holds the shared Notification column values (as built by
+        ``fan_out``). Returns the number of notifications created.
+        """
+        from suddenly.core.cache_invalidation import invalidate_account_badges
+        from suddenly.core.models import Notification
+        from suddenly.users.models import User
+
+        created = 0
+        for start in range(0, len(recipient_ids), NOTIFICATION_FANOUT_CHUNK):
+            chunk = recipient_ids[start : start + NOTIFICATION_FANOUT_CHUNK]
+            # One query per chunk: drops users deleted since a deferred fan-out
+            # was queued, and those who muted this type.
+            rows = [
+                Notification(recipient_id=user_id, **fields)
+                for user_id, muted_types in User.objects.filter(pk__in=chunk).values_list(
+                    "pk", "notification_preferences__muted_types"
+                )
+                if fields["type"] not in (muted_types or [])
+            ]
+            # bulk_create sends no post_save: drop the badge caches here.
+            Notification.objects.bulk_create(rows)
+            invalidate_account_badges(*(row.recipient_id for row in rows))
+            created += len(rows)
+        return created
@@ -0,0 +1,219 @@
+"""
+Database task queue (``TASK_QUEUE_BACKEND = "database"``).
+
+Without a broker, Celery can only run tasks eagerly: inside the web request,
+remote HTTP posts included. With the database backend, the app's task class
+(:class:`QueueAwareTask`, the ``task_cls`` of ``suddenly/celery.py``) turns
+``delay``/``apply_async`` into a :class:`QueuedTask` row instead, and the
+``run_task_queue`` command works through the rows:
+
+- rows are claimed with ``SELECT ... FOR UPDATE SKIP LOCKED``, so several
+  worker processes share the queue without ever taking the same row;
+- a task runs with a worker-like request context, so ``self.retry`` and
+  ``autoretry_for`` behave as under Celery: the retry is queued as a new row,
+  due after its countdown, within the task's ``max_retries``;
+- a task that raises without retrying is parked as FAILED; a RUNNING row whose
+  worker died is reclaimed after ``CELERY_TASK_TIME_LIMIT``;
+- each row records the queue ``CELERY_TASK_ROUTES`` sends its task to, so a
+  worker can be dedicated to one queue as with Celery.
+
+The row is written in the caller's transaction: a task queued inside an atomic
+block only becomes visible to workers once that block commits.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Sequence
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from celery import Task
+from celery.exceptions import Retry
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+def database_queue_enabled() -> bool:
+    """True when task calls go to the database queue instead of Celery."""
+    return getattr(settings, "TASK_QUEUE_BACKEND", "celery") == "database"
+
+
+def task_queue_name(task_name: str) -> str:
+    """Queue `task_name` is routed to (``CELERY_TASK_ROUTES``, else the default queue)."""
+    route = getattr(settings, "CELERY_TASK_ROUTES", {}).get(task_name) or {}
+    return str(route.get("queue") or getattr(settings, "CELERY_TASK_DEFAULT_QUEUE", "celery"))
+
+
+def _available_at(countdown: float | None, eta: Any) -> datetime:
+    if isinstance(eta, str):
+        eta = datetime.fromisoformat(eta)
+    if isinstance(eta, datetime):
+        return eta if timezone.is_aware(eta) else eta.replace(tzinfo=UTC)
+    return timezone.now() + timedelta(seconds=countdown or 0)
+
+
+def enqueue_task(
+    task_name: str,
+    args: Any = None,
+    kwargs: dict[str, Any] | None = None,
+    *,
+    countdown: float | None = None,
+    eta: Any = None,
+    retries: int = 0,
+    queue: str | None = None,
+) -> str:
+    """Write a task call to the database queue. Returns its id (the task id)."""
+    from .models import QueuedTask
+
+    queued = QueuedTask.objects.create(
+        task_name=task_name,
+        queue=queue or task_queue_name(task_name),
+        args=list(args or ()),
+        kwargs=dict(kwargs or {}),
+        retries=retries,
+        available_at=_available_at(countdown, eta),
+    )
+    return str(queued.pk)
+
+
+class QueueAwareTask(Task):  # type: ignore[misc]
+    """Celery task class that queues to the database when that backend is on."""
+
+    def apply_async(
+        self,
+        args: Any = None,
+        kwargs: dict[str, Any] | None = None,
+        task_id: str | None = None,
+        producer: Any = None,
+        link: Any = None,
+        link_error: Any = None,
+        shadow: str | None = None,
+        **options: Any,
+    ) -> Any:
+        if not database_queue_enabled():
+            return super().apply_async(
+                args, kwargs, task_id, producer, link, link_error, shadow, **options
+            )
+        queued_id = enqueue_task(
+            self.name,
+            args,
+            kwargs,
+            countdown=options.get("countdown"),
+            eta=options.get("eta"),
+            retries=int(options.get("retries") or 0),
+            queue=options.get("queue"),
+        )
+        return self.AsyncResult(queued_id)
+
+
+def _stale_after() -> timedelta:
+    return timedelta(seconds=int(getattr(settings, "CELERY_TASK_TIME_LIMIT", 30 * 60)))
+
+
+def _claimable(now: datetime) -> Q:
+    """Rows a worker may take: due PENDING ones, or RUNNING ones left by a dead worker."""
+    from .models import QueuedTaskStatus
+
+    return Q(status=QueuedTaskStatus.PENDING, available_at__lte=now) | Q(
+        status=QueuedTaskStatus.RUNNING, locked_at__lt=now - _stale_after()
+    )
+
+
+def claim_due_tasks(limit: int, queues: Sequence[str] | None = None) -> list[Any]:
+    """Lock and mark RUNNING up to `limit` due rows, oldest first.
+
+    Only rows of `queues` when given. Rows locked by a concurrent claim are
+    skipped rather than waited on.
+    """
+    from .models import QueuedTask, QueuedTaskStatus
+
+    now = timezone.now()
+    due = QueuedTask.objects.select_for_update(skip_locked=True).filter(_claimable(now))
+    if queues:
+        due = due.filter(queue__in=queues)
+    with transaction.atomic():
+        rows = list(due.order_by("available_at")[:limit])
+        if rows:
+            QueuedTask.objects.filter(pk__in=[row.pk for row in rows]).update(
+                status=QueuedTaskStatus.RUNNING, locked_at=now
+            )
+    return rows
+
+
+def run_queued_task(queued: Any) -> str:
+    """Run one claimed row. Returns ``"done"``, ``"retried"`` or ``"failed"``.
+
+    A retry (``self.retry``) has already queued its own row through
+    :class:`QueueAwareTask`, so the claimed row is deleted either way; only an
+    exception that escapes the task leaves the row behind, as FAILED.
+    """
+    from suddenly.celery import app
+
+    from .models import QueuedTask, QueuedTaskStatus
+
+    task = app.tasks.get(queued.task_name)
+    if task is None:
+        error = f"Unknown task {queued.task_name}"
+    else:
+        task.push_request(
+            id=str(queued.pk),
+            args=list(queued.args),
+            kwargs=dict(queued.kwargs),
+            retries=queued.retries,
+            # As from a broker: a retry goes back to the queue it came from.
+            delivery_info={"exchange": "", "routing_key": queued.queue},
+            is_eager=False,
+            called_directly=False,
+        )
+        try:
+            task.run(*queued.args, **queued.kwargs)
+        except Retry:
+            queued.delete()
+            return "retried"
+        except Exception as exc:  # noqa: BLE001 — recorded on the row
+            error = f"{type(exc).__name__}: {exc}"
+        else:
+            queued.delete()
+            return "done"
+        finally:
+            task.pop_request()
+
+    QueuedTask.objects.filter(pk=queued.pk).update(
+        status=QueuedTaskStatus.FAILED, locked_at=None, last_error=error[:2000]
+    )
+    logger.warning("Queued task %s %s failed: %s", queued.task_name, queued.pk, error)
+    return "failed"
+
+
+def drain_task_queue(limit: int = 20, queues: Sequence[str] | None = None) -> dict[str, int]:
+    """Claim and run up to `limit` due tasks (of `queues`, if given) in this process.
+
+    Used by the ``run_task_queue`` command. Failures are counted, never
+    raised: the loop must survive any single task.
+    """
+    stats = {"done": 0, "retried": 0, "failed": 0}
+    for queued in claim_due_tasks(limit, queues):
+        stats[run_queued_task(queued)] += 1
+    return stats
+
+
+def periodic_schedule() -> dict[str, tuple[str, float]]:
+    """``CELERY_BEAT_SCHEDULE`` entries with a fixed interval: name -> (task, seconds).
+
+    Entries with another kind of schedule (crontab) are left to Celery beat.
+    """
+    entries: dict[str, tuple[str, float]] = {}
+    for name, entry in getattr(settings, "CELERY_BEAT_SCHEDULE", {}).items():
+        schedule = entry.get("schedule")
+        if isinstance(schedule, timedelta):
+            schedule = schedule.total_seconds()
+        if isinstance(schedule, int | float) and schedule > 0:
+            entries[name] = (entry["task"], float(schedule))
+        else:
+            logger.warning("Periodic task %s has no fixed interval; not scheduled", name)
+    return entries
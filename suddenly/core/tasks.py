@@ -0,0 +1,20 @@
+"""Celery tasks for the core app."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task  # type: ignore[untyped-decorator]
+def fan_out_notifications(recipient_ids: list[str], fields: dict[str, Any]) -> int:
+    """Create a large notification fan-out off-request (``NotificationService.fan_out``)."""
+    from suddenly.core.services import NotificationService
+
+    created = NotificationService.create_notifications(recipient_ids, fields)
+    logger.info("fan_out_notifications: type=%s created=%d", fields.get("type"), created)
+    return created
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.14 on 2026-10-16 23:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0011_remove_userusagestats_total_quotes"),
+        ("games", "0027_remove_rapportmedia_tone"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="report",
+            index=models.Index(
+                fields=["author", "published_at"], name="games_repor_author__ee92a2_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.14 on 2026-10-17 00:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("games", "0028_collection_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="report",
+            index=models.Index(
+                fields=["status", "visibility", "remote", "published_at"],
+                name="games_repor_status_359da7_idx",
+            ),
+        ),
+    ]
@@ -287,6 +287,10 @@ class Report(BaseModel):
         indexes = [
             models.Index(fields=["game", "published_at"]),
             models.Index(fields=["status"]),
+            # Keyset pages of the user outbox (activitypub.paging).
+            models.Index(fields=["author", "published_at"]),
+            # Keyset pages of the Instance/Fediverse feeds (core.feed_views).
+            models.Index(fields=["status", "visibility", "remote", "published_at"]),
         ]
         constraints = [
             # XOR local/remote: a fiction link is either a hard FK (local) or a
@@ -13,6 +13,7 @@ from __future__ import annotations
 from typing import Any
 
 from django.db import transaction
+from django.db.models import Count, F, Q
 from django.utils import timezone
 
 
@@ -118,11 +119,14 @@ class MessageService:
     @staticmethod
     def mark_read(conversation: Any, user: Any) -> None:
         """Advance `user`'s read cursor on `conversation` to now."""
+        from suddenly.core.cache_invalidation import invalidate_account_badges
+
         from .models import ConversationMembership
 
         ConversationMembership.objects.filter(conversation=conversation, user=user).update(
             last_read_at=timezone.now()
         )
+        invalidate_account_badges(user.pk)
 
     @staticmethod
     def unread_for(conversation: Any, user: Any) -> int:
@@ -137,10 +141,36 @@ class MessageService:
             qs = qs.filter(created_at__gt=membership.last_read_at)
         return int(qs.count())
 
+    @staticmethod
+    def _unread_messages(user: Any) -> Any:
+        """Messages from others that arrived after `user`'s read cursor.
+
+        One filter() call so the membership join, its ``user`` condition and the
+        cursor comparison all address the same ``ConversationMembership`` row.
+        """
+        from .models import DirectMessage
+
+        return DirectMessage.objects.filter(
+            Q(conversation__memberships__last_read_at__isnull=True)
+            | Q(created_at__gt=F("conversation__memberships__last_read_at")),
+            conversation__memberships__user=user,
+        ).exclude(sender=user)
+
     @staticmethod
     def unread_count(user: Any) -> int:
-        """Total unread direct messages for `user`, across all their conversations."""
-        from .models import Conversation
+        """Total unread direct messages for `user`, across all their conversations.
+
+        A single aggregate query, whatever the number of conversations.
+        """
+        return int(MessageService._unread_messages(user).count())
 
-        conversations = Conversation.objects.filter(memberships__user=user).distinct()
-        return sum(MessageService.unread_for(c, user) for c in conversations)
+    @staticmethod
+    def unread_by_conversation(user: Any) -> dict[Any, int]:
+        """Unread count per conversation id for `user` (absent id = 0), in one query."""
+        rows = (
+            MessageService._unread_messages(user)
+            .order_by()
+            .values("conversation_id")
+            .annotate(unread=Count("id"))
+        )
+        return {row["conversation_id"]: row["unread"] for row in rows}
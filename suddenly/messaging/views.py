@@ -33,6 +33,7 @@ def inbox(request: AuthenticatedRequest) -> HttpResponse:
         .distinct()
     )
 
+    unread = MessageService.unread_by_conversation(request.user)
     rows = []
     for conversation in conversations:
         other = MessageService.other_participant(conversation, request.user)
@@ -40,7 +41,7 @@ def inbox(request: AuthenticatedRequest) -> HttpResponse:
             {
                 "conversation": conversation,
                 "other": other,
-                "unread_count": MessageService.unread_for(conversation, request.user),
+                "unread_count": unread.get(conversation.pk, 0),
             }
         )
 
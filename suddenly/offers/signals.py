@@ -84,26 +84,26 @@ def notify_followers_on_offer_created(
     from django.contrib.contenttypes.models import ContentType
 
     from suddenly.characters.models import Follow
-    from suddenly.core.models import Notification, NotificationType
+    from suddenly.core.models import NotificationType
+    from suddenly.core.services import NotificationService
     from suddenly.users.models import User
 
     user_ct = ContentType.objects.get_for_model(User)
-    offer_ct = ContentType.objects.get_for_model(instance)
-    follower_ids = Follow.objects.filter(
-        content_type=user_ct, object_id=instance.emitter_id, follower__remote=False
-    ).values_list("follower_id", flat=True)
-
-    for fid in follower_ids:
-        if fid == instance.emitter_id:
-            continue
-        Notification.objects.create(
-            recipient_id=fid,
-            type=NotificationType.OFFER,
-            actor=instance.emitter,
-            target_content_type=offer_ct,
-            target_object_id=instance.pk,
-            message=f"@{instance.emitter.username} a une nouvelle offre à laquelle répondre",
+    follower_ids = (
+        Follow.objects.filter(
+            content_type=user_ct, object_id=instance.emitter_id, follower__remote=False
         )
+        .exclude(follower_id=instance.emitter_id)
+        .values_list("follower_id", flat=True)
+    )
+
+    NotificationService.fan_out(
+        follower_ids,
+        notification_type=NotificationType.OFFER,
+        actor=instance.emitter,
+        target=instance,
+        message=f"@{instance.emitter.username} a une nouvelle offre à laquelle répondre",
+    )
 
 
 @receiver(post_save, sender="offers.OfferResponse")
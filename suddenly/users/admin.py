@@ -7,7 +7,7 @@ from __future__ import annotations
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 
-from .models import User
+from .models import FollowImport, User
 
 
 @admin.register(User)
@@ -33,6 +33,27 @@ class UserAdmin(BaseUserAdmin):  # type: ignore[type-arg]
         ),
         (
             "ActivityPub",
-            {"fields": ("remote", "ap_id", "inbox_url", "outbox_url", "public_key")},
+            {
+                "fields": (
+                    "remote",
+                    "ap_id",
+                    "inbox_url",
+                    "shared_inbox_url",
+                    "outbox_url",
+                    "public_key",
+                )
+            },
         ),
     )
+
+
+@admin.register(FollowImport)
+class FollowImportAdmin(admin.ModelAdmin):  # type: ignore[type-arg]
+    """Admin for follow imports (Mastodon CSV) and their progress."""
+
+    list_display = ["user", "status", "processed", "total", "imported", "failed", "created_at"]
+    list_filter = ["status"]
+    search_fields = ["user__username"]
+    raw_id_fields = ["user"]
+    readonly_fields = ["created_at", "updated_at", "finished_at"]
+    ordering = ["-created_at"]
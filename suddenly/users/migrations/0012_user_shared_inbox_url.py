@@ -0,0 +1,17 @@
+# Generated by Django 5.0.14 on 2026-10-16 22:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0011_user_blocked_at_user_blocked_by_admin_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="shared_inbox_url",
+            field=models.URLField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.0.14 on 2026-10-17 14:05
+
+import uuid
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0012_user_shared_inbox_url"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FollowImport",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("PENDING", "En attente"),
+                            ("RUNNING", "En cours"),
+                            ("DONE", "Terminé"),
+                            ("FAILED", "Échec"),
+                        ],
+                        default="PENDING",
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "total",
+                    models.PositiveIntegerField(default=0, help_text="Addresses in the file"),
+                ),
+                ("processed", models.PositiveIntegerField(default=0)),
+                (
+                    "imported",
+                    models.PositiveIntegerField(default=0, help_text="New follows created"),
+                ),
+                ("skipped", models.PositiveIntegerField(default=0, help_text="Already followed")),
+                (
+                    "failed",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Addresses that did not resolve"
+                    ),
+                ),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="follow_imports",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Import d'abonnements",
+                "verbose_name_plural": "Imports d'abonnements",
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
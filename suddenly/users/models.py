@@ -14,6 +14,8 @@ from django.db import models
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
+from suddenly.core.models import BaseModel
+
 
 class User(AbstractUser):
     """
@@ -79,6 +81,9 @@ class User(AbstractUser):
     remote = models.BooleanField(default=False, db_index=True, help_text="True if federated user")
     ap_id = models.URLField(blank=True, null=True, unique=True)  # unique already implies index
     inbox_url = models.URLField(blank=True, null=True)
+    # Remote instance's shared inbox (actor `endpoints.sharedInbox`). Broadcasts
+    # deliver once per shared inbox instead of once per follower.
+    shared_inbox_url = models.URLField(blank=True, null=True)
     outbox_url = models.URLField(blank=True, null=True)
     public_key = models.TextField(blank=True, help_text="PEM-encoded public key")
     private_key = models.TextField(blank=True, help_text="PEM-encoded private key (local only)")
@@ -133,3 +138,50 @@ class User(AbstractUser):
     def local(self) -> bool:
         """True if this user belongs to the local instance."""
         return not self.remote
+
+
+class FollowImportStatus(models.TextChoices):
+    """Progress of a follow import."""
+
+    PENDING = "PENDING", "En attente"
+    RUNNING = "RUNNING", "En cours"
+    DONE = "DONE", "Terminé"
+    FAILED = "FAILED", "Échec"
+
+
+class FollowImport(BaseModel):
+    """
+    One follow import (Mastodon CSV) and its progress.
+
+    Written by the import task (``suddenly/users/follow_import.py``) as
+    addresses resolve; the Data settings page polls it while it runs.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="follow_imports"
+    )
+    status = models.CharField(
+        max_length=10, choices=FollowImportStatus.choices, default=FollowImportStatus.PENDING
+    )
+    total = models.PositiveIntegerField(default=0, help_text="Addresses in the file")
+    processed = models.PositiveIntegerField(default=0)
+    imported = models.PositiveIntegerField(default=0, help_text="New follows created")
+    skipped = models.PositiveIntegerField(default=0, help_text="Already followed")
+    failed = models.PositiveIntegerField(default=0, help_text="Addresses that did not resolve")
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Import d'abonnements"
+        verbose_name_plural = "Imports d'abonnements"
+        ordering = ["-created_at"]
+
+    def __str__(self) -> str:
+        return f"{self.user} — {self.processed}/{self.total}"
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (FollowImportStatus.DONE, FollowImportStatus.FAILED)
+
+    @property
+    def percent(self) -> int:
+        return 100 if not self.total else min(100 * self.processed // self.total, 100)
@@ -19,7 +19,6 @@ from django.utils.translation import gettext as _
 
 from suddenly.core.types import AuthenticatedRequest
 from suddenly.users.forms import PreferencesForm
-from suddenly.users.models import User
 
 
 @login_required
@@ -33,6 +32,7 @@ def settings_stats(request: AuthenticatedRequest) -> HttpResponse:
     from django.utils import timezone
 
     from suddenly.core.achievements import achievements_view_model, evaluate_and_unlock
+    from suddenly.core.cache_invalidation import invalidate_account_badges
     from suddenly.core.models import UnlockedAchievement
     from suddenly.core.stats import compute_user_stats
 
@@ -42,9 +42,10 @@ def settings_stats(request: AuthenticatedRequest) -> HttpResponse:
     achievements = achievements_view_model(user, stats)
 
     # "Seen" = displayed on the Stats page (distinct from a read notification).
-    UnlockedAchievement.objects.filter(user=user, seen_at__isnull=True).update(
+    if UnlockedAchievement.objects.filter(user=user, seen_at__isnull=True).update(
         seen_at=timezone.now()
-    )
+    ):
+        invalidate_account_badges(user.pk)
 
     # Ordered (label, value) tiles — labels use the UI vocabulary (scènes/posts).
     stat_tiles = [
@@ -142,54 +143,65 @@ def export_follows_csv(request: AuthenticatedRequest) -> HttpResponse:
 def import_follows_csv(request: AuthenticatedRequest) -> HttpResponse:
     """Import follows from Mastodon-compatible CSV (US-32).
 
-    Resolves each address via WebFinger, creates or finds User,
-    then creates Follow relationship.
+    Queues the import and records it as a ``FollowImport``, whose progress the
+    page then polls (``follow_import_status``).
     """
     if request.method == "POST" and request.FILES.get("csv_file"):
         from django.core.files.uploadedfile import UploadedFile
 
+        from suddenly.users.models import FollowImport
+
         csv_file = request.FILES.get("csv_file")
         if not isinstance(csv_file, UploadedFile):
-            return render(request, "users/settings_data.html")
+            return render(request, "users/settings_data.html", _data_ctx(request))
         decoded = csv_file.read().decode("utf-8")
         reader = csv.DictReader(io.StringIO(decoded))
         addresses = [addr for row in reader if (addr := row.get("Account address", "").strip())]
 
         # Offload resolution: each address hits a remote WebFinger endpoint, so
-        # resolving inline would block the web worker for N × timeout. The task
-        # runs off-request; with no broker configured it degrades to eager (sync).
-        _queue_follow_import(str(request.user.pk), addresses)
+        # resolving inline would block the web worker. The task runs
+        # off-request; with no broker configured it degrades to eager (sync).
+        follow_import = FollowImport.objects.create(user=request.user, total=len(addresses))
+        _queue_follow_import(str(request.user.pk), addresses, str(follow_import.pk))
 
         return render(
             request,
             "users/settings_data.html",
-            {"import_queued": True, "import_count": len(addresses)},
+            {**_data_ctx(request), "import_queued": True, "import_count": len(addresses)},
         )
 
-    return render(request, "users/settings_data.html")
+    return render(request, "users/settings_data.html", _data_ctx(request))
 
 
-def _queue_follow_import(user_id: str, addresses: list[str]) -> None:
+def _queue_follow_import(user_id: str, addresses: list[str], import_id: str) -> None:
     """Enqueue the follow-import task, falling back to inline run if the broker is down."""
     from kombu.exceptions import KombuError  # type: ignore[import-untyped]
 
     from suddenly.users.tasks import import_follows_from_rows
 
     try:
-        import_follows_from_rows.delay(user_id, addresses)
+        import_follows_from_rows.delay(user_id, addresses, import_id)
     except (KombuError, ConnectionError, TimeoutError, OSError):
         # Broker configured but unreachable: run inline rather than drop the
         # import silently. Blocks this request, but only on broker failure.
-        import_follows_from_rows(user_id, addresses)
+        import_follows_from_rows(user_id, addresses, import_id)
+
+
+@login_required
+def follow_import_status(request: AuthenticatedRequest, pk: str) -> HttpResponse:
+    """Progress of one follow import — HTMX fragment polled while it runs."""
+    from django.shortcuts import get_object_or_404
+
+    from suddenly.users.models import FollowImport
+
+    follow_import = get_object_or_404(FollowImport, pk=pk, user=request.user)
+    return render(request, "users/_follow_import_status.html", {"follow_import": follow_import})
 
 
 @login_required
 def settings_data(request: AuthenticatedRequest) -> HttpResponse:
     """Data settings: export/import, migration (US-32)."""
-    from suddenly.games.models import Game
-
-    has_games = Game.objects.filter(owner=request.user, remote=False).exists()
-    return render(request, "users/settings_data.html", {"has_games": has_games})
+    return render(request, "users/settings_data.html", _data_ctx(request))
 
 
 @login_required
@@ -248,10 +260,14 @@ def export_characters(request: AuthenticatedRequest) -> FileResponse:
 
 
 def _data_ctx(request: AuthenticatedRequest) -> dict[str, object]:
-    """Base context for settings_data.html — resolves has_games once."""
+    """Base context for settings_data.html — resolves has_games and the last follow import."""
     from suddenly.games.models import Game
+    from suddenly.users.models import FollowImport
 
-    return {"has_games": Game.objects.filter(owner=request.user, remote=False).exists()}
+    return {
+        "has_games": Game.objects.filter(owner=request.user, remote=False).exists(),
+        "follow_import": FollowImport.objects.filter(user=request.user).first(),
+    }
 
 
 @login_required
@@ -437,59 +453,3 @@ def _get_domain() -> str:
     from django.conf import settings
 
     return getattr(settings, "DOMAIN", "localhost")
-
-
-def _resolve_and_follow(follower: User, address: str) -> bool:
-    """Resolve a @user@instance address and create Follow. Returns True on success."""
-    from django.contrib.contenttypes.models import ContentType
-
-    from suddenly.activitypub._http import fetch_ap_json
-    from suddenly.characters.models import Follow
-    from suddenly.users.models import User
-
-    # Parse address
-    address = address.lstrip("@")
-    parts = address.split("@")
-
-    if len(parts) == 1:
-        # Local user
-        target = User.objects.filter(username=parts[0], is_active=True, remote=False).first()
-    elif len(parts) == 2:
-        username, domain = parts
-        # Check if already known
-        target = User.objects.filter(ap_id__icontains=f"/{username}", remote=True).first()
-        if not target:
-            # WebFinger lookup — domain is user-supplied (CSV import), so the
-            # fetch must go through the SSRF-safe guard, never a raw httpx.Client.
-            url = f"https://{domain}/.well-known/webfinger?resource=acct:{address}"
-            data = fetch_ap_json(url, accept="application/jrd+json")
-            if not data:
-                return False
-
-            actor_url = None
-            for link in data.get("links", []):
-                if link.get("rel") == "self" and "activity" in link.get("type", ""):
-                    actor_url = link["href"]
-                    break
-
-            if not actor_url:
-                return False
-
-            # Create remote user (actor_url fetched via SSRF-safe fetch_ap_actor).
-            from suddenly.activitypub.tasks import get_or_create_remote_user
-
-            target = get_or_create_remote_user(actor_url)
-    else:
-        return False
-
-    if not target:
-        return False
-
-    # Create follow
-    ct = ContentType.objects.get_for_model(User)
-    _, created = Follow.objects.get_or_create(
-        follower=follower,
-        content_type=ct,
-        object_id=target.pk,
-    )
-    return created
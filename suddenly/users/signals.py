@@ -10,7 +10,7 @@ from allauth.account.signals import user_signed_up
 from django.conf import settings
 from django.dispatch import receiver
 
-from suddenly.activitypub.signatures import generate_key_pair
+from suddenly.activitypub.keypool import claim_key_pair
 from suddenly.users.models import User
 
 logger = logging.getLogger(__name__)
@@ -26,15 +26,14 @@ def initialize_activitypub_actor(
     Populate AP fields for a newly registered local user.
 
     Skips remote users (federated accounts created via AP ingestion).
-    Generates an RSA key pair and sets the canonical AP URLs.
+    Sets the canonical AP URLs, and a key pair unless the ``post_save``
+    handler already assigned one.
     """
     if user.remote:
         return
 
-    private_key, public_key = generate_key_pair()
-
-    user.private_key = private_key
-    user.public_key = public_key
+    if not user.private_key:
+        user.private_key, user.public_key = claim_key_pair()
     user.ap_id = f"{settings.AP_BASE_URL}/users/{user.username}"
     user.inbox_url = f"{user.ap_id}/inbox"
     user.outbox_url = f"{user.ap_id}/outbox"
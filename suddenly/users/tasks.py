@@ -10,35 +10,34 @@ logger = logging.getLogger(__name__)
 
 
 @shared_task  # type: ignore[untyped-decorator]
-def import_follows_from_rows(user_id: str, addresses: list[str]) -> dict[str, int]:
+def import_follows_from_rows(
+    user_id: str, addresses: list[str], import_id: str | None = None
+) -> dict[str, int]:
     """Resolve a batch of ``@user@instance`` addresses and create Follows off-request.
 
-    Runs outside the web request so a large CSV cannot tie up a web worker with N
-    sequential (blocking) WebFinger calls. Each address is resolved via the
-    SSRF-safe path in ``_resolve_and_follow``. Idempotent: ``get_or_create`` on
-    Follow makes re-runs no-ops. Returns counts for observability.
+    Runs outside the web request so a large CSV cannot tie up a web worker.
+    Addresses are resolved concurrently, grouped by domain, through the
+    SSRF-safe fetch path (``users.follow_import``); progress is written to the
+    ``FollowImport`` row `import_id` when given. Idempotent: follows that
+    already exist are skipped. Returns counts for observability.
     """
-    from suddenly.users.models import User
-    from suddenly.users.settings_views import _resolve_and_follow
+    from suddenly.users.follow_import import import_follows
+    from suddenly.users.models import FollowImport, User
 
     try:
         follower = User.objects.get(pk=user_id)
     except User.DoesNotExist:
         logger.warning("import_follows_from_rows: user %s not found", user_id)
-        return {"imported": 0, "errors": 0}
+        return {"imported": 0, "skipped": 0, "failed": 0}
 
-    imported = 0
-    errors = 0
-    for address in addresses:
-        if _resolve_and_follow(follower, address):
-            imported += 1
-        else:
-            errors += 1
+    record = FollowImport.objects.filter(pk=import_id, user=follower).first() if import_id else None
+    counts = import_follows(follower, addresses, record=record)
 
     logger.info(
-        "import_follows_from_rows: user=%s imported=%d errors=%d",
+        "import_follows_from_rows: user=%s imported=%d skipped=%d failed=%d",
         user_id,
-        imported,
-        errors,
+        counts["imported"],
+        counts["skipped"],
+        counts["failed"],
     )
-    return {"imported": imported, "errors": errors}
+    return counts
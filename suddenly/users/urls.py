@@ -14,6 +14,11 @@ urlpatterns = [
     path("settings/data/", settings_views.settings_data, name="settings_data"),
     path("settings/export-follows/", settings_views.export_follows_csv, name="export_follows"),
     path("settings/import-follows/", settings_views.import_follows_csv, name="import_follows"),
+    path(
+        "settings/import-follows/<uuid:pk>/status/",
+        settings_views.follow_import_status,
+        name="follow_import_status",
+    ),
     path("settings/export-games/", settings_views.export_games, name="export_games"),
     path("settings/export-characters/", settings_views.export_characters, name="export_characters"),
     path("settings/import-games/", settings_views.import_games, name="import_games"),
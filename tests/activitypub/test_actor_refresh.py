@@ -0,0 +1,223 @@
+"""
+Tests for the remote actor refresh engine (``activitypub.actor_refresh``).
+
+Due mirrors of every actor type are fetched conditionally in a bounded pool;
+only changed fields are written back, a 304 costs no write, failures are
+retried later and a rotated key drops the cached one. No network is hit.
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+import pytest
+from django.utils import timezone
+
+from suddenly.activitypub._http import RemoteDocument, fetch_ap_document
+from suddenly.activitypub.actor_refresh import refresh_remote_actors, stale_actors
+from suddenly.activitypub.models import PublicKeyCache, RemoteActorRefresh
+from suddenly.activitypub.tasks import refresh_remote_actors as refresh_task
+from suddenly.characters.models import Character
+from suddenly.games.models import Game
+from suddenly.users.models import User
+from tests.factories import CharacterFactory, GameFactory, UserFactory
+
+_FETCH = "suddenly.activitypub.actor_refresh.fetch_ap_document"
+
+
+def _actor(ap_id: str, name: str, **extra: Any) -> dict[str, Any]:
+    return {
+        "id": ap_id,
+        "name": name,
+        "summary": "",
+        "inbox": f"{ap_id}/inbox",
+        "outbox": f"{ap_id}/outbox",
+        "publicKey": {"id": f"{ap_id}#main-key", "publicKeyPem": "PEM"},
+        **extra,
+    }
+
+
+def _remote_user(ap_id: str = "https://masto.example/users/bob") -> User:
+    return UserFactory(
+        username="bob@masto.example",
+        remote=True,
+        ap_id=ap_id,
+        display_name="Bob",
+        bio="",
+        inbox_url=f"{ap_id}/inbox",
+        outbox_url=f"{ap_id}/outbox",
+        public_key="PEM",
+    )
+
+
+def _answers(documents: dict[str, RemoteDocument]) -> Any:
+    def fetch(url: str, **kwargs: Any) -> RemoteDocument:
+        return documents.get(url, RemoteDocument(0, None))
+
+    return fetch
+
+
+class TestConditionalFetch:
+    def test_sends_validators_and_returns_new_ones(self, mocker: Any) -> None:
+        url = "https://peer.example/users/bob"
+        mocker.patch("suddenly.activitypub._http._validate_and_pin", return_value=(url, {}, {}))
+        response = mocker.MagicMock(status_code=304, headers={"ETag": '"v2"'})
+        client = mocker.MagicMock()
+        client.__enter__.return_value.get.return_value = response
+        mocker.patch("httpx.Client", return_value=client)
+
+        document = fetch_ap_document(url, accept="application/activity+json", etag='"v1"')
+
+        headers = client.__enter__.return_value.get.call_args.kwargs["headers"]
+        assert headers["If-None-Match"] == '"v1"'
+        assert "If-Modified-Since" not in headers
+        assert document == RemoteDocument(304, None, '"v2"', "", "")
+        response.json.assert_not_called()
+
+
+@pytest.mark.django_db
+class TestSelection:
+    def test_all_actor_types_due_placeholders_skipped(self) -> None:
+        user = _remote_user()
+        game = GameFactory(remote=True, ap_id="https://peer.example/games/1")
+        GameFactory(remote=True, ap_id="https://peer.example")
+        character = CharacterFactory(remote=True, ap_id="https://peer.example/characters/1")
+        GameFactory(ap_id=None)
+
+        picked = {(s.actor_type, s.actor.pk) for s in stale_actors(10)}
+
+        assert picked == {("user", user.pk), ("game", game.pk), ("character", character.pk)}
+
+    def test_fresh_mirror_is_not_due(self) -> None:
+        user = _remote_user()
+        RemoteActorRefresh.objects.create(
+            ap_id=user.ap_id,
+            actor_type="user",
+            next_refresh_at=timezone.now() + timedelta(hours=1),
+        )
+
+        assert stale_actors(10) == []
+
+
+@pytest.mark.django_db
+class TestRefresh:
+    def test_updates_every_actor_type(self, mocker: Any) -> None:
+        user = _remote_user()
+        game = GameFactory(remote=True, ap_id="https://peer.example/games/1")
+        character = CharacterFactory(remote=True, ap_id="https://peer.example/characters/1")
+        mocker.patch(
+            _FETCH,
+            side_effect=_answers(
+                {
+                    user.ap_id: RemoteDocument(200, _actor(user.ap_id, "Robert")),
+                    game.ap_id: RemoteDocument(200, _actor(game.ap_id, "Campaign")),
+                    character.ap_id: RemoteDocument(200, _actor(character.ap_id, "Ayla")),
+                }
+            ),
+        )
+
+        stats = refresh_remote_actors()
+
+        assert (stats["fetched"], stats["updated"], stats["failed"]) == (3, 3, 0)
+        assert User.objects.get(pk=user.pk).display_name == "Robert"
+        game = Game.objects.get(pk=game.pk)
+        assert (game.title, game.inbox_url) == ("Campaign", f"{game.ap_id}/inbox")
+        assert Character.objects.get(pk=character.pk).name == "Ayla"
+        assert RemoteActorRefresh.objects.count() == 3
+
+    def test_only_changed_fields_are_written(self, mocker: Any) -> None:
+        user = _remote_user()
+        mocker.patch(
+            _FETCH,
+            return_value=RemoteDocument(200, _actor(user.ap_id, "Bob", summary="Hello")),
+        )
+        bulk_update = mocker.spy(User.objects, "bulk_update")
+
+        refresh_remote_actors()
+
+        assert bulk_update.call_args.args[1] == ["bio", "updated_at"]
+        assert User.objects.get(pk=user.pk).bio == "Hello"
+
+    def test_unchanged_document_writes_nothing(self, mocker: Any) -> None:
+        user = _remote_user()
+        before = User.objects.get(pk=user.pk).updated_at
+        mocker.patch(_FETCH, return_value=RemoteDocument(200, _actor(user.ap_id, "Bob"), "W/1"))
+
+        stats = refresh_remote_actors()
+
+        assert (stats["updated"], stats["unchanged"]) == (0, 1)
+        assert User.objects.get(pk=user.pk).updated_at == before
+        assert RemoteActorRefresh.objects.get().etag == "W/1"
+
+    def test_validators_sent_and_304_reschedules(self, mocker: Any) -> None:
+        user = _remote_user()
+        RemoteActorRefresh.objects.create(
+            ap_id=user.ap_id,
+            actor_type="user",
+            etag='"v1"',
+            last_modified="Tue, 01 Sep 2026 10:00:00 GMT",
+            next_refresh_at=timezone.now() - timedelta(minutes=1),
+        )
+        fetch = mocker.patch(_FETCH, return_value=RemoteDocument(304, None))
+
+        stats = refresh_remote_actors()
+
+        kwargs = fetch.call_args.kwargs
+        assert (kwargs["etag"], kwargs["last_modified"]) == (
+            '"v1"',
+            "Tue, 01 Sep 2026 10:00:00 GMT",
+        )
+        assert stats["unchanged"] == 1
+        row = RemoteActorRefresh.objects.get()
+        assert row.etag == '"v1"'
+        assert row.next_refresh_at > timezone.now() + timedelta(hours=23)
+
+    def test_failure_retried_later(self, mocker: Any, settings: Any) -> None:
+        settings.AP_ACTOR_REFRESH_RETRY_HOURS = 6
+        _remote_user()
+        mocker.patch(_FETCH, return_value=RemoteDocument(0, None))
+
+        assert refresh_remote_actors()["failed"] == 1
+        row = RemoteActorRefresh.objects.get()
+        assert row.failures == 1
+        assert row.next_refresh_at < timezone.now() + timedelta(hours=7)
+
+        RemoteActorRefresh.objects.update(next_refresh_at=timezone.now())
+        refresh_remote_actors()
+        assert RemoteActorRefresh.objects.get().failures == 2
+
+    def test_key_rotation_drops_cached_key(self, mocker: Any) -> None:
+        user = _remote_user()
+        PublicKeyCache.objects.create(actor_url=user.ap_id, public_key_pem="PEM")
+        rotated = _actor(user.ap_id, "Bob", publicKey={"publicKeyPem": "NEW"})
+        mocker.patch(_FETCH, return_value=RemoteDocument(200, rotated))
+        invalidate = mocker.patch("suddenly.activitypub.signatures.invalidate_cached_key")
+
+        refresh_remote_actors()
+
+        assert User.objects.get(pk=user.pk).public_key == "NEW"
+        assert not PublicKeyCache.objects.exists()
+        invalidate.assert_called_once_with(user.ap_id)
+
+    def test_runs_batches_until_nothing_due(self, mocker: Any, settings: Any) -> None:
+        settings.AP_ACTOR_REFRESH_BATCH = 2
+        for n in range(5):
+            GameFactory(remote=True, ap_id=f"https://peer.example/games/{n}")
+        fetch = mocker.patch(_FETCH, return_value=RemoteDocument(304, None))
+
+        stats = refresh_remote_actors()
+
+        assert (stats["fetched"], stats["backlog"]) == (5, 0)
+        assert fetch.call_count == 5
+
+    def test_task_queues_follow_up_for_backlog(self, mocker: Any) -> None:
+        mocker.patch(
+            "suddenly.activitypub.actor_refresh.refresh_remote_actors",
+            return_value={"fetched": 200, "backlog": 1},
+        )
+        follow_up = mocker.patch.object(refresh_task, "apply_async")
+
+        refresh_task()
+
+        follow_up.assert_called_once_with(countdown=5)
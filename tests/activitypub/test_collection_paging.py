@@ -0,0 +1,133 @@
+"""
+Tests for paged actor collections (``activitypub.paging``).
+
+Roots carry only ``totalItems`` and ``first``; items are reachable by walking
+``OrderedCollectionPage`` documents through ``next`` keyset cursors.
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+from urllib.parse import urlsplit
+
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.test import Client
+from django.utils import timezone
+
+from suddenly.activitypub.paging import COLLECTION_PAGE_SIZE, decode_cursor, encode_cursor
+from suddenly.characters.models import Follow
+from suddenly.core.models import InstanceSettings
+from suddenly.games.models import Game, Report
+from suddenly.users.models import User
+from tests.factories import UserFactory
+
+_AP = "application/activity+json"
+
+
+def _get(client: Client, url: str) -> dict[str, Any]:
+    parts = urlsplit(url)
+    path = f"{parts.path}?{parts.query}" if parts.query else parts.path
+    response = client.get(path, HTTP_ACCEPT=_AP)
+    assert response.status_code == 200
+    data: dict[str, Any] = response.json()
+    return data
+
+
+def _walk(client: Client, root_url: str) -> tuple[dict[str, Any], list[Any]]:
+    """Fetch the root, then every page; return (root, all items in order)."""
+    root = _get(client, root_url)
+    items: list[Any] = []
+    url: str | None = root["first"]
+    while url:
+        page = _get(client, url)
+        assert page["type"] == "OrderedCollectionPage"
+        assert page["partOf"] == root["id"]
+        assert len(page["orderedItems"]) <= COLLECTION_PAGE_SIZE
+        items.extend(page["orderedItems"])
+        url = page.get("next")
+    return root, items
+
+
+class TestCursor:
+    def test_round_trip(self) -> None:
+        import uuid
+
+        now = timezone.now()
+        pk = uuid.uuid4()
+
+        assert decode_cursor(encode_cursor(now, pk)) == (now, pk)
+
+
+@pytest.mark.django_db
+class TestPagedOutbox:
+    def test_root_has_no_items(self, client: Client, user: User, game: Game) -> None:
+        Report.objects.create(title="R", content="c", game=game, author=user, status="published")
+
+        root = _get(client, f"/users/{user.username}/outbox")
+
+        assert root["type"] == "OrderedCollection"
+        assert root["totalItems"] == 1
+        assert "orderedItems" not in root
+        assert "?page=true" in root["first"]
+
+    def test_walk_returns_every_report_once_newest_first(
+        self, client: Client, user: User, game: Game
+    ) -> None:
+        now = timezone.now()
+        count = COLLECTION_PAGE_SIZE * 2 + 5
+        for i in range(count):
+            report = Report.objects.create(
+                title=f"R{i}", content="c", game=game, author=user, status="published"
+            )
+            # Pairs share a timestamp so the id tie-break is exercised.
+            Report.objects.filter(pk=report.pk).update(published_at=now - timedelta(minutes=i // 2))
+
+        root, items = _walk(client, f"/games/{game.id}/outbox")
+
+        assert root["totalItems"] == count
+        ids = [item["object"]["id"] if "object" in item else item["id"] for item in items]
+        assert len(ids) == len(set(ids)) == count
+
+    def test_invalid_cursor_is_400(self, client: Client, user: User) -> None:
+        response = client.get(
+            f"/users/{user.username}/outbox?page=true&cursor=%%%", HTTP_ACCEPT=_AP
+        )
+
+        assert response.status_code == 400
+
+
+@pytest.mark.django_db
+class TestPagedFollowers:
+    def test_walk_followers_across_pages(self, client: Client, game: Game) -> None:
+        game_ct = ContentType.objects.get_for_model(Game)
+        followers = [UserFactory() for _ in range(COLLECTION_PAGE_SIZE + 3)]
+        for follower in followers:
+            Follow.objects.create(follower=follower, content_type=game_ct, object_id=game.pk)
+
+        root, items = _walk(client, f"/games/{game.id}/followers")
+
+        assert root["totalItems"] == len(followers)
+        assert sorted(items) == sorted(f.actor_url for f in followers)
+
+    def test_page_loads_one_page_of_rows(
+        self, client: Client, game: Game, django_assert_max_num_queries: Any
+    ) -> None:
+        game_ct = ContentType.objects.get_for_model(Game)
+        for follower in [UserFactory() for _ in range(COLLECTION_PAGE_SIZE * 3)]:
+            Follow.objects.create(follower=follower, content_type=game_ct, object_id=game.pk)
+        # The instance settings singleton is memoised: load it outside the budget.
+        InstanceSettings.get()
+
+        with django_assert_max_num_queries(4):
+            page = _get(client, f"/games/{game.id}/followers?page=true")
+
+        assert len(page["orderedItems"]) == COLLECTION_PAGE_SIZE
+        assert "next" in page
+
+    def test_character_outbox_page_is_empty(self, client: Client, character: Any) -> None:
+        root, items = _walk(client, f"/characters/{character.id}/outbox")
+
+        assert root["totalItems"] == 0
+        assert items == []
@@ -0,0 +1,110 @@
+"""
+Query-count regression tests for the actor collection pages.
+
+A page must cost a constant number of queries: serializing 10 items may not
+issue more queries than serializing 2 (``serialize_reports`` batches the
+report relations, follow lists load their actors with the page).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from suddenly.activitypub.serializers import serialize_report, serialize_reports
+from suddenly.characters.models import Character, CharacterAppearance, Follow
+from suddenly.core.models import InstanceSettings
+from suddenly.games.models import Game, Report
+from suddenly.users.models import User
+from tests.factories import CharacterFactory, GameFactory, UserFactory
+
+pytestmark = pytest.mark.django_db
+
+_AP = "application/activity+json"
+
+
+@pytest.fixture(autouse=True)
+def _instance_settings() -> None:
+    # Memoised on first use: loading it inside the baseline page would make
+    # the baseline one query heavier than the page it is compared with.
+    InstanceSettings.get()
+
+
+def _page_queries(client: Client, path: str) -> int:
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(f"{path}?page=true", HTTP_ACCEPT=_AP)
+    assert response.status_code == 200
+    return len(ctx.captured_queries)
+
+
+def _add_reports(author: User, game: Game, count: int) -> None:
+    for i in range(count):
+        report = Report.objects.create(
+            title=f"R{i}", content="c", game=game, author=author, status="published"
+        )
+        previous = Report.objects.filter(game=game).exclude(pk=report.pk).first()
+        Report.objects.filter(pk=report.pk).update(previous_report=previous)
+        for character in CharacterFactory.create_batch(2, origin_game=game):
+            CharacterAppearance.objects.create(character=character, report=report)
+
+
+def _add_followers(target: Any, count: int) -> None:
+    ct = ContentType.objects.get_for_model(type(target))
+    for follower in UserFactory.create_batch(count):
+        Follow.objects.create(follower=follower, content_type=ct, object_id=target.pk)
+
+
+def _assert_constant(
+    client: Client, path: str, grow: Callable[[int], None], small: int = 2, large: int = 10
+) -> None:
+    grow(small)
+    baseline = _page_queries(client, path)
+    grow(large - small)
+    assert _page_queries(client, path) == baseline
+
+
+class TestCollectionPageQueries:
+    def test_user_outbox(self, client: Client, user: User, game: Game) -> None:
+        _assert_constant(
+            client, f"/users/{user.username}/outbox", lambda n: _add_reports(user, game, n)
+        )
+
+    def test_game_outbox(self, client: Client, user: User, game: Game) -> None:
+        _assert_constant(client, f"/games/{game.id}/outbox", lambda n: _add_reports(user, game, n))
+
+    def test_user_followers(self, client: Client, user: User) -> None:
+        _assert_constant(
+            client, f"/users/{user.username}/followers", lambda n: _add_followers(user, n)
+        )
+
+    def test_game_followers(self, client: Client, game: Game) -> None:
+        _assert_constant(client, f"/games/{game.id}/followers", lambda n: _add_followers(game, n))
+
+    def test_character_followers(self, client: Client, character: Character) -> None:
+        _assert_constant(
+            client,
+            f"/characters/{character.id}/followers",
+            lambda n: _add_followers(character, n),
+        )
+
+    def test_user_following(self, client: Client, user: User) -> None:
+        def follow_more(n: int) -> None:
+            for target in GameFactory.create_batch(n):
+                ct = ContentType.objects.get_for_model(Game)
+                Follow.objects.create(follower=user, content_type=ct, object_id=target.pk)
+
+        _assert_constant(client, f"/users/{user.username}/following", follow_more)
+
+
+class TestSerializeReports:
+    def test_matches_single_serializer(self, user: User, game: Game) -> None:
+        _add_reports(user, game, 3)
+        reports = Report.objects.order_by("created_at")
+
+        assert serialize_reports(reports) == [serialize_report(r) for r in reports]
@@ -0,0 +1,169 @@
+"""
+Tests for per-host broadcast fan-out (shared inboxes, batched delivery tasks,
+pooled delivery client). No network is hit: the pooled client is patched.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from django.contrib.contenttypes.models import ContentType
+
+from suddenly.activitypub._http import get_delivery_client, shared_inbox_from_actor
+from suddenly.activitypub.models import OutboundActivity
+from suddenly.activitypub.outbound import store_activity
+from suddenly.activitypub.tasks import (
+    _group_inboxes_by_host,
+    broadcast_activity,
+    deliver_activity_batch,
+)
+from suddenly.characters.models import Follow
+from suddenly.users.models import User
+
+
+def _remote_follower(name: str, host: str, shared: bool) -> User:
+    return User.objects.create(
+        username=f"{name}@{host}",
+        remote=True,
+        ap_id=f"https://{host}/users/{name}",
+        inbox_url=f"https://{host}/users/{name}/inbox",
+        shared_inbox_url=f"https://{host}/inbox" if shared else None,
+    )
+
+
+class TestSharedInboxExtraction:
+    def test_reads_endpoints_shared_inbox(self) -> None:
+        data = {"endpoints": {"sharedInbox": "https://m.example/inbox"}}
+        assert shared_inbox_from_actor(data) == "https://m.example/inbox"
+
+    @pytest.mark.parametrize("data", [{}, {"endpoints": "x"}, {"endpoints": {"sharedInbox": 3}}])
+    def test_missing_or_malformed(self, data: dict[str, Any]) -> None:
+        assert shared_inbox_from_actor(data) is None
+
+
+class TestGroupInboxesByHost:
+    def test_groups_and_chunks(self) -> None:
+        urls = {f"https://a.example/users/{i}/inbox" for i in range(5)}
+        urls.add("https://b.example/inbox")
+
+        batches = _group_inboxes_by_host(urls, batch_size=2)
+
+        assert sorted(len(b) for b in batches) == [1, 1, 2, 2]
+        for batch in batches:
+            assert len({u.split("/")[2] for u in batch}) == 1
+
+
+@pytest.mark.django_db
+class TestBroadcastFanout:
+    def test_shared_inbox_dedup_and_one_task_per_host(self, user: User, mocker: Any) -> None:
+        """Followers behind a shared inbox collapse to one URL; one task per host."""
+        user_ct = ContentType.objects.get_for_model(User)
+        for i in range(3):
+            follower = _remote_follower(f"f{i}", "big.example", shared=True)
+            Follow.objects.create(follower=follower, content_type=user_ct, object_id=user.pk)
+        for i in range(2):
+            follower = _remote_follower(f"s{i}", "small.example", shared=False)
+            Follow.objects.create(follower=follower, content_type=user_ct, object_id=user.pk)
+        spy = mocker.patch("suddenly.activitypub.tasks.deliver_activity_batch.delay")
+
+        broadcast_activity({"type": "Create"}, str(user.pk), "User")
+
+        batches = sorted(call.kwargs["inbox_urls"] for call in spy.call_args_list)
+        assert batches == [
+            ["https://big.example/inbox"],
+            [
+                "https://small.example/users/s0/inbox",
+                "https://small.example/users/s1/inbox",
+            ],
+        ]
+        # One stored copy for every batch; no key material in the messages.
+        assert {call.kwargs["outbound_id"] for call in spy.call_args_list} == {
+            str(OutboundActivity.objects.get().pk)
+        }
+        assert all(set(call.kwargs) == {"outbound_id", "inbox_urls"} for call in spy.call_args_list)
+
+
+@pytest.mark.django_db
+class TestDeliverActivityBatch:
+    def _client(self, mocker: Any, statuses: list[int]) -> Any:
+        responses = []
+        for code in statuses:
+            response = mocker.MagicMock()
+            response.status_code = code
+            responses.append(response)
+        client = mocker.MagicMock()
+        client.post.side_effect = responses
+        mocker.patch("httpx.Client", return_value=client)
+        return client
+
+    def test_posts_each_inbox_over_one_client(self, mocker: Any) -> None:
+        client = self._client(mocker, [202, 202, 202])
+        inboxes = [f"https://a.example/users/{i}/inbox" for i in range(3)]
+
+        deliver_activity_batch(store_activity({"type": "Create"}, None), inboxes)
+
+        assert [c.args[0] for c in client.post.call_args_list] == inboxes
+
+    def test_transient_failure_requeues_single_inbox(self, mocker: Any) -> None:
+        self._client(mocker, [202, 503, 404])
+        spy = mocker.patch("suddenly.activitypub.tasks.deliver_activity.apply_async")
+        inboxes = [f"https://a.example/users/{i}/inbox" for i in range(3)]
+
+        deliver_activity_batch(store_activity({"type": "Create"}, None), inboxes)
+
+        spy.assert_called_once()
+        assert spy.call_args.kwargs["kwargs"]["inbox_url"] == inboxes[1]
+        assert spy.call_args.kwargs["queue"] == "fanout"
+
+    def test_soft_time_limit_requeues_unsent_inboxes(self, mocker: Any) -> None:
+        from celery.exceptions import SoftTimeLimitExceeded
+
+        client = self._client(mocker, [])
+        delivered = mocker.MagicMock(status_code=202)
+        client.post.side_effect = [delivered, SoftTimeLimitExceeded()]
+        spy = mocker.patch("suddenly.activitypub.tasks.deliver_activity_batch.delay")
+        retry = mocker.patch("suddenly.activitypub.tasks.deliver_activity.apply_async")
+        inboxes = [f"https://a.example/users/{i}/inbox" for i in range(4)]
+        outbound_id = store_activity({"type": "Create"}, None)
+
+        deliver_activity_batch(outbound_id, inboxes)
+
+        spy.assert_called_once_with(outbound_id=outbound_id, inbox_urls=inboxes[1:])
+        retry.assert_not_called()
+
+    def test_body_encoded_once_and_digest_matches_sent_bytes(self, mocker: Any, user: User) -> None:
+        import base64
+        import hashlib
+
+        from suddenly.activitypub import signatures
+
+        client = self._client(mocker, [202, 202, 202])
+        encode = mocker.patch.object(signatures, "encode_body", wraps=signatures.encode_body)
+        user.private_key, user.public_key = signatures.generate_key_pair()
+        user.save(update_fields=["private_key", "public_key"])
+        inboxes = [f"https://a.example/users/{i}/inbox" for i in range(3)]
+        outbound_id = store_activity(
+            {"type": "Create", "content": "Scène — été"}, f"{user.actor_url}#main-key"
+        )
+
+        deliver_activity_batch(outbound_id, inboxes)
+
+        encode.assert_called_once()
+        sent = [c.kwargs["content"] for c in client.post.call_args_list]
+        assert sent[0] == sent[1] == sent[2]
+        expected = "SHA-256=" + base64.b64encode(hashlib.sha256(sent[0]).digest()).decode()
+        headers = [c.kwargs["headers"] for c in client.post.call_args_list]
+        assert {h["Digest"] for h in headers} == {expected}
+        assert all("digest" in h["Signature"] for h in headers)
+
+
+class TestPooledClient:
+    def test_client_reused_within_process(self, mocker: Any) -> None:
+        factory = mocker.patch("httpx.Client")
+
+        first = get_delivery_client()
+        second = get_delivery_client()
+
+        assert first is second
+        factory.assert_called_once()
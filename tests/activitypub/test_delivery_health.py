@@ -0,0 +1,212 @@
+"""
+Tests for outbound delivery health and the circuit breaker
+(``activitypub.delivery_health``).
+
+Failures open an instance's circuit; deliveries to an open circuit are parked
+without a request; after the cooldown one probe goes through, and its
+success replays what was parked. No network is hit: ``_post_activity`` is
+patched.
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+import httpx
+import pytest
+from celery.exceptions import Retry
+from django.core.cache import cache
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from suddenly.activitypub.delivery_health import probe_open_circuits
+from suddenly.activitypub.domains import is_circuit_open
+from suddenly.activitypub.models import CircuitState, FederatedServer, ParkedDelivery
+from suddenly.activitypub.outbound import store_activity
+from suddenly.activitypub.tasks import deliver_activity, deliver_activity_batch
+from suddenly.users.models import User
+from tests.factories import UserFactory
+
+_INBOX = "https://down.example/users/bob/inbox"
+
+
+def _respond(mocker: Any, *statuses: int) -> Any:
+    responses = []
+    for code in statuses:
+        response = mocker.MagicMock()
+        response.status_code = code
+        responses.append(response)
+    return mocker.patch("suddenly.activitypub.tasks._post_activity", side_effect=responses)
+
+
+def _stored(user: User | None = None) -> str:
+    key_id = f"{user.actor_url}#main-key" if user else None
+    return store_activity({"type": "Create"}, key_id)
+
+
+def _deliver(user: User, inbox_url: str = _INBOX) -> None:
+    deliver_activity.apply(kwargs={"outbound_id": _stored(user), "inbox_url": inbox_url})
+
+
+def _open_circuit(retry_in: timedelta) -> FederatedServer:
+    return FederatedServer.objects.create(
+        server_name="down.example",
+        circuit_state=CircuitState.OPEN,
+        circuit_retry_at=timezone.now() + retry_in,
+        consecutive_failures=5,
+    )
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache() -> None:
+    cache.clear()
+
+
+@pytest.mark.django_db
+class TestCircuitOpening:
+    def test_failures_below_threshold_retry(self, mocker: Any, user: User) -> None:
+        _respond(mocker, 503)
+        retry = mocker.patch.object(deliver_activity, "retry", side_effect=Retry())
+
+        # Called directly: ``apply()`` would swallow the Retry into the result.
+        with pytest.raises(Retry):
+            deliver_activity(outbound_id=_stored(user), inbox_url=_INBOX)
+
+        retry.assert_called_once()
+        server = FederatedServer.objects.get(server_name="down.example")
+        assert (server.delivery_failures, server.consecutive_failures) == (1, 1)
+        assert server.last_delivery_error == "HTTP 503"
+        assert server.circuit_state == CircuitState.CLOSED
+        assert not is_circuit_open("down.example")
+        assert not ParkedDelivery.objects.exists()
+
+    def test_threshold_opens_circuit_and_parks(
+        self, mocker: Any, settings: Any, user: User
+    ) -> None:
+        settings.AP_CIRCUIT_FAILURE_THRESHOLD = 1
+        mocker.patch(
+            "suddenly.activitypub.tasks._post_activity",
+            side_effect=httpx.ConnectError("refused"),
+        )
+        retry = mocker.patch.object(deliver_activity, "retry")
+
+        _deliver(user)
+
+        retry.assert_not_called()
+        server = FederatedServer.objects.get(server_name="down.example")
+        assert server.circuit_state == CircuitState.OPEN
+        assert server.last_delivery_error.startswith("ConnectError")
+        assert ParkedDelivery.objects.get().inbox_url == _INBOX
+        assert is_circuit_open("down.example")
+
+    def test_success_resets_streak(self, mocker: Any, user: User) -> None:
+        FederatedServer.objects.create(server_name="down.example", consecutive_failures=3)
+        _respond(mocker, 404)
+
+        _deliver(user)
+
+        server = FederatedServer.objects.get()
+        assert (server.delivery_successes, server.consecutive_failures) == (1, 0)
+
+
+@pytest.mark.django_db
+class TestOpenCircuit:
+    def test_delivery_parked_without_request(self, mocker: Any, user: User) -> None:
+        _open_circuit(timedelta(minutes=5))
+        post = _respond(mocker)
+
+        _deliver(user)
+        deliver_activity_batch(
+            _stored(user), ["https://down.example/a/inbox", "https://down.example/b/inbox"]
+        )
+
+        post.assert_not_called()
+        assert ParkedDelivery.objects.count() == 3
+
+    def test_successful_probe_closes_and_replays(self, mocker: Any, user: User) -> None:
+        server = _open_circuit(timedelta(minutes=5))
+        for name in ("a", "b"):
+            ParkedDelivery.objects.create(
+                server=server,
+                inbox_url=f"https://down.example/{name}/inbox",
+                outbound_id=_stored(user),
+            )
+        FederatedServer.objects.filter(pk=server.pk).update(
+            circuit_retry_at=timezone.now() - timedelta(seconds=1)
+        )
+        post = _respond(mocker, 202, 202, 202)
+
+        _deliver(user)
+
+        server.refresh_from_db()
+        assert server.circuit_state == CircuitState.CLOSED
+        assert not ParkedDelivery.objects.exists()
+        assert [c.args[1] for c in post.call_args_list] == [
+            _INBOX,
+            "https://down.example/a/inbox",
+            "https://down.example/b/inbox",
+        ]
+
+    def test_failed_probe_reopens(self, mocker: Any, user: User) -> None:
+        server = _open_circuit(-timedelta(seconds=1))
+        _respond(mocker, 502)
+
+        _deliver(user)
+
+        server.refresh_from_db()
+        assert server.circuit_state == CircuitState.OPEN
+        assert server.circuit_retry_at is not None
+        assert server.circuit_retry_at > timezone.now()
+        assert ParkedDelivery.objects.count() == 1
+
+
+@pytest.mark.django_db
+class TestProbeOpenCircuits:
+    def test_sends_oldest_parked_delivery(self, mocker: Any, user: User) -> None:
+        server = _open_circuit(-timedelta(seconds=1))
+        for name in ("first", "second"):
+            ParkedDelivery.objects.create(
+                server=server,
+                inbox_url=f"https://down.example/{name}/inbox",
+                outbound_id=_stored(user),
+            )
+        post = _respond(mocker, 202, 202)
+
+        assert probe_open_circuits() == 1
+
+        assert post.call_args_list[0].args[1] == "https://down.example/first/inbox"
+        server.refresh_from_db()
+        assert server.circuit_state == CircuitState.CLOSED
+        assert not ParkedDelivery.objects.exists()
+
+    def test_expires_old_parked_deliveries(self, settings: Any) -> None:
+        settings.AP_CIRCUIT_PARK_DAYS = 7
+        server = _open_circuit(timedelta(minutes=5))
+        parked = ParkedDelivery.objects.create(
+            server=server, inbox_url=_INBOX, outbound_id=_stored()
+        )
+        ParkedDelivery.objects.filter(pk=parked.pk).update(
+            created_at=timezone.now() - timedelta(days=8)
+        )
+
+        assert probe_open_circuits() == 0
+        assert not ParkedDelivery.objects.exists()
+
+
+@pytest.mark.django_db
+def test_instances_page_shows_delivery_health() -> None:
+    server = _open_circuit(timedelta(minutes=5))
+    FederatedServer.objects.filter(pk=server.pk).update(
+        delivery_failures=12, last_delivery_error="HTTP 503"
+    )
+    ParkedDelivery.objects.create(server=server, inbox_url=_INBOX, outbound_id=_stored())
+    client = Client()
+    client.force_login(UserFactory(is_admin=True))
+
+    response = client.get(reverse("gmh:instances"))
+
+    assert response.status_code == 200
+    assert response.context["instances"][0].parked == 1
+    assert b"HTTP 503" in response.content
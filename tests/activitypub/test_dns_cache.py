@@ -0,0 +1,106 @@
+"""
+Tests for the resolver cache behind SSRF-pinned fetches (``activitypub._http``).
+
+A host is resolved once per TTL; failures are cached for a shorter time; the
+cached addresses still go through the block list and are the ones pinned.
+"""
+
+from __future__ import annotations
+
+import socket
+from typing import Any
+
+import pytest
+
+from suddenly.activitypub._http import (
+    _validate_and_pin,
+    dns_cache_stats,
+    fetch_ap_actor,
+    resolve_host,
+)
+
+
+def _answer(*ips: str) -> list[tuple[Any, ...]]:
+    return [(2, 1, 6, "", (ip, 0)) for ip in ips]
+
+
+class TestResolveHost:
+    def test_second_lookup_served_from_cache(self, mocker: Any) -> None:
+        lookup = mocker.patch(
+            "suddenly.activitypub._http.socket.getaddrinfo",
+            return_value=_answer("93.184.216.34", "93.184.216.34", "93.184.216.35"),
+        )
+
+        assert resolve_host("Peer.Example") == ("93.184.216.34", "93.184.216.35")
+        assert resolve_host("peer.example") == ("93.184.216.34", "93.184.216.35")
+
+        lookup.assert_called_once()
+        assert dns_cache_stats() == {"hits": 1, "misses": 1, "size": 1}
+
+    def test_entries_expire(self, mocker: Any, settings: Any) -> None:
+        settings.AP_DNS_CACHE_TTL = 60
+        lookup = mocker.patch(
+            "suddenly.activitypub._http.socket.getaddrinfo", return_value=_answer("93.184.216.34")
+        )
+        clock = mocker.patch("suddenly.activitypub._http.time.monotonic", return_value=1000.0)
+
+        resolve_host("peer.example")
+        clock.return_value = 1059.0
+        resolve_host("peer.example")
+        clock.return_value = 1061.0
+        resolve_host("peer.example")
+
+        assert lookup.call_count == 2
+
+    def test_failure_cached_for_negative_ttl(self, mocker: Any, settings: Any) -> None:
+        settings.AP_DNS_NEGATIVE_TTL = 30
+        lookup = mocker.patch(
+            "suddenly.activitypub._http.socket.getaddrinfo", side_effect=socket.gaierror
+        )
+        clock = mocker.patch("suddenly.activitypub._http.time.monotonic", return_value=1000.0)
+
+        assert resolve_host("gone.example") == ()
+        assert resolve_host("gone.example") == ()
+        clock.return_value = 1031.0
+        assert resolve_host("gone.example") == ()
+
+        assert lookup.call_count == 2
+
+    def test_size_bounded(self, mocker: Any, settings: Any) -> None:
+        settings.AP_DNS_CACHE_SIZE = 2
+        lookup = mocker.patch(
+            "suddenly.activitypub._http.socket.getaddrinfo", return_value=_answer("93.184.216.34")
+        )
+
+        for host in ("a.example", "b.example", "c.example", "a.example"):
+            resolve_host(host)
+
+        assert lookup.call_count == 4
+        assert dns_cache_stats()["size"] == 2
+
+
+class TestPinningWithCache:
+    def test_cached_address_is_pinned(self, mocker: Any) -> None:
+        lookup = mocker.patch(
+            "suddenly.activitypub._http.socket.getaddrinfo", return_value=_answer("93.184.216.34")
+        )
+
+        first = _validate_and_pin("https://peer.example/users/bob")
+        second = _validate_and_pin("https://peer.example:8443/inbox")
+
+        lookup.assert_called_once()
+        assert first is not None and second is not None
+        assert first[0] == "https://93.184.216.34/users/bob"
+        assert second[0] == "https://93.184.216.34:8443/inbox"
+        assert second[1] == {"Host": "peer.example:8443"}
+        assert second[2] == {"sni_hostname": "peer.example"}
+
+    @pytest.mark.parametrize("ip", ["127.0.0.1", "10.0.0.5"])
+    def test_cached_blocked_address_stays_blocked(self, mocker: Any, ip: str) -> None:
+        mocker.patch("suddenly.activitypub._http.socket.getaddrinfo", return_value=_answer(ip))
+        mock_client = mocker.patch("httpx.Client")
+
+        assert fetch_ap_actor("https://evil.example/actor") is None
+        assert fetch_ap_actor("https://evil.example/actor") is None
+
+        mock_client.assert_not_called()
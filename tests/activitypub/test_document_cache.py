@@ -0,0 +1,143 @@
+"""
+Tests for the rendered-JSON document cache (``document_cache``).
+
+Repeated actor and first-outbox-page fetches are served from the cache with
+ETag/Last-Modified validators (304 on a match); saves invalidate them.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from suddenly.characters.models import Character
+from suddenly.games.models import Game, Report
+from suddenly.users.models import User
+from tests.factories import GameFactory
+
+_AP = "application/activity+json"
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache() -> None:
+    cache.clear()
+
+
+def _fetch(client: Client, path: str, **headers: Any) -> Any:
+    return client.get(path, HTTP_ACCEPT=_AP, **headers)
+
+
+class TestActorDocuments:
+    @pytest.mark.parametrize("kind", ["user", "game", "character"])
+    def test_repeat_fetch_skips_database(
+        self, client: Client, user: User, game: Game, character: Character, kind: str
+    ) -> None:
+        path = {
+            "user": f"/users/{user.username}",
+            "game": f"/games/{game.id}",
+            "character": f"/characters/{character.id}",
+        }[kind]
+        first = _fetch(client, path)
+
+        with CaptureQueriesContext(connection) as ctx:
+            second = _fetch(client, path)
+
+        assert second.status_code == 200
+        assert second.content == first.content
+        assert second["ETag"] == first["ETag"]
+        assert [q["sql"] for q in ctx.captured_queries if "django_cache" not in q["sql"]] == []
+
+    def test_if_none_match_returns_304(self, client: Client, user: User) -> None:
+        etag = _fetch(client, f"/users/{user.username}")["ETag"]
+
+        response = _fetch(client, f"/users/{user.username}", HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+        assert response.content == b""
+
+    def test_if_modified_since_returns_304(self, client: Client, user: User) -> None:
+        last_modified = _fetch(client, f"/users/{user.username}")["Last-Modified"]
+
+        response = _fetch(client, f"/users/{user.username}", HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        assert response.status_code == 304
+
+    def test_save_invalidates(self, client: Client, user: User) -> None:
+        _fetch(client, f"/users/{user.username}")
+        user.display_name = "Renamed"
+        user.save()
+
+        assert _fetch(client, f"/users/{user.username}").json()["name"] == "Renamed"
+
+    def test_private_game_not_served_from_cache(self, client: Client, game: Game) -> None:
+        _fetch(client, f"/games/{game.id}")
+        game.is_public = False
+        game.save()
+
+        assert _fetch(client, f"/games/{game.id}").status_code == 404
+
+    def test_missing_actor_is_404(self, client: Client, db: Any) -> None:
+        assert _fetch(client, "/users/nobody").status_code == 404
+
+
+class TestOutboxFirstPage:
+    def test_cached_until_report_saved(self, client: Client, user: User, game: Game) -> None:
+        path = f"/games/{game.id}/outbox?page=true"
+        assert _fetch(client, path).json()["orderedItems"] == []
+
+        with CaptureQueriesContext(connection) as ctx:
+            _fetch(client, path)
+        assert [q["sql"] for q in ctx.captured_queries if "django_cache" not in q["sql"]] == []
+
+        Report.objects.create(title="R", content="c", game=game, author=user, status="published")
+
+        assert len(_fetch(client, path).json()["orderedItems"]) == 1
+        assert (
+            len(_fetch(client, f"/users/{user.username}/outbox?page=true").json()["orderedItems"])
+            == 1
+        )
+
+    def test_report_keeps_other_actors_pages(self, client: Client, user: User, game: Game) -> None:
+        other = GameFactory()
+        path = f"/games/{other.id}/outbox?page=true"
+        _fetch(client, path)
+
+        Report.objects.create(title="R", content="c", game=game, author=user, status="published")
+
+        with CaptureQueriesContext(connection) as ctx:
+            _fetch(client, path)
+        assert [q["sql"] for q in ctx.captured_queries if "django_cache" not in q["sql"]] == []
+
+    def test_game_visibility_retires_member_outbox(
+        self, client: Client, user: User, game: Game
+    ) -> None:
+        Report.objects.create(title="R", content="c", game=game, author=user, status="published")
+        path = f"/users/{user.username}/outbox?page=true"
+        assert len(_fetch(client, path).json()["orderedItems"]) == 1
+
+        game.is_public = False
+        game.save()
+
+        assert _fetch(client, path).json()["orderedItems"] == []
+
+    def test_remote_report_bumps_nothing(self, mocker: Any, user: User, game: Game) -> None:
+        bump = mocker.patch("suddenly.activitypub.document_cache.invalidate_outbox_pages")
+
+        Report.objects.create(
+            title="R",
+            content="c",
+            game=game,
+            author=user,
+            status="published",
+            remote=True,
+            ap_id="https://peer.example/reports/1",
+        )
+
+        bump.assert_not_called()
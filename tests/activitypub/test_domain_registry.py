@@ -0,0 +1,111 @@
+"""
+Tests for the federation domain registry (``activitypub.domains``).
+
+One cached snapshot answers "known / Suddenly / blocked" for every federation
+path; ``FederatedServer`` saves retire it. The inbox refuses a blocked
+instance before signature verification.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from suddenly.activitypub.domains import (
+    is_blocked_domain,
+    is_known_domain,
+    is_known_non_suddenly_domain,
+    is_suddenly_domain,
+)
+from suddenly.activitypub.models import FederatedServer, ServerStatus
+from suddenly.users.models import User
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache() -> None:
+    cache.clear()
+
+
+@pytest.mark.django_db
+class TestDomainRegistry:
+    def test_sets_reflect_federated_servers(self) -> None:
+        FederatedServer.objects.create(server_name="masto.example", application_type="mastodon")
+        FederatedServer.objects.create(server_name="sud.example", application_type="suddenly")
+        FederatedServer.objects.create(server_name="bad.example", status=ServerStatus.BLOCKED)
+
+        assert is_known_domain("masto.example")
+        assert not is_known_domain("never.example")
+        assert is_suddenly_domain("sud.example")
+        assert not is_suddenly_domain("masto.example")
+        assert is_blocked_domain("bad.example")
+        assert not is_blocked_domain("masto.example")
+        assert is_known_non_suddenly_domain("masto.example")
+        assert not is_known_non_suddenly_domain("sud.example")
+        assert not is_known_non_suddenly_domain("never.example")
+
+    def test_lookup_ignores_case_and_port(self) -> None:
+        FederatedServer.objects.create(server_name="bad.example", status=ServerStatus.BLOCKED)
+        assert is_blocked_domain("Bad.Example:8443")
+
+    def test_repeat_lookups_do_not_query(self) -> None:
+        FederatedServer.objects.create(server_name="masto.example")
+        is_known_domain("masto.example")
+
+        with CaptureQueriesContext(connection) as ctx:
+            for _ in range(10):
+                is_known_domain("masto.example")
+                is_blocked_domain("other.example")
+
+        assert len(ctx.captured_queries) == 0
+
+    def test_save_invalidates(self) -> None:
+        server = FederatedServer.objects.create(server_name="soon-bad.example")
+        assert not is_blocked_domain("soon-bad.example")
+
+        server.status = ServerStatus.BLOCKED
+        server.save(update_fields=["status", "updated_at"])
+        assert is_blocked_domain("soon-bad.example")
+
+        server.delete()
+        assert not is_known_domain("soon-bad.example")
+
+
+@pytest.mark.django_db
+class TestInboxBlockGate:
+    def test_blocked_instance_refused_before_signature(
+        self, client: Client, user: User, mocker: Any
+    ) -> None:
+        FederatedServer.objects.create(server_name="bad.example", status=ServerStatus.BLOCKED)
+        verify = mocker.patch("suddenly.activitypub.inbox.verify_signature")
+        rate_limit = mocker.patch("suddenly.activitypub.inbox._check_rate_limit")
+
+        response = client.post(
+            f"/users/{user.username}/inbox",
+            data=json.dumps({"type": "Follow", "actor": "https://bad.example/actor"}),
+            content_type="application/activity+json",
+            HTTP_SIGNATURE='keyId="https://bad.example/actor#main-key"',
+        )
+
+        assert response.status_code == 403
+        verify.assert_not_called()
+        rate_limit.assert_not_called()
+
+    def test_shared_inbox_refuses_blocked_instance(self, client: Client, mocker: Any) -> None:
+        FederatedServer.objects.create(server_name="bad.example", status=ServerStatus.BLOCKED)
+        verify = mocker.patch("suddenly.activitypub.inbox.verify_signature")
+
+        response = client.post(
+            "/inbox",
+            data=json.dumps({"type": "Create", "actor": "https://bad.example/actor"}),
+            content_type="application/activity+json",
+            HTTP_SIGNATURE='keyId="https://bad.example/actor#main-key"',
+        )
+
+        assert response.status_code == 403
+        verify.assert_not_called()
@@ -17,6 +17,7 @@ from __future__ import annotations
 
 from typing import Any
 from unittest.mock import patch
+from urllib.parse import urlsplit
 
 import pytest
 from django.contrib.contenttypes.models import ContentType
@@ -691,6 +692,15 @@ class TestRemoteProfileEnrichment:
 # ─── AP-JSON collection endpoints (review finding #3 — no permanent test) ──
 
 
+def _first_page(client: Client, collection: dict[str, Any]) -> dict[str, Any]:
+    """Follow the collection root's `first` link (items are served in pages)."""
+    parts = urlsplit(collection["first"])
+    response = client.get(f"{parts.path}?{parts.query}")
+    assert response.status_code == 200
+    page: dict[str, Any] = response.json()
+    return page
+
+
 class TestActivityPubCollectionEndpoints:
     """`activitypub.views.user_following`/`game_followers`/`character_followers`.
 
@@ -711,7 +721,7 @@ class TestActivityPubCollectionEndpoints:
         data = response.json()
         assert data["type"] == "OrderedCollection"
         assert data["totalItems"] == 1
-        assert data["orderedItems"] == [target.actor_url]
+        assert _first_page(client, data)["orderedItems"] == [target.actor_url]
 
     def test_user_following_empty_reports_zero_total(self, client: Client) -> None:
         follower = UserFactory()
@@ -722,7 +732,7 @@ class TestActivityPubCollectionEndpoints:
         data = response.json()
         assert data["type"] == "OrderedCollection"
         assert data["totalItems"] == 0
-        assert data["orderedItems"] == []
+        assert _first_page(client, data)["orderedItems"] == []
 
     def test_game_followers_returns_ordered_collection(self, client: Client) -> None:
         game = GameFactory()
@@ -739,7 +749,8 @@ class TestActivityPubCollectionEndpoints:
         data = response.json()
         assert data["type"] == "OrderedCollection"
         assert data["totalItems"] == 2
-        assert set(data["orderedItems"]) == {follower1.actor_url, follower2.actor_url}
+        page = _first_page(client, data)
+        assert set(page["orderedItems"]) == {follower1.actor_url, follower2.actor_url}
 
     def test_character_followers_returns_ordered_collection(self, client: Client) -> None:
         character = CharacterFactory()
@@ -754,4 +765,4 @@ class TestActivityPubCollectionEndpoints:
         data = response.json()
         assert data["type"] == "OrderedCollection"
         assert data["totalItems"] == 1
-        assert data["orderedItems"] == [follower.actor_url]
+        assert _first_page(client, data)["orderedItems"] == [follower.actor_url]
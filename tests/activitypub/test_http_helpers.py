@@ -4,8 +4,8 @@ Regression tests for the canonical federation-core helpers in ``_http.py``
 
 Covers the three risks flagged in the plan's risk register:
 - remote-user ingest is idempotent (no duplicate row, no re-fetch on replay)
-- ``sign_and_deliver`` hands ``deliver_activity.delay`` the exact same
-  keyword-argument contract as before the refactor (unchanged headers/signature)
+- ``sign_and_deliver`` hands ``deliver_activity.delay`` a keyword-only
+  reference to the stored activity and its signer (no private key in the queue)
 - an unusually long remote handle truncates instead of raising ``DataError``
 """
 
@@ -16,6 +16,7 @@ from typing import Any
 import pytest
 
 from suddenly.activitypub._http import get_or_create_remote_user, sign_and_deliver
+from suddenly.activitypub.models import OutboundActivity
 from tests.factories import UserFactory
 
 
@@ -52,7 +53,7 @@ class TestGetOrCreateRemoteUserIdempotent:
 
 @pytest.mark.django_db
 class TestSignAndDeliverSpy:
-    def test_calls_deliver_activity_with_unchanged_signed_kwargs(self, mocker: Any) -> None:
+    def test_queues_stored_activity_without_private_key(self, mocker: Any) -> None:
         # UserFactory doesn't trigger `user_signed_up` (allauth-only signal, see
         # `suddenly/users/signals.py`), so the private key must be set directly.
         signer = UserFactory(private_key="TEST-PRIVATE-KEY-PEM-DATA")
@@ -74,10 +75,11 @@ class TestSignAndDeliverSpy:
 
         assert len(captured_calls) == 1
         call_kwargs = captured_calls[0]
-        assert call_kwargs["activity"] == activity
+        assert set(call_kwargs) == {"outbound_id", "inbox_url"}
         assert call_kwargs["inbox_url"] == inbox_url
-        assert call_kwargs["actor_key_id"] == f"{signer.actor_url}#main-key"
-        assert call_kwargs["private_key_pem"] == signer.private_key
+        stored = OutboundActivity.objects.get(pk=call_kwargs["outbound_id"])
+        assert stored.activity == activity
+        assert stored.signer_key_id == f"{signer.actor_url}#main-key"
 
     def test_no_op_when_inbox_url_falsy(self, mocker: Any) -> None:
         signer = UserFactory()
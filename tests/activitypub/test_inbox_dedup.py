@@ -0,0 +1,92 @@
+"""
+Tests for the inbox dedup store (``activitypub.dedup``).
+
+A cache "recently seen" set answers duplicates before the database; the
+``ProcessedActivity`` table stays authoritative and is purged past the
+retention window.
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from django.db import DataError, connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from suddenly.activitypub.dedup import claim_activity, purge_processed_activities
+from suddenly.activitypub.models import ProcessedActivity
+
+_AP_ID = "https://remote.example/activities/dedup-1"
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache() -> None:
+    cache.clear()
+
+
+@pytest.mark.django_db
+class TestClaimActivity:
+    def test_first_claim_records_row(self) -> None:
+        assert claim_activity(_AP_ID, "remote.example") is True
+        row = ProcessedActivity.objects.get()
+        assert (row.ap_id, row.actor_domain) == (_AP_ID, "remote.example")
+
+    def test_cached_duplicate_rejected_without_query(self) -> None:
+        claim_activity(_AP_ID, "remote.example")
+
+        with CaptureQueriesContext(connection) as ctx:
+            assert claim_activity(_AP_ID, "remote.example") is False
+
+        assert not [q for q in ctx.captured_queries if "processed" in q["sql"].lower()]
+
+    def test_database_answers_after_cache_loss(self) -> None:
+        claim_activity(_AP_ID, "remote.example")
+        cache.clear()
+
+        assert claim_activity(_AP_ID, "remote.example") is False
+        assert ProcessedActivity.objects.count() == 1
+
+    def test_failed_insert_releases_cache_claim(self) -> None:
+        with (
+            patch.object(ProcessedActivity.objects, "create", side_effect=DataError("boom")),
+            pytest.raises(DataError),
+        ):
+            claim_activity(_AP_ID, "remote.example")
+
+        # The retry is processed, not dropped as a duplicate.
+        assert claim_activity(_AP_ID, "remote.example") is True
+        assert ProcessedActivity.objects.count() == 1
+
+
+@pytest.mark.django_db
+class TestPurgeProcessedActivities:
+    def _row(self, ap_id: str, age_days: int) -> ProcessedActivity:
+        row = ProcessedActivity.objects.create(ap_id=ap_id, actor_domain="remote.example")
+        ProcessedActivity.objects.filter(pk=row.pk).update(
+            created_at=timezone.now() - timedelta(days=age_days)
+        )
+        return row
+
+    def test_purges_only_rows_past_retention(self, settings: Any) -> None:
+        settings.AP_DEDUP_RETENTION_DAYS = 30
+        old = [self._row(f"https://remote.example/old/{i}", 31) for i in range(5)]
+        recent = self._row("https://remote.example/recent", 2)
+
+        deleted = purge_processed_activities(chunk_size=2)
+
+        assert deleted == len(old)
+        assert list(ProcessedActivity.objects.values_list("pk", flat=True)) == [recent.pk]
+
+    def test_task_runs_purge(self, settings: Any) -> None:
+        from suddenly.activitypub.tasks import purge_processed_activities as purge_task
+
+        settings.AP_DEDUP_RETENTION_DAYS = 1
+        self._row("https://remote.example/old", 3)
+
+        assert purge_task() == 1
+        assert not ProcessedActivity.objects.exists()
@@ -0,0 +1,183 @@
+"""
+Tests for the queued inbox pipeline (``AP_INBOX_ASYNC``).
+
+The request only validates and stores the activity; dispatch happens in
+``inbox_queue.run_inbound_activity`` (Celery task or local worker command),
+with retry bookkeeping and a per-domain concurrency cap. No network is hit.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import timedelta
+from typing import Any
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client
+from django.utils import timezone
+
+from suddenly.activitypub.inbox_queue import (
+    InboundDomainBusyError,
+    drain_inbound_queue,
+    enqueue_inbound_activity,
+    run_inbound_activity,
+)
+from suddenly.activitypub.models import InboundActivity, InboundActivityStatus
+from suddenly.users.models import User
+
+_ACTIVITY: dict[str, Any] = {
+    "@context": "https://www.w3.org/ns/activitystreams",
+    "type": "Follow",
+    "id": "https://remote.example/activities/queued-1",
+    "actor": "https://remote.example/actor",
+}
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache() -> None:
+    cache.clear()
+
+
+@pytest.mark.django_db
+class TestAsyncInbox:
+    """With AP_INBOX_ASYNC on, the inbox stores the activity and skips the handler."""
+
+    def test_post_queues_without_dispatch(
+        self, client: Client, user: User, mocker: Any, settings: Any
+    ) -> None:
+        settings.AP_INBOX_ASYNC = True
+        mocker.patch(
+            "suddenly.activitypub.inbox.verify_signature",
+            return_value=(True, "https://remote.example/actor#main-key"),
+        )
+        mocker.patch("suddenly.activitypub.inbox._check_rate_limit", return_value=False)
+        spy_follow = mocker.patch("suddenly.activitypub.inbox.handle_follow")
+
+        response = client.post(
+            f"/users/{user.username}/inbox",
+            data=json.dumps(_ACTIVITY),
+            content_type="application/activity+json",
+            HTTP_SIGNATURE='keyId="https://remote.example/actor#main-key"',
+        )
+
+        assert response.status_code == 202
+        spy_follow.assert_not_called()
+        record = InboundActivity.objects.get()
+        assert record.ap_id == _ACTIVITY["id"]
+        assert record.actor_type == "user"
+        assert record.actor_identifier == user.username
+        assert record.actor_domain == "remote.example"
+        assert record.status == InboundActivityStatus.PENDING
+
+    def test_sync_mode_still_dispatches_inline(
+        self, client: Client, user: User, mocker: Any, settings: Any
+    ) -> None:
+        settings.AP_INBOX_ASYNC = False
+        mocker.patch(
+            "suddenly.activitypub.inbox.verify_signature",
+            return_value=(True, "https://remote.example/actor#main-key"),
+        )
+        mocker.patch("suddenly.activitypub.inbox._check_rate_limit", return_value=False)
+        spy_follow = mocker.patch("suddenly.activitypub.inbox.handle_follow")
+
+        client.post(
+            f"/users/{user.username}/inbox",
+            data=json.dumps(_ACTIVITY),
+            content_type="application/activity+json",
+            HTTP_SIGNATURE='keyId="https://remote.example/actor#main-key"',
+        )
+
+        spy_follow.assert_called_once()
+        assert not InboundActivity.objects.exists()
+
+
+@pytest.mark.django_db
+class TestRunInboundActivity:
+    """Worker-side dispatch, retry bookkeeping and domain cap."""
+
+    def test_success_dispatches_and_deletes_row(self, mocker: Any) -> None:
+        record = enqueue_inbound_activity(_ACTIVITY, "user", "bob", "remote.example")
+        spy_follow = mocker.patch("suddenly.activitypub.inbox.handle_follow")
+
+        assert run_inbound_activity(record.pk) is True
+
+        spy_follow.assert_called_once_with(_ACTIVITY, "user", "bob")
+        assert not InboundActivity.objects.exists()
+
+    def test_failure_records_attempt_and_backs_off(self, mocker: Any) -> None:
+        record = enqueue_inbound_activity(_ACTIVITY, "user", "bob", "remote.example")
+        mocker.patch(
+            "suddenly.activitypub.inbox.handle_follow", side_effect=RuntimeError("remote down")
+        )
+
+        with pytest.raises(RuntimeError):
+            run_inbound_activity(record.pk)
+
+        record.refresh_from_db()
+        assert record.status == InboundActivityStatus.PENDING
+        assert record.attempts == 1
+        assert "remote down" in record.last_error
+        assert record.available_at > timezone.now()
+        # Not due yet: a second worker cannot claim it.
+        assert run_inbound_activity(record.pk) is False
+
+    def test_exhausted_attempts_park_as_failed(self, mocker: Any, settings: Any) -> None:
+        settings.AP_INBOX_MAX_ATTEMPTS = 1
+        record = enqueue_inbound_activity(_ACTIVITY, "user", "bob", "remote.example")
+        mocker.patch("suddenly.activitypub.inbox.handle_follow", side_effect=RuntimeError("x"))
+
+        with pytest.raises(RuntimeError):
+            run_inbound_activity(record.pk)
+
+        record.refresh_from_db()
+        assert record.status == InboundActivityStatus.FAILED
+
+    def test_domain_at_cap_is_deferred(self, mocker: Any, settings: Any) -> None:
+        settings.AP_INBOX_DOMAIN_CONCURRENCY = 1
+        cache.set("ap-inbox-slots:remote.example", 1, timeout=60)
+        record = enqueue_inbound_activity(_ACTIVITY, "user", "bob", "remote.example")
+        spy_follow = mocker.patch("suddenly.activitypub.inbox.handle_follow")
+
+        with pytest.raises(InboundDomainBusyError):
+            run_inbound_activity(record.pk)
+
+        spy_follow.assert_not_called()
+        record.refresh_from_db()
+        assert record.status == InboundActivityStatus.PENDING
+        assert record.attempts == 0
+
+    def test_stale_processing_row_is_reclaimed(self, mocker: Any) -> None:
+        record = enqueue_inbound_activity(_ACTIVITY, "user", "bob", "remote.example")
+        InboundActivity.objects.filter(pk=record.pk).update(
+            status=InboundActivityStatus.PROCESSING,
+            updated_at=timezone.now() - timedelta(hours=1),
+        )
+        mocker.patch("suddenly.activitypub.inbox.handle_follow")
+
+        assert run_inbound_activity(record.pk) is True
+
+
+@pytest.mark.django_db
+class TestLocalWorker:
+    """The broker-less worker drains every due activity and survives failures."""
+
+    def test_drain_counts_outcomes(self, mocker: Any) -> None:
+        enqueue_inbound_activity(_ACTIVITY, "user", "bob", "a.example")
+        enqueue_inbound_activity({**_ACTIVITY, "type": "Undo"}, "user", "bob", "b.example")
+        mocker.patch("suddenly.activitypub.inbox.handle_follow")
+        mocker.patch("suddenly.activitypub.inbox.handle_undo", side_effect=RuntimeError("boom"))
+
+        stats = drain_inbound_queue()
+
+        assert stats == {"done": 1, "deferred": 0, "failed": 1}
+
+    def test_command_once(self, mocker: Any) -> None:
+        enqueue_inbound_activity(_ACTIVITY, "user", "bob", "remote.example")
+        spy_follow = mocker.patch("suddenly.activitypub.inbox.handle_follow")
+
+        call_command("process_inbox_queue", "--once")
+
+        spy_follow.assert_called_once()
+        assert not InboundActivity.objects.exists()
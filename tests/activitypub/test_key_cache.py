@@ -0,0 +1,131 @@
+"""
+Tests for the process-local parsed-key cache in ``signatures``.
+
+Signing and verification must reuse parsed RSA key objects and the known actor
+PEM instead of re-parsing / re-querying on every request, while a replaced key
+(``_fetch_public_key``, ``Update(Person)``) is never served from the cache.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from suddenly.activitypub import signatures
+from suddenly.activitypub.signatures import (
+    _actor_public_key_pem,
+    _fetch_public_key,
+    generate_key_pair,
+    invalidate_cached_key,
+    load_private_key,
+    load_public_key,
+    sign_request,
+)
+
+ACTOR = "https://remote.example/users/alice"
+
+
+class TestParsedKeyReuse:
+    def test_private_key_parsed_once(self, mocker: Any) -> None:
+        private_pem, _ = generate_key_pair()
+        spy = mocker.spy(signatures.serialization, "load_pem_private_key")
+
+        for _ in range(3):
+            sign_request(
+                "POST",
+                "https://remote.example/inbox",
+                {},
+                body={"type": "Follow"},
+                key_id="https://local.test/users/bob#main-key",
+                private_key_pem=private_pem,
+            )
+
+        assert spy.call_count == 1
+
+    def test_same_key_id_new_pem_is_reparsed(self) -> None:
+        _, pem_a = generate_key_pair()
+        _, pem_b = generate_key_pair()
+
+        key_a = load_public_key(pem_a, f"{ACTOR}#main-key")
+        key_b = load_public_key(pem_b, f"{ACTOR}#main-key")
+
+        assert key_a is not key_b
+        assert load_public_key(pem_a, f"{ACTOR}#main-key") is key_a
+
+    def test_lru_evicts_beyond_size(self, settings: Any) -> None:
+        settings.AP_KEY_CACHE_SIZE = 1
+        private_a, _ = generate_key_pair()
+        private_b, _ = generate_key_pair()
+
+        key_a = load_private_key(private_a, "a")
+        load_private_key(private_b, "b")
+
+        assert load_private_key(private_a, "a") is not key_a
+
+    def test_expired_entry_is_reparsed(self, settings: Any) -> None:
+        settings.AP_KEY_CACHE_TTL = -1
+        private_pem, _ = generate_key_pair()
+
+        first = load_private_key(private_pem, "k")
+
+        assert load_private_key(private_pem, "k") is not first
+
+    def test_invalid_pem_raises_and_is_not_cached(self) -> None:
+        with pytest.raises(ValueError):
+            load_public_key("-----NOT A KEY-----")
+
+
+@pytest.mark.django_db
+class TestActorPemCache:
+    def test_db_read_once(self) -> None:
+        from suddenly.activitypub.models import PublicKeyCache
+
+        _, pem = generate_key_pair()
+        PublicKeyCache.objects.create(actor_url=ACTOR, public_key_pem=pem)
+
+        assert _actor_public_key_pem(ACTOR) == pem
+        with CaptureQueriesContext(connection) as ctx:
+            assert _actor_public_key_pem(ACTOR) == pem
+        assert len(ctx.captured_queries) == 0
+
+    def test_invalidate_drops_actor_entries(self) -> None:
+        from suddenly.activitypub.models import PublicKeyCache
+
+        _, pem = generate_key_pair()
+        PublicKeyCache.objects.create(actor_url=ACTOR, public_key_pem=pem)
+        _actor_public_key_pem(ACTOR)
+
+        PublicKeyCache.objects.all().delete()
+        invalidate_cached_key(ACTOR)
+
+        assert _actor_public_key_pem(ACTOR) is None
+
+    def test_refetch_replaces_cached_pem(self, mocker: Any) -> None:
+        _, old_pem = generate_key_pair()
+        _, new_pem = generate_key_pair()
+        from suddenly.activitypub.models import PublicKeyCache
+
+        PublicKeyCache.objects.create(actor_url=ACTOR, public_key_pem=old_pem)
+        _actor_public_key_pem(ACTOR)
+        mocker.patch(
+            "suddenly.activitypub._http.fetch_ap_actor",
+            return_value={"publicKey": {"publicKeyPem": new_pem}},
+        )
+
+        assert _fetch_public_key(ACTOR) == new_pem
+        assert _actor_public_key_pem(ACTOR) == new_pem
+
+    def test_update_person_invalidates_memory(self) -> None:
+        from suddenly.activitypub.inbox import _invalidate_actor_key
+        from suddenly.activitypub.models import PublicKeyCache
+
+        _, pem = generate_key_pair()
+        PublicKeyCache.objects.create(actor_url=ACTOR, public_key_pem=pem)
+        _actor_public_key_pem(ACTOR)
+
+        _invalidate_actor_key(ACTOR)
+
+        assert _actor_public_key_pem(ACTOR) is None
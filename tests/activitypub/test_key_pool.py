@@ -0,0 +1,117 @@
+"""
+Tests for the pre-generated RSA key pool (``keypool``).
+
+New local actors take a pooled pair when one is ready and only generate inline
+when the pool is empty; a claimed pair is never handed out twice. Generation is
+patched out to keep the tests fast.
+"""
+
+from __future__ import annotations
+
+import itertools
+from typing import Any
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from suddenly.activitypub import keypool
+from suddenly.activitypub.keypool import claim_key_pair, claim_pooled_key_pair, fill_key_pool
+from suddenly.activitypub.models import PooledKeyPair
+from suddenly.characters.models import Character
+from suddenly.games.models import Game
+from suddenly.users.models import User
+
+
+@pytest.fixture
+def fake_keys(mocker: Any) -> Any:
+    """Replace RSA generation with numbered fake PEMs."""
+    counter = itertools.count()
+
+    def _generate() -> tuple[str, str]:
+        n = next(counter)
+        return f"private-{n}", f"public-{n}"
+
+    return mocker.patch.object(keypool, "generate_key_pair", side_effect=_generate)
+
+
+@pytest.mark.django_db
+class TestKeyPool:
+    def test_fill_tops_up_to_target(self, fake_keys: Any, settings: Any) -> None:
+        settings.AP_KEY_POOL_SIZE = 3
+        PooledKeyPair.objects.create(private_key="p", public_key="q")
+
+        assert fill_key_pool() == 2
+        assert PooledKeyPair.objects.count() == 3
+        assert fill_key_pool() == 0
+
+    def test_claim_takes_oldest_and_removes_it(self, fake_keys: Any) -> None:
+        fill_key_pool(2)
+
+        assert claim_key_pair() == ("private-0", "public-0")
+        assert claim_key_pair() == ("private-1", "public-1")
+        assert not PooledKeyPair.objects.exists()
+        assert fake_keys.call_count == 2
+
+    def test_empty_pool_generates_inline(self, fake_keys: Any) -> None:
+        assert claim_key_pair() == ("private-0", "public-0")
+        assert claim_pooled_key_pair() is None
+
+    def test_disabled_pool_ignores_rows(self, fake_keys: Any, settings: Any) -> None:
+        settings.AP_KEY_POOL_SIZE = 0
+        PooledKeyPair.objects.create(private_key="pooled", public_key="pooled")
+
+        assert claim_key_pair() == ("private-0", "public-0")
+        assert PooledKeyPair.objects.count() == 1
+
+    def test_claim_skips_rows_locked_by_other_claims(self, fake_keys: Any) -> None:
+        """Concurrent claims lock different rows instead of racing for the oldest."""
+        fill_key_pool(1)
+
+        with CaptureQueriesContext(connection) as ctx:
+            assert claim_pooled_key_pair() == ("private-0", "public-0")
+
+        assert any("FOR UPDATE SKIP LOCKED" in q["sql"] for q in ctx.captured_queries)
+
+    def test_command_fills_pool(self, fake_keys: Any) -> None:
+        call_command("fill_key_pool", "--count", "4")
+
+        assert PooledKeyPair.objects.count() == 4
+
+
+@pytest.mark.django_db
+class TestSignalsUsePool:
+    def test_new_user_and_game_get_pooled_keys(self, fake_keys: Any) -> None:
+        fill_key_pool(2)
+
+        user = User.objects.create(username="pooled")
+        game = Game.objects.create(title="Pooled", owner=user)
+
+        user.refresh_from_db()
+        game.refresh_from_db()
+        assert user.private_key == "private-0"
+        assert game.private_key == "private-1"
+        assert fake_keys.call_count == 2  # only the fill, nothing inline
+
+    def test_character_keyed_only_from_pool(self, fake_keys: Any, user: User, game: Game) -> None:
+        keyless = Character.objects.create(name="Keyless", creator=user, origin_game=game)
+        fill_key_pool(1)
+        keyed = Character.objects.create(name="Keyed", creator=user, origin_game=game)
+
+        keyless.refresh_from_db()
+        keyed.refresh_from_db()
+        assert keyless.private_key == ""
+        assert keyed.public_key.startswith("public-")
+
+    def test_signup_reuses_post_save_keys(self, fake_keys: Any, rf: Any) -> None:
+        from suddenly.users.signals import initialize_activitypub_actor
+
+        user = User.objects.create(username="signup")
+        assigned = user.private_key
+
+        initialize_activitypub_actor(rf.get("/"), user)
+
+        user.refresh_from_db()
+        assert user.private_key == assigned
+        assert user.ap_id.endswith("/users/signup")
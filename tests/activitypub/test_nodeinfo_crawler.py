@@ -0,0 +1,202 @@
+"""
+Tests for the NodeInfo crawler (``activitypub.nodeinfo``).
+
+Domains seen in remote users and inbox dedup rows get a ``FederatedServer``
+row; due rows are probed in a bounded pool and rescheduled; blocked
+instances are never probed.
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+from suddenly.activitypub.domains import is_known_non_suddenly_domain, is_suddenly_domain
+from suddenly.activitypub.models import FederatedServer, ProcessedActivity, ServerStatus
+from suddenly.activitypub.nodeinfo import (
+    _nodeinfo_href,
+    crawl_nodeinfo,
+    discover_domains,
+    parse_nodeinfo,
+)
+from suddenly.users.models import User
+
+_SCHEMA = "http://nodeinfo.diaspora.software/ns/schema/"
+
+
+def _index(domain: str) -> dict[str, Any]:
+    return {"links": [{"rel": f"{_SCHEMA}2.0", "href": f"https://{domain}/nodeinfo/2.0"}]}
+
+
+def _document(software: str, users: int = 12) -> dict[str, Any]:
+    return {
+        "version": "2.0",
+        "software": {"name": software, "version": "1.2.3"},
+        "usage": {"users": {"total": users}},
+    }
+
+
+def _fake_fetch(peers: dict[str, str]) -> Any:
+    """A ``fetch_ap_json`` answering NodeInfo for `peers` (domain -> software)."""
+
+    def fetch(url: str, *, accept: str) -> dict[str, Any] | None:
+        domain = url.split("/")[2]
+        if domain not in peers:
+            return None
+        if url.endswith("/.well-known/nodeinfo"):
+            return _index(domain)
+        return _document(peers[domain])
+
+    return fetch
+
+
+@pytest.fixture
+def _clear_cache() -> None:
+    # The cache lives in the database in CI: only the db classes use this.
+    cache.clear()
+
+
+class TestParsing:
+    def test_parse_nodeinfo(self) -> None:
+        info = parse_nodeinfo(_document("Mastodon", users=42))
+        assert (info.software, info.version, info.user_count) == ("mastodon", "1.2.3", 42)
+
+    def test_parse_tolerates_missing_fields(self) -> None:
+        info = parse_nodeinfo({"usage": {"users": {"total": "lots"}}})
+        assert (info.software, info.version, info.user_count) == ("", "", 0)
+
+    def test_href_prefers_newest_schema_on_same_host(self) -> None:
+        index = {
+            "links": [
+                {"rel": f"{_SCHEMA}2.0", "href": "https://peer.example/nodeinfo/2.0"},
+                {"rel": f"{_SCHEMA}2.1", "href": "https://peer.example/nodeinfo/2.1"},
+                {"rel": f"{_SCHEMA}2.2", "href": "https://elsewhere.example/nodeinfo/2.2"},
+            ]
+        }
+        assert _nodeinfo_href(index, "peer.example") == "https://peer.example/nodeinfo/2.1"
+        assert _nodeinfo_href({"links": "nope"}, "peer.example") is None
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("_clear_cache")
+class TestDiscovery:
+    def test_collects_remote_users_and_dedup_domains(self, settings: Any) -> None:
+        settings.DOMAIN = "local.test"
+        User.objects.create(
+            username="bob@masto.example",
+            remote=True,
+            ap_id="https://masto.example/users/bob",
+            inbox_url="https://masto.example/users/bob/inbox",
+        )
+        ProcessedActivity.objects.create(ap_id="https://a.example/1", actor_domain="A.example")
+        ProcessedActivity.objects.create(ap_id="https://x.example/1", actor_domain="unknown")
+        ProcessedActivity.objects.create(ap_id="https://l.test/1", actor_domain="local.test")
+
+        assert discover_domains() == {"masto.example", "a.example"}
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("_clear_cache")
+class TestCrawl:
+    def test_discovers_and_probes(self, mocker: Any) -> None:
+        for domain in ("sud.example", "down.example"):
+            ProcessedActivity.objects.create(ap_id=f"https://{domain}/1", actor_domain=domain)
+        mocker.patch(
+            "suddenly.activitypub.nodeinfo.fetch_ap_json",
+            side_effect=_fake_fetch({"sud.example": "suddenly"}),
+        )
+
+        counters = crawl_nodeinfo()
+
+        assert counters == {"discovered": 2, "probed": 2, "failed": 1}
+        sud = FederatedServer.objects.get(server_name="sud.example")
+        assert (sud.application_type, sud.user_count, sud.status) == (
+            "suddenly",
+            12,
+            ServerStatus.FEDERATED,
+        )
+        assert sud.last_checked is not None
+        down = FederatedServer.objects.get(server_name="down.example")
+        assert (down.application_type, down.last_checked, down.status) == (
+            "",
+            None,
+            ServerStatus.UNKNOWN,
+        )
+
+    def test_reschedules_after_success_and_failure(self, mocker: Any, settings: Any) -> None:
+        settings.AP_NODEINFO_REFRESH_HOURS = 24
+        settings.AP_NODEINFO_RETRY_HOURS = 6
+        FederatedServer.objects.create(server_name="ok.example")
+        FederatedServer.objects.create(server_name="down.example")
+        mocker.patch(
+            "suddenly.activitypub.nodeinfo.fetch_ap_json",
+            side_effect=_fake_fetch({"ok.example": "mastodon"}),
+        )
+
+        before = timezone.now()
+        crawl_nodeinfo()
+
+        ok = FederatedServer.objects.get(server_name="ok.example")
+        down = FederatedServer.objects.get(server_name="down.example")
+        assert ok.next_check_at is not None and down.next_check_at is not None
+        assert ok.next_check_at >= before + timedelta(hours=24)
+        assert before + timedelta(hours=6) <= down.next_check_at < before + timedelta(hours=7)
+
+    def test_only_due_servers_are_probed(self, mocker: Any, settings: Any) -> None:
+        settings.AP_NODEINFO_CRAWL_BATCH = 1
+        now = timezone.now()
+        FederatedServer.objects.create(
+            server_name="later.example", next_check_at=now + timedelta(hours=1)
+        )
+        FederatedServer.objects.create(
+            server_name="due.example", next_check_at=now - timedelta(hours=1)
+        )
+        FederatedServer.objects.create(server_name="new.example")
+        fetch = mocker.patch(
+            "suddenly.activitypub.nodeinfo.fetch_ap_json", side_effect=_fake_fetch({})
+        )
+
+        crawl_nodeinfo()
+
+        # Never-probed rows go first; the batch of one leaves due.example for later.
+        probed = {call.args[0].split("/")[2] for call in fetch.call_args_list}
+        assert probed == {"new.example"}
+
+    def test_blocked_server_never_probed_or_unblocked(self, mocker: Any) -> None:
+        FederatedServer.objects.create(server_name="bad.example", status=ServerStatus.BLOCKED)
+        fetch = mocker.patch(
+            "suddenly.activitypub.nodeinfo.fetch_ap_json",
+            side_effect=_fake_fetch({"bad.example": "mastodon"}),
+        )
+
+        crawl_nodeinfo()
+
+        fetch.assert_not_called()
+        assert FederatedServer.objects.get().status == ServerStatus.BLOCKED
+
+    def test_refreshes_domain_registry(self, mocker: Any) -> None:
+        FederatedServer.objects.create(server_name="sud.example")
+        FederatedServer.objects.create(server_name="masto.example")
+        # Unprobed rows are known but not yet "non-Suddenly".
+        assert not is_known_non_suddenly_domain("masto.example")
+        mocker.patch(
+            "suddenly.activitypub.nodeinfo.fetch_ap_json",
+            side_effect=_fake_fetch({"sud.example": "suddenly", "masto.example": "mastodon"}),
+        )
+
+        crawl_nodeinfo()
+
+        assert is_suddenly_domain("sud.example")
+        assert is_known_non_suddenly_domain("masto.example")
+
+    def test_task_runs_crawl(self, mocker: Any) -> None:
+        from suddenly.activitypub.tasks import crawl_nodeinfo as crawl_task
+
+        FederatedServer.objects.create(server_name="down.example")
+        mocker.patch("suddenly.activitypub.nodeinfo.fetch_ap_json", return_value=None)
+
+        assert crawl_task() == {"discovered": 0, "probed": 1, "failed": 1}
@@ -0,0 +1,132 @@
+"""
+Tests for the outbound activity store (``activitypub.outbound``).
+
+An outgoing activity is stored once and delivery messages only carry its id:
+the signer's private key is looked up at send time, never queued. No network
+is hit: ``_post_activity`` is patched.
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+from suddenly.activitypub.models import FederatedServer, OutboundActivity, ParkedDelivery
+from suddenly.activitypub.outbound import (
+    purge_outbound_activities,
+    signing_keys,
+    store_activity,
+    store_signed_activity,
+)
+from suddenly.activitypub.tasks import deliver_activity
+from suddenly.users.models import User
+
+_INBOX = "https://remote.example/users/bob/inbox"
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache() -> None:
+    cache.clear()
+
+
+def _accepting(mocker: Any) -> Any:
+    response = mocker.MagicMock()
+    response.status_code = 202
+    return mocker.patch("suddenly.activitypub.tasks._post_activity", return_value=response)
+
+
+@pytest.mark.django_db
+class TestSigningKeys:
+    def test_local_signer_resolves_to_its_key(self, user: User) -> None:
+        user.private_key = "TEST-PRIVATE-KEY-PEM-DATA"
+        user.save(update_fields=["private_key"])
+
+        outbound = OutboundActivity.objects.get(pk=store_signed_activity({"type": "Follow"}, user))
+
+        assert outbound.signer_key_id == f"{user.actor_url}#main-key"
+        assert signing_keys(outbound.signer_key_id) == (
+            f"{user.actor_url}#main-key",
+            "TEST-PRIVATE-KEY-PEM-DATA",
+        )
+
+    @pytest.mark.parametrize("key_id", ["", "https://remote.example/users/bob#main-key"])
+    def test_empty_or_foreign_key_is_unsigned(self, key_id: str) -> None:
+        assert signing_keys(key_id) == (None, None)
+
+    def test_deleted_signer_cannot_sign(self, settings: Any) -> None:
+        assert signing_keys(f"{settings.AP_BASE_URL}/users/ghost#main-key") is None
+
+
+@pytest.mark.django_db
+class TestDeliverStoredActivity:
+    def test_posts_stored_body_with_signer_key(self, mocker: Any, user: User) -> None:
+        user.private_key = "TEST-PRIVATE-KEY-PEM-DATA"
+        user.save(update_fields=["private_key"])
+        post = _accepting(mocker)
+
+        deliver_activity.apply(
+            kwargs={
+                "outbound_id": store_activity({"type": "Like"}, f"{user.actor_url}#main-key"),
+                "inbox_url": _INBOX,
+            }
+        )
+
+        body, inbox_url, key_id, pem = post.call_args.args
+        assert body.content == b'{"type":"Like"}'
+        assert (inbox_url, key_id, pem) == (
+            _INBOX,
+            f"{user.actor_url}#main-key",
+            "TEST-PRIVATE-KEY-PEM-DATA",
+        )
+
+    def test_purged_activity_is_dropped(self, mocker: Any) -> None:
+        post = _accepting(mocker)
+        outbound_id = store_activity({"type": "Like"}, None)
+        OutboundActivity.objects.all().delete()
+
+        deliver_activity.apply(kwargs={"outbound_id": outbound_id, "inbox_url": _INBOX})
+
+        post.assert_not_called()
+
+    def test_legacy_message_is_stored_then_delivered(self, mocker: Any) -> None:
+        """Messages queued before the store (activity in the payload) still go out."""
+        post = _accepting(mocker)
+
+        deliver_activity.apply(
+            kwargs={
+                "activity": {"type": "Like"},
+                "inbox_url": _INBOX,
+                "actor_key_id": None,
+                "private_key_pem": None,
+            }
+        )
+
+        assert OutboundActivity.objects.get().activity == {"type": "Like"}
+        assert post.call_args.args[0].content == b'{"type":"Like"}'
+
+
+@pytest.mark.django_db
+class TestPurge:
+    def test_purges_past_retention_only(self, settings: Any) -> None:
+        settings.AP_OUTBOUND_RETENTION_DAYS = 8
+        old = store_activity({"type": "Create"}, None)
+        recent = store_activity({"type": "Create"}, None)
+        server = FederatedServer.objects.create(server_name="down.example")
+        ParkedDelivery.objects.create(server=server, outbound_id=old, inbox_url=_INBOX)
+        OutboundActivity.objects.filter(pk=old).update(
+            created_at=timezone.now() - timedelta(days=9)
+        )
+
+        assert purge_outbound_activities(chunk_size=1) == 1
+
+        assert [str(pk) for pk in OutboundActivity.objects.values_list("pk", flat=True)] == [recent]
+        assert not ParkedDelivery.objects.exists()
+
+    def test_task_runs_purge(self) -> None:
+        from suddenly.activitypub.tasks import purge_outbound_activities as purge_task
+
+        assert purge_task() == 0
@@ -300,6 +300,7 @@ class TestOfferSuddenlyOnlyGuard:
         mock_delay.assert_called_once()
 
 
+@pytest.mark.django_db
 class TestDeliveryRetryPolicy:
     """deliver_activity must retry on 5xx/network but not on permanent 4xx."""
 
@@ -315,6 +316,15 @@ class TestDeliveryRetryPolicy:
 
         mocker.patch("httpx.Client", return_value=client)
 
+    def _stored_accept(self) -> dict[str, Any]:
+        """deliver_activity kwargs for an unsigned Accept in the outbound store."""
+        from suddenly.activitypub.outbound import store_activity
+
+        return {
+            "outbound_id": store_activity({"type": "Accept"}, None),
+            "inbox_url": "https://remote.example/actor/inbox",
+        }
+
     def test_4xx_does_not_retry(self, mocker: Any) -> None:
         """A 404 response returns normally without raising Retry."""
         from suddenly.activitypub.tasks import deliver_activity
@@ -324,9 +334,7 @@ class TestDeliveryRetryPolicy:
             deliver_activity, "retry", side_effect=AssertionError("retry must not be called")
         )
 
-        result = deliver_activity.apply(
-            args=[{"type": "Accept"}, "https://remote.example/actor/inbox"],
-        )
+        result = deliver_activity.apply(kwargs=self._stored_accept())
 
         assert result.successful()
         spy_retry.assert_not_called()
@@ -342,9 +350,6 @@ class TestDeliveryRetryPolicy:
         spy_retry = mocker.patch.object(deliver_activity, "retry", return_value=sentinel)
 
         with pytest.raises(RuntimeError, match="retry-sentinel"):
-            deliver_activity.apply(
-                args=[{"type": "Accept"}, "https://remote.example/actor/inbox"],
-                throw=True,
-            )
+            deliver_activity.apply(kwargs=self._stored_accept(), throw=True)
 
         spy_retry.assert_called_once()
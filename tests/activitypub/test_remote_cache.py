@@ -0,0 +1,202 @@
+"""
+Tests for the remote document cache behind ``fetch_ap_json`` (``activitypub._http``).
+
+Answers are kept for the peer's max-age clamped to the configured floor and
+ceiling, revalidated with their validators once expired, negative-cached for
+404/410 and unreachable hosts, and concurrent fetches of one URL share a
+single request. No network is hit.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+
+import pytest
+
+from suddenly.activitypub._http import (
+    RemoteDocument,
+    fetch_ap_actor,
+    fetch_ap_json,
+    forget_remote_document,
+    remote_cache_stats,
+)
+
+_FETCH = "suddenly.activitypub._http.fetch_ap_document"
+_URL = "https://peer.example/users/bob"
+_ACCEPT = "application/activity+json"
+
+
+@pytest.fixture(autouse=True)
+def _cache_settings(settings: Any) -> None:
+    settings.AP_REMOTE_CACHE_MIN_TTL = 60
+    settings.AP_REMOTE_CACHE_MAX_TTL = 900
+    settings.AP_REMOTE_CACHE_NEGATIVE_TTL = 30
+    settings.AP_REMOTE_CACHE_SIZE = 16
+
+
+@pytest.fixture
+def clock(mocker: Any) -> Any:
+    return mocker.patch("suddenly.activitypub._http.time.monotonic", return_value=1000.0)
+
+
+def _ok(cache_control: str = "", etag: str = "") -> RemoteDocument:
+    return RemoteDocument(200, {"id": _URL, "name": "Bob"}, etag, "", cache_control)
+
+
+class TestFreshness:
+    def test_second_fetch_is_a_hit_and_a_copy(self, mocker: Any) -> None:
+        fetch = mocker.patch(_FETCH, return_value=_ok())
+
+        first = fetch_ap_json(_URL, accept=_ACCEPT)
+        assert first is not None
+        first["name"] = "Mallory"
+
+        assert fetch_ap_json(_URL, accept=_ACCEPT) == {"id": _URL, "name": "Bob"}
+        fetch.assert_called_once()
+        assert remote_cache_stats()["hits"] == 1
+
+    def test_accept_header_is_part_of_the_key(self, mocker: Any) -> None:
+        fetch = mocker.patch(_FETCH, return_value=_ok())
+
+        fetch_ap_json(_URL, accept=_ACCEPT)
+        fetch_ap_json(_URL, accept="application/jrd+json")
+
+        assert fetch.call_count == 2
+
+    @pytest.mark.parametrize(
+        ("cache_control", "fresh_for"),
+        [
+            ("", 60),
+            ("public, max-age=180", 180),
+            ("max-age=5", 60),
+            ("max-age=86400", 900),
+            ("no-cache", 60),
+        ],
+    )
+    def test_lifetime_clamped(
+        self, mocker: Any, clock: Any, cache_control: str, fresh_for: int
+    ) -> None:
+        fetch = mocker.patch(_FETCH, return_value=_ok(cache_control))
+
+        fetch_ap_json(_URL, accept=_ACCEPT)
+        clock.return_value = 1000.0 + fresh_for - 1
+        fetch_ap_json(_URL, accept=_ACCEPT)
+        assert fetch.call_count == 1
+
+        clock.return_value = 1000.0 + fresh_for + 1
+        fetch_ap_json(_URL, accept=_ACCEPT)
+        assert fetch.call_count == 2
+
+    def test_no_store_is_not_kept(self, mocker: Any) -> None:
+        fetch = mocker.patch(_FETCH, return_value=_ok("private, no-store"))
+
+        fetch_ap_json(_URL, accept=_ACCEPT)
+        fetch_ap_json(_URL, accept=_ACCEPT)
+
+        assert fetch.call_count == 2
+
+    def test_fresh_bypasses_cached_copy(self, mocker: Any) -> None:
+        fetch = mocker.patch(_FETCH, return_value=_ok(etag='"v1"'))
+
+        fetch_ap_actor(_URL)
+        fetch_ap_actor(_URL, fresh=True)
+
+        assert fetch.call_count == 2
+        assert fetch.call_args.kwargs["etag"] == '"v1"'
+
+    def test_forget_drops_every_variant(self, mocker: Any) -> None:
+        fetch = mocker.patch(_FETCH, return_value=_ok())
+        fetch_ap_json(_URL, accept=_ACCEPT)
+        fetch_ap_json(_URL, accept="application/ld+json")
+
+        forget_remote_document(_URL)
+        fetch_ap_json(_URL, accept=_ACCEPT)
+
+        assert fetch.call_count == 3
+
+
+class TestRevalidation:
+    def test_expired_entry_revalidated_with_304(self, mocker: Any, clock: Any) -> None:
+        fetch = mocker.patch(_FETCH, return_value=_ok("max-age=120", etag='"v1"'))
+        fetch_ap_json(_URL, accept=_ACCEPT)
+
+        clock.return_value = 1200.0
+        fetch.return_value = RemoteDocument(304, None, cache_control="max-age=300")
+
+        assert fetch_ap_json(_URL, accept=_ACCEPT) == {"id": _URL, "name": "Bob"}
+        assert fetch.call_args.kwargs["etag"] == '"v1"'
+        assert remote_cache_stats()["revalidated"] == 1
+
+        # The 304 renewed the entry for its own max-age.
+        clock.return_value = 1450.0
+        fetch_ap_json(_URL, accept=_ACCEPT)
+        assert fetch.call_count == 2
+
+    def test_changed_document_replaces_entry(self, mocker: Any, clock: Any) -> None:
+        fetch = mocker.patch(_FETCH, return_value=_ok(etag='"v1"'))
+        fetch_ap_json(_URL, accept=_ACCEPT)
+
+        clock.return_value = 1100.0
+        fetch.return_value = RemoteDocument(200, {"id": _URL, "name": "Robert"}, '"v2"')
+
+        assert fetch_ap_json(_URL, accept=_ACCEPT) == {"id": _URL, "name": "Robert"}
+
+
+class TestNegativeCache:
+    @pytest.mark.parametrize("status", [0, 404, 410])
+    def test_gone_or_unreachable_remembered_briefly(
+        self, mocker: Any, clock: Any, status: int
+    ) -> None:
+        fetch = mocker.patch(_FETCH, return_value=RemoteDocument(status, None))
+
+        assert fetch_ap_json(_URL, accept=_ACCEPT) is None
+        assert fetch_ap_json(_URL, accept=_ACCEPT) is None
+        assert fetch.call_count == 1
+
+        clock.return_value = 1031.0
+        fetch_ap_json(_URL, accept=_ACCEPT)
+        assert fetch.call_count == 2
+
+    def test_server_error_not_cached(self, mocker: Any) -> None:
+        fetch = mocker.patch(_FETCH, return_value=RemoteDocument(503, None))
+
+        fetch_ap_json(_URL, accept=_ACCEPT)
+        fetch_ap_json(_URL, accept=_ACCEPT)
+
+        assert fetch.call_count == 2
+
+
+class TestCoalescing:
+    def test_concurrent_fetches_share_one_request(self, mocker: Any) -> None:
+        release = threading.Event()
+        started = threading.Event()
+
+        def slow_fetch(url: str, **kwargs: Any) -> RemoteDocument:
+            started.set()
+            release.wait(5)
+            return _ok()
+
+        fetch = mocker.patch(_FETCH, side_effect=slow_fetch)
+        results: list[Any] = []
+
+        def worker() -> None:
+            results.append(fetch_ap_json(_URL, accept=_ACCEPT))
+
+        leader = threading.Thread(target=worker)
+        leader.start()
+        started.wait(5)
+        followers = [threading.Thread(target=worker) for _ in range(3)]
+        for thread in followers:
+            thread.start()
+        for _ in range(500):
+            if remote_cache_stats()["coalesced"] == 3:
+                break
+            time.sleep(0.01)
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join(5)
+
+        fetch.assert_called_once()
+        assert results == [{"id": _URL, "name": "Bob"}] * 4
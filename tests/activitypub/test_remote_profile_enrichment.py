@@ -0,0 +1,110 @@
+"""
+Tests for the time-bounded remote profile enrichment
+(``follow_federation.remote_profile_collections``).
+
+Game actors are fetched concurrently; whatever has not answered by the
+deadline is left out of the page, and only a complete summary is cached per
+actor. No network is hit.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+import pytest
+from django.core.cache import cache
+
+from suddenly.activitypub.follow_federation import remote_profile_collections
+
+_AP_ID = "https://peer.suddenly.test/users/alice"
+_GAMES = [f"https://peer.suddenly.test/games/{n}" for n in range(3)]
+
+
+def _outbox() -> dict[str, Any]:
+    return {
+        "orderedItems": [
+            {
+                "type": "Article",
+                "id": f"https://peer.suddenly.test/reports/{n}",
+                "name": f"Session {n}",
+                "content": "...",
+                "context": game,
+            }
+            for n, game in enumerate(_GAMES)
+        ]
+    }
+
+
+_ACTOR = {"id": _AP_ID, "type": "Person", "outbox": f"{_AP_ID}/outbox"}
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache(settings: Any) -> None:
+    settings.AP_REMOTE_PROFILE_DEADLINE = 2
+    cache.clear()
+
+
+def _patch_fetches(mocker: Any, fetch_actor: Any) -> Any:
+    mocker.patch("suddenly.activitypub._http.fetch_ap_json", return_value=_outbox())
+    return mocker.patch("suddenly.activitypub._http.fetch_ap_actor", side_effect=fetch_actor)
+
+
+@pytest.mark.django_db
+class TestRemoteProfileCollections:
+    def test_game_actors_fetched_concurrently(self, mocker: Any) -> None:
+        # Each fetch waits for all the others: run one after another, they
+        # would time out at the barrier.
+        barrier = threading.Barrier(len(_GAMES), timeout=1)
+
+        def fetch_actor(url: str) -> dict[str, Any]:
+            barrier.wait()
+            return {"id": url, "name": url.rsplit("/", 1)[1]}
+
+        _patch_fetches(mocker, fetch_actor)
+
+        collections = remote_profile_collections(_AP_ID, _ACTOR, is_suddenly=True)
+
+        assert [g["name"] for g in collections["games"]] == ["0", "1", "2"]
+
+    def test_deadline_renders_partial_and_skips_cache(self, mocker: Any, settings: Any) -> None:
+        settings.AP_REMOTE_PROFILE_DEADLINE = 0.2
+        release = threading.Event()
+
+        def fetch_actor(url: str) -> dict[str, Any]:
+            if url == _GAMES[1]:
+                release.wait(2)
+            return {"id": url, "name": url.rsplit("/", 1)[1]}
+
+        fetch = _patch_fetches(mocker, fetch_actor)
+        try:
+            collections = remote_profile_collections(_AP_ID, _ACTOR, is_suddenly=True)
+        finally:
+            release.set()
+
+        assert [g["name"] for g in collections["games"]] == ["0", "2"]
+        assert len(collections["activity"]) == 3
+
+        remote_profile_collections(_AP_ID, _ACTOR, is_suddenly=True)
+        assert fetch.call_count == 6
+
+    def test_complete_summary_cached_per_actor(self, mocker: Any) -> None:
+        fetch = _patch_fetches(mocker, lambda url: {"id": url, "name": "Game"})
+
+        first = remote_profile_collections(_AP_ID, _ACTOR, is_suddenly=True)
+        second = remote_profile_collections(_AP_ID, _ACTOR, is_suddenly=True)
+
+        assert first == second
+        assert fetch.call_count == len(_GAMES)
+
+    def test_failing_game_fetch_only_drops_that_game(self, mocker: Any) -> None:
+        def fetch_actor(url: str) -> dict[str, Any]:
+            if url == _GAMES[0]:
+                raise RuntimeError("boom")
+            return {"id": url, "name": url.rsplit("/", 1)[1]}
+
+        _patch_fetches(mocker, fetch_actor)
+
+        collections = remote_profile_collections(_AP_ID, _ACTOR, is_suddenly=True)
+
+        assert [g["name"] for g in collections["games"]] == ["1", "2"]
@@ -0,0 +1,175 @@
+"""
+Tests for the instance-wide shared inbox (``POST /inbox``).
+
+One signed delivery is verified and deduplicated once, then handed to the
+local actors it targets. Every local actor advertises it as
+``endpoints.sharedInbox``. No network is hit.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import pytest
+from django.conf import settings as django_settings
+from django.core.cache import cache
+from django.test import Client
+
+from suddenly.activitypub.inbox import shared_inbox_targets
+from suddenly.activitypub.models import InboundActivity, ProcessedActivity
+from suddenly.activitypub.serializers import (
+    serialize_character,
+    serialize_game,
+    serialize_user,
+)
+from suddenly.characters.models import Character
+from suddenly.games.models import Game
+from suddenly.users.models import User
+
+_SIGNATURE = 'keyId="https://remote.example/actor#main-key"'
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache() -> None:
+    cache.clear()
+
+
+@pytest.fixture
+def _signed(mocker: Any) -> None:
+    mocker.patch(
+        "suddenly.activitypub.inbox.verify_signature",
+        return_value=(True, "https://remote.example/actor#main-key"),
+    )
+    mocker.patch("suddenly.activitypub.inbox._check_rate_limit", return_value=False)
+
+
+def _post(client: Client, activity: dict[str, Any]) -> Any:
+    return client.post(
+        "/inbox",
+        data=json.dumps(activity),
+        content_type="application/activity+json",
+        HTTP_SIGNATURE=_SIGNATURE,
+    )
+
+
+def _create_note(to: list[str], activity_id: str = "https://remote.example/a/1") -> dict[str, Any]:
+    return {
+        "@context": "https://www.w3.org/ns/activitystreams",
+        "type": "Create",
+        "id": activity_id,
+        "actor": "https://remote.example/actor",
+        "to": to,
+        "object": {"type": "Note", "id": f"{activity_id}/note", "content": "hi"},
+    }
+
+
+# ─── Routing ───────────────────────────────────────────────────────────────
+
+
+@pytest.mark.django_db
+class TestSharedInboxTargets:
+    def test_follow_targets_named_local_actor(self, user: User) -> None:
+        activity = {"type": "Follow", "object": user.actor_url}
+        assert shared_inbox_targets(activity) == [("user", user.username)]
+
+    def test_undo_follow_targets_inner_object(self, game: Game) -> None:
+        activity = {"type": "Undo", "object": {"type": "Follow", "object": game.actor_url}}
+        assert shared_inbox_targets(activity) == [("game", str(game.pk))]
+
+    def test_follow_of_unknown_actor_has_no_target(self) -> None:
+        activity = {"type": "Follow", "object": f"{django_settings.AP_BASE_URL}/users/ghost"}
+        assert shared_inbox_targets(activity) == []
+
+    def test_owner_independent_activity_dispatched_once(
+        self, user: User, other_user: User, character: Character
+    ) -> None:
+        activity = _create_note([user.actor_url, other_user.actor_url, character.actor_url])
+        assert shared_inbox_targets(activity) == [("user", user.username)]
+
+    def test_followers_only_delivery_goes_to_instance(self) -> None:
+        activity = _create_note(
+            ["https://www.w3.org/ns/activitystreams#Public", "https://remote.example/followers"]
+        )
+        assert shared_inbox_targets(activity) == [("instance", "")]
+
+    def test_collections_are_not_actors(self, user: User) -> None:
+        activity = _create_note([f"{user.actor_url}/followers"])
+        assert shared_inbox_targets(activity) == [("instance", "")]
+
+
+# ─── Endpoint ──────────────────────────────────────────────────────────────
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("_signed")
+class TestSharedInboxView:
+    def test_follow_dispatched_for_target(
+        self, client: Client, user: User, mocker: Any, settings: Any
+    ) -> None:
+        settings.AP_INBOX_ASYNC = False
+        spy_follow = mocker.patch("suddenly.activitypub.inbox.handle_follow")
+        activity = {
+            "type": "Follow",
+            "id": "https://remote.example/follows/1",
+            "actor": "https://remote.example/actor",
+            "object": user.actor_url,
+        }
+
+        response = _post(client, activity)
+
+        assert response.status_code == 202
+        spy_follow.assert_called_once_with(activity, "user", user.username)
+
+    def test_one_delivery_one_dedup_row_one_dispatch(
+        self, client: Client, user: User, other_user: User, mocker: Any, settings: Any
+    ) -> None:
+        settings.AP_INBOX_ASYNC = False
+        spy_create = mocker.patch("suddenly.activitypub.inbox.handle_create")
+        activity = _create_note([user.actor_url, other_user.actor_url])
+
+        assert _post(client, activity).status_code == 202
+        assert _post(client, activity).status_code == 202  # redelivery
+
+        assert ProcessedActivity.objects.filter(ap_id=activity["id"]).count() == 1
+        spy_create.assert_called_once()
+
+    def test_async_mode_queues_per_target(
+        self, client: Client, user: User, mocker: Any, settings: Any
+    ) -> None:
+        settings.AP_INBOX_ASYNC = True
+        spy_follow = mocker.patch("suddenly.activitypub.inbox.handle_follow")
+        activity = {
+            "type": "Follow",
+            "id": "https://remote.example/follows/2",
+            "actor": "https://remote.example/actor",
+            "object": user.actor_url,
+        }
+
+        assert _post(client, activity).status_code == 202
+
+        spy_follow.assert_not_called()
+        record = InboundActivity.objects.get()
+        assert (record.actor_type, record.actor_identifier) == ("user", user.username)
+
+    def test_invalid_signature_rejected(self, client: Client, mocker: Any) -> None:
+        mocker.patch(
+            "suddenly.activitypub.inbox.verify_signature", return_value=(False, "bad signature")
+        )
+        response = _post(client, _create_note([]))
+        assert response.status_code == 403
+
+    def test_get_not_allowed(self, client: Client) -> None:
+        assert client.get("/inbox").status_code == 405
+
+
+# ─── Advertisement ─────────────────────────────────────────────────────────
+
+
+@pytest.mark.django_db
+def test_actor_documents_advertise_shared_inbox(
+    user: User, game: Game, character: Character
+) -> None:
+    expected = f"{django_settings.AP_BASE_URL}/inbox"
+    for document in (serialize_user(user), serialize_game(game), serialize_character(character)):
+        assert document["endpoints"] == {"sharedInbox": expected}
@@ -255,6 +255,45 @@ class TestAcceptedAlgorithms:
         assert reason == "Unsupported algorithm: hmac-sha256"
 
 
+class TestStaleDocumentKey:
+    """A key from a (possibly cached) actor document is refetched once before rejecting."""
+
+    def _request(self, private_pem: str) -> Any:
+        body = json.dumps({"type": "Follow"})
+        return _sign(
+            private_pem,
+            body=body,
+            signed_headers=["(request-target)", "host", "date", "digest"],
+            date_str=None,
+            digest_value=_digest_of(body),
+        )
+
+    def test_rotated_key_accepted_after_fresh_fetch(self, mocker: Any) -> None:
+        _, old_pem = generate_key_pair()
+        private_pem, new_pem = generate_key_pair()
+        fetch = mocker.patch(
+            "suddenly.activitypub.signatures._fetch_public_key", side_effect=[old_pem, new_pem]
+        )
+
+        is_valid, result = verify_signature(self._request(private_pem))
+
+        assert is_valid is True
+        assert result == KEY_ID
+        assert fetch.call_args_list[1].kwargs == {"fresh": True}
+
+    def test_unchanged_key_rejected(self, keys: tuple[str, str], mocker: Any) -> None:
+        _, public_pem = keys
+        other_private, _ = generate_key_pair()
+        fetch = mocker.patch(
+            "suddenly.activitypub.signatures._fetch_public_key", return_value=public_pem
+        )
+
+        is_valid, _reason = verify_signature(self._request(other_private))
+
+        assert is_valid is False
+        assert fetch.call_count == 2
+
+
 class TestVerifyWithKeyMalformed:
     """_verify_with_key returns False on malformed crypto input — never raises.
 
@@ -4,6 +4,7 @@ Pytest configuration and fixtures for Suddenly tests.
 
 from __future__ import annotations
 
+from collections.abc import Iterator
 from typing import Any
 
 import pytest
@@ -66,6 +67,48 @@ def _celery_eager(settings: Any) -> None:
         pass  # Celery may not be configured (no broker)
 
 
+@pytest.fixture(autouse=True)
+def _fresh_delivery_client() -> Iterator[None]:
+    """Drop the pooled delivery client so each test's ``httpx.Client`` patch applies."""
+    from suddenly.activitypub._http import reset_delivery_client
+
+    reset_delivery_client()
+    yield
+    reset_delivery_client()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_key_cache() -> None:
+    """Empty the process-local parsed-key cache — DB rows roll back, memory does not."""
+    from suddenly.activitypub.signatures import clear_key_cache
+
+    clear_key_cache()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_dns_cache() -> None:
+    """Empty the process-local resolver cache so each test's ``getaddrinfo`` patch applies."""
+    from suddenly.activitypub._http import clear_dns_cache
+
+    clear_dns_cache()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_remote_cache() -> None:
+    """Empty the process-local remote document cache so each test's fetch mocks apply."""
+    from suddenly.activitypub._http import clear_remote_cache
+
+    clear_remote_cache()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_domain_registry() -> None:
+    """Forget the in-process federation domain registry — DB rows roll back, memory does not."""
+    from suddenly.activitypub.domains import reset_local_registry
+
+    reset_local_registry()
+
+
 @pytest.fixture
 def user(db: Any) -> User:
     """Create a test user."""
@@ -0,0 +1,157 @@
+"""Tests for keyset-paginated feeds ("load more" / infinite scroll)."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from suddenly.characters.models import Follow
+from suddenly.core.feed_views import FEED_PAGE_SIZE, interleave_promos
+from suddenly.games.models import Game, ReportStatus, ReportVisibility
+from tests.factories import CharacterFactory, GameFactory, ReportFactory, UserFactory
+
+
+def _publish(count: int, **kwargs: Any) -> list[Any]:
+    """Create `count` public scenes, newest first, one minute apart."""
+    now = timezone.now()
+    return [
+        ReportFactory(
+            status=ReportStatus.PUBLISHED,
+            visibility=ReportVisibility.PUBLIC,
+            published_at=now - timedelta(minutes=i),
+            released_at=now,
+            **kwargs,
+        )
+        for i in range(count)
+    ]
+
+
+def _next_query(response: Any) -> dict[str, str]:
+    url = response.context["next_page_url"]
+    return {k: v[0] for k, v in parse_qs(urlparse(url).query).items()}
+
+
+# ---------------------------------------------------------------------------
+# interleave_promos — page offsets
+# ---------------------------------------------------------------------------
+
+
+def test_interleave_slots_counted_from_feed_top() -> None:
+    npcs = ["n0", "n1", "n2"]
+    first = interleave_promos(["r0", "r1", "r2", "r3"], npcs, every=3, complete=False)
+    second = interleave_promos(["r4", "r5", "r6"], npcs, every=3, start=4)
+    promos = [it["obj"] for it in first + second if it["type"] == "promo"]
+    assert promos == ["n0", "n1"]
+    # n1 follows r5 (the 6th report), on the second page.
+    assert [it["obj"] for it in second] == ["r4", "r5", "n1", "r6"]
+
+
+def test_interleave_short_feed_guarantee_first_complete_page_only() -> None:
+    assert interleave_promos(["r0"], ["n0"], every=6, complete=False) == [
+        {"type": "report", "obj": "r0"}
+    ]
+    assert interleave_promos(["r9"], ["n0"], every=60, start=9) == [{"type": "report", "obj": "r9"}]
+
+
+# ---------------------------------------------------------------------------
+# Views
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.django_db
+def test_instance_feed_pages_cover_every_report_once(client: Client) -> None:
+    reports = _publish(FEED_PAGE_SIZE + 5)
+
+    first = client.get(reverse("feed:instance"))
+    assert first.status_code == 200
+    assert len(first.context["reports"]) == FEED_PAGE_SIZE
+    assert first.context["next_page_url"]
+
+    second = client.get(reverse("feed:instance"), _next_query(first), HTTP_HX_REQUEST="true")
+    assert second.status_code == 200
+    assert [t.name for t in second.templates][0] == "feed/_feed_page.html"
+    assert second.context["next_page_url"] is None
+
+    seen = [r.pk for r in first.context["reports"]] + [r.pk for r in second.context["reports"]]
+    assert seen == [r.pk for r in reports]
+
+
+@pytest.mark.django_db
+def test_fediverse_feed_breaks_published_at_ties_by_id(client: Client) -> None:
+    now = timezone.now()
+    reports = [
+        ReportFactory(
+            status=ReportStatus.PUBLISHED,
+            visibility=ReportVisibility.PUBLIC,
+            published_at=now,
+            remote=True,
+        )
+        for _ in range(FEED_PAGE_SIZE + 3)
+    ]
+
+    first = client.get(reverse("feed:fediverse"))
+    second = client.get(reverse("feed:fediverse"), _next_query(first))
+
+    seen = {r.pk for r in first.context["reports"]} | {r.pk for r in second.context["reports"]}
+    assert seen == {r.pk for r in reports}
+
+
+@pytest.mark.django_db
+def test_invalid_cursor_is_bad_request(client: Client) -> None:
+    response = client.get(reverse("feed:instance"), {"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_deep_page_query_count_matches_first_page(client: Client) -> None:
+    _publish(FEED_PAGE_SIZE * 3)
+
+    with CaptureQueriesContext(connection) as first_ctx:
+        first = client.get(reverse("feed:instance"), HTTP_HX_REQUEST="true")
+    second = client.get(reverse("feed:instance"), _next_query(first))
+    with CaptureQueriesContext(connection) as deep_ctx:
+        client.get(reverse("feed:instance"), _next_query(second))
+
+    assert len(deep_ctx.captured_queries) <= len(first_ctx.captured_queries)
+    assert not any("OFFSET" in q["sql"].upper() for q in deep_ctx.captured_queries)
+
+
+@pytest.mark.django_db
+def test_home_feed_promos_stable_across_pages(client: Client, settings: Any) -> None:
+    settings.FEED_PROMO_EVERY = 6
+    viewer = UserFactory()
+    author = UserFactory()
+    game = GameFactory(owner=author)
+    Follow.objects.create(
+        follower=viewer,
+        content_type=ContentType.objects.get_for_model(Game),
+        object_id=game.pk,
+    )
+    _publish(FEED_PAGE_SIZE + 10, game=game, author=author)
+    npcs = [
+        CharacterFactory(status="npc", origin_game=game, creator=author, remote=False)
+        for _ in range(6)
+    ]
+
+    client.force_login(viewer)
+    first = client.get(reverse("feed:home"))
+    second = client.get(reverse("feed:home"), _next_query(first))
+
+    items = first.context["feed_items"] + second.context["feed_items"]
+    types = [it["type"] for it in items]
+    # A promo after every 6th report of the whole feed: 30 reports → 5 promos.
+    assert types.count("promo") == 5
+    report_positions = [i for i, t in enumerate(types) if t == "promo"]
+    assert report_positions == [6, 13, 20, 27, 34]
+    promo_ids = [it["obj"].pk for it in items if it["type"] == "promo"]
+    assert len(set(promo_ids)) == 5
+    assert set(promo_ids) <= {n.pk for n in npcs}
@@ -131,3 +131,41 @@ class TestAccountMenu:
             user = _Anon()
 
         assert account_badges(_Req()) == {}
+
+
+class _Req:
+    def __init__(self, user: User) -> None:
+        self.user = user
+
+
+class TestAccountBadgeCache:
+    """Badge counts are one cached payload per user, dropped on relevant writes."""
+
+    def test_second_render_hits_cache(
+        self, db: Any, user: User, django_assert_num_queries: Any
+    ) -> None:
+        from suddenly.core.context_processors import account_badges
+
+        account_badges(_Req(user))
+
+        with django_assert_num_queries(0):
+            account_badges(_Req(user))
+
+    def test_new_notification_invalidates(self, db: Any, user: User) -> None:
+        from suddenly.core.context_processors import account_badges
+
+        assert account_badges(_Req(user))["unread_notifications_count"] == 0
+        Notification.objects.create(recipient=user, type=NotificationType.MENTION, message="x")
+
+        assert account_badges(_Req(user))["unread_notifications_count"] == 1
+
+    def test_mark_all_read_invalidates(self, db: Any, client: Client, user: User) -> None:
+        from suddenly.core.context_processors import account_badges
+
+        Notification.objects.create(recipient=user, type=NotificationType.MENTION, message="x")
+        assert account_badges(_Req(user))["unread_notifications_count"] == 1
+        client.force_login(user)
+
+        client.post(reverse("feed:notifications_read_all"))
+
+        assert account_badges(_Req(user))["unread_notifications_count"] == 0
@@ -0,0 +1,170 @@
+"""
+Tests for `NotificationService.fan_out` (bulk notification fan-out).
+
+Covers chunked creation, `NotificationPreference.muted_types`, the deferred
+path for large audiences and the offer/report call sites moved onto it.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from suddenly.core import services as core_services
+from suddenly.core.models import Notification, NotificationPreference, NotificationType
+from suddenly.core.services import NotificationService
+from tests.factories import UserFactory
+
+
+@pytest.mark.django_db
+class TestFanOut:
+    def test_creates_one_notification_per_recipient(self) -> None:
+        actor = UserFactory()
+        recipients = UserFactory.create_batch(3)
+
+        count = NotificationService.fan_out(
+            recipients,
+            notification_type=NotificationType.NEW_REPORT,
+            actor=actor,
+            message="hello",
+        )
+
+        assert count == 3
+        notifs = Notification.objects.filter(type=NotificationType.NEW_REPORT)
+        assert {n.recipient_id for n in notifs} == {u.pk for u in recipients}
+        assert all(n.actor_id == actor.pk and n.message == "hello" for n in notifs)
+
+    def test_accepts_ids_and_drops_duplicates(self) -> None:
+        user = UserFactory()
+
+        count = NotificationService.fan_out(
+            [user.pk, user, str(user.pk)],
+            notification_type=NotificationType.NEW_REPORT,
+            message="x",
+        )
+
+        assert count == 1
+        assert Notification.objects.filter(recipient=user).count() == 1
+
+    def test_sets_generic_target(self) -> None:
+        recipient = UserFactory()
+        target = UserFactory()
+
+        NotificationService.fan_out(
+            [recipient],
+            notification_type=NotificationType.NEW_FOLLOWER,
+            target=target,
+            message="x",
+        )
+
+        notif = Notification.objects.get(recipient=recipient)
+        assert notif.target_content_type == ContentType.objects.get_for_model(target)
+        assert str(notif.target_object_id) == str(target.pk)
+
+    def test_skips_recipients_who_muted_the_type(self) -> None:
+        muted, other = UserFactory(), UserFactory()
+        NotificationPreference.objects.create(user=muted, muted_types=[NotificationType.NEW_REPORT])
+
+        count = NotificationService.fan_out(
+            [muted, other],
+            notification_type=NotificationType.NEW_REPORT,
+            message="x",
+        )
+
+        assert count == 1
+        assert not Notification.objects.filter(recipient=muted).exists()
+        assert Notification.objects.filter(recipient=other).exists()
+
+    def test_empty_recipients_is_noop(self) -> None:
+        assert (
+            NotificationService.fan_out(
+                [], notification_type=NotificationType.NEW_REPORT, message="x"
+            )
+            == 0
+        )
+
+    def test_query_count_is_per_chunk_not_per_recipient(self, settings: Any) -> None:
+        # In CI the default cache is the database one: its invalidations
+        # would be counted with the fan-out's own queries.
+        settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+        recipients = UserFactory.create_batch(6)
+
+        with (
+            patch.object(core_services, "NOTIFICATION_FANOUT_CHUNK", 3),
+            CaptureQueriesContext(connection) as ctx,
+        ):
+            NotificationService.fan_out(
+                recipients, notification_type=NotificationType.NEW_REPORT, message="x"
+            )
+
+        assert Notification.objects.count() == 6
+        # Two chunks: one recipient lookup + one bulk INSERT each.
+        assert len(ctx.captured_queries) <= 4
+
+    def test_large_audience_deferred_when_broker_available(
+        self, settings: Any, django_capture_on_commit_callbacks: Any
+    ) -> None:
+        from suddenly.core.tasks import fan_out_notifications
+
+        settings.NOTIFICATION_FANOUT_SYNC_LIMIT = 1
+        recipients = UserFactory.create_batch(2)
+
+        with (
+            patch("suddenly.activitypub.inbox_queue._broker_available", return_value=True),
+            # The "worker" runs the queued task on the spot.
+            patch(
+                "suddenly.core.tasks.fan_out_notifications.delay",
+                side_effect=fan_out_notifications,
+            ) as delay,
+            django_capture_on_commit_callbacks(execute=True) as callbacks,
+        ):
+            count = NotificationService.fan_out(
+                recipients, notification_type=NotificationType.NEW_REPORT, message="x"
+            )
+            # Nothing is queued or written before the transaction commits.
+            delay.assert_not_called()
+            assert not Notification.objects.exists()
+
+        assert count == 2
+        assert len(callbacks) == 1
+        delay.assert_called_once()
+        notifs = Notification.objects.filter(type=NotificationType.NEW_REPORT)
+        assert {n.recipient_id for n in notifs} == {u.pk for u in recipients}
+
+    def test_large_audience_inline_in_eager_mode(self, settings: Any) -> None:
+        settings.NOTIFICATION_FANOUT_SYNC_LIMIT = 1
+        recipients = UserFactory.create_batch(2)
+
+        with patch("suddenly.activitypub.inbox_queue._broker_available", return_value=False):
+            NotificationService.fan_out(
+                recipients, notification_type=NotificationType.NEW_REPORT, message="x"
+            )
+
+        assert Notification.objects.count() == 2
+
+
+@pytest.mark.django_db
+class TestFanOutNotificationsTask:
+    def test_task_creates_rows_and_ignores_deleted_users(self) -> None:
+        from suddenly.core.tasks import fan_out_notifications
+
+        kept, gone = UserFactory(), UserFactory()
+        gone_pk = str(gone.pk)
+        gone.delete()
+        fields = {
+            "type": NotificationType.NEW_REPORT,
+            "message": "x",
+            "actor_id": None,
+            "target_content_type_id": None,
+            "target_object_id": None,
+        }
+
+        created = fan_out_notifications([str(kept.pk), gone_pk], fields)
+
+        assert created == 1
+        assert Notification.objects.filter(recipient=kept).count() == 1
@@ -0,0 +1,219 @@
+"""
+Tests for the database task queue (``core.task_queue``).
+
+With ``TASK_QUEUE_BACKEND = "database"``, ``delay`` writes a ``QueuedTask``
+row instead of running the task; the worker claims due rows, runs them with a
+worker-like request (so ``self.retry`` queues a new row) and parks failures.
+No network is hit.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.utils import timezone
+
+from suddenly.activitypub.inbox_queue import _broker_available
+from suddenly.activitypub.outbound import store_activity
+from suddenly.activitypub.tasks import deliver_activity, purge_outbound_activities
+from suddenly.core.models import QueuedTask, QueuedTaskStatus
+from suddenly.core.task_queue import claim_due_tasks, drain_task_queue, periodic_schedule
+
+
+@pytest.fixture(autouse=True)
+def _database_queue(settings: Any) -> None:
+    settings.TASK_QUEUE_BACKEND = "database"
+    cache.clear()
+
+
+@pytest.mark.django_db
+class TestEnqueue:
+    def test_delay_writes_row_instead_of_running(self, mocker: Any) -> None:
+        purge = mocker.patch("suddenly.activitypub.outbound.purge_outbound_activities")
+
+        result = purge_outbound_activities.delay()
+
+        purge.assert_not_called()
+        queued = QueuedTask.objects.get()
+        assert result.id == str(queued.pk)
+        assert (queued.task_name, queued.args, queued.kwargs, queued.status) == (
+            "suddenly.activitypub.tasks.purge_outbound_activities",
+            [],
+            {},
+            QueuedTaskStatus.PENDING,
+        )
+
+    def test_countdown_delays_availability(self) -> None:
+        deliver_activity.apply_async(
+            kwargs={"outbound_id": "x", "inbox_url": "https://a.example/inbox"}, countdown=300
+        )
+
+        assert claim_due_tasks(10) == []
+        assert QueuedTask.objects.get().available_at > timezone.now() + timedelta(seconds=250)
+
+    def test_celery_backend_is_untouched(self, mocker: Any, settings: Any) -> None:
+        settings.TASK_QUEUE_BACKEND = "celery"
+        purge = mocker.patch(
+            "suddenly.activitypub.outbound.purge_outbound_activities", return_value=0
+        )
+
+        purge_outbound_activities.delay()
+
+        purge.assert_called_once()
+        assert not QueuedTask.objects.exists()
+
+    def test_row_records_routed_queue(self) -> None:
+        purge_outbound_activities.delay()
+        deliver_activity.apply_async(
+            kwargs={"outbound_id": "x", "inbox_url": "https://a.example/inbox"}, queue="fanout"
+        )
+
+        assert sorted(QueuedTask.objects.values_list("queue", flat=True)) == [
+            "fanout",
+            "maintenance",
+        ]
+
+    def test_counts_as_broker(self) -> None:
+        assert _broker_available()
+
+
+@pytest.mark.django_db
+class TestWorker:
+    def test_runs_and_deletes_due_task(self, mocker: Any) -> None:
+        purge = mocker.patch(
+            "suddenly.activitypub.outbound.purge_outbound_activities", return_value=3
+        )
+        purge_outbound_activities.delay()
+
+        assert drain_task_queue() == {"done": 1, "retried": 0, "failed": 0}
+
+        purge.assert_called_once()
+        assert not QueuedTask.objects.exists()
+
+    def test_retry_queues_backoff_row(self, mocker: Any) -> None:
+        response = mocker.MagicMock()
+        response.status_code = 503
+        mocker.patch("suddenly.activitypub.tasks._post_activity", return_value=response)
+        outbound_id = store_activity({"type": "Create"}, None)
+        deliver_activity.apply_async(
+            kwargs={"outbound_id": outbound_id, "inbox_url": "https://a.example/inbox"},
+            queue="fanout",
+        )
+        first = QueuedTask.objects.get()
+
+        assert drain_task_queue() == {"done": 0, "retried": 1, "failed": 0}
+
+        retry = QueuedTask.objects.get()
+        assert retry.pk != first.pk
+        assert (retry.retries, retry.queue) == (1, "fanout")
+        assert retry.kwargs == {"outbound_id": outbound_id, "inbox_url": "https://a.example/inbox"}
+        assert retry.available_at > timezone.now() + timedelta(seconds=50)
+
+    def test_exception_parks_row_as_failed(self, mocker: Any) -> None:
+        mocker.patch(
+            "suddenly.activitypub.outbound.purge_outbound_activities",
+            side_effect=RuntimeError("boom"),
+        )
+        purge_outbound_activities.delay()
+
+        assert drain_task_queue() == {"done": 0, "retried": 0, "failed": 1}
+
+        queued = QueuedTask.objects.get()
+        assert queued.status == QueuedTaskStatus.FAILED
+        assert queued.last_error == "RuntimeError: boom"
+        assert claim_due_tasks(10) == []
+
+    def test_unknown_task_fails(self) -> None:
+        QueuedTask.objects.create(task_name="suddenly.nope")
+
+        assert drain_task_queue()["failed"] == 1
+        assert "Unknown task" in QueuedTask.objects.get().last_error
+
+    def test_stale_running_row_is_reclaimed(self, settings: Any) -> None:
+        settings.CELERY_TASK_TIME_LIMIT = 60
+        now = timezone.now()
+        stale = QueuedTask.objects.create(
+            task_name="a", status=QueuedTaskStatus.RUNNING, locked_at=now - timedelta(minutes=5)
+        )
+        QueuedTask.objects.create(task_name="b", status=QueuedTaskStatus.RUNNING, locked_at=now)
+
+        assert [row.pk for row in claim_due_tasks(10)] == [stale.pk]
+
+    def test_worker_limited_to_its_queues(self, mocker: Any) -> None:
+        mocker.patch("suddenly.activitypub.outbound.purge_outbound_activities", return_value=0)
+        purge_outbound_activities.delay()
+
+        assert drain_task_queue(queues=["interactive"])["done"] == 0
+        assert drain_task_queue(queues=["maintenance"])["done"] == 1
+
+    def test_command_once(self, mocker: Any) -> None:
+        mocker.patch("suddenly.activitypub.outbound.purge_outbound_activities", return_value=0)
+        # The worker loop recycles connections; here that would close the
+        # test transaction's connection.
+        close = mocker.patch(
+            "suddenly.core.management.commands.run_task_queue.close_old_connections"
+        )
+        purge_outbound_activities.delay()
+
+        call_command("run_task_queue", "--once")
+
+        close.assert_called_once()
+        assert not QueuedTask.objects.exists()
+
+
+# The autouse fixture clears the cache, which lives in the database in CI.
+@pytest.mark.django_db
+def test_periodic_schedule_keeps_fixed_intervals(settings: Any) -> None:
+    settings.CELERY_BEAT_SCHEDULE = {
+        "hourly": {"task": "a.hourly", "schedule": 3600},
+        "daily": {"task": "a.daily", "schedule": timedelta(days=1)},
+        "cron": {"task": "a.cron", "schedule": object()},
+    }
+
+    assert periodic_schedule() == {
+        "hourly": ("a.hourly", 3600.0),
+        "daily": ("a.daily", 86400.0),
+    }
+
+
+_ENQUEUE_SCRIPT = """
+from unittest import mock
+
+import django
+
+django.setup()
+
+from suddenly.activitypub.tasks import purge_outbound_activities
+
+with mock.patch("suddenly.core.task_queue.enqueue_task", return_value="queued") as enqueue:
+    result = purge_outbound_activities.delay()
+print(enqueue.call_count, result.id)
+"""
+
+
+@pytest.mark.django_db  # for the autouse cache clear, as above
+def test_web_process_enqueues_without_importing_celery_module() -> None:
+    # A fresh interpreter, as a web process: only Django is set up, nothing
+    # imports ``suddenly.celery`` by hand (the test fixtures do).
+    env = {**os.environ, "TASK_QUEUE_BACKEND": "database"}
+    env.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.development")
+
+    done = subprocess.run(
+        [sys.executable, "-c", _ENQUEUE_SCRIPT],
+        cwd=Path(__file__).resolve().parents[2],
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+
+    assert done.returncode == 0, done.stderr
+    assert done.stdout.split()[-2:] == ["1", "queued"]
@@ -0,0 +1,63 @@
+"""
+Tests for task routing: interactive, fan-out and maintenance queues
+(``CELERY_TASK_ROUTES``) and the per-queue ``run_worker`` command.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import Any
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from suddenly.celery import app
+
+
+def _routed_queue(task_name: str) -> str:
+    return str(app.amqp.router.route({}, task_name)["queue"].name)
+
+
+class TestRoutes:
+    @pytest.mark.parametrize(
+        ("task_name", "queue"),
+        [
+            ("suddenly.activitypub.tasks.send_direct_message_activity", "interactive"),
+            ("suddenly.activitypub.tasks.send_accept_activity", "interactive"),
+            ("suddenly.activitypub.tasks.deliver_activity", "interactive"),
+            ("suddenly.activitypub.tasks.broadcast_activity", "fanout"),
+            ("suddenly.activitypub.tasks.deliver_activity_batch", "fanout"),
+            ("suddenly.users.tasks.import_follows_from_rows", "fanout"),
+            ("suddenly.activitypub.tasks.refresh_remote_actors", "maintenance"),
+            ("suddenly.activitypub.tasks.crawl_nodeinfo", "maintenance"),
+        ],
+    )
+    def test_task_queue(self, task_name: str, queue: str) -> None:
+        assert _routed_queue(task_name) == queue
+
+    def test_routes_name_existing_tasks_and_declared_queues(self, settings: Any) -> None:
+        for task_name, route in settings.CELERY_TASK_ROUTES.items():
+            module, _, func = task_name.rpartition(".")
+            assert hasattr(importlib.import_module(module), func), task_name
+            assert route["queue"] in settings.CELERY_TASK_QUEUES
+        assert set(settings.CELERY_TASK_QUEUES) == set(settings.TASK_QUEUE_WORKERS)
+
+
+class TestRunWorker:
+    def test_starts_worker_on_one_queue(self, mocker: Any, settings: Any) -> None:
+        settings.TASK_QUEUE_WORKERS = {"fanout": {"concurrency": 3, "prefetch_multiplier": 1}}
+        worker_main = mocker.patch.object(app, "worker_main")
+
+        call_command("run_worker", "fanout")
+
+        argv = worker_main.call_args.args[0]
+        assert argv[0] == "worker"
+        assert {"--queues=fanout", "--concurrency=3", "--prefetch-multiplier=1"} <= set(argv)
+
+    def test_unknown_queue(self, mocker: Any) -> None:
+        worker_main = mocker.patch.object(app, "worker_main")
+
+        with pytest.raises(CommandError):
+            call_command("run_worker", "bulk")
+
+        worker_main.assert_not_called()
@@ -155,6 +155,9 @@ class TestFeedInitialState:
         client.force_login(user)
         for i in range(3):
             _published_with_rapport(user, game, i)
+        # Warm the per-user caches (account badges) so both measured renders
+        # hit them and only the feed loop can make the counts differ.
+        client.get(reverse("feed:instance"))
         with CaptureQueriesContext(connection) as ctx_small:
             client.get(reverse("feed:instance"))
 
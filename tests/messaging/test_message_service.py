@@ -105,3 +105,28 @@ class TestUnread:
         MessageService.mark_read(conv, alice)
         assert MessageService.unread_for(conv, alice) == 0
         assert MessageService.unread_count(alice) == 0
+
+    def test_unread_count_uses_each_users_own_cursor(self, alice: User, bob: User) -> None:
+        carol = UserFactory(username="carol", email="carol@example.com")
+        _make_mutual(alice, bob)
+        _make_mutual(alice, carol)
+        MessageService.send(bob, alice, "un")
+        conv_bob, _ = MessageService.get_or_create_conversation(alice, bob)
+        # Bob reads (his cursor moves), Alice does not: still unread for her.
+        MessageService.mark_read(conv_bob, bob)
+        MessageService.send(carol, alice, "deux")
+        MessageService.send(alice, carol, "réponse")
+
+        assert MessageService.unread_count(alice) == 2
+        assert MessageService.unread_count(carol) == 1
+        conv_carol, _ = MessageService.get_or_create_conversation(alice, carol)
+        assert MessageService.unread_by_conversation(alice) == {conv_bob.pk: 1, conv_carol.pk: 1}
+
+    def test_unread_count_is_one_query(self, alice: User, django_assert_num_queries: Any) -> None:
+        for i in range(4):
+            other = UserFactory(username=f"peer{i}", email=f"peer{i}@example.com")
+            _make_mutual(alice, other)
+            MessageService.send(other, alice, "salut")
+
+        with django_assert_num_queries(1):
+            assert MessageService.unread_count(alice) == 4
@@ -11,6 +11,7 @@ import pytest
 from django.http import HttpRequest
 from django.test import Client, RequestFactory
 
+from suddenly.activitypub.models import OutboundActivity
 from suddenly.activitypub.serializers import (
     serialize_character,
     serialize_game,
@@ -426,6 +427,40 @@ class TestHTTPSignatures:
         is_valid, _ = verify_signature(request)
         assert is_valid is False
 
+    def test_encoded_body_roundtrip(self, mocker: Any) -> None:
+        """A body from encode_body verifies when its exact bytes are sent."""
+        from suddenly.activitypub.signatures import encode_body, sign_request, verify_signature
+
+        private_pem, public_pem = generate_key_pair()
+        key_id = "https://remote.social/users/alice#main-key"
+        body = encode_body({"type": "Create", "content": "Scène d'été"})
+
+        headers: dict[str, str] = {}
+        sign_request(
+            method="POST",
+            url="https://test.social/users/testuser/inbox",
+            headers=headers,
+            body=body,
+            key_id=key_id,
+            private_key_pem=private_pem,
+        )
+        request = RequestFactory().post(
+            "/users/testuser/inbox",
+            data=body.content,
+            content_type="application/activity+json",
+            HTTP_HOST=headers["Host"],
+            HTTP_DATE=headers["Date"],
+            HTTP_SIGNATURE=headers["Signature"],
+            HTTP_DIGEST=headers["Digest"],
+        )
+        mocker.patch(
+            "suddenly.activitypub.signatures._fetch_public_key",
+            return_value=public_pem,
+        )
+
+        assert headers["Digest"] == body.digest
+        assert verify_signature(request) == (True, key_id)
+
 
 class TestInbox:
     """Tests for inbox endpoints (receiving activities)."""
@@ -792,10 +827,12 @@ class TestLinkOfferFederation:
         send_accept_activity(str(lr.pk))
 
         assert deliver.delay.called
-        # sign_and_deliver calls deliver_activity.delay(...) with all-keyword
-        # arguments (activity=, inbox_url=, actor_key_id=, private_key_pem=) —
+        # sign_and_deliver stores the activity and calls deliver_activity.delay(...)
+        # with all-keyword arguments (outbound_id=, inbox_url=) —
         # see suddenly/activitypub/_http.py::sign_and_deliver.
-        sent_activity = deliver.delay.call_args.kwargs["activity"]
+        sent_activity = OutboundActivity.objects.get(
+            pk=deliver.delay.call_args.kwargs["outbound_id"]
+        ).activity
         assert sent_activity["object"] == origin_id
 
     def test_locally_created_request_accept_keeps_serialized_offer(
@@ -819,10 +856,12 @@ class TestLinkOfferFederation:
         send_accept_activity(str(lr.pk))
 
         assert deliver.delay.called
-        # sign_and_deliver calls deliver_activity.delay(...) with all-keyword
-        # arguments (activity=, inbox_url=, actor_key_id=, private_key_pem=) —
+        # sign_and_deliver stores the activity and calls deliver_activity.delay(...)
+        # with all-keyword arguments (outbound_id=, inbox_url=) —
         # see suddenly/activitypub/_http.py::sign_and_deliver.
-        sent_activity = deliver.delay.call_args.kwargs["activity"]
+        sent_activity = OutboundActivity.objects.get(
+            pk=deliver.delay.call_args.kwargs["outbound_id"]
+        ).activity
         assert isinstance(sent_activity["object"], dict)
         assert sent_activity["object"]["type"] == "Offer"
 
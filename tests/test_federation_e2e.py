@@ -22,6 +22,32 @@ from django.test import RequestFactory
 from suddenly.activitypub.signatures import generate_key_pair
 from tests.factories import UserFactory
 
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def _queued_delivery(kwargs: dict[str, Any]) -> dict[str, Any]:
+    """Resolve a ``deliver_activity.delay`` message against the outbound store.
+
+    The message only carries ``outbound_id`` and ``inbox_url``; the activity and
+    the signing keys the worker would use are read back here so assertions can
+    check them.
+    """
+    from suddenly.activitypub.models import OutboundActivity
+    from suddenly.activitypub.outbound import signing_keys
+
+    assert "private_key_pem" not in kwargs, "private keys must never be queued"
+    stored = OutboundActivity.objects.get(pk=kwargs["outbound_id"])
+    actor_key_id, private_key_pem = signing_keys(stored.signer_key_id) or (None, None)
+    return {
+        **kwargs,
+        "activity": stored.activity,
+        "actor_key_id": actor_key_id,
+        "private_key_pem": private_key_pem,
+    }
+
+
 # ---------------------------------------------------------------------------
 # Fixtures
 # ---------------------------------------------------------------------------
@@ -194,7 +220,7 @@ class TestFollowIncoming:
         captured_delay_calls: list[dict[str, Any]] = []
 
         def fake_delay(**kwargs: Any) -> None:
-            captured_delay_calls.append(kwargs)
+            captured_delay_calls.append(_queued_delivery(kwargs))
 
         mocker.patch("httpx.Client", return_value=mock_client_instance)
         # deliver_activity is imported inside handle_follow via
@@ -312,7 +338,7 @@ class TestFollowOutgoing:
         captured_delay_calls: list[dict[str, Any]] = []
 
         def fake_delay(**kwargs: Any) -> None:
-            captured_delay_calls.append(kwargs)
+            captured_delay_calls.append(_queued_delivery(kwargs))
 
         mock_deliver = mocker.MagicMock()
         mock_deliver.delay.side_effect = fake_delay
@@ -541,7 +567,7 @@ class TestUnfollowOutgoing:
         captured_delay_calls: list[dict[str, Any]] = []
 
         def fake_delay(**kwargs: Any) -> None:
-            captured_delay_calls.append(kwargs)
+            captured_delay_calls.append(_queued_delivery(kwargs))
 
         mock_deliver = mocker.MagicMock()
         mock_deliver.delay.side_effect = fake_delay
@@ -1009,10 +1035,10 @@ class TestOfferOutgoing:
         def fake_delay(*args: Any, **kwargs: Any) -> None:
             # Normalise positional args to their named equivalents so assertions
             # can use call_kwargs.get("activity") / call_kwargs.get("inbox_url").
-            param_names = ["activity", "inbox_url", "actor_key_id", "private_key_pem"]
+            param_names = ["outbound_id", "inbox_url"]
             normalised = dict(zip(param_names, args, strict=False))
             normalised.update(kwargs)
-            captured_delay_calls.append(normalised)
+            captured_delay_calls.append(_queued_delivery(normalised))
 
         mock_deliver = mocker.MagicMock()
         mock_deliver.delay.side_effect = fake_delay
@@ -2044,7 +2070,7 @@ class TestFollowOutgoingActivityId:
         captured_delay_calls: list[dict[str, Any]] = []
 
         def fake_delay(**kwargs: Any) -> None:
-            captured_delay_calls.append(kwargs)
+            captured_delay_calls.append(_queued_delivery(kwargs))
 
         mock_deliver = mocker.MagicMock()
         mock_deliver.delay.side_effect = fake_delay
@@ -0,0 +1,252 @@
+"""
+Tests for the concurrent follow import (``users.follow_import``).
+
+Known accounts are matched without HTTP, unknown ones are resolved in a
+bounded pool grouped by domain, follows are bulk-written with their
+post_save side effects, and the ``FollowImport`` row reports progress to the
+settings page. No network is hit.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client
+from django.urls import reverse
+
+from suddenly.characters.models import Follow
+from suddenly.core.models import Notification
+from suddenly.users.follow_import import import_follows, parse_address
+from suddenly.users.models import FollowImport, FollowImportStatus, User
+from tests.factories import UserFactory
+
+_MODULE = "suddenly.users.follow_import"
+
+
+@pytest.fixture(autouse=True)
+def _isolated(settings: Any) -> Any:
+    settings.DOMAIN = "suddenly.test"
+    settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    settings.STORAGES = {
+        **settings.STORAGES,
+        "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    }
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _webfinger(url: str, **kwargs: Any) -> dict[str, Any] | None:
+    account = url.split("acct:", 1)[1]
+    username, domain = account.split("@")
+    if username == "ghost":
+        return None
+    return {
+        "links": [
+            {
+                "rel": "self",
+                "type": "application/activity+json",
+                "href": f"https://{domain}/users/{username}",
+            }
+        ]
+    }
+
+
+def _actor(url: str, **kwargs: Any) -> dict[str, Any]:
+    return {
+        "id": url,
+        "preferredUsername": url.rsplit("/", 1)[1],
+        "name": url.rsplit("/", 1)[1].title(),
+        "inbox": f"{url}/inbox",
+        "outbox": f"{url}/outbox",
+        "publicKey": {"publicKeyPem": "PEM"},
+    }
+
+
+@pytest.fixture(autouse=True)
+def deliver(mocker: Any) -> Any:
+    # Follows written by the import still send their Follow activity
+    # (post_save); keep it off the network.
+    return mocker.patch("suddenly.activitypub.signals._safe_delay")
+
+
+@pytest.fixture
+def remote(mocker: Any) -> Any:
+    mocker.patch(f"{_MODULE}.fetch_ap_json", side_effect=_webfinger)
+    return mocker.patch(f"{_MODULE}.fetch_ap_actor", side_effect=_actor)
+
+
+def _followed(follower: User) -> set[str]:
+    ct = ContentType.objects.get_for_model(User)
+    ids = Follow.objects.filter(follower=follower, content_type=ct).values_list(
+        "object_id", flat=True
+    )
+    return set(User.objects.filter(pk__in=ids).values_list("username", flat=True))
+
+
+@pytest.mark.parametrize(
+    ("address", "parsed"),
+    [
+        ("alice", ("alice", "")),
+        ("@alice@suddenly.test", ("alice", "")),
+        ("bob@Masto.Example", ("bob", "masto.example")),
+        ("@bob@masto.example:8443", ("bob", "masto.example:8443")),
+        ("bob@masto.example/evil", None),
+        ("a@b@c", None),
+        ("", None),
+    ],
+)
+def test_parse_address(address: str, parsed: tuple[str, str] | None) -> None:
+    assert parse_address(address) == parsed
+
+
+@pytest.mark.django_db
+class TestImportFollows:
+    def test_local_known_and_unknown_accounts(self, remote: Any, deliver: Any) -> None:
+        follower = UserFactory(username="me")
+        UserFactory(username="alice")
+        UserFactory(
+            username="carol@peer.example",
+            remote=True,
+            ap_id="https://peer.example/users/carol",
+        )
+
+        counts = import_follows(
+            follower, ["alice", "@carol@peer.example", "bob@masto.example", "ghost@masto.example"]
+        )
+
+        assert counts == {"imported": 3, "skipped": 0, "failed": 1}
+        assert _followed(follower) == {"alice", "carol@peer.example", "bob@masto.example"}
+        # Only bob needed HTTP; carol was already mirrored.
+        remote.assert_called_once_with("https://masto.example/users/bob")
+        # post_save side effects still run for bulk-written follows.
+        inboxes = {call.kwargs["inbox_url"] for call in deliver.call_args_list}
+        assert "https://masto.example/users/bob/inbox" in inboxes
+        assert Notification.objects.filter(recipient__username="alice").exists()
+
+    def test_existing_duplicates_and_malformed_are_counted(self, remote: Any) -> None:
+        follower = UserFactory(username="me")
+        alice = UserFactory(username="alice")
+        Follow.objects.create(
+            follower=follower,
+            content_type=ContentType.objects.get_for_model(User),
+            object_id=alice.pk,
+        )
+
+        counts = import_follows(follower, ["alice", "@alice", "me", "nobody", "not an address"])
+
+        assert counts == {"imported": 0, "skipped": 3, "failed": 2}
+        assert Follow.objects.filter(follower=follower).count() == 1
+
+    def test_domains_resolved_concurrently(self, mocker: Any) -> None:
+        follower = UserFactory(username="me")
+        domains = ["a.example", "b.example", "c.example"]
+        # Each WebFinger waits for the others: resolved one after another,
+        # they would time out at the barrier.
+        barrier = threading.Barrier(len(domains), timeout=2)
+
+        def webfinger(url: str, **kwargs: Any) -> dict[str, Any] | None:
+            barrier.wait()
+            return _webfinger(url)
+
+        mocker.patch(f"{_MODULE}.fetch_ap_json", side_effect=webfinger)
+        mocker.patch(f"{_MODULE}.fetch_ap_actor", side_effect=_actor)
+
+        counts = import_follows(follower, [f"bob@{domain}" for domain in domains])
+
+        assert counts["imported"] == 3
+
+    def test_per_domain_limit(self, mocker: Any, settings: Any) -> None:
+        settings.AP_FOLLOW_IMPORT_PER_DOMAIN = 2
+        follower = UserFactory(username="me")
+        lock = threading.Lock()
+        active = {"now": 0, "peak": 0}
+
+        def webfinger(url: str, **kwargs: Any) -> dict[str, Any] | None:
+            with lock:
+                active["now"] += 1
+                active["peak"] = max(active["peak"], active["now"])
+            time.sleep(0.02)
+            with lock:
+                active["now"] -= 1
+            return _webfinger(url)
+
+        mocker.patch(f"{_MODULE}.fetch_ap_json", side_effect=webfinger)
+        mocker.patch(f"{_MODULE}.fetch_ap_actor", side_effect=_actor)
+
+        counts = import_follows(follower, [f"user{n}@big.example" for n in range(10)])
+
+        assert counts["imported"] == 10
+        assert active["peak"] == 2
+
+    def test_progress_written_per_batch(self, remote: Any, settings: Any) -> None:
+        settings.AP_FOLLOW_IMPORT_BATCH = 2
+        follower = UserFactory(username="me")
+        record = FollowImport.objects.create(user=follower, total=5)
+        addresses = [f"user{n}@masto.example" for n in range(4)] + ["ghost@masto.example"]
+
+        import_follows(follower, addresses, record=record)
+
+        record = FollowImport.objects.get(pk=record.pk)
+        assert record.status == FollowImportStatus.DONE
+        assert (record.processed, record.imported, record.failed) == (5, 4, 1)
+        assert record.finished_at is not None
+        assert record.percent == 100
+
+    def test_failure_marks_record_failed(self, mocker: Any) -> None:
+        follower = UserFactory(username="me")
+        record = FollowImport.objects.create(user=follower, total=1)
+        mocker.patch(f"{_MODULE}._resolve_remote", side_effect=RuntimeError("boom"))
+
+        with pytest.raises(RuntimeError):
+            import_follows(follower, ["bob@masto.example"], record=record)
+
+        assert FollowImport.objects.get(pk=record.pk).status == FollowImportStatus.FAILED
+
+
+@pytest.mark.django_db
+class TestImportViews:
+    def test_upload_queues_task_with_status_record(self, mocker: Any) -> None:
+        user = UserFactory(username="me")
+        client = Client()
+        client.force_login(user)
+        delay = mocker.patch("suddenly.users.tasks.import_follows_from_rows.delay")
+        upload = SimpleUploadedFile(
+            "follows.csv", b"Account address,Show boosts\nbob@masto.example,true\n"
+        )
+
+        response = client.post(reverse("users:import_follows"), {"csv_file": upload})
+
+        record = FollowImport.objects.get()
+        delay.assert_called_once_with(str(user.pk), ["bob@masto.example"], str(record.pk))
+        assert record.total == 1
+        assert reverse("users:follow_import_status", kwargs={"pk": record.pk}) in (
+            response.content.decode()
+        )
+
+    def test_status_polls_until_finished(self) -> None:
+        user = UserFactory(username="me")
+        record = FollowImport.objects.create(user=user, total=4, processed=1)
+        client = Client()
+        client.force_login(user)
+        url = reverse("users:follow_import_status", kwargs={"pk": record.pk})
+
+        assert 'hx-trigger="every 2s"' in client.get(url).content.decode()
+
+        FollowImport.objects.filter(pk=record.pk).update(status=FollowImportStatus.DONE)
+        assert "hx-trigger" not in client.get(url).content.decode()
+
+    def test_status_of_someone_elses_import_is_404(self) -> None:
+        record = FollowImport.objects.create(user=UserFactory(username="other"), total=1)
+        client = Client()
+        client.force_login(UserFactory(username="me"))
+
+        response = client.get(reverse("users:follow_import_status", kwargs={"pk": record.pk}))
+
+        assert response.status_code == 404